@@ -613,9 +613,10 @@ class ServiceProcess:
         env.update(self.extra_env)
 
         # Add shared modules to PYTHONPATH for local development
-        # This allows importing crm_security, crm_cache, crm_channels, crm_llm without pip install
+        # This allows importing crm_security, crm_cache, crm_channels, crm_llm, crm_utils without pip install
         shared_paths = [
             str(ROOT_DIR / "src" / "shared" / "crm-security"),
+            str(ROOT_DIR / "src" / "shared" / "crm-utils"),
             str(ROOT_DIR / "src" / "shared" / "crm-cache"),
             str(ROOT_DIR / "src" / "shared" / "crm-channels"),
             str(ROOT_DIR / "src" / "shared" / "crm-llm"),
@@ -2,10 +2,15 @@
 Health check and metadata endpoints.
 """
 
-from fastapi import APIRouter, Query
+import hashlib
+import json
+
+from crm_security import TrustedUserContext, require_auth
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
 import config
 from db.database import db
+from db.runtime import runtime_stats
 
 router = APIRouter(tags=["Health"])
 
@@ -20,6 +25,21 @@ async def health_check():
     }
 
 
+@router.get("/metrics")
+async def metrics(user: TrustedUserContext = Depends(require_auth)):
+    """
+    Runtime metrics for monitoring.
+
+    Reports the shared query executor and background event loop used by
+    the database backend (thread counts should stay flat under load).
+    """
+    return {
+        "service": "asset-management",
+        "db_backend": db.backend_name,
+        "db_runtime": runtime_stats(),
+    }
+
+
 @router.get("/")
 async def root():
     """Root endpoint."""
@@ -77,12 +97,17 @@ async def expand_companies(
 
 
 @router.get("/api/companies/hierarchy")
-async def get_company_hierarchy():
+async def get_company_hierarchy(request: Request, response: Response):
     """
     Get the full company hierarchy tree.
 
     Returns all companies with their parent relationships and children.
-    Used by admin panels and permission management UIs.
+    Used by admin panels and permission management UIs, and cached by the
+    unified-ui gateway to expand company access in-process.
+
+    `version` (also sent as the ETag) is a hash of the tree, so it changes
+    whenever the hierarchy does. Requests with a matching If-None-Match
+    get 304 Not Modified. A database error is a 503, never an empty tree.
 
     Hierarchy structure:
     - mmg (root group)
@@ -92,8 +117,20 @@ async def get_company_hierarchy():
         - backlite_abudhabi (leaf)
       - viola (leaf)
     """
-    hierarchy = db.get_company_hierarchy()
+    try:
+        hierarchy = db.get_company_hierarchy()
+    except Exception:
+        raise HTTPException(status_code=503, detail="Company hierarchy unavailable")
+    body = json.dumps(hierarchy, sort_keys=True, separators=(",", ":"), default=str)
+    version = hashlib.sha256(body.encode()).hexdigest()[:16]
+    etag = f'"{version}"'
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
     return {
         "hierarchy": hierarchy,
         "count": len(hierarchy),
+        "version": version,
     }
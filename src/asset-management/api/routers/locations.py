@@ -8,12 +8,13 @@ After migration 02_unify_standalone, all sellable entities are networks
 for the frontend - no standalone vs traditional distinction exposed.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
 import config
 from core.locations import Location, LocationCreate, LocationUpdate, LocationService
 from core.packages import PackageService
 from db.database import db
+from db.pagination import InvalidCursorError
 from crm_security import (
     TrustedUserContext,
     require_auth,
@@ -30,11 +31,14 @@ _package_service = PackageService()
 
 @router.get("")
 def list_locations(
+    response: Response,
     companies: list[str] = Query(default=None, description="Filter by company schemas"),
     network_id: int | None = Query(default=None, description="Filter by network"),
     type_id: int | None = Query(default=None, description="Filter by asset type"),
     active_only: bool = Query(default=True, description="Only return active locations"),
     include_eligibility: bool = Query(default=False, description="Include eligibility info"),
+    limit: int | None = Query(default=None, ge=1, le=500, description="Page size (enables cursor paging)"),
+    cursor: str | None = Query(default=None, description="X-Next-Cursor value from the previous page"),
     user: TrustedUserContext = Depends(require_permission("assets:locations:read")),
 ) -> list[Location]:
     """
@@ -43,12 +47,33 @@ def list_locations(
     Requires: assets:locations:read permission
 
     Locations are sellable entities (all networks after unification).
+
+    Pass limit (and then cursor) to page through all companies in one
+    display_name order; the next page's cursor is returned in the
+    X-Next-Cursor header, which is absent on the last page.
     """
     # Filter to user's accessible companies
     user_companies = user.get("companies", [])
     requested = companies or user_companies
     accessible = [c for c in requested if c in user_companies] if user_companies else requested
 
+    if limit is not None or cursor is not None:
+        try:
+            locations, next_cursor = _location_service.page_locations(
+                companies=accessible or config.COMPANY_SCHEMAS,
+                network_id=network_id,
+                type_id=type_id,
+                active_only=active_only,
+                include_eligibility=include_eligibility,
+                limit=limit or 100,
+                cursor=cursor,
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return locations
+
     return _location_service.list_locations(
         companies=accessible or config.COMPANY_SCHEMAS,
         network_id=network_id,
@@ -6,7 +6,7 @@ They are NOT directly sellable - networks are sold as complete units.
 These endpoints are for admin/management features.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
 import config
 from core.network_assets import (
@@ -16,6 +16,7 @@ from core.network_assets import (
     NetworkAssetService,
 )
 from crm_security import TrustedUserContext, require_permission
+from db.pagination import InvalidCursorError
 
 router = APIRouter(prefix="/api/network-assets", tags=["Network Assets"])
 logger = config.get_logger("api.routers.network_assets")
@@ -26,10 +27,13 @@ _service = NetworkAssetService()
 
 @router.get("")
 def list_network_assets(
+    response: Response,
     companies: list[str] = Query(default=None, description="Filter by company schemas"),
     network_id: int | None = Query(default=None, description="Filter by network"),
     type_id: int | None = Query(default=None, description="Filter by asset type"),
     active_only: bool = Query(default=True, description="Only return active assets"),
+    limit: int | None = Query(default=None, ge=1, le=500, description="Page size (enables cursor paging)"),
+    cursor: str | None = Query(default=None, description="X-Next-Cursor value from the previous page"),
     user: TrustedUserContext = Depends(require_permission("assets:network_assets:read")),
 ) -> list[NetworkAsset]:
     """
@@ -39,12 +43,31 @@ def list_network_assets(
 
     Network assets are individual billboards within a network.
     They are NOT directly sellable - the parent network is sold as a unit.
+
+    Pass limit (and then cursor) to page in display_name order; the next
+    page's cursor is returned in the X-Next-Cursor header.
     """
     # Filter to user's accessible companies
     user_companies = user.get("companies", [])
     requested = companies or user_companies
     accessible = [c for c in requested if c in user_companies] if user_companies else requested
 
+    if limit is not None or cursor is not None:
+        try:
+            assets, next_cursor = _service.page_network_assets(
+                companies=accessible or config.COMPANY_SCHEMAS,
+                network_id=network_id,
+                type_id=type_id,
+                active_only=active_only,
+                limit=limit or 100,
+                cursor=cursor,
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return assets
+
     return _service.list_network_assets(
         companies=accessible or config.COMPANY_SCHEMAS,
         network_id=network_id,
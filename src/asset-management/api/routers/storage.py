@@ -2,15 +2,27 @@
 Storage API Router - Templates and Mockup Files.
 
 Provides access to templates and mockup files stored in Supabase Storage.
+
+Files are served two ways:
+- JSON (base64 FileResponse) - original endpoints, kept for compatibility
+- Binary (.../raw) - application/octet-stream streamed from storage, with
+  Content-Length, ETag, If-None-Match (304) and single-range (206) support.
+  Preferred by services.
 """
 
 import asyncio
 import base64
+import hashlib
 import logging
+import re
 from typing import Any
+from urllib.parse import quote
 
-from fastapi import APIRouter, HTTPException, Query
+import httpx
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
 
 import config
 from db.database import db
@@ -66,6 +78,155 @@ def _get_storage_client():
         raise HTTPException(status_code=500, detail="Storage service unavailable")
 
 
+_http_client: httpx.AsyncClient | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Pooled client for streaming objects straight from the storage API."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            base_url=f"{config.SUPABASE_URL}/storage/v1/",
+            headers={
+                "apikey": config.SUPABASE_SERVICE_KEY,
+                "Authorization": f"Bearer {config.SUPABASE_SERVICE_KEY}",
+            },
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+    return _http_client
+
+
+async def close_storage_client() -> None:
+    """Close the pooled storage API connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _make_etag(headers: httpx.Headers) -> str:
+    """Strong ETag from object metadata: the storage ETag, else size and mtime."""
+    etag = headers.get("etag")
+    if etag:
+        return etag if etag.startswith('"') else f'"{etag}"'
+    version = f"{headers.get('content-length')}:{headers.get('last-modified')}"
+    return f'"{hashlib.sha256(version.encode()).hexdigest()[:32]}"'
+
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_range(range_header: str | None, total: int) -> tuple[int, int] | None:
+    """
+    Resolve a single-range Range header against the object size.
+
+    Returns:
+        (start, end) inclusive, or None for no/multi/malformed ranges, which
+        are answered with the full body
+
+    Raises:
+        ValueError: If the range cannot be satisfied
+    """
+    match = _RANGE_RE.match(range_header.strip()) if range_header else None
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+
+    start_s, end_s = match.groups()
+    if start_s:
+        start = int(start_s)
+        end = min(int(end_s), total - 1) if end_s else total - 1
+    else:
+        # Suffix range: last N bytes
+        start = max(total - int(end_s), 0)
+        end = total - 1
+
+    if start >= total or start > end:
+        raise ValueError(f"Unsatisfiable range: {range_header}")
+    return start, end
+
+
+async def _binary_response(
+    request: Request,
+    bucket_name: str,
+    storage_key: str,
+    filename: str,
+    detail: str,
+) -> Response:
+    """
+    Stream a storage object, honouring conditional and range requests.
+
+    The ETag comes from a HEAD request, so a matching If-None-Match costs no
+    download; otherwise the body (or just the requested range) is streamed
+    through without being held in memory.
+
+    Args:
+        request: Incoming request (If-None-Match / Range headers)
+        bucket_name: Storage bucket
+        storage_key: Object key within the bucket
+        filename: Filename for Content-Disposition
+        detail: 404 detail if the object is missing
+
+    Returns:
+        200 with the full body, 206 with a byte range, 304 if the client's
+        ETag matches, or 416 for an unsatisfiable range
+    """
+    client = _get_http_client()
+    path = f"object/{bucket_name}/{quote(storage_key)}"
+    try:
+        head = await client.head(path)
+    except httpx.HTTPError as e:
+        logger.error(f"[STORAGE] Metadata request failed: {bucket_name}/{storage_key} - {e}")
+        raise HTTPException(status_code=404, detail=detail)
+    if head.is_error:
+        logger.debug(f"[STORAGE] Object not found: {bucket_name}/{storage_key} - HTTP {head.status_code}")
+        raise HTTPException(status_code=404, detail=detail)
+
+    etag = _make_etag(head.headers)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'inline; filename="{filename}"',
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    total = int(head.headers.get("content-length", 0))
+    try:
+        byte_range = _parse_range(request.headers.get("range"), total)
+    except ValueError:
+        headers["Content-Range"] = f"bytes */{total}"
+        return Response(status_code=416, headers=headers)
+
+    upstream_headers = {"Range": f"bytes={byte_range[0]}-{byte_range[1]}"} if byte_range else {}
+    try:
+        upstream = await client.send(client.build_request("GET", path, headers=upstream_headers), stream=True)
+    except httpx.HTTPError as e:
+        logger.error(f"[STORAGE] Download failed: {bucket_name}/{storage_key} - {e}")
+        raise HTTPException(status_code=404, detail=detail)
+    if upstream.is_error:
+        await upstream.aclose()
+        raise HTTPException(status_code=404, detail=detail)
+
+    status_code = 200
+    if byte_range and upstream.status_code == 206:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{total}"
+    # Multi-range and malformed Range headers fall back to the full body
+    if "content-length" in upstream.headers:
+        headers["Content-Length"] = upstream.headers["content-length"]
+
+    return StreamingResponse(
+        upstream.aiter_bytes(),
+        status_code=status_code,
+        media_type="application/octet-stream",
+        headers=headers,
+        background=BackgroundTask(upstream.aclose),
+    )
+
+
 # =============================================================================
 # TEMPLATES
 # =============================================================================
@@ -168,6 +329,33 @@ async def get_template(
         raise HTTPException(status_code=404, detail="Template not found")
 
 
+@router.get("/templates/{company}/{location_key}/raw")
+async def get_template_raw(
+    request: Request,
+    company: str,
+    location_key: str,
+    format: str = Query(default="pptx", regex="^(pptx|pdf)$"),
+) -> Response:
+    """
+    Download template file as raw bytes.
+
+    Args:
+        request: Incoming request (If-None-Match / Range headers)
+        company: Company schema
+        location_key: Location identifier
+        format: File format - "pptx" (default) or "pdf"
+
+    Returns:
+        application/octet-stream body with ETag
+    """
+    logger.info(f"[STORAGE] Getting raw template for {company}/{location_key} (format={format})")
+
+    storage_key = f"{company}/{location_key}/{location_key}.{format}"
+    return await _binary_response(
+        request, "templates", storage_key, f"{location_key}.{format}", f"Template not found ({format})"
+    )
+
+
 @router.get("/templates/{company}/{location_key}/exists", response_model=ExistsResponse)
 async def template_exists(company: str, location_key: str) -> dict[str, bool]:
     """
@@ -387,6 +575,25 @@ async def get_intro_outro_pdf(company: str, pdf_name: str) -> dict[str, Any]:
         raise HTTPException(status_code=404, detail="PDF not found")
 
 
+@router.get("/intro-outro/{company}/{pdf_name}/raw")
+async def get_intro_outro_pdf_raw(request: Request, company: str, pdf_name: str) -> Response:
+    """
+    Download intro/outro PDF as raw bytes.
+
+    Args:
+        request: Incoming request (If-None-Match / Range headers)
+        company: Company schema
+        pdf_name: PDF name (e.g., "landmark_series", "rest")
+
+    Returns:
+        application/octet-stream body with ETag
+    """
+    logger.info(f"[STORAGE] Getting raw intro/outro PDF: {company}/{pdf_name}")
+
+    storage_key = f"{company}/intro_outro/{pdf_name}.pdf"
+    return await _binary_response(request, "templates", storage_key, f"{pdf_name}.pdf", "PDF not found")
+
+
 # =============================================================================
 # MOCKUP PHOTOS
 # =============================================================================
@@ -553,6 +760,64 @@ async def get_mockup_photo_indoor(
         raise HTTPException(status_code=404, detail="Photo not found")
 
 
+@router.get("/mockups/{company}/{location_key}/{environment}/{time_of_day}/{side}/{photo_filename}/raw")
+async def get_mockup_photo_raw(
+    request: Request,
+    company: str,
+    location_key: str,
+    environment: str,
+    time_of_day: str,
+    side: str,
+    photo_filename: str,
+) -> Response:
+    """
+    Download mockup background photo as raw bytes.
+
+    Args:
+        request: Incoming request (If-None-Match / Range headers)
+        company: Company schema
+        location_key: Location identifier
+        environment: "indoor" or "outdoor"
+        time_of_day: "day" or "night" (ignored for indoor)
+        side: "gold", "silver", or "single_side" (ignored for indoor)
+        photo_filename: Photo filename
+
+    Returns:
+        application/octet-stream body with ETag
+    """
+    logger.info(f"[STORAGE] Getting raw mockup photo: {company}/{location_key}/{environment}/{time_of_day}/{side}/{photo_filename}")
+
+    storage_key = _build_mockup_storage_key(
+        company, location_key, environment, time_of_day, side, photo_filename
+    )
+    return await _binary_response(request, "mockups", storage_key, photo_filename, "Photo not found")
+
+
+@router.get("/mockups/{company}/{location_key}/indoor/{photo_filename}/raw")
+async def get_mockup_photo_indoor_raw(
+    request: Request,
+    company: str,
+    location_key: str,
+    photo_filename: str,
+) -> Response:
+    """
+    Download indoor mockup background photo as raw bytes (simplified path).
+
+    Args:
+        request: Incoming request (If-None-Match / Range headers)
+        company: Company schema
+        location_key: Location identifier
+        photo_filename: Photo filename
+
+    Returns:
+        application/octet-stream body with ETag
+    """
+    logger.info(f"[STORAGE] Getting raw indoor mockup photo: {company}/{location_key}/indoor/{photo_filename}")
+
+    storage_key = f"{company}/{location_key}/indoor/{photo_filename}"
+    return await _binary_response(request, "mockups", storage_key, photo_filename, "Photo not found")
+
+
 @router.get(
     "/mockups/{company}/{location_key}/{environment}/{time_of_day}/{side}/{photo_filename}/url",
     response_model=UrlResponse,
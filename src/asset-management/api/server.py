@@ -45,6 +45,18 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    # Stop the backend's query executor and background loop (closes its cache connections)
+    from db.runtime import shutdown_runtime
+    shutdown_runtime()
+
+    # Close the storage router's pooled connections to Supabase Storage
+    from api.routers.storage import close_storage_client
+    await close_storage_client()
+
+    # Close the rate limiter's pooled connections to security-service
+    from crm_security import close_rate_limit_client
+    await close_rate_limit_client()
+
     # Close cache connection
     await close_cache()
     logger.info("[SHUTDOWN] Asset Management Service shutting down")
@@ -81,6 +93,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["Content-Type", "Authorization", "X-API-Key", "X-Request-ID", "X-Proxy-Secret"],
+    expose_headers=["X-Next-Cursor"],
 )
 logger.info(f"[CORS] Allowed origins: {config.get_cors_origins_list()}")
 
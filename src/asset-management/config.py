@@ -53,6 +53,16 @@ SUPABASE_SERVICE_KEY = (
     else ASSETMGMT_DEV_SUPABASE_SERVICE_ROLE_KEY
 )
 
+# SQLite (local development): database file (default: db/assets.db, or
+# db/assets_test.db when ENVIRONMENT=test) and connections kept open for
+# reuse, one per thread
+SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "16"))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+
+# Shared threads for per-schema query fan-out (see db/runtime.py)
+DB_QUERY_WORKERS = int(os.getenv("DB_QUERY_WORKERS", "16"))
+
 # =============================================================================
 # COMPANY SCHEMAS
 # =============================================================================
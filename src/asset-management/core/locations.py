@@ -147,12 +147,49 @@ class LocationService:
 
         # Add eligibility if requested
         if include_eligibility:
-            for loc in locations:
-                eligibility = db.check_location_eligibility(loc.id, [loc.company])
-                loc.service_eligibility = eligibility.get("service_eligibility", {})
+            self._add_eligibility(locations)
 
         return locations
 
+    def page_locations(
+        self,
+        companies: list[str],
+        network_id: int | None = None,
+        type_id: int | None = None,
+        active_only: bool = True,
+        include_eligibility: bool = False,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[list[Location], str | None]:
+        """
+        Get one page of locations across companies, ordered by display name.
+
+        Returns:
+            (locations, cursor for the next page or None on the last page)
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        results, next_cursor = db.page_locations(
+            company_schemas=companies,
+            network_id=network_id,
+            type_id=type_id,
+            include_inactive=not active_only,
+            limit=limit,
+            cursor=cursor,
+        )
+
+        locations = [self._dict_to_location(r) for r in results]
+        if include_eligibility:
+            self._add_eligibility(locations)
+
+        return locations, next_cursor
+
+    def _add_eligibility(self, locations: list[Location]) -> None:
+        for loc in locations:
+            eligibility = db.check_location_eligibility(loc.id, [loc.company])
+            loc.service_eligibility = eligibility.get("service_eligibility", {})
+
     def get_location(
         self,
         company: str,
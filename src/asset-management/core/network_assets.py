@@ -145,6 +145,34 @@ class NetworkAssetService:
         )
         return [self._dict_to_network_asset(r) for r in results]
 
+    def page_network_assets(
+        self,
+        companies: list[str],
+        network_id: int | None = None,
+        type_id: int | None = None,
+        active_only: bool = True,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[list[NetworkAsset], str | None]:
+        """
+        Get one page of network assets across companies, ordered by display name.
+
+        Returns:
+            (network assets, cursor for the next page or None on the last page)
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        results, next_cursor = db.page_network_assets(
+            company_schemas=companies,
+            network_id=network_id,
+            type_id=type_id,
+            include_inactive=not active_only,
+            limit=limit,
+            cursor=cursor,
+        )
+        return [self._dict_to_network_asset(r) for r in results], next_cursor
+
     def get_network_asset(
         self,
         company: str,
@@ -13,7 +13,11 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from crm_utils import PooledConnection, SQLiteConnectionPool
+
+import config
 from db.base import DatabaseBackend
+from db.pagination import Position, paginate_schemas
 
 logger = logging.getLogger("asset-management")
 
@@ -206,10 +210,14 @@ class SQLiteBackend(DatabaseBackend):
         Initialize SQLite backend.
 
         Args:
-            db_path: Optional path to database file.
+            db_path: Optional path to database file (default: SQLITE_DB_PATH,
+                else db/assets.db or db/assets_test.db)
         """
         if db_path:
             self._db_path = db_path
+        elif config.SQLITE_DB_PATH:
+            self._db_path = Path(config.SQLITE_DB_PATH)
+            logger.info(f"[SQLITE] Using database at {self._db_path}")
         else:
             environment = os.getenv("ENVIRONMENT", "development")
             base_dir = Path(__file__).parent.parent
@@ -221,19 +229,29 @@ class SQLiteBackend(DatabaseBackend):
 
             logger.info(f"[SQLITE] Using database at {self._db_path}")
 
+        self._pool = SQLiteConnectionPool(
+            self._db_path,
+            setup=self._configure_connection,
+            max_size=config.DB_POOL_SIZE,
+            cached_statements=config.DB_STATEMENT_CACHE_SIZE,
+        )
+
     @property
     def name(self) -> str:
         return "sqlite"
 
-    def _connect(self) -> sqlite3.Connection:
-        """Create a database connection."""
-        conn = sqlite3.connect(self._db_path, timeout=5.0, isolation_level=None)
+    @staticmethod
+    def _configure_connection(conn: sqlite3.Connection) -> None:
+        """PRAGMAs and row factory for a new connection (runs once per pooled connection)."""
         conn.execute("PRAGMA journal_mode=WAL;")
         conn.execute("PRAGMA busy_timeout=5000;")
         conn.execute("PRAGMA synchronous=NORMAL;")
         conn.execute("PRAGMA foreign_keys=ON;")
         conn.row_factory = sqlite3.Row
-        return conn
+
+    def _connect(self) -> PooledConnection:
+        """Get this thread's pooled connection; close() returns it to the pool."""
+        return self._pool.connect()
 
     def init_db(self) -> None:
         """Initialize database with schema."""
@@ -258,6 +276,38 @@ class SQLiteBackend(DatabaseBackend):
         """Get current timestamp."""
         return datetime.utcnow().isoformat()
 
+    def _company_rows_after(
+        self,
+        select: str,
+        column_prefix: str,
+        order_by: str,
+        company: str,
+        filters: list[str],
+        params: list[Any],
+        after: Position | None,
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        """Rows of one company ordered by (order_by, id), strictly after `after` (keyset paging)."""
+        order_col, id_col = f"{column_prefix}{order_by}", f"{column_prefix}id"
+        where = [f"{column_prefix}company = ?", *filters]
+        args = [company, *params]
+        if after is not None:
+            where.append(f"({order_col} > ? OR ({order_col} = ? AND {id_col} > ?))")
+            args += [after[0], after[0], after[1]]
+
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"{select} WHERE {' AND '.join(where)} ORDER BY {order_col}, {id_col} LIMIT ?",
+                (*args, limit),
+            )
+            results = self._rows_to_list(cursor.fetchall())
+        finally:
+            conn.close()
+        for r in results:
+            r["company_schema"] = r.pop("company", None)
+        return results
+
     # =========================================================================
     # NETWORKS
     # =========================================================================
@@ -690,7 +740,7 @@ class SQLiteBackend(DatabaseBackend):
                 LEFT JOIN networks n ON na.network_id = n.id
                 LEFT JOIN asset_types at ON na.type_id = at.id
                 WHERE na.company IN ({placeholders}) {active_filter} {network_filter} {type_filter}
-                ORDER BY na.display_name
+                ORDER BY na.display_name, na.company, na.id
                 LIMIT ? OFFSET ?
                 """,
                 (*params, limit, offset),
@@ -702,6 +752,37 @@ class SQLiteBackend(DatabaseBackend):
         finally:
             conn.close()
 
+    def page_network_assets(
+        self,
+        company_schemas: list[str],
+        network_id: int | None = None,
+        type_id: int | None = None,
+        include_inactive: bool = False,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """One page of network assets in global display_name order, plus the next cursor."""
+        filters = [] if include_inactive else ["na.is_active = 1"]
+        params: list[Any] = []
+        if network_id is not None:
+            filters.append("na.network_id = ?")
+            params.append(network_id)
+        if type_id is not None:
+            filters.append("na.type_id = ?")
+            params.append(type_id)
+
+        select = """
+            SELECT na.*, n.name as network_name, at.name as type_name
+            FROM network_assets na
+            LEFT JOIN networks n ON na.network_id = n.id
+            LEFT JOIN asset_types at ON na.type_id = at.id
+        """
+
+        def fetch(company: str, after: Position | None, n: int) -> list[dict[str, Any]]:
+            return self._company_rows_after(select, "na.", "display_name", company, filters, params, after, n)
+
+        return paginate_schemas(fetch, company_schemas, "display_name", limit, cursor)
+
     # =========================================================================
     # MOCKUP STORAGE INFO (Unified Architecture Support)
     # =========================================================================
@@ -916,7 +997,7 @@ class SQLiteBackend(DatabaseBackend):
                 f"""
                 SELECT * FROM locations
                 WHERE {where_clause}
-                ORDER BY display_name
+                ORDER BY display_name, company, id
                 LIMIT ? OFFSET ?
                 """,
                 (*params, limit, offset),
@@ -928,6 +1009,27 @@ class SQLiteBackend(DatabaseBackend):
         finally:
             conn.close()
 
+    def page_locations(
+        self,
+        company_schemas: list[str],
+        network_id: int | None = None,
+        type_id: int | None = None,
+        include_inactive: bool = False,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """One page of locations in global display_name order, plus the next cursor."""
+        # Same filters as list_locations (the VIEW already filters is_active=1)
+        filters, params = [], []
+        if network_id is not None:
+            filters.append("network_id = ?")
+            params.append(network_id)
+
+        def fetch(company: str, after: Position | None, n: int) -> list[dict[str, Any]]:
+            return self._company_rows_after("SELECT * FROM locations", "", "display_name", company, filters, params, after, n)
+
+        return paginate_schemas(fetch, company_schemas, "display_name", limit, cursor)
+
     def update_location(
         self,
         location_id: int,
@@ -5,16 +5,16 @@ This backend uses Supabase for cloud-hosted PostgreSQL storage with
 multi-schema support for company isolation.
 """
 
-import asyncio
 import json
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
 
 from config import COMPANY_SCHEMAS, SUPABASE_URL, SUPABASE_SERVICE_KEY
 from db.base import DatabaseBackend
+from db.pagination import Position, merge_schema_rows, paginate_schemas
+from db.runtime import fan_out, run_coro
 
 logger = logging.getLogger("asset-management")
 
@@ -27,19 +27,15 @@ FRAME_CACHE_TTL = 600  # 10 minutes for frames
 NETWORK_ASSET_CACHE_TTL = 600  # 10 minutes for network assets
 
 
-def _run_async(coro):
-    """Run async code from sync context."""
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
+def _postgrest_quote(value: Any) -> str:
+    """Quote a value for use inside a PostgREST or=() filter."""
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
 
-    if loop and loop.is_running():
-        import concurrent.futures
-        with concurrent.futures.ThreadPoolExecutor() as pool:
-            return pool.submit(asyncio.run, coro).result()
-    else:
-        return asyncio.run(coro)
+def _run_async(coro):
+    """Run async code (cache calls) from sync context on the shared background loop."""
+    return run_coro(coro)
 
 
 class SupabaseOperationError(Exception):
@@ -251,8 +247,7 @@ class SupabaseBackend(DatabaseBackend):
                 return (schema, None)
 
         # Search all schemas in parallel
-        with ThreadPoolExecutor(max_workers=len(COMPANY_SCHEMAS)) as executor:
-            results = list(executor.map(search_schema, COMPANY_SCHEMAS))
+        results = fan_out(search_schema, COMPANY_SCHEMAS)
 
         # Find first match and check access
         for schema, data in results:
@@ -271,6 +266,16 @@ class SupabaseBackend(DatabaseBackend):
 
         return (None, None, "not_found")
 
+    @staticmethod
+    def _apply_filters(query, filters: dict[str, Any] | None):
+        """Apply column->value equality filters (None matches NULL)."""
+        for col, val in (filters or {}).items():
+            if val is None:
+                query = query.is_(col, "null")
+            else:
+                query = query.eq(col, val)
+        return query
+
     def _query_schemas(
         self,
         table: str,
@@ -284,12 +289,16 @@ class SupabaseBackend(DatabaseBackend):
         """
         Query a table across multiple company schemas IN PARALLEL and aggregate results.
 
+        limit and offset apply to each schema, as they always have; callers
+        that need a global page use _page_schemas. With order_by, the
+        per-schema results are merged into one global order.
+
         Args:
             table: Table name to query
             company_schemas: List of schemas to query
             select: Columns to select
             filters: Optional dict of column->value filters
-            order_by: Optional column to order by
+            order_by: Optional column to order by (ties broken by id)
             limit: Optional limit per schema
             offset: Optional offset per schema
 
@@ -301,17 +310,10 @@ class SupabaseBackend(DatabaseBackend):
         def query_single_schema(schema: str) -> list[dict[str, Any]]:
             """Query a single schema, return list of records with company_schema added."""
             try:
-                query = client.schema(schema).table(table).select(select)
-
-                if filters:
-                    for col, val in filters.items():
-                        if val is None:
-                            query = query.is_(col, "null")
-                        else:
-                            query = query.eq(col, val)
+                query = self._apply_filters(client.schema(schema).table(table).select(select), filters)
 
                 if order_by:
-                    query = query.order(order_by)
+                    query = query.order(order_by).order("id")
                 if limit:
                     query = query.limit(limit)
                 if offset:
@@ -329,12 +331,48 @@ class SupabaseBackend(DatabaseBackend):
                 return []
 
         # Query all schemas in parallel
-        with ThreadPoolExecutor(max_workers=len(company_schemas)) as executor:
-            results = list(executor.map(query_single_schema, company_schemas))
+        results = fan_out(query_single_schema, company_schemas)
+
+        if order_by and len(company_schemas) > 1:
+            return merge_schema_rows(dict(zip(company_schemas, results)), order_by)
 
         # Flatten results
         return [record for schema_results in results for record in schema_results]
 
+    def _page_schemas(
+        self,
+        table: str,
+        company_schemas: list[str],
+        filters: dict[str, Any] | None,
+        order_by: str,
+        limit: int,
+        cursor: str | None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Get one keyset page of a table in global order across schemas.
+
+        See db/pagination.py. Unlike _query_schemas, a failing schema raises:
+        skipping it would silently drop its rows from the page.
+        """
+        client = self._get_client()
+
+        def fetch(schema: str, after: Position | None, n: int) -> list[dict[str, Any]]:
+            query = self._apply_filters(client.schema(schema).table(table).select("*"), filters)
+            if after is not None:
+                value = _postgrest_quote(after[0])
+                query = query.or_(f"{order_by}.gt.{value},and({order_by}.eq.{value},id.gt.{int(after[1])})")
+            try:
+                response = query.order(order_by).order("id").limit(n).execute()
+            except Exception as e:
+                logger.error(f"[SUPABASE] Error paging {schema}.{table}: {e}")
+                raise
+            rows = response.data or []
+            for record in rows:
+                record["company_schema"] = schema
+            return rows
+
+        return paginate_schemas(fetch, company_schemas, order_by, limit, cursor, map_schemas=fan_out)
+
     # =========================================================================
     # NETWORKS
     # =========================================================================
@@ -1087,7 +1125,34 @@ class SupabaseBackend(DatabaseBackend):
             limit=limit,
             offset=offset,
         )
+        return self._enrich_network_assets(results, company_schemas)
+
+    def page_network_assets(
+        self,
+        company_schemas: list[str],
+        network_id: int | None = None,
+        type_id: int | None = None,
+        include_inactive: bool = False,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        filters = {} if include_inactive else {"is_active": True}
+        if network_id is not None:
+            filters["network_id"] = network_id
+        if type_id is not None:
+            filters["type_id"] = type_id
+
+        results, next_cursor = self._page_schemas(
+            "network_assets", company_schemas, filters, "display_name", limit, cursor
+        )
+        return self._enrich_network_assets(results, company_schemas), next_cursor
 
+    def _enrich_network_assets(
+        self,
+        results: list[dict[str, Any]],
+        company_schemas: list[str],
+    ) -> list[dict[str, Any]]:
+        """Add network_name and type_name to network asset records."""
         # OPTIMIZED: Bulk fetch networks and types instead of N individual queries
         # Collect unique IDs
         network_ids = list({r["network_id"] for r in results if r.get("network_id")})
@@ -1375,15 +1440,46 @@ class SupabaseBackend(DatabaseBackend):
         if type_id is not None:
             filters["type_id"] = type_id
 
-        results = self._query_schemas(
-            "locations",
-            company_schemas,
-            filters=filters,
-            order_by="display_name",
-            limit=limit,
-            offset=offset,
+        results = self._enrich_locations(
+            self._query_schemas(
+                "locations",
+                company_schemas,
+                filters=filters,
+                order_by="display_name",
+                limit=limit,
+                offset=offset,
+            )
         )
 
+        # Cache the result (only for default pagination)
+        if offset == 0 and limit >= 100:
+            _run_async(self._cache_set(cache_key, results, ttl=LOCATION_CACHE_TTL))
+            logger.debug(f"[CACHE] Cached {len(results)} locations")
+
+        return results
+
+    def page_locations(
+        self,
+        company_schemas: list[str],
+        network_id: int | None = None,
+        type_id: int | None = None,
+        include_inactive: bool = False,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        filters = {} if include_inactive else {"is_active": True}
+        if network_id is not None:
+            filters["network_id"] = network_id
+        if type_id is not None:
+            filters["type_id"] = type_id
+
+        results, next_cursor = self._page_schemas(
+            "locations", company_schemas, filters, "display_name", limit, cursor
+        )
+        return self._enrich_locations(results), next_cursor
+
+    def _enrich_locations(self, results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Add network_name and type_name to location records."""
         # Enrich with network and type names - optimized with pre-fetched data
         # Pre-fetch networks and types per schema to avoid N+1 queries
         networks_by_schema = {}
@@ -1413,11 +1509,6 @@ class SupabaseBackend(DatabaseBackend):
                 if asset_type:
                     r["type_name"] = asset_type.get("name")
 
-        # Cache the result (only for default pagination)
-        if offset == 0 and limit >= 100:
-            _run_async(self._cache_set(cache_key, results, ttl=LOCATION_CACHE_TTL))
-            logger.debug(f"[CACHE] Cached {len(results)} locations")
-
         return results
 
     def update_location(
@@ -2678,4 +2769,5 @@ class SupabaseBackend(DatabaseBackend):
 
         except Exception as e:
             logger.error(f"[SUPABASE] Failed to get company hierarchy: {e}")
-            return []
+            # Raise rather than return an empty tree: callers cache it
+            raise
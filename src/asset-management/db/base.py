@@ -400,6 +400,40 @@ class DatabaseBackend(ABC):
         """Delete an asset type."""
         pass
 
+    # =========================================================================
+    # NETWORK ASSETS
+    # =========================================================================
+
+    @abstractmethod
+    def list_network_assets(
+        self,
+        company_schemas: list[str],
+        network_id: int | None = None,
+        type_id: int | None = None,
+        include_inactive: bool = False,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """List network assets (individual display units within traditional networks)."""
+        pass
+
+    @abstractmethod
+    def page_network_assets(
+        self,
+        company_schemas: list[str],
+        network_id: int | None = None,
+        type_id: int | None = None,
+        include_inactive: bool = False,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Get one page of network assets in global display_name order across companies.
+
+        Same arguments and return shape as page_locations().
+        """
+        pass
+
     # =========================================================================
     # LOCATIONS
     # =========================================================================
@@ -478,6 +512,35 @@ class DatabaseBackend(ABC):
         """
         pass
 
+    @abstractmethod
+    def page_locations(
+        self,
+        company_schemas: list[str],
+        network_id: int | None = None,
+        type_id: int | None = None,
+        include_inactive: bool = False,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Get one page of locations in global display_name order across companies.
+
+        Args:
+            company_schemas: List of company schemas to query
+            network_id: Optional filter by network
+            type_id: Optional filter by asset type
+            include_inactive: Include inactive locations
+            limit: Page size
+            cursor: Cursor from the previous page (see db/pagination.py)
+
+        Returns:
+            (location records, cursor for the next page or None)
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        pass
+
     @abstractmethod
     def update_location(
         self,
@@ -908,5 +971,8 @@ class DatabaseBackend(ABC):
 
         Returns:
             List of companies with parent_id, is_group, and children info
+
+        Raises:
+            Exception: If the hierarchy cannot be read
         """
         pass
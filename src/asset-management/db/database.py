@@ -268,6 +268,36 @@ class _DatabaseNamespace:
             network_key, company_schemas, include_inactive
         )
 
+    # =========================================================================
+    # NETWORK ASSETS
+    # =========================================================================
+
+    def list_network_assets(
+        self,
+        company_schemas: list[str],
+        network_id: int | None = None,
+        type_id: int | None = None,
+        include_inactive: bool = False,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        return self._backend.list_network_assets(
+            company_schemas, network_id, type_id, include_inactive, limit, offset
+        )
+
+    def page_network_assets(
+        self,
+        company_schemas: list[str],
+        network_id: int | None = None,
+        type_id: int | None = None,
+        include_inactive: bool = False,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        return self._backend.page_network_assets(
+            company_schemas, network_id, type_id, include_inactive, limit, cursor
+        )
+
     # =========================================================================
     # LOCATIONS
     # =========================================================================
@@ -315,6 +345,19 @@ class _DatabaseNamespace:
             company_schemas, network_id, type_id, include_inactive, limit, offset
         )
 
+    def page_locations(
+        self,
+        company_schemas: list[str],
+        network_id: int | None = None,
+        type_id: int | None = None,
+        include_inactive: bool = False,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        return self._backend.page_locations(
+            company_schemas, network_id, type_id, include_inactive, limit, cursor
+        )
+
     def update_location(
         self,
         location_id: int,
@@ -0,0 +1,137 @@
+"""
+Global pagination across company schemas.
+
+Each company's rows live in their own schema (Supabase) or are tagged
+with their company (SQLite), so a global page is a k-way merge of
+per-schema pages ordered by (order_by, company_schema, id).
+
+Pagination is keyset-based. The cursor records, per schema, the
+(order_by value, id) of the last row already returned. The next page
+fetches at most limit + 1 rows past that position from each schema and
+merges them, so no schema is ever read from offset 0 again. Keeping a
+position per schema (rather than one global key) means the result never
+depends on Python and the database collating strings the same way.
+
+Cursors are opaque to callers: URL-safe base64 of a small JSON document.
+"""
+
+import base64
+import binascii
+import heapq
+import json
+from collections.abc import Callable, Iterable
+from typing import Any
+
+# (order_by value, id) of the last row returned from a schema
+Position = tuple[Any, int]
+
+# fetch(schema, after, limit) -> rows of that schema ordered by (order_by, id),
+# strictly after `after` when given
+SchemaFetch = Callable[[str, Position | None, int], list[dict[str, Any]]]
+
+
+class InvalidCursorError(ValueError):
+    """Cursor could not be decoded or does not match the query."""
+
+
+def encode_cursor(order_by: str, positions: dict[str, Position]) -> str:
+    """Encode per-schema positions as an opaque cursor."""
+    payload = {"o": order_by, "p": {schema: list(pos) for schema, pos in sorted(positions.items())}}
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str) -> dict[str, Position]:
+    """Decode a cursor made by encode_cursor() for the same order_by column."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        positions = {schema: (pos[0], int(pos[1])) for schema, pos in payload["p"].items()}
+    except (binascii.Error, ValueError, TypeError, KeyError, IndexError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+    if payload.get("o") != order_by:
+        raise InvalidCursorError("Cursor does not match this listing")
+    return positions
+
+
+def _sort_key(row: dict[str, Any], order_by: str, schema: str) -> tuple:
+    value = row.get(order_by)
+    return (value is None, value if value is not None else "", schema, row.get("id") or 0)
+
+
+def _keyed(rows: list[dict[str, Any]], order_by: str, schema: str) -> list[tuple]:
+    """(sort key, schema, index, row) for each row of one schema."""
+    return [(_sort_key(row, order_by, schema), schema, n, row) for n, row in enumerate(rows)]
+
+
+def merge_schema_rows(
+    rows_by_schema: dict[str, list[dict[str, Any]]],
+    order_by: str,
+    limit: int | None = None,
+    offset: int = 0,
+) -> list[dict[str, Any]]:
+    """
+    Merge per-schema rows (each already ordered) into one global order.
+
+    Puts unpaged per-schema listings in one order. limit and offset, when
+    given, slice the merged list.
+    """
+    merged = heapq.merge(
+        *(_keyed(rows, order_by, schema) for schema, rows in rows_by_schema.items()),
+        key=lambda item: item[0],
+    )
+    out = [row for _, _, _, row in merged]
+    end = None if limit is None else offset + limit
+    return out[offset:end]
+
+
+def paginate_schemas(
+    fetch: SchemaFetch,
+    company_schemas: list[str],
+    order_by: str,
+    limit: int,
+    cursor: str | None = None,
+    map_schemas: Callable[..., Iterable[list[dict[str, Any]]]] = map,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """
+    Get one globally ordered page across company schemas.
+
+    Args:
+        fetch: Reads up to `limit` rows of one schema after a position
+        company_schemas: Schemas to page over
+        order_by: Sort column (ties broken by company_schema, then id)
+        limit: Page size
+        cursor: Cursor from the previous page, or None for the first page
+        map_schemas: map()-like runner for the per-schema fetches, e.g. an
+            executor's map to fetch schemas in parallel
+
+    Returns:
+        (rows, next_cursor); next_cursor is None on the last page
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or for another listing
+    """
+    positions = decode_cursor(cursor, order_by) if cursor else {}
+
+    def fetch_schema(schema: str) -> list[dict[str, Any]]:
+        return fetch(schema, positions.get(schema), limit + 1)
+
+    pages = list(map_schemas(fetch_schema, company_schemas))
+
+    merged = heapq.merge(
+        *(_keyed(rows, order_by, schema) for schema, rows in zip(company_schemas, pages)),
+        key=lambda item: item[0],
+    )
+
+    page: list[dict[str, Any]] = []
+    consumed: dict[str, int] = {}
+    for _, schema, n, row in merged:
+        if len(page) == limit:
+            break
+        page.append(row)
+        consumed[schema] = n + 1
+        positions[schema] = (row.get(order_by), row["id"])
+
+    has_more = any(len(rows) > consumed.get(schema, 0) for schema, rows in zip(company_schemas, pages))
+    next_cursor = encode_cursor(order_by, positions) if has_more else None
+    return page, next_cursor
@@ -0,0 +1,175 @@
+"""
+Shared concurrency for the database backends.
+
+The backends are synchronous, but they fan queries out across company
+schemas and talk to the async cache. Both used to create resources per
+call (a ThreadPoolExecutor per fan-out, a new event loop per cache call,
+and with it a new Redis connection pool). This module owns one of each
+for the life of the process:
+
+- A bounded query executor (config.DB_QUERY_WORKERS threads) for
+  per-schema fan-out. Fan-out from inside one of its own workers runs
+  inline instead of waiting on the same pool, so nesting cannot deadlock.
+- One background event loop thread that runs every cache coroutine, so
+  the cache keeps a single connection pool.
+
+Thread and connection counts therefore stay flat with request rate.
+runtime_stats() reports both for GET /metrics.
+
+Usage:
+    from db.runtime import fan_out, run_coro
+
+    results = fan_out(query_single_schema, company_schemas)
+    cached = run_coro(self._cache_get(key))
+"""
+
+import asyncio
+import logging
+import threading
+from collections.abc import Callable, Coroutine, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+import config
+
+logger = logging.getLogger("asset-management")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_worker = threading.local()
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_thread: threading.Thread | None = None
+
+_stats = {"fan_outs": 0, "inline_fan_outs": 0, "tasks": 0, "coroutines": 0, "coroutine_errors": 0}
+_inflight = {"tasks": 0, "coroutines": 0}
+
+
+def _mark_worker() -> None:
+    _worker.active = True
+
+
+def get_query_executor() -> ThreadPoolExecutor:
+    """Get the shared query executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=config.DB_QUERY_WORKERS,
+                    thread_name_prefix="db-query",
+                    initializer=_mark_worker,
+                )
+    return _executor
+
+
+def _count(key: str, delta: int, inflight: bool = False) -> None:
+    with _lock:
+        (_inflight if inflight else _stats)[key] += delta
+
+
+def fan_out(func: Callable[[T], R], items: Iterable[T]) -> list[R]:
+    """
+    Run func over items on the shared query executor, in order.
+
+    Drop-in for `list(ThreadPoolExecutor(...).map(func, items))`.
+    """
+    items = list(items)
+    if len(items) <= 1 or getattr(_worker, "active", False):
+        _count("inline_fan_outs", 1)
+        return [func(item) for item in items]
+
+    def tracked(item: T) -> R:
+        _count("tasks", 1, inflight=True)
+        try:
+            return func(item)
+        finally:
+            _count("tasks", -1, inflight=True)
+
+    _count("fan_outs", 1)
+    _count("tasks", len(items))
+    return list(get_query_executor().map(tracked, items))
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _loop_thread
+    if _loop is None:
+        with _lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="db-async", daemon=True)
+                thread.start()
+                _loop, _loop_thread = loop, thread
+                logger.info("[DB] Background event loop started")
+    return _loop
+
+
+def run_coro(coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+    """Run a coroutine on the background loop and wait for its result (from sync code)."""
+    loop = _get_loop()
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError("run_coro() called from the background loop itself; await instead")
+
+    _count("coroutines", 1)
+    _count("coroutines", 1, inflight=True)
+    try:
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+    except Exception:
+        _count("coroutine_errors", 1)
+        raise
+    finally:
+        _count("coroutines", -1, inflight=True)
+
+
+def runtime_stats() -> dict[str, Any]:
+    """Executor and background loop counters, plus process thread count."""
+    with _lock:
+        executor_threads = len(_executor._threads) if _executor is not None else 0
+        return {
+            "query_executor": {
+                "max_workers": config.DB_QUERY_WORKERS,
+                "threads": executor_threads,
+                "queued": _executor._work_queue.qsize() if _executor is not None else 0,
+                "active_tasks": _inflight["tasks"],
+                "fan_outs": _stats["fan_outs"],
+                "inline_fan_outs": _stats["inline_fan_outs"],
+                "tasks": _stats["tasks"],
+            },
+            "event_loop": {
+                "running": _loop is not None and _loop.is_running(),
+                "active_coroutines": _inflight["coroutines"],
+                "coroutines": _stats["coroutines"],
+                "errors": _stats["coroutine_errors"],
+            },
+            "process_threads": threading.active_count(),
+        }
+
+
+def shutdown_runtime() -> None:
+    """Close the cache connection on the background loop, stop the loop and the executor."""
+    global _executor, _loop, _loop_thread
+
+    if _loop is not None:
+        try:
+            from crm_cache import get_cache
+
+            cache = get_cache()
+            if hasattr(cache, "close"):
+                # Connections are per event loop; close the background loop's
+                run_coro(cache.close(), timeout=5)
+        except Exception as e:
+            logger.debug(f"[DB] Cache close on background loop failed: {e}")
+
+        _loop.call_soon_threadsafe(_loop.stop)
+        _loop_thread.join(timeout=5)
+        _loop.close()
+        _loop, _loop_thread = None, None
+
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+    logger.info("[DB] Query executor and background loop stopped")
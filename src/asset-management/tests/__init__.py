@@ -0,0 +1 @@
+"""Test suite for the Asset Management service."""
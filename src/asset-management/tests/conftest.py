@@ -0,0 +1,24 @@
+"""
+Pytest configuration for asset-management tests.
+
+The SQLite backend is created when db.database is first imported, during
+collection, so its database file is pointed at a temporary directory here
+rather than at db/assets.db in the source tree.
+"""
+
+import os
+import shutil
+import tempfile
+
+_tmp_dir: str | None = None
+
+
+def pytest_configure(config):
+    global _tmp_dir
+    _tmp_dir = tempfile.mkdtemp(prefix="asset-management-tests-")
+    os.environ["SQLITE_DB_PATH"] = os.path.join(_tmp_dir, "assets.db")
+
+
+def pytest_unconfigure(config):
+    if _tmp_dir:
+        shutil.rmtree(_tmp_dir, ignore_errors=True)
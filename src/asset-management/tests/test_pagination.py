@@ -0,0 +1,249 @@
+"""
+Tests for global pagination across company schemas (db/pagination.py).
+
+These tests verify:
+- merge_schema_rows puts per-schema rows in one (order_by, schema, id) order
+- paginate_schemas walks every row exactly once, in global order, including
+  when order_by values tie within and across schemas
+- Each schema is only asked for rows past its own cursor position
+- Cursors round-trip and reject garbage or another listing's cursor
+- Unpaged Supabase listings keep their limit per schema
+"""
+
+import pytest
+
+from db.backends.supabase import SupabaseBackend
+from db.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    merge_schema_rows,
+    paginate_schemas,
+)
+
+SCHEMAS = ["backlite", "viola", "dubai"]
+
+# Several rows share a display_name, both inside one schema and across schemas
+ROWS = {
+    "backlite": [
+        {"id": 1, "display_name": "Gateway"},
+        {"id": 2, "display_name": "Gateway"},
+        {"id": 3, "display_name": "Marina"},
+        {"id": 7, "display_name": None},
+    ],
+    "viola": [
+        {"id": 1, "display_name": "Atrium"},
+        {"id": 4, "display_name": "Gateway"},
+        {"id": 5, "display_name": "Marina"},
+    ],
+    "dubai": [
+        {"id": 2, "display_name": "Gateway"},
+        {"id": 9, "display_name": "Zabeel"},
+    ],
+}
+
+
+def _key(row: dict, schema: str) -> tuple:
+    value = row["display_name"]
+    return (value is None, value or "", schema, row["id"])
+
+
+def expected_order() -> list[tuple[str, int]]:
+    rows = [(schema, row) for schema, rows in ROWS.items() for row in rows]
+    return [(schema, row["id"]) for schema, row in sorted(rows, key=lambda item: _key(item[1], item[0]))]
+
+
+class SchemaStore:
+    """In-memory schemas answering keyset fetches like the backends do."""
+
+    def __init__(self, rows: dict[str, list[dict]]):
+        self.rows = rows
+        self.calls: list[tuple[str, tuple | None, int]] = []
+
+    def fetch(self, schema: str, after: tuple | None, limit: int) -> list[dict]:
+        self.calls.append((schema, after, limit))
+        rows = sorted(self.rows[schema], key=lambda row: _key(row, schema))
+        if after is not None:
+            rows = [row for row in rows if _key(row, schema) > _key({"display_name": after[0], "id": after[1]}, schema)]
+        return [{**row, "company_schema": schema} for row in rows[:limit]]
+
+
+def walk(store: SchemaStore, limit: int) -> list[list[tuple[str, int]]]:
+    pages, cursor = [], None
+    while True:
+        rows, cursor = paginate_schemas(store.fetch, SCHEMAS, "display_name", limit, cursor)
+        pages.append([(row["company_schema"], row["id"]) for row in rows])
+        if cursor is None:
+            return pages
+
+
+class TestMergeSchemaRows:
+    """merge_schema_rows()."""
+
+    def test_global_order_with_ties(self):
+        rows_by_schema = {
+            schema: [{**row, "company_schema": schema} for row in sorted(rows, key=lambda r: _key(r, schema))]
+            for schema, rows in ROWS.items()
+        }
+        merged = merge_schema_rows(rows_by_schema, "display_name")
+        assert [(row["company_schema"], row["id"]) for row in merged] == expected_order()
+
+    def test_limit_and_offset_slice_merged_rows(self):
+        rows_by_schema = {
+            schema: sorted(rows, key=lambda r: _key(r, schema)) for schema, rows in ROWS.items()
+        }
+        everything = merge_schema_rows(rows_by_schema, "display_name")
+        assert merge_schema_rows(rows_by_schema, "display_name", limit=3, offset=2) == everything[2:5]
+
+    def test_keeps_every_row_without_limit(self):
+        rows_by_schema = {"a": [{"id": n, "name": f"{n:03}"} for n in range(150)], "b": [{"id": 1, "name": "000"}]}
+        assert len(merge_schema_rows(rows_by_schema, "name")) == 151
+
+
+class TestPaginateSchemas:
+    """paginate_schemas()."""
+
+    @pytest.mark.parametrize("limit", [1, 2, 3, 5, 100])
+    def test_walks_every_row_once_in_order(self, limit):
+        pages = walk(SchemaStore(ROWS), limit)
+
+        assert [row for page in pages for row in page] == expected_order()
+        assert all(len(page) == limit for page in pages[:-1])
+
+    def test_last_page_has_no_cursor(self):
+        rows, cursor = paginate_schemas(SchemaStore(ROWS).fetch, SCHEMAS, "display_name", 100)
+        assert len(rows) == sum(len(r) for r in ROWS.values())
+        assert cursor is None
+
+    def test_exact_fit_page_has_no_cursor(self):
+        total = sum(len(r) for r in ROWS.values())
+        _, cursor = paginate_schemas(SchemaStore(ROWS).fetch, SCHEMAS, "display_name", total)
+        assert cursor is None
+
+    def test_schemas_resume_from_their_own_position(self):
+        store = SchemaStore(ROWS)
+        first, cursor = paginate_schemas(store.fetch, SCHEMAS, "display_name", 3)
+        assert [(row["company_schema"], row["id"]) for row in first] == expected_order()[:3]
+
+        store.calls.clear()
+        paginate_schemas(store.fetch, SCHEMAS, "display_name", 3, cursor)
+
+        after = {schema: pos for schema, pos, _ in store.calls}
+        # Atrium (viola 1), then the two backlite Gateways
+        assert after == {"backlite": ("Gateway", 2), "viola": ("Atrium", 1), "dubai": None}
+        assert all(limit == 4 for _, _, limit in store.calls)
+
+    def test_empty_schemas(self):
+        rows, cursor = paginate_schemas(SchemaStore({s: [] for s in SCHEMAS}).fetch, SCHEMAS, "display_name", 10)
+        assert rows == []
+        assert cursor is None
+
+    def test_cursor_for_another_listing_is_rejected(self):
+        _, cursor = paginate_schemas(SchemaStore(ROWS).fetch, SCHEMAS, "display_name", 2)
+        with pytest.raises(InvalidCursorError):
+            paginate_schemas(SchemaStore(ROWS).fetch, SCHEMAS, "name", 2, cursor)
+
+
+class TestCursor:
+    """encode_cursor() / decode_cursor()."""
+
+    def test_round_trip(self):
+        positions = {"viola": ("Gateway", 4), "backlite": ("Gateway", 2), "dubai": (None, 9)}
+        cursor = encode_cursor("display_name", positions)
+
+        assert decode_cursor(cursor, "display_name") == positions
+        assert "=" not in cursor
+
+    def test_round_trip_with_tied_and_unicode_values(self):
+        positions = {"a": ("Al Barsha — Tower", 1), "b": ("Al Barsha — Tower", 1), "c": (42, 3)}
+        assert decode_cursor(encode_cursor("display_name", positions), "display_name") == positions
+
+    def test_is_deterministic(self):
+        first = encode_cursor("display_name", {"a": ("x", 1), "b": ("y", 2)})
+        second = encode_cursor("display_name", {"b": ("y", 2), "a": ("x", 1)})
+        assert first == second
+
+    @pytest.mark.parametrize("cursor", ["not a cursor", "e30", "!!!", encode_cursor("display_name", {})[:-3] + "xyz"])
+    def test_garbage_is_rejected(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "display_name")
+
+    def test_other_order_column_is_rejected(self):
+        cursor = encode_cursor("display_name", {"a": ("x", 1)})
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "created_at")
+
+
+class FakeQuery:
+    """Just enough of a PostgREST query builder for _query_schemas."""
+
+    def __init__(self, rows: list[dict]):
+        self.rows = rows
+        self.order_by: list[str] = []
+        self.limit_value: int | None = None
+        self.offset_value = 0
+
+    def eq(self, column, value):
+        self.rows = [row for row in self.rows if row.get(column) == value]
+        return self
+
+    def order(self, column):
+        self.order_by.append(column)
+        return self
+
+    def limit(self, value):
+        self.limit_value = value
+        return self
+
+    def offset(self, value):
+        self.offset_value = value
+        return self
+
+    def execute(self):
+        rows = sorted(self.rows, key=lambda row: tuple(row[c] for c in self.order_by))
+        end = None if self.limit_value is None else self.offset_value + self.limit_value
+        return type("Response", (), {"data": [dict(row) for row in rows[self.offset_value:end]]})()
+
+
+class FakeTable:
+    def __init__(self, rows: list[dict]):
+        self.rows = rows
+
+    def table(self, name):
+        return self
+
+    def select(self, columns):
+        return FakeQuery(self.rows)
+
+
+class FakeClient:
+    def __init__(self, rows_by_schema: dict[str, list[dict]]):
+        self.rows_by_schema = rows_by_schema
+
+    def schema(self, name):
+        return FakeTable(self.rows_by_schema[name])
+
+
+class TestQuerySchemas:
+    """SupabaseBackend._query_schemas without paging."""
+
+    @pytest.fixture
+    def backend(self) -> SupabaseBackend:
+        backend = SupabaseBackend()
+        backend._client = FakeClient({
+            schema: [{"id": n, "display_name": f"{schema} {n:03}"} for n in range(1, 121)]
+            for schema in SCHEMAS
+        })
+        return backend
+
+    def test_limit_applies_per_schema(self, backend):
+        rows = backend._query_schemas("locations", SCHEMAS, order_by="display_name", limit=100)
+
+        assert len(rows) == 300
+        for schema in SCHEMAS:
+            assert sum(row["company_schema"] == schema for row in rows) == 100
+
+    def test_merged_rows_are_globally_ordered(self, backend):
+        rows = backend._query_schemas("locations", SCHEMAS, order_by="display_name", limit=5)
+        names = [row["display_name"] for row in rows]
+        assert names == sorted(names)
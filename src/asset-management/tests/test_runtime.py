@@ -0,0 +1,132 @@
+"""
+Tests for the shared query executor and background event loop (db/runtime.py).
+
+These tests verify:
+- fan_out returns results in order, and runs inline when called from one of
+  the executor's own workers, so nested fan-out cannot deadlock the pool
+- Exceptions raised by func propagate out of fan_out, pooled or inline
+- run_coro works from sync code and from a thread with a running event
+  loop, and refuses to block the background loop on itself
+- shutdown_runtime stops both, and the next call starts them again
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+import config
+from db import runtime
+
+
+@pytest.fixture(autouse=True)
+def fresh_runtime(monkeypatch):
+    """A two-worker executor and no background loop, cleaned up afterwards."""
+    runtime.shutdown_runtime()
+    monkeypatch.setattr(config, "DB_QUERY_WORKERS", 2)
+    yield
+    runtime.shutdown_runtime()
+
+
+def call_with_timeout(func, timeout: float = 5.0):
+    """Run func on a separate thread, failing instead of hanging on a deadlock."""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        # Abandon the deadlocked executor so teardown does not wait on it
+        runtime._executor = None
+        pytest.fail("fan_out deadlocked")
+    return result[0]
+
+
+class TestFanOut:
+    """fan_out() on the shared query executor."""
+
+    def test_results_in_order(self):
+        assert runtime.fan_out(lambda n: n * n, range(6)) == [0, 1, 4, 9, 16, 25]
+        assert runtime.runtime_stats()["query_executor"]["fan_outs"] >= 1
+
+    def test_nested_fan_out_runs_inline(self):
+        # More outer items than workers: waiting on the pool from inside it would deadlock
+        def outer(n: int) -> list[tuple[int, str]]:
+            return runtime.fan_out(lambda m: (n * 10 + m, threading.current_thread().name), range(3))
+
+        before = runtime.runtime_stats()["query_executor"]["inline_fan_outs"]
+        results = call_with_timeout(lambda: runtime.fan_out(outer, range(4)))
+
+        assert [[value for value, _ in inner] for inner in results] == [
+            [n * 10 + m for m in range(3)] for n in range(4)
+        ]
+        # Each inner fan-out ran on the worker thread that called it
+        assert all(name.startswith("db-query") for inner in results for _, name in inner)
+        assert runtime.runtime_stats()["query_executor"]["inline_fan_outs"] - before == 4
+        assert runtime.runtime_stats()["query_executor"]["threads"] <= 2
+
+    @pytest.mark.parametrize("items", [range(5), range(1)], ids=["pooled", "inline"])
+    def test_exception_propagates(self, items):
+        def query(n: int) -> int:
+            if n == len(items) - 1:
+                raise ValueError(f"schema {n} failed")
+            return n
+
+        with pytest.raises(ValueError, match=f"schema {len(items) - 1} failed"):
+            runtime.fan_out(query, items)
+        assert runtime.runtime_stats()["query_executor"]["active_tasks"] == 0
+
+
+async def double(n: int) -> int:
+    await asyncio.sleep(0)
+    return n * 2
+
+
+class TestRunCoro:
+    """run_coro() on the background event loop."""
+
+    def test_from_sync_code(self):
+        assert runtime.run_coro(double(21)) == 42
+        assert runtime.runtime_stats()["event_loop"]["running"]
+
+    async def test_from_a_running_loop(self):
+        # Sync backend code called from a coroutine: the coroutine runs on the
+        # background loop, not on this one
+        assert runtime.run_coro(double(4), timeout=5) == 8
+
+    def test_errors_propagate_and_are_counted(self):
+        async def fail():
+            raise LookupError("cache miss")
+
+        before = runtime.runtime_stats()["event_loop"]["errors"]
+        with pytest.raises(LookupError, match="cache miss"):
+            runtime.run_coro(fail())
+        assert runtime.runtime_stats()["event_loop"]["errors"] == before + 1
+
+    def test_refuses_the_background_loop_itself(self):
+        async def nested():
+            coro = double(1)
+            try:
+                runtime.run_coro(coro)
+            except RuntimeError as e:
+                return str(e)
+
+        assert "background loop itself" in runtime.run_coro(nested(), timeout=5)
+
+
+class TestShutdown:
+    """shutdown_runtime() and re-use."""
+
+    def test_restarts_after_shutdown(self):
+        assert runtime.fan_out(str, range(3)) == ["0", "1", "2"]
+        assert runtime.run_coro(double(1)) == 2
+        first_loop = runtime._loop
+
+        runtime.shutdown_runtime()
+        stats = runtime.runtime_stats()
+        assert not stats["event_loop"]["running"]
+        assert stats["query_executor"]["threads"] == 0
+        assert first_loop.is_closed()
+
+        assert runtime.fan_out(str, range(3)) == ["0", "1", "2"]
+        assert runtime.run_coro(double(2)) == 4
+        assert runtime._loop is not first_loop
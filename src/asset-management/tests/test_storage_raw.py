@@ -0,0 +1,108 @@
+"""
+Tests for the binary (.../raw) storage endpoints (api/routers/storage.py).
+
+These tests verify:
+- A full download streams the object with its storage ETag
+- A matching If-None-Match answers 304 from metadata, without a download
+- A single range is fetched from storage as a range and answered with 206
+- An unsatisfiable range answers 416 without a download
+- Missing objects answer 404
+"""
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from api.routers import storage as storage_router
+
+BODY = bytes(range(256)) * 4
+ETAG = '"5d41402abc4b2a76b9719d911017c592"'
+PHOTO_URL = "/api/storage/mockups/backlite/dubai_gateway/indoor/photo.jpg/raw"
+
+
+class FakeStorageAPI:
+    """Serves one object through httpx.MockTransport, recording requests."""
+
+    def __init__(self):
+        self.requests: list[tuple[str, str, str | None]] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.method, request.url.path, request.headers.get("range")))
+        if request.url.path != "/storage/v1/object/mockups/backlite/dubai_gateway/indoor/photo.jpg":
+            return httpx.Response(400, json={"statusCode": "404", "message": "Object not found"})
+
+        headers = {"etag": ETAG, "content-type": "image/jpeg"}
+        if request.method == "HEAD":
+            return httpx.Response(200, headers={**headers, "content-length": str(len(BODY))})
+        range_header = request.headers.get("range")
+        if range_header:
+            start, end = (int(n) for n in range_header.removeprefix("bytes=").split("-"))
+            return httpx.Response(206, content=BODY[start:end + 1], headers=headers)
+        return httpx.Response(200, content=BODY, headers=headers)
+
+
+@pytest.fixture
+def api(monkeypatch) -> FakeStorageAPI:
+    api = FakeStorageAPI()
+    client = httpx.AsyncClient(
+        base_url="https://project.supabase.co/storage/v1/",
+        transport=httpx.MockTransport(api),
+    )
+    monkeypatch.setattr(storage_router, "_http_client", client)
+    return api
+
+
+@pytest.fixture
+async def client(api):
+    app = FastAPI()
+    app.include_router(storage_router.router)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    await storage_router.close_storage_client()
+
+
+class TestRawDownload:
+    """GET .../raw responses."""
+
+    async def test_full_body(self, client, api):
+        response = await client.get(PHOTO_URL)
+
+        assert response.status_code == 200
+        assert response.content == BODY
+        assert response.headers["etag"] == ETAG
+        assert response.headers["content-length"] == str(len(BODY))
+        assert response.headers["accept-ranges"] == "bytes"
+
+    async def test_matching_etag_skips_the_download(self, client, api):
+        response = await client.get(PHOTO_URL, headers={"If-None-Match": f'"other", {ETAG}'})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert [method for method, _, _ in api.requests] == ["HEAD"]
+
+    async def test_range(self, client, api):
+        response = await client.get(PHOTO_URL, headers={"Range": "bytes=10-19"})
+
+        assert response.status_code == 206
+        assert response.content == BODY[10:20]
+        assert response.headers["content-range"] == f"bytes 10-19/{len(BODY)}"
+        assert api.requests[-1] == ("GET", api.requests[0][1], "bytes=10-19")
+
+    async def test_suffix_range(self, client, api):
+        response = await client.get(PHOTO_URL, headers={"Range": "bytes=-5"})
+
+        assert response.status_code == 206
+        assert response.content == BODY[-5:]
+
+    async def test_unsatisfiable_range(self, client, api):
+        response = await client.get(PHOTO_URL, headers={"Range": f"bytes={len(BODY)}-"})
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(BODY)}"
+        assert [method for method, _, _ in api.requests] == ["HEAD"]
+
+    async def test_missing_object(self, client, api):
+        response = await client.get("/api/storage/mockups/backlite/dubai_gateway/indoor/missing.jpg/raw")
+
+        assert response.status_code == 404
+        assert [method for method, _, _ in api.requests] == ["HEAD"]
@@ -12,6 +12,7 @@ from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 
+from core.utils.render_pool import RenderPoolFullError
 from core.utils.time import get_uae_time
 
 logger = logging.getLogger("proposal-bot")
@@ -221,6 +222,22 @@ async def api_error_handler(request: Request, exc: APIError) -> JSONResponse:
     )
 
 
+async def render_pool_full_handler(request: Request, exc: RenderPoolFullError) -> JSONResponse:
+    """Handle a saturated render pool as a retryable 503."""
+    logger.warning(f"[RENDER POOL FULL] {exc}")
+
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(exc.retry_after)},
+        content=build_error_response(
+            message="Mockup rendering is busy, please retry shortly",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            error_code="RENDER_POOL_FULL",
+            details={"retry_after_seconds": exc.retry_after},
+        ),
+    )
+
+
 async def validation_error_handler(
     request: Request, exc: RequestValidationError
 ) -> JSONResponse:
@@ -288,6 +305,9 @@ def setup_exception_handlers(app: FastAPI) -> None:
     # Custom API errors
     app.add_exception_handler(APIError, api_error_handler)
 
+    # Saturated mockup render pool
+    app.add_exception_handler(RenderPoolFullError, render_pool_full_handler)
+
     # Pydantic validation errors
     app.add_exception_handler(RequestValidationError, validation_error_handler)
 
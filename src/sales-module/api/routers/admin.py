@@ -22,6 +22,7 @@ from integrations.rbac import (
     get_rbac_client,
 )
 from core.utils.logging import get_logger
+from db.executor import run_db
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 logger = get_logger("api.admin")
@@ -286,7 +287,7 @@ async def list_api_keys(
     from db.database import db
 
 
-    keys = db.list_api_keys(include_inactive=include_inactive)
+    keys = await run_db(db.list_api_keys, include_inactive=include_inactive)
 
     return [
         APIKeyResponse(
@@ -320,7 +321,7 @@ async def get_api_key(
     from db.database import db
 
 
-    k = db.get_api_key_by_id(key_id)
+    k = await run_db(db.get_api_key_by_id, key_id)
 
     if not k:
         raise HTTPException(
@@ -376,7 +377,8 @@ async def create_api_key(
             )
 
     # Create in database
-    key_id = db.create_api_key(
+    key_id = await run_db(
+        db.create_api_key,
         key_hash=key_hash,
         key_prefix=key_prefix,
         name=key_data.name,
@@ -420,7 +422,7 @@ async def update_api_key(
 
 
     # Check key exists
-    existing = db.get_api_key_by_id(key_id)
+    existing = await run_db(db.get_api_key_by_id, key_id)
     if not existing:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -438,7 +440,8 @@ async def update_api_key(
                 )
 
     # Update
-    success = db.update_api_key(
+    success = await run_db(
+        db.update_api_key,
         key_id=key_id,
         name=key_data.name,
         description=key_data.description,
@@ -457,7 +460,7 @@ async def update_api_key(
     logger.info(f"[ADMIN] API key updated: {key_id} by {user.email}")
 
     # Fetch updated key
-    k = db.get_api_key_by_id(key_id)
+    k = await run_db(db.get_api_key_by_id, key_id)
 
     return APIKeyResponse(
         id=k["id"],
@@ -495,7 +498,7 @@ async def rotate_api_key(
 
 
     # Check key exists
-    existing = db.get_api_key_by_id(key_id)
+    existing = await run_db(db.get_api_key_by_id, key_id)
     if not existing:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -507,7 +510,8 @@ async def rotate_api_key(
     key_prefix = raw_key[:8]
 
     # Rotate
-    success = db.rotate_api_key(
+    success = await run_db(
+        db.rotate_api_key,
         key_id=key_id,
         new_key_hash=key_hash,
         new_key_prefix=key_prefix,
@@ -544,14 +548,14 @@ async def delete_api_key(
 
 
     # Check key exists
-    existing = db.get_api_key_by_id(key_id)
+    existing = await run_db(db.get_api_key_by_id, key_id)
     if not existing:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"API key {key_id} not found",
         )
 
-    success = db.delete_api_key(key_id)
+    success = await run_db(db.delete_api_key, key_id)
 
     if not success:
         raise HTTPException(
@@ -576,14 +580,14 @@ async def deactivate_api_key(
 
 
     # Check key exists
-    existing = db.get_api_key_by_id(key_id)
+    existing = await run_db(db.get_api_key_by_id, key_id)
     if not existing:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"API key {key_id} not found",
         )
 
-    success = db.deactivate_api_key(key_id)
+    success = await run_db(db.deactivate_api_key, key_id)
 
     if not success:
         raise HTTPException(
@@ -612,14 +616,15 @@ async def get_api_key_usage(
 
 
     # Check key exists
-    existing = db.get_api_key_by_id(key_id)
+    existing = await run_db(db.get_api_key_by_id, key_id)
     if not existing:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"API key {key_id} not found",
         )
 
-    stats = db.get_api_key_usage_stats(
+    stats = await run_db(
+        db.get_api_key_usage_stats,
         api_key_id=key_id,
         start_date=start_date,
         end_date=end_date,
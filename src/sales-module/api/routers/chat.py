@@ -17,6 +17,7 @@ from pydantic import BaseModel, field_validator
 from crm_security import require_permission_user as require_permission, AuthUser
 from integrations.rbac import get_rbac_client
 from core.utils.logging import get_logger
+from db.executor import run_db
 
 logger = get_logger("api.chat")
 
@@ -314,8 +315,8 @@ async def get_chat_history(
     from db.database import db
 
     try:
-        # Single database call - get full session (cached)
-        session = db.get_chat_session(user.id)
+        # Session header (cached), then only the requested page of messages
+        session = await run_db(db.get_chat_session, user.id, include_messages=False)
 
         if not session:
             return {
@@ -326,27 +327,20 @@ async def get_chat_history(
                 "last_updated": None,
             }
 
-        all_messages = session.get("messages", [])
-        # Filter out any None/null messages (defensive against corrupted data)
-        all_messages = [m for m in all_messages if m is not None]
-        total_count = len(all_messages)
+        total_count = session.get("message_count", 0)
+        messages = await run_db(db.get_chat_messages, user.id, limit=limit, offset=offset, newest_first=newest_first)
 
-        # Apply pagination if limit is specified
+        # Whether there is another page beyond this one
         if limit is not None:
             if newest_first:
                 # For infinite scroll: offset from end, return in chronological order
-                # offset=0, limit=50 → last 50 messages (index [total-50:total])
-                # offset=50, limit=50 → previous 50 messages (index [total-100:total-50])
-                end_idx = total_count - offset
-                start_idx = max(0, end_idx - limit)
-                messages = all_messages[start_idx:end_idx]
-                has_more = start_idx > 0
+                # offset=0, limit=50 → last 50 messages
+                # offset=50, limit=50 → previous 50 messages
+                has_more = total_count - offset - limit > 0
             else:
                 # Original behavior: offset from start
-                messages = all_messages[offset:offset + limit]
                 has_more = (offset + limit) < total_count
         else:
-            messages = all_messages[offset:] if offset > 0 else all_messages
             has_more = False
 
         # Collect all attachment file_ids for dimension enrichment (no URL generation)
@@ -363,7 +357,7 @@ async def get_chat_history(
         # Frontend will call /attachments/refresh to get URLs for visible images
         dimension_cache = {}
         if attachment_ids:
-            docs = db.get_documents_batch(attachment_ids)
+            docs = await run_db(db.get_documents_batch, attachment_ids)
             for file_id, doc in docs.items():
                 if doc:
                     dimension_cache[file_id] = {
@@ -587,7 +581,7 @@ async def refresh_attachment_urls(
         return {"urls": {}}
 
     # Single batch DB lookup
-    docs = db.get_documents_batch(all_ids)
+    docs = await run_db(db.get_documents_batch, all_ids)
 
     # Collect storage keys for batch URL generation
     uploads_keys: dict[str, str] = {}  # storage_key -> file_id
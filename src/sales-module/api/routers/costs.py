@@ -11,6 +11,8 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from api.schemas import CallType, Workflow
 from app_settings import settings
 from db.database import db
+from db.executor import run_db
+from integrations.llm.cost_tracker import get_cost_tracker, get_costs_summary
 from crm_security import (
     AuthUser,
     require_auth_user as require_auth,
@@ -67,7 +69,7 @@ async def get_costs(
     call_type_str = call_type.value if call_type else None
     workflow_str = workflow.value if workflow else None
 
-    summary = db.get_ai_costs_summary(
+    summary = await get_costs_summary(
         start_date=start_date,
         end_date=end_date,
         call_type=call_type_str,
@@ -114,7 +116,8 @@ async def clear_costs(
         )
 
     logger.warning(f"[COSTS] !!! CLEARING ALL COST DATA !!! Initiated by {user.email}")
-    db.clear_ai_costs()
+    get_cost_tracker().clear()
+    await run_db(db.clear_ai_costs)
     logger.warning(f"[COSTS] All cost data cleared by {user.email} at {get_uae_time().isoformat()}")
 
     return {
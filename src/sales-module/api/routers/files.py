@@ -20,6 +20,7 @@ from crm_security import (
     has_permission,
 )
 from core.utils.logging import get_logger
+from db.executor import run_db
 
 router = APIRouter(prefix="/api/files", tags=["files"])
 logger = get_logger("api.files")
@@ -133,7 +134,7 @@ async def upload_file(
                 logger.info(f"[FILES] Image dimensions: {image_width}x{image_height}")
 
                 # Store dimensions in document record
-                db.update_document(result.file_id, {
+                await run_db(db.update_document, result.file_id, {
                     "image_width": image_width,
                     "image_height": image_height,
                 })
@@ -224,7 +225,7 @@ async def upload_multiple_files(
                         image_width, image_height = img.size
 
                         # Store dimensions in document record
-                        db.update_document(result.file_id, {
+                        await run_db(db.update_document, result.file_id, {
                             "image_width": image_width,
                             "image_height": image_height,
                         })
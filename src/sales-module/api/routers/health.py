@@ -25,11 +25,11 @@ async def check_database() -> dict[str, Any]:
     """Check database connectivity."""
     try:
         from db.database import db
+        from db.executor import run_db
 
         # Try a simple operation to verify connectivity
         # Using get_proposals_summary as a lightweight check
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, db.get_proposals_summary)
+        await run_db(db.get_proposals_summary)
 
         return {
             "status": "healthy",
@@ -262,6 +262,10 @@ async def metrics(user: AuthUser = Depends(require_auth)):
     import psutil
 
     import config
+    from core.proposals.financial_cache import get_financial_slide_cache
+    from core.utils.disk_cache import get_asset_file_cache
+    from core.utils.soffice_pool import get_soffice_pool
+    from core.utils.task_queue import mockup_queue
     from db.cache import user_history
     from generators.pdf import _CONVERT_SEMAPHORE
 
@@ -286,7 +290,11 @@ async def metrics(user: AuthUser = Depends(require_auth)):
         "pdf_conversions": {
             "active": pdf_conversions_active,
             "max_concurrent": _CONVERT_SEMAPHORE._initial_value,
+            "soffice_pool": get_soffice_pool().get_stats(),
         },
+        "mockup_queue": mockup_queue.get_queue_status(),
+        "asset_file_cache": get_asset_file_cache().stats(),
+        "financial_slide_cache": get_financial_slide_cache().stats(),
         "cache_sizes": {
             "user_histories": len(user_history),
             "templates_cached": len(config.get_location_mapping()),
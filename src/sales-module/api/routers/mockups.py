@@ -13,11 +13,13 @@ import config
 from core.services.asset_service import get_asset_service
 from core.services.mockup_frame_service import MockupFrameService, invalidate_mockup_caches
 from core.utils import sanitize_path_component  # ✅ Use shared utility (removed duplicate)
+from core.utils.render_pool import RenderPoolFullError
 from crm_security import require_permission_user as require_permission, AuthUser
 from api.schemas import (
     validate_image_upload,
 )
 from db.database import db
+from db.executor import run_db
 
 logger = config.logger
 
@@ -520,7 +522,7 @@ async def test_preview_mockup(
     import cv2
     import numpy as np
 
-    from generators import mockup as mockup_generator
+    from core.utils.task_queue import mockup_queue
 
     try:
         # Parse frame points (list of 4 [x, y] coordinates)
@@ -547,13 +549,14 @@ async def test_preview_mockup(
         if creative_img is None:
             raise HTTPException(status_code=400, detail="Invalid creative image")
 
-        # Apply the warp using the same function as real mockup generation
-        result = mockup_generator.warp_creative_to_billboard(
+        # Apply the warp using the same function as real mockup generation,
+        # in the render pool so the event loop stays free
+        result = await mockup_queue.composite(
             billboard_img,
             creative_img,
             points,
             config=config_dict,
-            time_of_day=time_of_day
+            time_of_day=time_of_day,
         )
 
         # Encode result as JPEG
@@ -586,6 +589,8 @@ async def test_preview_mockup(
             cleanup_memory(context="mockup_preview_error", aggressive=False, log_stats=False)
         except NameError:
             pass  # Some variables may not have been assigned
+        if isinstance(e, RenderPoolFullError):
+            raise  # Answered as 503 with Retry-After by the exception handler
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1102,6 +1107,7 @@ async def generate_mockup_api(
             service = MockupFrameService(companies=user.companies)
             generated_mockups = []
             skipped_types = []
+            render_types = []
 
             for asset_type in asset_types:
                 type_key = asset_type.get("type_key")
@@ -1150,63 +1156,63 @@ async def generate_mockup_api(
                     })
                     continue
 
-                # Generate mockup for this type
-                try:
-                    result_path, photo_used = await mockup_generator.generate_mockup_async(
-                        type_storage_key,
-                        creative_paths,
+                render_types.append((type_key, type_name, type_storage_key))
+
+            # Generate all compatible types in one batch (creatives decoded and prepared once)
+            try:
+                batch_results = await mockup_generator.generate_mockups_batch_async(
+                    [type_storage_key for _, _, type_storage_key in render_types],
+                    creative_paths,
+                    time_of_day=time_of_day,
+                    side=side,
+                    environment=environment,
+                    config_override=config_dict,
+                    company_schemas=user.companies,
+                    company_hint=company_schema,
+                )
+            except RenderPoolFullError:
+                raise
+            except Exception as gen_error:
+                logger.error(f"[MOCKUP API] Error in batch mockup generation: {gen_error}")
+                batch_results = [(None, None)] * len(render_types)
+
+            for (type_key, type_name, type_storage_key), (result_path, photo_used) in zip(render_types, batch_results, strict=True):
+                if result_path and photo_used:
+                    # Read image and encode as base64
+                    with open(result_path, "rb") as img_file:
+                        image_base64 = base64.b64encode(img_file.read()).decode("utf-8")
+
+                    generated_mockups.append({
+                        "storage_key": type_storage_key,
+                        "type_key": type_key,
+                        "type_name": type_name,
+                        "image_base64": image_base64,
+                        "photo_used": photo_used,
+                    })
+
+                    # Log success
+                    await run_db(
+                        db.log_mockup_usage,
+                        location_key=location_key,
                         time_of_day=time_of_day,
                         side=side,
-                        environment=environment,
-                        specific_photo=None,  # Let it pick randomly from compatible
-                        config_override=config_dict,
-                        company_schemas=user.companies,
-                        company_hint=company_schema,
+                        photo_used=photo_used,
+                        creative_type=creative_type,
+                        company_schema=company_schema,
+                        ai_prompt=ai_prompt if ai_prompt else None,
+                        template_selected=False,
+                        success=True,
+                        user_ip=client_ip,
                     )
 
-                    if result_path and photo_used:
-                        # Read image and encode as base64
-                        with open(result_path, "rb") as img_file:
-                            image_base64 = base64.b64encode(img_file.read()).decode("utf-8")
-
-                        generated_mockups.append({
-                            "storage_key": type_storage_key,
-                            "type_key": type_key,
-                            "type_name": type_name,
-                            "image_base64": image_base64,
-                            "photo_used": photo_used,
-                        })
-
-                        # Log success
-                        db.log_mockup_usage(
-                            location_key=location_key,
-                            time_of_day=time_of_day,
-                            side=side,
-                            photo_used=photo_used,
-                            creative_type=creative_type,
-                            company_schema=company_schema,
-                            ai_prompt=ai_prompt if ai_prompt else None,
-                            template_selected=False,
-                            success=True,
-                            user_ip=client_ip,
-                        )
-
-                        # Cleanup temp result file
-                        if result_path.exists():
-                            result_path.unlink()
-                    else:
-                        skipped_types.append({
-                            "type_key": type_key,
-                            "type_name": type_name,
-                            "reason": "generation_failed"
-                        })
-
-                except Exception as gen_error:
-                    logger.error(f"[MOCKUP API] Error generating mockup for type {type_key}: {gen_error}")
+                    # Cleanup temp result file
+                    if result_path.exists():
+                        result_path.unlink()
+                else:
                     skipped_types.append({
                         "type_key": type_key,
                         "type_name": type_name,
-                        "reason": f"error: {str(gen_error)}"
+                        "reason": "generation_failed"
                     })
 
             # Cleanup creative file
@@ -1256,7 +1262,8 @@ async def generate_mockup_api(
 
         if not result_path or not photo_used:
             # Log failed attempt
-            db.log_mockup_usage(
+            await run_db(
+                db.log_mockup_usage,
                 location_key=location_key,
                 time_of_day=time_of_day,
                 side=side,
@@ -1271,7 +1278,8 @@ async def generate_mockup_api(
             raise HTTPException(status_code=500, detail="Failed to generate mockup")
 
         # Log successful generation
-        db.log_mockup_usage(
+        await run_db(
+            db.log_mockup_usage,
             location_key=location_key,
             time_of_day=time_of_day,
             side=side,
@@ -1353,7 +1361,8 @@ async def generate_mockup_api(
 
         # Log failed attempt
         try:
-            db.log_mockup_usage(
+            await run_db(
+                db.log_mockup_usage,
                 location_key=location_key,
                 time_of_day=time_of_day,
                 side=side,
@@ -1368,6 +1377,8 @@ async def generate_mockup_api(
         except Exception as log_error:
             logger.error(f"[MOCKUP API] Error logging usage: {log_error}")
 
+        if isinstance(e, RenderPoolFullError):
+            raise  # Answered as 503 with Retry-After by the exception handler
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -19,6 +19,7 @@ from crm_security import (
     has_permission,
 )
 from core.utils.logging import get_logger
+from db.executor import run_db
 from core.utils.time import get_uae_time
 
 router = APIRouter(prefix="/api/modules", tags=["modules"])
@@ -195,7 +196,8 @@ async def get_accessible_modules(user: AuthUser = Depends(require_auth)):
     from db.database import db
 
     try:
-        user_pref = db.execute_query(
+        user_pref = await run_db(
+            db.execute_query,
             """
             SELECT m.name FROM user_modules um
             JOIN modules m ON um.module_id = m.id
@@ -345,7 +347,8 @@ async def grant_module_access(
     now = get_uae_time().isoformat()
 
     # Get or create module in database
-    module_record = db.execute_query(
+    module_record = await run_db(
+        db.execute_query,
         "SELECT id FROM modules WHERE name = ?",
         (assignment.module_name,)
     )
@@ -353,7 +356,8 @@ async def grant_module_access(
     if not module_record:
         # Create module record
         config = MODULE_CONFIGS[assignment.module_name]
-        db.execute_query(
+        await run_db(
+            db.execute_query,
             """
             INSERT INTO modules (name, display_name, description, icon, is_active, is_default, sort_order, required_permission, created_at)
             VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?)
@@ -369,7 +373,8 @@ async def grant_module_access(
                 now,
             )
         )
-        module_record = db.execute_query(
+        module_record = await run_db(
+            db.execute_query,
             "SELECT id FROM modules WHERE name = ?",
             (assignment.module_name,)
         )
@@ -378,13 +383,15 @@ async def grant_module_access(
 
     # If setting as default, clear other defaults for this user
     if assignment.is_default:
-        db.execute_query(
+        await run_db(
+            db.execute_query,
             "UPDATE user_modules SET is_default = 0 WHERE user_id = ?",
             (assignment.user_id,)
         )
 
     # Insert or update user-module assignment
-    db.execute_query(
+    await run_db(
+        db.execute_query,
         """
         INSERT INTO user_modules (user_id, module_id, is_default, granted_by, granted_at)
         VALUES (?, ?, ?, ?, ?)
@@ -423,7 +430,8 @@ async def revoke_module_access(
     db = get_db()
 
     # Get module ID
-    module_record = db.execute_query(
+    module_record = await run_db(
+        db.execute_query,
         "SELECT id FROM modules WHERE name = ?",
         (module_name,)
     )
@@ -437,7 +445,8 @@ async def revoke_module_access(
     module_id = module_record[0]["id"]
 
     # Delete assignment
-    db.execute_query(
+    await run_db(
+        db.execute_query,
         "DELETE FROM user_modules WHERE user_id = ? AND module_id = ?",
         (user_id, module_id)
     )
@@ -461,7 +470,8 @@ async def get_user_modules(
 
     db = get_db()
 
-    assignments = db.execute_query(
+    assignments = await run_db(
+        db.execute_query,
         """
         SELECT m.name, m.display_name, um.is_default, um.granted_at, um.granted_by
         FROM user_modules um
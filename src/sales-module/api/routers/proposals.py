@@ -19,6 +19,7 @@ from pydantic import BaseModel, Field
 
 import config
 from db.database import db
+from db.executor import run_db
 from core.services.asset_service import get_asset_service
 from crm_security import (
     AuthUser,
@@ -335,7 +336,8 @@ async def list_proposals(
                 # Empty list - shouldn't happen, but fallback to own
                 user_ids = user.id
 
-        proposals = db.get_proposals(
+        proposals = await run_db(
+            db.get_proposals,
             limit=limit,
             offset=offset,
             user_ids=user_ids,
@@ -549,7 +551,7 @@ async def get_proposals_history(user: AuthUser = Depends(require_auth)):
             elif not user_ids:
                 user_ids = user.id
 
-        proposals = db.get_proposals(limit=20, user_ids=user_ids)
+        proposals = await run_db(db.get_proposals, limit=20, user_ids=user_ids)
         return proposals
     except Exception as e:
         logger.error(f"[PROPOSALS API] Error getting history: {e}")
@@ -567,7 +569,7 @@ async def get_proposal(
     Access: own proposals, subordinates' proposals (for managers), or sales:proposals:manage permission.
     """
     try:
-        proposal = db.get_proposal_by_id(proposal_id)
+        proposal = await run_db(db.get_proposal_by_id, proposal_id)
 
         if not proposal:
             raise HTTPException(status_code=404, detail="Proposal not found")
@@ -582,7 +584,7 @@ async def get_proposal(
             raise HTTPException(status_code=403, detail="Not authorized to view this proposal")
 
         # Get locations
-        locations = db.get_proposal_locations(proposal_id)
+        locations = await run_db(db.get_proposal_locations, proposal_id)
 
         return ProposalDetailResponse(
             **proposal,
@@ -606,7 +608,7 @@ async def delete_proposal(
     Access: own proposals, subordinates' proposals (for managers), or sales:proposals:delete permission.
     """
     try:
-        proposal = db.get_proposal_by_id(proposal_id)
+        proposal = await run_db(db.get_proposal_by_id, proposal_id)
 
         if not proposal:
             raise HTTPException(status_code=404, detail="Proposal not found")
@@ -620,7 +622,7 @@ async def delete_proposal(
         if not can_access:
             raise HTTPException(status_code=403, detail="Not authorized to delete this proposal")
 
-        success = db.delete_proposal(proposal_id)
+        success = await run_db(db.delete_proposal, proposal_id)
 
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete proposal")
@@ -644,7 +646,7 @@ async def get_proposal_locations(
     Access: own proposals, subordinates' proposals (for managers), or sales:proposals:manage permission.
     """
     try:
-        proposal = db.get_proposal_by_id(proposal_id)
+        proposal = await run_db(db.get_proposal_by_id, proposal_id)
 
         if not proposal:
             raise HTTPException(status_code=404, detail="Proposal not found")
@@ -658,7 +660,7 @@ async def get_proposal_locations(
         if not can_access:
             raise HTTPException(status_code=403, detail="Not authorized to view this proposal")
 
-        locations = db.get_proposal_locations(proposal_id)
+        locations = await run_db(db.get_proposal_locations, proposal_id)
         return locations
     except HTTPException:
         raise
@@ -682,7 +684,7 @@ async def update_proposal(
     the actual proposal files, use POST /{proposal_id}/regenerate.
     """
     try:
-        proposal = db.get_proposal_by_id(proposal_id)
+        proposal = await run_db(db.get_proposal_by_id, proposal_id)
 
         if not proposal:
             raise HTTPException(status_code=404, detail="Proposal not found")
@@ -705,7 +707,7 @@ async def update_proposal(
             raise HTTPException(status_code=400, detail="No fields to update")
 
         # Update in database
-        success = db.update_proposal(proposal_id, update_data)
+        success = await run_db(db.update_proposal, proposal_id, update_data)
 
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update proposal")
@@ -736,7 +738,7 @@ async def regenerate_proposal(
     - currency: New currency
     """
     try:
-        proposal = db.get_proposal_by_id(proposal_id)
+        proposal = await run_db(db.get_proposal_by_id, proposal_id)
 
         if not proposal:
             raise HTTPException(status_code=404, detail="Proposal not found")
@@ -821,7 +823,7 @@ async def regenerate_proposal(
                 proposals_data.append(proposal_dict)
         else:
             # Use existing locations from proposal
-            existing_locations = db.get_proposal_locations(proposal_id)
+            existing_locations = await run_db(db.get_proposal_locations, proposal_id)
             if not existing_locations:
                 raise HTTPException(
                     status_code=400,
@@ -904,7 +906,7 @@ async def download_proposal(
     Returns a signed URL that expires in 1 hour.
     """
     try:
-        proposal = db.get_proposal_by_id(proposal_id)
+        proposal = await run_db(db.get_proposal_by_id, proposal_id)
 
         if not proposal:
             raise HTTPException(status_code=404, detail="Proposal not found")
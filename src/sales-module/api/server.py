@@ -156,6 +156,10 @@ async def lifespan(app: FastAPI):
     # Initialize storage (for Supabase/S3 bucket setup)
     await initialize_storage()
 
+    # Start the write-behind AI cost writer (loads cost aggregates in the background)
+    from integrations.llm.cost_tracker import start_cost_tracker
+    start_cost_tracker()
+
     # Download and install custom fonts from Supabase Storage
     await ensure_fonts_available()
 
@@ -163,6 +167,10 @@ async def lifespan(app: FastAPI):
     from workflows import bo_approval
     await bo_approval.load_workflows_from_db()
 
+    # Warm up persistent LibreOffice instances so the first proposal skips the cold start
+    from core.utils.soffice_pool import get_soffice_pool
+    soffice_warmup = asyncio.create_task(asyncio.to_thread(get_soffice_pool().start))
+
     yield
 
     # Shutdown
@@ -176,6 +184,43 @@ async def lifespan(app: FastAPI):
     await close_cache()
     logger.info("[SHUTDOWN] Cache connection closed")
 
+    # Write out queued AI cost rows
+    from integrations.llm.cost_tracker import close_cost_tracker
+    await close_cost_tracker()
+    logger.info("[SHUTDOWN] AI cost rows flushed")
+
+    # Write out queued audit events
+    from core.utils.audit import audit_logger
+    await audit_logger.close()
+    from crm_security import close_audit_client
+    await close_audit_client()
+    logger.info("[SHUTDOWN] Audit events flushed")
+
+    # Close the rate limiter's pooled connections to security-service
+    from crm_security import close_rate_limit_client
+    await close_rate_limit_client()
+
+    # Stop the database executor once the flushes above are done
+    from db.executor import shutdown_db_executor
+    shutdown_db_executor()
+
+    # Close pooled storage connections
+    from integrations.storage import get_storage_client
+    await get_storage_client().close()
+    logger.info("[SHUTDOWN] Storage connections closed")
+
+    # Stop mockup render workers
+    from core.utils.render_pool import shutdown_render_pool
+    shutdown_render_pool()
+    logger.info("[SHUTDOWN] Render pool stopped")
+
+    # Stop LibreOffice instances
+    from core.utils.soffice_pool import shutdown_soffice_pool
+    if not soffice_warmup.done():
+        await soffice_warmup
+    shutdown_soffice_pool()
+    logger.info("[SHUTDOWN] Soffice pool stopped")
+
 
 # Create FastAPI app with dev auth docs (if enabled)
 swagger_ui_parameters = None
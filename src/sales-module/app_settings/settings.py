@@ -74,6 +74,21 @@ class Settings(BaseSettings):
         default=None,
         description="Database connection URL (for direct DB access)",
     )
+    db_pool_size: int = Field(
+        default=16,
+        ge=1,
+        description="SQLite connections kept open for reuse (one per thread)",
+    )
+    db_statement_cache_size: int = Field(
+        default=256,
+        ge=0,
+        description="Prepared statements cached per SQLite connection",
+    )
+    db_executor_workers: int = Field(
+        default=8,
+        ge=1,
+        description="Threads in the executor that runs database calls for async code",
+    )
 
     # =========================================================================
     # SALES BOT SUPABASE (Data storage - separate from UI)
@@ -201,6 +216,21 @@ class Settings(BaseSettings):
         default="local",
         description="File storage provider",
     )
+    storage_max_connections: int = Field(
+        default=20,
+        ge=1,
+        description="Maximum pooled HTTP connections to the storage API",
+    )
+    storage_batch_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description="Concurrent transfers per batch storage operation",
+    )
+    storage_timeout: float = Field(
+        default=60.0,
+        gt=0,
+        description="Storage API request timeout in seconds",
+    )
 
     # AWS S3 (optional)
     aws_access_key_id: str | None = Field(
@@ -276,6 +306,96 @@ class Settings(BaseSettings):
         description="Default job timeout in seconds",
     )
 
+    # =========================================================================
+    # RENDER POOL
+    # =========================================================================
+
+    render_pool_workers: int = Field(
+        default=2,
+        ge=1,
+        description="Worker processes for mockup rendering (OpenCV runs off the event loop)",
+    )
+    render_pool_max_pending: int = Field(
+        default=16,
+        ge=1,
+        description="Maximum mockup render jobs queued or running before new ones are rejected",
+    )
+
+    # =========================================================================
+    # SOFFICE POOL
+    # =========================================================================
+
+    soffice_pool_size: int = Field(
+        default=2,
+        ge=0,
+        description="Persistent headless LibreOffice instances for PPTX->PDF (0 = one process per conversion)",
+    )
+    soffice_max_conversions: int = Field(
+        default=200,
+        ge=1,
+        description="Conversions before a LibreOffice instance is recycled",
+    )
+    soffice_convert_timeout: int = Field(
+        default=60,
+        ge=5,
+        description="Seconds before a conversion is treated as hung and its instance restarted",
+    )
+    soffice_python: str | None = Field(
+        default=None,
+        description="Python interpreter with pyuno for the soffice bridge (auto-detected if unset)",
+    )
+
+    # =========================================================================
+    # ASSET FILE CACHE
+    # =========================================================================
+
+    asset_cache_dir: str | None = Field(
+        default=None,
+        description="Disk cache root for mockup photos, templates and intro/outro PDFs "
+                    "(default: /data/cache/assets in production, ./data/cache/assets locally)",
+    )
+    asset_cache_max_mb: int = Field(
+        default=1024,
+        ge=1,
+        description="Disk cache size budget in MB (least recently used files are evicted)",
+    )
+    asset_cache_max_age: int = Field(
+        default=3600,
+        ge=0,
+        description="Seconds a cached file is served before it is revalidated against Asset-Management",
+    )
+    financial_slide_cache_mb: int = Field(
+        default=256,
+        ge=0,
+        description="Disk budget in MB for rendered financial-slide PDFs (0 disables the cache)",
+    )
+
+    # =========================================================================
+    # AI COST TRACKING
+    # =========================================================================
+
+    cost_batch_size: int = Field(
+        default=100,
+        ge=1,
+        description="AI cost rows written per batch insert",
+    )
+    cost_flush_interval: float = Field(
+        default=2.0,
+        gt=0,
+        description="Max seconds an AI cost row waits in memory before it is written",
+    )
+    cost_max_pending: int = Field(
+        default=10000,
+        ge=1,
+        description="AI cost rows held while the database is unavailable (oldest are dropped)",
+    )
+    cost_aggregates_refresh: int = Field(
+        default=900,
+        ge=0,
+        description="Seconds between reloads of the in-memory cost aggregates from the database "
+                    "(picks up rows written by other instances; 0 = load once at startup)",
+    )
+
     # =========================================================================
     # API KEYS
     # =========================================================================
@@ -417,6 +537,11 @@ class Settings(BaseSettings):
         default=3,
         description="Maximum concurrent PDF conversion workers",
     )
+    pdf_merge_spill_pages: int = Field(
+        default=24,
+        ge=1,
+        description="Pages a streaming PDF merge keeps in memory before spilling to disk",
+    )
 
     # =========================================================================
     # COSTS / ADMIN
@@ -6,6 +6,10 @@ Provides a simple interface for chat_api and WebAdapter to persist chat history.
 
 Supports parallel request handling by maintaining logical message ordering:
 user messages are paired with their assistant responses via parent_id.
+
+Messages are stored one row per message (see db/chat_messages.py), so
+appends only write the new messages and loads can be limited to the
+most recent ones.
 """
 
 import logging
@@ -126,8 +130,7 @@ def append_chat_messages(
 
     This is the PREFERRED method for saving new messages as it:
     - Prevents race conditions when concurrent requests save messages
-    - Uses PostgreSQL JSONB concatenation for atomic appends
-    - Falls back to optimistic locking if RPC is unavailable
+    - Inserts only the new message rows instead of rewriting the history
 
     Args:
         user_id: User's unique ID
@@ -155,23 +158,23 @@ def append_chat_messages(
         return False
 
 
-def load_chat_messages(user_id: str) -> list[dict[str, Any]]:
+def load_chat_messages(user_id: str, limit: int | None = None) -> list[dict[str, Any]]:
     """
     Load chat messages for a user from the database.
 
     Args:
         user_id: User's unique ID
+        limit: Only load the last N messages (None = all)
 
     Returns:
-        List of message dictionaries, or empty list if none found
+        List of message dictionaries (oldest first), or empty list if none found
     """
     try:
         db = _get_db()
-        session = db.get_chat_session(user_id)
-        if session and session.get("messages"):
-            logger.debug(f"[CHAT PERSIST] Loaded {len(session['messages'])} messages for {user_id}")
-            return session["messages"]
-        return []
+        messages = db.get_chat_messages(user_id, limit=limit, newest_first=True)
+        if messages:
+            logger.debug(f"[CHAT PERSIST] Loaded {len(messages)} messages for {user_id}")
+        return messages
     except Exception as e:
         logger.error(f"[CHAT PERSIST] Failed to load messages for {user_id}: {e}")
         return []
@@ -207,11 +210,11 @@ def get_chat_session_info(user_id: str) -> dict[str, Any] | None:
     """
     try:
         db = _get_db()
-        session = db.get_chat_session(user_id)
+        session = db.get_chat_session(user_id, include_messages=False)
         if session:
             return {
                 "session_id": session.get("session_id"),
-                "message_count": len(session.get("messages", [])),
+                "message_count": session.get("message_count", 0),
                 "created_at": session.get("created_at"),
                 "updated_at": session.get("updated_at"),
             }
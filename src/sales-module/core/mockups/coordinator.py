@@ -11,7 +11,7 @@ from typing import Any, Callable
 import config
 from core.services.asset_service import get_asset_service
 from core.services.mockup_eligibility import GenerateLLMEligibilityService
-from core.utils import match_location_key
+from core.utils import LocationIndex
 
 from .strategies.ai import AIMockupStrategy
 from .strategies.followup import FollowupMockupStrategy
@@ -41,6 +41,7 @@ class MockupCoordinator:
         generate_mockup_func: Callable,
         generate_ai_mockup_func: Callable,
         company_hint: str | None = None,
+        location_index: LocationIndex | None = None,
     ):
         """
         Initialize coordinator with dependencies.
@@ -50,6 +51,7 @@ class MockupCoordinator:
             generate_mockup_func: Function to generate mockup from creatives
             generate_ai_mockup_func: Function to generate AI creative and mockup
             company_hint: Optional company to try first for O(1) asset lookups
+            location_index: Optional prebuilt index of the user's locations (from WorkflowContext)
         """
         self.user_companies = user_companies
         self.generate_mockup_func = generate_mockup_func
@@ -59,7 +61,8 @@ class MockupCoordinator:
 
         # Initialize components (lazy-load locations) - use singleton for shared cache
         self.asset_service = get_asset_service()
-        self._available_locations: list[dict[str, Any]] | None = None
+        # (an empty index counts as not provided)
+        self._location_index: LocationIndex | None = location_index or None
         self.validator = MockupValidator(user_companies, company_hint=company_hint)
 
         # Initialize eligibility service for LLM-friendly validation
@@ -72,13 +75,12 @@ class MockupCoordinator:
             FollowupMockupStrategy(self.validator, generate_mockup_func, company_hint=company_hint),
         ]
 
-    async def _get_available_locations(self) -> list[dict[str, Any]]:
-        """Lazy-load available locations (async)."""
-        if self._available_locations is None:
-            self._available_locations = await self.asset_service.get_locations_for_companies(
-                self.user_companies
-            )
-        return self._available_locations
+    async def _get_location_index(self) -> LocationIndex:
+        """Lazy-load available locations and index them (async)."""
+        if self._location_index is None:
+            locations = await self.asset_service.get_locations_for_companies(self.user_companies)
+            self._location_index = LocationIndex(locations)
+        return self._location_index
 
     async def resolve_location(
         self,
@@ -97,8 +99,8 @@ class MockupCoordinator:
         """
         self.logger.info(f"[COORDINATOR] Resolving location '{location_name}'")
 
-        available_locations = await self._get_available_locations()
-        location_key = match_location_key(location_name, available_locations)
+        location_index = await self._get_location_index()
+        location_key = location_index.match(location_name)
 
         if not location_key:
             error_msg = (
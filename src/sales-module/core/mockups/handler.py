@@ -10,6 +10,7 @@ from collections.abc import Callable
 from pathlib import Path
 
 import config
+from core.utils import LocationIndex
 
 from .coordinator import MockupCoordinator
 
@@ -50,6 +51,7 @@ async def handle_mockup_generation(
     company_hint: str | None = None,
     venue_type: str = "all",
     asset_type_key: str | None = None,
+    location_index: LocationIndex | None = None,
 ) -> bool:
     """
     Handle mockup generation request from chat channels.
@@ -77,6 +79,7 @@ async def handle_mockup_generation(
         company_hint: Optional company to try first for O(1) asset lookups
         venue_type: Venue type filter ("indoor", "outdoor", "all")
         asset_type_key: Optional asset type key for traditional networks
+        location_index: Optional prebuilt index of the user's locations (from WorkflowContext)
 
     Returns:
         True when handled (success or error)
@@ -103,6 +106,7 @@ async def handle_mockup_generation(
         generate_mockup_func=generate_mockup_queued_func,
         generate_ai_mockup_func=generate_ai_mockup_queued_func,
         company_hint=company_hint,
+        location_index=location_index,
     )
 
     # Generate mockup (coordinator handles all modes: upload/AI/followup)
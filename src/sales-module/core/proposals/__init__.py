@@ -28,6 +28,7 @@ Usage:
 from typing import Any
 
 from core.services.template_service import TemplateService
+from core.utils import LocationIndex
 
 from .intro_outro import IntroOutroHandler
 from .processor import ProposalProcessor
@@ -53,6 +54,7 @@ async def process_proposals(
     payment_terms: str = "100% upfront",
     currency: str = None,
     user_companies: list[str] = None,
+    location_index: LocationIndex | None = None,
 ) -> dict[str, Any]:
     """
     Process proposal generation (backwards-compatible API).
@@ -66,6 +68,7 @@ async def process_proposals(
         payment_terms: Payment terms text
         currency: Target currency code (e.g., 'USD', 'EUR'). If None or 'AED', uses AED.
         user_companies: List of company schemas user has access to
+        location_index: Optional prebuilt index of the user's locations (from WorkflowContext)
 
     Returns:
         Dict with success status and file paths
@@ -87,7 +90,7 @@ async def process_proposals(
         return {"success": False, "error": "User companies are required"}
 
     # Create module instances
-    validator = ProposalValidator(user_companies)
+    validator = ProposalValidator(user_companies, location_index)
     renderer = ProposalRenderer()
     # Await the available locations (async) before creating IntroOutroHandler
     available_locations = await validator._get_available_locations()
@@ -138,6 +141,7 @@ async def process_combined_package(
     currency: str = None,
     user_companies: list[str] = None,
     available_locations: list[dict[str, Any]] = None,
+    location_index: LocationIndex | None = None,
 ) -> dict[str, Any]:
     """
     Process combined package proposal (backwards-compatible API).
@@ -151,6 +155,7 @@ async def process_combined_package(
         currency: Currency code
         user_companies: List of company schemas user has access to
         available_locations: Optional pre-fetched locations (for optimization)
+        location_index: Optional prebuilt index of the user's locations (from WorkflowContext)
 
     Returns:
         Dict with success status and file paths
@@ -169,7 +174,7 @@ async def process_combined_package(
         return {"success": False, "error": "User companies are required"}
 
     # Create module instances
-    validator = ProposalValidator(user_companies)
+    validator = ProposalValidator(user_companies, location_index)
     renderer = ProposalRenderer()
     # Await the available locations (async) before creating IntroOutroHandler
     # Use pre-fetched available_locations if provided, otherwise fetch async
@@ -0,0 +1,209 @@
+"""
+Financial Slide Cache - Reuses rendered financial-slide PDFs across proposals.
+
+Building the financial slide (python-pptx) and converting it to PDF
+(LibreOffice) is repeated on every proposal, even when a salesperson
+regenerates an identical proposal or the same location/rates/durations
+show up again. Rendered PDFs are stored in a size-bounded DiskCache keyed
+on a hash of everything that affects the slide:
+
+- The canonicalised financial data (or combined-package inputs)
+- Currency, plus the currency and upload-fee configuration
+- config.LOCATION_METADATA for locations without their own metadata (the
+  slide builders fall back to it)
+- The slide layout version and the header image
+- The render date (slides print the proposal and validity dates)
+
+Usage:
+    from core.proposals.financial_cache import get_financial_slide_cache
+
+    cache = get_financial_slide_cache()
+    key = cache.make_key("separate", financial_data, currency)
+    cached = cache.get(key)   # (pdf_path, meta) or None
+    if cached is None:
+        ...render...
+        cache.put(key, pdf_path, {"vat_amounts": vat, "total_amounts": totals})
+
+Configuration:
+    FINANCIAL_SLIDE_CACHE_MB: Size budget in MB (default: 256, 0 disables)
+"""
+
+import hashlib
+import json
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import config
+from core.utils.disk_cache import DiskCache, default_cache_root
+from core.utils.logging import get_logger
+
+logger = get_logger("proposals.financial_cache")
+
+
+def _canonical(value: Any) -> str:
+    """Stable JSON encoding (sorted keys, no whitespace) for hashing."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _fallback_location_metadata(inputs: Any) -> dict[str, Any]:
+    """
+    Global metadata the slide builders use for locations that carry none.
+
+    Separate slides pass one location's financial data; combined slides
+    pass {"proposals": [...]}. Either way, a location with an empty
+    location_metadata is rendered from config.LOCATION_METADATA.
+    """
+    if not isinstance(inputs, dict):
+        return {}
+    items = inputs.get("proposals", [inputs])
+    resolved = {}
+    for item in items:
+        if isinstance(item, dict) and item.get("location") and not item.get("location_metadata"):
+            location_key = str(item["location"]).lower()
+            resolved[location_key] = config.LOCATION_METADATA.get(location_key, {})
+    return resolved
+
+
+def _template_version() -> str:
+    """Financial slide layout version plus the header image it embeds."""
+    from generators import pptx
+
+    header = pptx._get_header_image_path()
+    if header and header.exists():
+        stat = header.stat()
+        return f"{pptx.FINANCIAL_SLIDE_VERSION}:{stat.st_size}:{int(stat.st_mtime)}"
+    return f"{pptx.FINANCIAL_SLIDE_VERSION}:no-header"
+
+
+class FinancialSlideCache:
+    """Content-hash cache of rendered financial-slide PDFs."""
+
+    def __init__(self, store: DiskCache | None):
+        """
+        Initialize the cache.
+
+        Args:
+            store: Backing DiskCache (None disables caching)
+        """
+        self._store = store
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._store is not None
+
+    def make_key(self, kind: str, inputs: Any, currency: str | None) -> str:
+        """
+        Build the cache key for a financial slide.
+
+        Args:
+            kind: "separate" or "combined"
+            inputs: Everything passed to the slide builder besides currency
+            currency: Target currency (None/AED for the base currency)
+
+        Returns:
+            Hex digest key
+        """
+        currency = (currency or "AED").upper()
+        material = _canonical({
+            "kind": kind,
+            "inputs": inputs,
+            "currency": currency,
+            "currency_config": config.CURRENCY_CONFIG,
+            "upload_fees": config.UPLOAD_FEES_MAPPING,
+            "location_metadata": _fallback_location_metadata(inputs),
+            "template_version": _template_version(),
+            "render_date": date.today().isoformat(),
+        })
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def get(self, key: str) -> tuple[Path, dict[str, Any]] | None:
+        """
+        Look up a rendered slide.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            (pdf path owned by the caller, metadata dict) or None
+        """
+        if not self._store:
+            return None
+
+        pdf_entry = self._store.peek(f"{key}.pdf")
+        meta_entry = self._store.peek(f"{key}.json")
+        if pdf_entry and meta_entry:
+            try:
+                meta = json.loads(self._store.read_bytes(meta_entry))
+                path = self._store.materialize(pdf_entry, ".pdf")
+                with self._lock:
+                    self.hits += 1
+                return path, meta
+            except (OSError, ValueError) as e:
+                logger.warning(f"[FINANCIAL_CACHE] Dropping unreadable entry {key[:12]}: {e}")
+                self._store.invalidate(f"{key}.*")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, pdf_path: str, meta: dict[str, Any]) -> None:
+        """
+        Store a rendered slide (the caller keeps ownership of pdf_path).
+
+        Args:
+            key: Key from make_key()
+            pdf_path: Rendered financial slide PDF
+            meta: JSON-serialisable values returned alongside the slide
+        """
+        if not self._store:
+            return
+        try:
+            self._store.put(f"{key}.json", _canonical(meta).encode())
+            self._store.put(f"{key}.pdf", Path(pdf_path).read_bytes())
+        except OSError as e:
+            logger.warning(f"[FINANCIAL_CACHE] Failed to store {key[:12]}: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        stats = {"enabled": self.enabled, "hits": self.hits, "misses": self.misses}
+        if self._store:
+            store_stats = self._store.stats()
+            stats.update({
+                "entries": store_stats["entries"] // 2,
+                "size_bytes": store_stats["size_bytes"],
+                "max_bytes": store_stats["max_bytes"],
+                "evictions": store_stats["evictions"],
+            })
+        return stats
+
+
+# Global cache instance
+_financial_slide_cache: FinancialSlideCache | None = None
+
+
+def get_financial_slide_cache() -> FinancialSlideCache:
+    """Get or create the global financial slide cache."""
+    global _financial_slide_cache
+    if _financial_slide_cache is None:
+        from app_settings import settings
+
+        store = None
+        if settings.financial_slide_cache_mb > 0:
+            store = DiskCache(
+                root=default_cache_root("financial_slides"),
+                max_bytes=settings.financial_slide_cache_mb * 1024 * 1024,
+                max_age=float("inf"),
+            )
+        _financial_slide_cache = FinancialSlideCache(store)
+    return _financial_slide_cache
+
+
+def set_financial_slide_cache(cache: FinancialSlideCache | None) -> None:
+    """Set a custom financial slide cache (for testing)."""
+    global _financial_slide_cache
+    _financial_slide_cache = cache
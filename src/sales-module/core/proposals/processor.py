@@ -5,6 +5,7 @@ Coordinates validation, rendering, and PDF generation for proposals.
 """
 
 import asyncio
+import contextlib
 import os
 import shutil
 import tempfile
@@ -16,17 +17,19 @@ from pptx import Presentation
 from pypdf import PdfReader
 
 import config
-
-# Logger shorthand for timing logs
-logger = config.logger
 from core.services.template_service import TemplateService
 from db.database import db
 from generators.pdf import convert_pptx_to_pdf, merge_pdfs, remove_slides_and_convert_to_pdf
+from generators.pdf_merge import PdfMergeStream, extract_pdf_pages, pdf_page_count
 
+from .financial_cache import get_financial_slide_cache
 from .intro_outro import IntroOutroHandler
 from .renderer import ProposalRenderer
 from .validator import ProposalValidator
 
+# Logger shorthand for timing logs
+logger = config.logger
+
 
 class ProposalProcessor:
     """
@@ -108,9 +111,9 @@ class ProposalProcessor:
         """
         Process all networks in a package using PDF-first strategy.
 
-        Downloads PDF for each network, extracts content (strips intro/outro),
-        and merges them into a single PDF. Continues with available networks
-        if some are missing.
+        Downloads PDF for each network and streams its content pages (strips
+        intro/outro) into a single merged PDF. Continues with available
+        networks if some are missing.
 
         Args:
             network_keys: List of network keys in the package
@@ -123,60 +126,46 @@ class ProposalProcessor:
             - missing_networks: List of network keys that had no templates
         """
         loop = asyncio.get_event_loop()
-        network_pdfs = []
+        merger = PdfMergeStream()
         missing_networks = []
 
-        for network_key in network_keys:
-            pdf_path = await self.template_service.download_to_temp(
-                network_key, company_hint=company_hint, format="pdf"
-            )
-
-            if not pdf_path:
-                # Track missing network but continue with others
-                self.logger.warning(f"[PROCESSOR] PDF template not found for network: {network_key}")
-                missing_networks.append(network_key)
-                continue
-
-            # Extract content pages (strip first and last for intro/outro)
-            reader = PdfReader(pdf_path)
-            total_pages = len(reader.pages)
-
-            if total_pages > 2:
-                # Keep middle pages (content only)
-                content_pdf = self._extract_pages_from_pdf(pdf_path, list(range(1, total_pages - 1)))
-            elif total_pages == 2:
-                # Just 2 pages, keep the second (likely content)
-                content_pdf = self._extract_pages_from_pdf(pdf_path, [1])
-            else:
-                # Single page, keep it
-                content_pdf = pdf_path
-                pdf_path = None  # Don't delete below
-
-            if pdf_path:
-                try:
-                    os.unlink(pdf_path)
-                except OSError:
-                    pass
+        try:
+            for network_key in network_keys:
+                pdf_path = await self.template_service.download_to_temp(
+                    network_key, company_hint=company_hint, format="pdf"
+                )
 
-            network_pdfs.append(content_pdf)
+                if not pdf_path:
+                    # Track missing network but continue with others
+                    self.logger.warning(f"[PROCESSOR] PDF template not found for network: {network_key}")
+                    missing_networks.append(network_key)
+                    continue
+
+                # Append content pages (strip first and last for intro/outro)
+                total_pages = await loop.run_in_executor(None, pdf_page_count, pdf_path)
+
+                if total_pages > 2:
+                    # Keep middle pages (content only)
+                    content_pages = list(range(1, total_pages - 1))
+                elif total_pages == 2:
+                    # Just 2 pages, keep the second (likely content)
+                    content_pages = [1]
+                else:
+                    # Single page, keep it
+                    content_pages = None
 
-        # If no networks had PDFs, return None to trigger PPTX fallback
-        if not network_pdfs:
-            return None, missing_networks
+                await loop.run_in_executor(None, merger.append, pdf_path, content_pages)
 
-        # Merge all network PDFs into one
-        if len(network_pdfs) == 1:
-            return network_pdfs[0], missing_networks
+                with contextlib.suppress(OSError):
+                    os.unlink(pdf_path)
 
-        from generators.pdf import merge_pdfs
-        merged_pdf = await loop.run_in_executor(None, merge_pdfs, network_pdfs)
+            # If no networks had PDFs, return None to trigger PPTX fallback
+            if not merger.page_count:
+                return None, missing_networks
 
-        # Clean up individual network PDFs
-        for pdf in network_pdfs:
-            try:
-                os.unlink(pdf)
-            except OSError:
-                pass
+            merged_pdf = await loop.run_in_executor(None, merger.finish)
+        finally:
+            merger.close()
 
         return merged_pdf, missing_networks
 
@@ -191,8 +180,8 @@ class ProposalProcessor:
         Process all networks in a package using PPTX fallback strategy.
 
         Downloads PPTX for each network, converts to PDF (strips intro/outro),
-        and merges them into a single PDF. Continues with available networks
-        if some are missing.
+        and streams each conversion into a single merged PDF. Continues with
+        available networks if some are missing.
 
         Args:
             network_keys: List of network keys in the package
@@ -205,53 +194,46 @@ class ProposalProcessor:
             - merged_pdf_path: Path to merged PDF, or None if ALL networks unavailable
             - missing_networks: List of network keys that had no templates
         """
-        from generators.pdf import remove_slides_and_convert_to_pdf, merge_pdfs
+        from generators.pdf import remove_slides_and_convert_to_pdf
 
-        network_pdfs = []
+        loop = asyncio.get_event_loop()
+        merger = PdfMergeStream()
         missing_networks = list(already_missing) if already_missing else []
 
-        for network_key in network_keys:
-            # Skip networks already known to be missing
-            if network_key in missing_networks:
-                continue
-
-            pptx_path = await self.template_service.download_to_temp(
-                network_key, company_hint=company_hint, format="pptx"
-            )
+        try:
+            for network_key in network_keys:
+                # Skip networks already known to be missing
+                if network_key in missing_networks:
+                    continue
 
-            if not pptx_path:
-                # Track missing network but continue with others
-                self.logger.warning(f"[PROCESSOR] PPTX template not found for network: {network_key}")
-                missing_networks.append(network_key)
-                continue
+                pptx_path = await self.template_service.download_to_temp(
+                    network_key, company_hint=company_hint, format="pptx"
+                )
 
-            # Convert to PDF, removing intro (first) and outro (last) slides
-            pdf_path = await remove_slides_and_convert_to_pdf(str(pptx_path), remove_first=True, remove_last=True)
+                if not pptx_path:
+                    # Track missing network but continue with others
+                    self.logger.warning(f"[PROCESSOR] PPTX template not found for network: {network_key}")
+                    missing_networks.append(network_key)
+                    continue
 
-            try:
-                os.unlink(pptx_path)
-            except OSError:
-                pass
+                # Convert to PDF, removing intro (first) and outro (last) slides
+                pdf_path = await remove_slides_and_convert_to_pdf(str(pptx_path), remove_first=True, remove_last=True)
 
-            network_pdfs.append(pdf_path)
+                with contextlib.suppress(OSError):
+                    os.unlink(pptx_path)
 
-        # If no networks had templates, return None
-        if not network_pdfs:
-            return None, missing_networks
+                await loop.run_in_executor(None, merger.append, pdf_path)
 
-        # Merge all network PDFs into one
-        if len(network_pdfs) == 1:
-            return network_pdfs[0], missing_networks
+                with contextlib.suppress(OSError):
+                    os.unlink(pdf_path)
 
-        loop = asyncio.get_event_loop()
-        merged_pdf = await loop.run_in_executor(None, merge_pdfs, network_pdfs)
+            # If no networks had templates, return None
+            if not merger.page_count:
+                return None, missing_networks
 
-        # Clean up individual network PDFs
-        for pdf in network_pdfs:
-            try:
-                os.unlink(pdf)
-            except OSError:
-                pass
+            merged_pdf = await loop.run_in_executor(None, merger.finish)
+        finally:
+            merger.close()
 
         return merged_pdf, missing_networks
 
@@ -283,21 +265,161 @@ class ProposalProcessor:
         Returns:
             Path to new PDF with extracted pages
         """
-        reader = PdfReader(pdf_path)
-        from pypdf import PdfWriter
-        writer = PdfWriter()
+        return extract_pdf_pages(pdf_path, pages)
+
+    @staticmethod
+    def _merge_pdf_parts(parts: list[tuple[str, list[int] | None]]) -> str:
+        """
+        Merge page selections from several PDFs without intermediate files.
+
+        Args:
+            parts: (pdf_path, pages) in output order; pages=None keeps every page
+
+        Returns:
+            Path to the merged PDF
+        """
+        with PdfMergeStream() as merger:
+            for pdf_path, pages in parts:
+                merger.append(pdf_path, pages)
+            return merger.finish()
 
-        for page_num in pages:
-            if page_num < len(reader.pages):
-                writer.add_page(reader.pages[page_num])
+    def _remove_temp_pdf(self, pdf_path: str) -> None:
+        """Delete a temp PDF once its pages are merged."""
+        try:
+            os.unlink(pdf_path)
+        except Exception as e:
+            self.logger.warning(f"Failed to clean up PDF: {pdf_path} - {e}")
 
-        output_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        output_file.close()
+    @staticmethod
+    def _result_error(idx: int, result: Any) -> dict[str, Any] | None:
+        """Error response for a failed per-location result, or None if it succeeded."""
+        if isinstance(result, Exception):
+            return {"success": False, "error": f"Error processing proposal {idx + 1}: {str(result)}"}
+        # Check for error dicts (e.g., from package with no networks)
+        if isinstance(result, dict) and result.get("error"):
+            return {"success": False, "error": result["error"]}
+        return None
 
-        with open(output_file.name, 'wb') as f:
-            writer.write(f)
+    @staticmethod
+    async def _in_index_order(tasks: list[asyncio.Future]):
+        """
+        Yield (idx, result) for parallel tasks in index order.
 
-        return output_file.name
+        Each result is yielded as soon as its task and every task before it
+        have finished, so callers can merge early locations while later ones
+        are still processing. Exceptions are yielded as results.
+        """
+        for idx, task in enumerate(tasks):
+            try:
+                yield idx, await task
+            except Exception as e:
+                yield idx, e
+
+    @staticmethod
+    async def _cancel_pending(tasks: list[asyncio.Future]) -> None:
+        """Cancel tasks that are still running (e.g. after an earlier location failed)."""
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def _is_cacheable_pdf(pdf_path: str) -> bool:
+        """Reject text-only fallback renders (ReportLab) so they are not reused."""
+        try:
+            producer = (PdfReader(pdf_path).metadata or {}).get("/Producer", "")
+        except Exception:
+            return False
+        return "reportlab" not in str(producer).lower()
+
+    def _render_financial_pdf(
+        self,
+        financial_data: dict,
+        currency: str | None,
+    ) -> tuple[str, list[str], list[str]]:
+        """
+        Render the standalone financial slide to PDF (blocking).
+
+        Identical inputs reuse a cached render, skipping python-pptx and the
+        LibreOffice conversion.
+
+        Args:
+            financial_data: Financial data dict for the slide
+            currency: Optional currency code
+
+        Returns:
+            Tuple of (pdf_path, vat_amounts, total_amounts); pdf_path is owned by the caller
+        """
+        cache = get_financial_slide_cache()
+        key = cache.make_key("separate", financial_data, currency)
+        cached = cache.get(key)
+        if cached:
+            pdf_path, meta = cached
+            self.logger.info(f"[FINANCIAL_CACHE] Hit for {financial_data.get('location')}")
+            return str(pdf_path), meta["vat_amounts"], meta["total_amounts"]
+
+        pptx_path, vat_amounts, total_amounts = self.renderer.create_standalone_financial_slide(
+            financial_data, currency, None, None
+        )
+        try:
+            pdf_path = convert_pptx_to_pdf(pptx_path)
+        finally:
+            with contextlib.suppress(OSError):
+                os.unlink(pptx_path)
+
+        if self._is_cacheable_pdf(pdf_path):
+            cache.put(key, pdf_path, {"vat_amounts": vat_amounts, "total_amounts": total_amounts})
+        return pdf_path, vat_amounts, total_amounts
+
+    def _render_combined_financial_pdf(
+        self,
+        proposals: list[dict[str, Any]],
+        combined_net_rate: str,
+        client_name: str,
+        payment_terms: str,
+        currency: str | None,
+    ) -> tuple[str, str]:
+        """
+        Render the standalone combined financial slide to PDF (blocking, cached).
+
+        Args:
+            proposals: Validated proposal dicts
+            combined_net_rate: Combined net rate for package
+            client_name: Client name
+            payment_terms: Payment terms text
+            currency: Optional currency code
+
+        Returns:
+            Tuple of (pdf_path, total_combined); pdf_path is owned by the caller
+        """
+        cache = get_financial_slide_cache()
+        key = cache.make_key(
+            "combined",
+            {
+                "proposals": proposals,
+                "combined_net_rate": combined_net_rate,
+                "client_name": client_name,
+                "payment_terms": payment_terms,
+            },
+            currency,
+        )
+        cached = cache.get(key)
+        if cached:
+            pdf_path, meta = cached
+            self.logger.info("[FINANCIAL_CACHE] Hit for combined package")
+            return str(pdf_path), meta["total_combined"]
+
+        pptx_path, total_combined = self.renderer.create_standalone_combined_financial_slide(
+            proposals, combined_net_rate, client_name, payment_terms, currency, None, None
+        )
+        try:
+            pdf_path = convert_pptx_to_pdf(pptx_path)
+        finally:
+            with contextlib.suppress(OSError):
+                os.unlink(pptx_path)
+
+        if self._is_cacheable_pdf(pdf_path):
+            cache.put(key, pdf_path, {"total_combined": total_combined})
+        return pdf_path, total_combined
 
     async def _create_intro_outro_slides(
         self,
@@ -365,15 +487,12 @@ class ProposalProcessor:
             if pdf_temp_path:
                 t0 = time.time()
                 intro_pdf = self._extract_pages_from_pdf(pdf_temp_path, [0])
-                reader = PdfReader(pdf_temp_path)
-                last_page = len(reader.pages) - 1
+                last_page = pdf_page_count(pdf_temp_path) - 1
                 outro_pdf = self._extract_pages_from_pdf(pdf_temp_path, [last_page])
                 self.logger.info(f"[TIMING] Intro/outro extraction: {(time.time() - t0)*1000:.0f}ms")
                 # Clean up the temp PDF (but keep extracted pages)
-                try:
+                with contextlib.suppress(OSError):
                     os.unlink(pdf_temp_path)
-                except OSError:
-                    pass
                 # Cache the extracted slides
                 self._extracted_slides_cache[pdf_name] = (intro_pdf, outro_pdf)
                 self.logger.info(f"[TIMING] Intro/outro creation DONE: {(time.time() - intro_outro_start)*1000:.0f}ms")
@@ -535,29 +654,13 @@ class ProposalProcessor:
 
             self.logger.info(f"[TIMING] [{idx+1}/{total_proposals}] {location_key} - PDF download: {(time.time() - t0)*1000:.0f}ms (PDF-FIRST)")
 
-            # Build financial data and create standalone financial slide
+            # Build financial data and render standalone financial slide PDF
             financial_data = build_financial_data(proposal)
             t0 = time.time()
-            financial_pptx_path, vat_amounts, total_amounts = await loop.run_in_executor(
-                None,
-                self.renderer.create_standalone_financial_slide,
-                financial_data,
-                currency,
-                None,  # slide_width (use default)
-                None,  # slide_height (use default)
+            financial_pdf, vat_amounts, total_amounts = await loop.run_in_executor(
+                None, self._render_financial_pdf, financial_data, currency
             )
-            self.logger.info(f"[TIMING] [{idx+1}/{total_proposals}] {location_key} - Financial slide created: {(time.time() - t0)*1000:.0f}ms")
-
-            # Convert financial slide to PDF
-            t0 = time.time()
-            financial_pdf = await loop.run_in_executor(None, convert_pptx_to_pdf, financial_pptx_path)
-            self.logger.info(f"[TIMING] [{idx+1}/{total_proposals}] {location_key} - Financial PDF conversion: {(time.time() - t0)*1000:.0f}ms")
-
-            # Clean up financial PPTX
-            try:
-                os.unlink(financial_pptx_path)
-            except OSError:
-                pass
+            self.logger.info(f"[TIMING] [{idx+1}/{total_proposals}] {location_key} - Financial slide PDF: {(time.time() - t0)*1000:.0f}ms")
 
             display_name = proposal.get("location_metadata", {}).get("display_name") or proposal["location"].replace("_", " ").title()
             result = {
@@ -605,10 +708,8 @@ class ProposalProcessor:
             self.logger.info(f"[TIMING] [{idx+1}/{total_proposals}] {location_key} - PPTX rendering: {(time.time() - t0)*1000:.0f}ms")
 
             # Clean up downloaded template
-            try:
+            with contextlib.suppress(OSError):
                 os.unlink(template_path)
-            except OSError:
-                pass
 
             display_name = proposal.get("location_metadata", {}).get("display_name") or proposal["location"].replace("_", " ").title()
             result = {
@@ -675,26 +776,12 @@ class ProposalProcessor:
                 if missing_networks:
                     self.logger.warning(f"[PROCESSOR] Package '{location_key}' generated with partial content. Missing networks: {missing_networks}")
 
-                # Build financial data and create standalone financial slide
+                # Build financial data and render standalone financial slide PDF
                 financial_data = build_financial_data(proposal)
-                financial_pptx_path, vat_amounts, total_amounts = await loop.run_in_executor(
-                    None,
-                    self.renderer.create_standalone_financial_slide,
-                    financial_data,
-                    currency,
-                    None,
-                    None,
+                financial_pdf, vat_amounts, total_amounts = await loop.run_in_executor(
+                    None, self._render_financial_pdf, financial_data, currency
                 )
 
-                # Convert financial slide to PDF
-                financial_pdf = await loop.run_in_executor(None, convert_pptx_to_pdf, financial_pptx_path)
-
-                # Clean up financial PPTX
-                try:
-                    os.unlink(financial_pptx_path)
-                except OSError:
-                    pass
-
                 self.logger.info(f"[TIMING] [{idx+1}/{total_proposals}] {location_key} - PACKAGE TOTAL: {(time.time() - single_start)*1000:.0f}ms")
 
                 display_name = proposal.get("location_metadata", {}).get("display_name") or proposal["location"].replace("_", " ").title()
@@ -720,24 +807,18 @@ class ProposalProcessor:
         # Process all in parallel
         self.logger.info(f"[TIMING] Starting parallel processing of {total_proposals} proposals...")
         t0 = time.time()
-        tasks = [process_proposal(idx, p) for idx, p in enumerate(validated_proposals)]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        self.logger.info(f"[TIMING] Parallel processing complete: {(time.time() - t0)*1000:.0f}ms")
-
-        # Check for errors
-        for idx, result in enumerate(results):
-            if isinstance(result, Exception):
-                return {"success": False, "error": f"Error processing proposal {idx + 1}: {str(result)}"}
-            # Check for error dicts (e.g., from package with no networks)
-            if isinstance(result, dict) and result.get("error"):
-                return {"success": False, "error": result["error"]}
-
-        # Sort by original index
-        sorted_results = sorted(results, key=lambda x: x["idx"])
+        tasks = [asyncio.ensure_future(process_proposal(idx, p)) for idx, p in enumerate(validated_proposals)]
 
         # Handle single proposal
         if is_single:
-            result = sorted_results[0]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            self.logger.info(f"[TIMING] Parallel processing complete: {(time.time() - t0)*1000:.0f}ms")
+
+            error = self._result_error(0, results[0])
+            if error:
+                return error
+
+            result = results[0]
             total_str = result["totals"][0] if result["totals"] else "AED 0"
             timestamp_code = self._generate_timestamp_code()
             client_prefix = client_name.replace(" ", "_") if client_name else "Client"
@@ -782,28 +863,19 @@ class ProposalProcessor:
                         )
                 else:
                     # Regular location - last page is outro
-                    reader = PdfReader(result["pdf_template_path"])
-                    total_pages = len(reader.pages)
+                    total_pages = await loop.run_in_executor(None, pdf_page_count, result["pdf_template_path"])
 
                     if total_pages > 1:
-                        # Extract content (all pages except last/outro)
-                        content_pdf = self._extract_pages_from_pdf(
-                            result["pdf_template_path"], list(range(0, total_pages - 1))
-                        )
-                        # Extract outro (last page)
-                        outro_pdf = self._extract_pages_from_pdf(
-                            result["pdf_template_path"], [total_pages - 1]
-                        )
-                        # Merge: content + financial + outro
+                        # Merge: content (all pages except last/outro) + financial + outro
                         pdf_path = await loop.run_in_executor(
-                            None, merge_pdfs, [content_pdf, result["financial_pdf"], outro_pdf]
+                            None,
+                            self._merge_pdf_parts,
+                            [
+                                (result["pdf_template_path"], list(range(0, total_pages - 1))),
+                                (result["financial_pdf"], None),
+                                (result["pdf_template_path"], [total_pages - 1]),
+                            ],
                         )
-                        # Clean up extracted PDFs
-                        try:
-                            os.unlink(content_pdf)
-                            os.unlink(outro_pdf)
-                        except OSError:
-                            pass
                     else:
                         # Single page template - just append financial
                         pdf_path = await loop.run_in_executor(
@@ -876,111 +948,108 @@ class ProposalProcessor:
                     "pdf_filename": f"{client_prefix}_{timestamp_code}.pdf",
                 }
 
-        # Handle multiple proposals
+        # Handle multiple proposals: each location is merged as soon as it (and
+        # every location before it) is ready, while later ones are still processing
         individual_files = []
-        pdf_files = []
         locations = []
+        merger = PdfMergeStream()
+        intro_outro_task = None
+        if intro_outro_info:
+            intro_outro_task = asyncio.ensure_future(self._create_intro_outro_slides(intro_outro_info))
 
-        for result in sorted_results:
-            if result.get("is_pdf_first"):
-                # PDF-first flow: extract middle pages, merge with financial slide
-                t0 = time.time()
-                reader = PdfReader(result["pdf_template_path"])
-                total_pages = len(reader.pages)
-
-                # For packages, content is already stripped (no intro/outro) - keep all pages
-                # For regular locations, skip first/last for intro/outro
-                if result.get("is_package"):
-                    # Package content is already clean - keep all pages
-                    pages_to_keep = list(range(total_pages))
-                elif intro_outro_info:
-                    pages_to_keep = list(range(1, total_pages - 1)) if total_pages > 2 else list(range(total_pages))
-                else:
-                    idx = result["idx"]
-                    if idx == 0:
-                        pages_to_keep = list(range(0, total_pages - 1))
-                    elif idx < total_proposals - 1:
-                        pages_to_keep = list(range(1, total_pages - 1))
+        try:
+            outro_pdf = None
+            if intro_outro_task:
+                intro_pdf, outro_pdf = await intro_outro_task
+                self.logger.info(f"[TIMING] Intro/outro slides ready: {(time.time() - t0)*1000:.0f}ms")
+                await loop.run_in_executor(None, merger.append, intro_pdf)
+                self._remove_temp_pdf(intro_pdf)
+
+            async for idx, result in self._in_index_order(tasks):
+                error = self._result_error(idx, result)
+                if error:
+                    return error
+
+                t1 = time.time()
+                if result.get("is_pdf_first"):
+                    # PDF-first flow: template content pages followed by the financial slide
+                    total_pages = await loop.run_in_executor(None, pdf_page_count, result["pdf_template_path"])
+
+                    # For packages, content is already stripped (no intro/outro) - keep all pages
+                    # For regular locations, skip first/last for intro/outro
+                    if result.get("is_package"):
+                        # Package content is already clean - keep all pages
+                        pages_to_keep = list(range(total_pages))
+                    elif intro_outro_info:
+                        pages_to_keep = list(range(1, total_pages - 1)) if total_pages > 2 else list(range(total_pages))
                     else:
-                        pages_to_keep = list(range(1, total_pages))
-
-                if pages_to_keep:
-                    template_content_pdf = self._extract_pages_from_pdf(result["pdf_template_path"], pages_to_keep)
-                else:
-                    template_content_pdf = result["pdf_template_path"]
-
-                # Merge template content with financial slide
-                location_pdf = await loop.run_in_executor(
-                    None, merge_pdfs, [template_content_pdf, result["financial_pdf"]]
-                )
-                self.logger.info(f"[TIMING] Location PDF merge ({result['location']}): {(time.time() - t0)*1000:.0f}ms")
-
-                # Clean up temp files
-                try:
-                    if template_content_pdf != result["pdf_template_path"]:
-                        os.unlink(template_content_pdf)
-                    os.unlink(result["pdf_template_path"])
-                    os.unlink(result["financial_pdf"])
-                except OSError:
-                    pass
-
-                individual_files.append({
-                    "path": None,  # No PPTX in PDF-first flow
-                    "location": result["location"],
-                    "filename": result["filename"],
-                    "totals": result["totals"],
-                })
-                pdf_files.append(location_pdf)
-            else:
-                # PPTX fallback flow: remove slides and convert
-                t0 = time.time()
-                if intro_outro_info:
-                    remove_first = True
-                    remove_last = True
+                        if idx == 0:
+                            pages_to_keep = list(range(0, total_pages - 1))
+                        elif idx < total_proposals - 1:
+                            pages_to_keep = list(range(1, total_pages - 1))
+                        else:
+                            pages_to_keep = list(range(1, total_pages))
+
+                    await loop.run_in_executor(None, merger.append, result["pdf_template_path"], pages_to_keep or None)
+                    await loop.run_in_executor(None, merger.append, result["financial_pdf"])
+                    self.logger.info(f"[TIMING] Location PDF merge ({result['location']}): {(time.time() - t1)*1000:.0f}ms")
+
+                    # Clean up temp files
+                    try:
+                        os.unlink(result["pdf_template_path"])
+                        os.unlink(result["financial_pdf"])
+                    except OSError:
+                        pass
+
+                    individual_files.append({
+                        "path": None,  # No PPTX in PDF-first flow
+                        "location": result["location"],
+                        "filename": result["filename"],
+                        "totals": result["totals"],
+                    })
                 else:
-                    idx = result["idx"]
-                    remove_first = False
-                    remove_last = False
-                    if idx == 0:
-                        remove_last = True
-                    elif idx < total_proposals - 1:
+                    # PPTX fallback flow: remove slides and convert
+                    if intro_outro_info:
                         remove_first = True
                         remove_last = True
                     else:
-                        remove_first = True
+                        remove_first = False
+                        remove_last = False
+                        if idx == 0:
+                            remove_last = True
+                        elif idx < total_proposals - 1:
+                            remove_first = True
+                            remove_last = True
+                        else:
+                            remove_first = True
 
-                pdf_path = await remove_slides_and_convert_to_pdf(result["path"], remove_first, remove_last)
-                self.logger.info(f"[TIMING] Location PDF conversion ({result['location']}): {(time.time() - t0)*1000:.0f}ms")
+                    pdf_path = await remove_slides_and_convert_to_pdf(result["path"], remove_first, remove_last)
+                    await loop.run_in_executor(None, merger.append, pdf_path)
+                    self._remove_temp_pdf(pdf_path)
+                    self.logger.info(f"[TIMING] Location PDF conversion ({result['location']}): {(time.time() - t1)*1000:.0f}ms")
 
-                individual_files.append({
-                    "path": result["path"],
-                    "location": result["location"],
-                    "filename": result["filename"],
-                    "totals": result["totals"],
-                })
-                pdf_files.append(pdf_path)
+                    individual_files.append({
+                        "path": result["path"],
+                        "location": result["location"],
+                        "filename": result["filename"],
+                        "totals": result["totals"],
+                    })
 
-            locations.append(result["location"])
+                locations.append(result["location"])
 
-        # Add intro/outro slides
-        if intro_outro_info:
-            t0 = time.time()
-            intro_pdf, outro_pdf = await self._create_intro_outro_slides(intro_outro_info)
-            self.logger.info(f"[TIMING] Intro/outro slides: {(time.time() - t0)*1000:.0f}ms")
-            pdf_files.insert(0, intro_pdf)
-            pdf_files.append(outro_pdf)
+            self.logger.info(f"[TIMING] Parallel processing + streaming merge: {(time.time() - t0)*1000:.0f}ms")
 
-        # Merge PDFs
-        t0 = time.time()
-        merged_pdf = await loop.run_in_executor(None, merge_pdfs, pdf_files)
-        self.logger.info(f"[TIMING] Final PDF merge ({len(pdf_files)} files): {(time.time() - t0)*1000:.0f}ms")
+            if outro_pdf:
+                await loop.run_in_executor(None, merger.append, outro_pdf)
+                self._remove_temp_pdf(outro_pdf)
 
-        # Clean up temp PDFs
-        for pdf_file in pdf_files:
-            try:
-                os.unlink(pdf_file)
-            except Exception as e:
-                self.logger.warning(f"Failed to clean up PDF: {pdf_file} - {e}")
+            # Write merged PDF
+            t0 = time.time()
+            merged_pdf = await loop.run_in_executor(None, merger.finish)
+            self.logger.info(f"[TIMING] Final PDF write ({merger.page_count} pages): {(time.time() - t0)*1000:.0f}ms")
+        finally:
+            await self._cancel_pending(tasks + ([intro_outro_task] if intro_outro_task else []))
+            merger.close()
 
         # Log to database
         first_totals = [f.get("totals", ["AED 0"])[0] for f in individual_files]
@@ -1119,10 +1188,9 @@ class ProposalProcessor:
 
             self.logger.info(f"[TIMING] [{idx+1}/{total_proposals}] {location_key} - PDF download: {(time.time() - t0)*1000:.0f}ms (PDF-FIRST)")
 
-            # Extract middle pages (skip first and last for intro/outro)
+            # Select middle pages (skip first and last for intro/outro)
             t0 = time.time()
-            reader = PdfReader(pdf_template_path)
-            total_pages = len(reader.pages)
+            total_pages = await asyncio.to_thread(pdf_page_count, pdf_template_path)
 
             if intro_outro_info:
                 pages_to_keep = list(range(1, total_pages - 1)) if total_pages > 2 else list(range(total_pages))
@@ -1134,19 +1202,11 @@ class ProposalProcessor:
                 else:
                     pages_to_keep = list(range(1, total_pages))
 
-            if pages_to_keep:
-                pdf_path = self._extract_pages_from_pdf(pdf_template_path, pages_to_keep)
-                try:
-                    os.unlink(pdf_template_path)
-                except OSError:
-                    pass
-            else:
-                pdf_path = pdf_template_path
-
-            self.logger.info(f"[TIMING] [{idx+1}/{total_proposals}] {location_key} - PDF extraction: {(time.time() - t0)*1000:.0f}ms")
+            self.logger.info(f"[TIMING] [{idx+1}/{total_proposals}] {location_key} - PDF page selection: {(time.time() - t0)*1000:.0f}ms")
             self.logger.info(f"[TIMING] [{idx+1}/{total_proposals}] {location_key} - TOTAL: {(time.time() - single_start)*1000:.0f}ms (PDF-FIRST)")
 
-            return {"pdf_path": pdf_path, "idx": idx}
+            # Pages are copied straight from the template by the streaming merge
+            return {"pdf_path": pdf_template_path, "pages": pages_to_keep or None, "idx": idx}
 
         async def process_combined_single_pptx_fallback(idx: int, proposal: dict) -> dict:
             """
@@ -1189,10 +1249,8 @@ class ProposalProcessor:
             pdf_path = await remove_slides_and_convert_to_pdf(pptx_path, remove_first, remove_last)
             self.logger.info(f"[TIMING] [{idx+1}/{total_proposals}] {location_key} - PDF conversion: {(time.time() - t0)*1000:.0f}ms")
 
-            try:
+            with contextlib.suppress(OSError):
                 os.unlink(pptx_path)
-            except OSError:
-                pass
 
             self.logger.info(f"[TIMING] [{idx+1}/{total_proposals}] {location_key} - TOTAL: {(time.time() - single_start)*1000:.0f}ms (PPTX FALLBACK)")
             return {"pdf_path": pdf_path, "idx": idx}
@@ -1248,80 +1306,72 @@ class ProposalProcessor:
                 result = await process_combined_single_pptx_fallback(idx, proposal)
             return result
 
-        # Process all locations in parallel (PDF-first with PPTX fallback)
+        # Process all locations in parallel (PDF-first with PPTX fallback); the
+        # financial slide and intro/outro render alongside them and every
+        # location is merged as soon as it (and every location before it) is ready
         self.logger.info(f"[TIMING] Starting parallel processing of {total_proposals} locations...")
         t0 = time.time()
-        tasks = [process_location(idx, p) for idx, p in enumerate(unique_proposals_for_deck)]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        self.logger.info(f"[TIMING] Parallel processing complete: {(time.time() - t0)*1000:.0f}ms")
-
-        # Check for errors
-        for idx, result in enumerate(results):
-            if isinstance(result, Exception):
-                return {"success": False, "error": f"Error processing proposal {idx + 1}: {str(result)}"}
-            # Check for error dicts (e.g., from package with no networks)
-            if isinstance(result, dict) and result.get("error"):
-                return {"success": False, "error": result["error"]}
-
-        # Sort by original index and extract PDFs
-        sorted_results = sorted(results, key=lambda x: x["idx"])
-        pdf_files = [r["pdf_path"] for r in sorted_results]
-
-        # Aggregate missing networks from all results
-        all_missing_networks = []
-        for r in sorted_results:
-            missing = r.get("missing_networks", [])
-            if missing:
-                all_missing_networks.extend(missing)
-
-        # Create standalone combined financial slide
-        t0 = time.time()
-        financial_pptx_path, total_combined = await loop.run_in_executor(
+        tasks = [asyncio.ensure_future(process_location(idx, p)) for idx, p in enumerate(unique_proposals_for_deck)]
+        financial_task = loop.run_in_executor(
             None,
-            self.renderer.create_standalone_combined_financial_slide,
+            self._render_combined_financial_pdf,
             validated_proposals,
             combined_net_rate,
             client_name,
             payment_terms,
             currency,
-            None,  # slide_width (use default)
-            None,  # slide_height (use default)
         )
-        self.logger.info(f"[TIMING] Standalone financial slide created: {(time.time() - t0)*1000:.0f}ms")
+        intro_outro_task = None
+        if intro_outro_info:
+            intro_outro_task = asyncio.ensure_future(self._create_intro_outro_slides(intro_outro_info))
 
-        # Convert financial slide to PDF
-        t0 = time.time()
-        financial_pdf_path = await loop.run_in_executor(None, convert_pptx_to_pdf, financial_pptx_path)
-        self.logger.info(f"[TIMING] Financial slide PDF conversion: {(time.time() - t0)*1000:.0f}ms")
+        merger = PdfMergeStream()
+        financial_pdf_path = None
+        all_missing_networks = []
 
-        # Clean up financial PPTX
         try:
-            os.unlink(financial_pptx_path)
-        except OSError:
-            pass
+            outro_pdf = None
+            if intro_outro_task:
+                intro_pdf, outro_pdf = await intro_outro_task
+                self.logger.info(f"[TIMING] Intro/outro slides ready: {(time.time() - t0)*1000:.0f}ms")
+                await loop.run_in_executor(None, merger.append, intro_pdf)
+                self._remove_temp_pdf(intro_pdf)
 
-        # Add financial slide PDF to the list (before outro)
-        pdf_files.append(financial_pdf_path)
+            async for idx, result in self._in_index_order(tasks):
+                error = self._result_error(idx, result)
+                if error:
+                    return error
 
-        # Add intro/outro slides
-        if intro_outro_info:
-            t0 = time.time()
-            intro_pdf, outro_pdf = await self._create_intro_outro_slides(intro_outro_info)
-            self.logger.info(f"[TIMING] Intro/outro slides: {(time.time() - t0)*1000:.0f}ms")
-            pdf_files.insert(0, intro_pdf)
-            pdf_files.append(outro_pdf)
+                await loop.run_in_executor(None, merger.append, result["pdf_path"], result.get("pages"))
+                self._remove_temp_pdf(result["pdf_path"])
 
-        # Merge PDFs
-        t0 = time.time()
-        merged_pdf = await loop.run_in_executor(None, merge_pdfs, pdf_files)
-        self.logger.info(f"[TIMING] PDF merge ({len(pdf_files)} files): {(time.time() - t0)*1000:.0f}ms")
+                # Aggregate missing networks from all results
+                all_missing_networks.extend(result.get("missing_networks", []))
 
-        # Clean up temp PDFs
-        for pdf_file in pdf_files:
-            try:
-                os.unlink(pdf_file)
-            except Exception as e:
-                self.logger.warning(f"Failed to clean up PDF: {pdf_file} - {e}")
+            self.logger.info(f"[TIMING] Parallel processing + streaming merge: {(time.time() - t0)*1000:.0f}ms")
+
+            # Standalone combined financial slide PDF (before outro)
+            financial_pdf_path, total_combined = await financial_task
+            self.logger.info(f"[TIMING] Standalone financial slide PDF ready: {(time.time() - t0)*1000:.0f}ms")
+            await loop.run_in_executor(None, merger.append, financial_pdf_path)
+
+            if outro_pdf:
+                await loop.run_in_executor(None, merger.append, outro_pdf)
+                self._remove_temp_pdf(outro_pdf)
+
+            # Write merged PDF
+            t0 = time.time()
+            merged_pdf = await loop.run_in_executor(None, merger.finish)
+            self.logger.info(f"[TIMING] PDF write ({merger.page_count} pages): {(time.time() - t0)*1000:.0f}ms")
+        finally:
+            await self._cancel_pending(tasks + ([intro_outro_task] if intro_outro_task else []))
+            merger.close()
+            if financial_pdf_path is None:
+                # Early exit: the financial slide may still be rendering
+                with contextlib.suppress(Exception):
+                    financial_pdf_path, _ = await financial_task
+            if financial_pdf_path:
+                self._remove_temp_pdf(financial_pdf_path)
 
         # Calculate total if not provided
         if total_combined is None:
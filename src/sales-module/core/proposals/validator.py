@@ -10,7 +10,7 @@ from typing import Any
 
 import config
 from core.services.asset_service import get_asset_service
-from core.utils import match_location_key, get_location_metadata
+from core.utils import LocationIndex
 
 
 def _calculate_end_date(start_date: str, duration_str: str | int) -> str:
@@ -84,38 +84,29 @@ class ProposalValidator:
     - Validate duration/rate alignment
     """
 
-    def __init__(self, user_companies: list[str]):
+    def __init__(self, user_companies: list[str], location_index: LocationIndex | None = None):
         """
         Initialize validator with user's company access.
 
         Args:
             user_companies: List of company schemas user has access to
+            location_index: Optional prebuilt index of the same companies' locations
+                            (e.g. WorkflowContext.location_index) to skip the fetch
         """
         self.user_companies = user_companies
         self.asset_service = get_asset_service()  # Use singleton for shared cache
-        self._available_locations: list[dict[str, Any]] | None = None
-        # O(1) lookup index for location metadata: {location_key_lower: metadata}
-        self._location_index: dict[str, dict[str, Any]] | None = None
+        # Key, display-name and fuzzy lookups for every proposal line
+        # (an empty index counts as not provided)
+        self._location_index: LocationIndex | None = location_index or None
         self.logger = config.logger
 
     async def _get_available_locations(self) -> list[dict[str, Any]]:
-        """Lazy-load available locations and build O(1) lookup index (async)."""
-        if self._available_locations is None:
-            self._available_locations = await self.asset_service.get_locations_for_companies(
-                self.user_companies
-            )
-            # Build O(1) lookup index by location_key
-            self._location_index = {}
-            for loc in self._available_locations:
-                key = loc.get("location_key", "").lower().strip()
-                if key:
-                    self._location_index[key] = loc
-                    # Also index by display_name for fuzzy matching
-                    display_name = loc.get("display_name", "").lower().strip()
-                    if display_name and display_name not in self._location_index:
-                        self._location_index[display_name] = loc
-            self.logger.debug(f"[VALIDATOR] Built location index with {len(self._location_index)} entries")
-        return self._available_locations
+        """Lazy-load available locations and build the lookup index (async)."""
+        if self._location_index is None:
+            locations = await self.asset_service.get_locations_for_companies(self.user_companies)
+            self._location_index = LocationIndex(locations)
+            self.logger.debug(f"[VALIDATOR] Built location index with {len(self._location_index)} locations")
+        return self._location_index.locations
 
     def get_location_metadata_fast(self, location_key: str) -> dict[str, Any] | None:
         """
@@ -129,8 +120,7 @@ class ProposalValidator:
         """
         if self._location_index is None:
             return None
-        normalized = location_key.lower().strip()
-        return self._location_index.get(normalized)
+        return self._location_index.get(location_key)
 
     async def validate_proposals(
         self,
@@ -160,8 +150,9 @@ class ProposalValidator:
             errors.append("No proposals provided")
             return validated, errors
 
-        # Fetch locations once (async)
-        available_locations = await self._get_available_locations()
+        # Fetch locations and build the index once (async)
+        await self._get_available_locations()
+        location_index = self._location_index
 
         for idx, proposal in enumerate(proposals_data):
             # Extract proposal data
@@ -186,7 +177,7 @@ class ProposalValidator:
                 continue
 
             # Match location to canonical key
-            matched_key = match_location_key(location, available_locations)
+            matched_key = location_index.match(location)
             is_package = False
 
             package_data = None
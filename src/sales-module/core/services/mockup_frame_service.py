@@ -9,11 +9,11 @@ are location-specific assets.
 import asyncio
 import io
 import random
-import tempfile
 import time
 from pathlib import Path
 from typing import Any
 
+from core.utils.disk_cache import FetchResult, get_asset_file_cache
 from integrations.asset_management import asset_mgmt_client
 
 # Lazy import to avoid circular dependency
@@ -36,6 +36,18 @@ _bulk_locations_cache: dict[str, Any] | None = None
 _bulk_locations_cache_time: float = 0
 
 
+def mockup_photo_cache_key(
+    company: str,
+    location_key: str,
+    environment: str,
+    time_of_day: str,
+    side: str,
+    photo_filename: str,
+) -> str:
+    """Disk cache key for a mockup background photo."""
+    return f"mockup/{company}/{location_key.lower()}/{environment}/{time_of_day}/{side}/{photo_filename}"
+
+
 class MockupFrameCache:
     """Thread-safe cache for mockup frame discovery results."""
 
@@ -115,6 +127,12 @@ async def invalidate_mockup_caches(
     await _frame_cache.invalidate(company, location_key)
     invalidate_bulk_locations_cache()
 
+    # Drop downloaded photos so edited/deleted mockups aren't served from disk
+    await asyncio.to_thread(
+        get_asset_file_cache().invalidate,
+        f"mockup/{company or '*'}/{location_key.lower() if location_key else '*'}/*"
+    )
+
     # Invalidate remote Redis cache in asset-management
     if invalidate_remote:
         try:
@@ -530,6 +548,8 @@ class MockupFrameService:
         """
         Download mockup background photo to a temporary file.
 
+        Served from the shared disk cache when a fresh copy exists; the
+        returned path is private to the caller and may be deleted.
         If company_hint is provided, tries that company first for O(1) lookup.
 
         Args:
@@ -548,55 +568,41 @@ class MockupFrameService:
         )
 
         # Try company_hint first if provided (O(1) lookup from WorkflowContext)
-        if company_hint and company_hint in self.companies:
-            try:
-                data = await asset_mgmt_client.get_mockup_photo(
-                    company_hint,
-                    location_key,
-                    time_of_day,
-                    side,
-                    photo_filename,
-                    environment,
-                )
-
-                if data:
-                    suffix = Path(photo_filename).suffix or ".jpg"
-                    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-                    temp_file.write(data)
-                    temp_file.close()
-
-                    self.logger.info(f"[MOCKUP_FRAME_SERVICE] Photo saved to: {temp_file.name} (direct hit)")
-                    return Path(temp_file.name)
-            except Exception as e:
-                self.logger.debug(f"[MOCKUP_FRAME_SERVICE] No photo in hinted company {company_hint}: {e}")
-
-        # Fallback: search all companies
-        for company in self.companies:
-            if company == company_hint:
-                continue
-            try:
-                data = await asset_mgmt_client.get_mockup_photo(
+        companies = list(self.companies)
+        if company_hint and company_hint in companies:
+            companies.remove(company_hint)
+            companies.insert(0, company_hint)
+
+        def make_fetcher(company: str):
+            async def fetch(etag: str | None) -> FetchResult | None:
+                result = await asset_mgmt_client.download_mockup_photo(
                     company,
                     location_key,
                     time_of_day,
                     side,
                     photo_filename,
                     environment,
+                    etag=etag,
                 )
-
-                if data:
-                    # Determine suffix from filename
-                    suffix = Path(photo_filename).suffix or ".jpg"
-
-                    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-                    temp_file.write(data)
-                    temp_file.close()
-
-                    self.logger.info(f"[MOCKUP_FRAME_SERVICE] Photo saved to: {temp_file.name}")
-                    return Path(temp_file.name)
-            except Exception as e:
-                self.logger.debug(f"[MOCKUP_FRAME_SERVICE] No photo in {company}: {e}")
-                continue
+                if not result:
+                    return None
+                return FetchResult(path=result.path, etag=result.etag, not_modified=result.not_modified)
+            return fetch
+
+        candidates = [
+            (
+                mockup_photo_cache_key(company, location_key, environment, time_of_day, side, photo_filename),
+                make_fetcher(company),
+            )
+            for company in companies
+        ]
+
+        suffix = Path(photo_filename).suffix or ".jpg"
+        found = await get_asset_file_cache().fetch_first(candidates, suffix)
+        if found:
+            path, index = found
+            self.logger.info(f"[MOCKUP_FRAME_SERVICE] Photo saved to: {path} ({companies[index]})")
+            return path
 
         self.logger.warning(f"[MOCKUP_FRAME_SERVICE] Photo not found in any company")
         return None
@@ -7,11 +7,11 @@ Templates are stored in Asset-Management because they are location-specific asse
 
 import asyncio
 import os
-import tempfile
 import time
 from pathlib import Path
 from typing import Any
 
+from core.utils.disk_cache import FetchResult, get_asset_file_cache
 from integrations.asset_management import asset_mgmt_client
 
 # Lazy import to avoid circular dependency
@@ -62,6 +62,16 @@ class TemplateCache:
 _template_cache = TemplateCache()
 
 
+def template_cache_key(company: str, location_key: str, format: str) -> str:
+    """Disk cache key for a location template."""
+    return f"template/{company}/{location_key.lower().strip()}/{format}"
+
+
+def intro_outro_cache_key(company: str, pdf_name: str) -> str:
+    """Disk cache key for an intro/outro PDF."""
+    return f"intro_outro/{company}/{pdf_name}"
+
+
 class TemplateService:
     """
     Service for managing proposal templates from Asset-Management.
@@ -114,6 +124,12 @@ class TemplateService:
         # Maps: pdf_name -> temp file path
         self._downloaded_intro_outro: dict[str, str] = {}
 
+    def _ordered_companies(self, company_hint: str | None) -> list[str]:
+        """Companies to search, with company_hint (if valid) first."""
+        if company_hint and company_hint in self.companies:
+            return [company_hint] + [c for c in self.companies if c != company_hint]
+        return list(self.companies)
+
     async def _discover_templates_for_company(self, company: str) -> dict[str, dict[str, Any]]:
         """
         Discover templates from Asset-Management API for a single company.
@@ -259,7 +275,8 @@ class TemplateService:
         Download template to a temporary file.
 
         Uses request-scoped cache to avoid re-downloading the same template
-        multiple times within a single request (e.g., combined proposals).
+        multiple times within a single request (e.g., combined proposals),
+        backed by the shared disk cache across requests.
 
         Args:
             location_key: Location identifier
@@ -285,23 +302,35 @@ class TemplateService:
                 self.logger.debug(f"[TEMPLATE_SERVICE] Cached file deleted, re-downloading: {location_key} ({format})")
                 del self._downloaded_templates[cache_key]
 
-        data, _ = await self.download(location_key, company_hint=company_hint, format=format)
-        if not data:
-            return None
-
         # Use appropriate suffix based on format
         actual_suffix = f".{format}" if format in ("pptx", "pdf") else suffix
 
-        # Create temp file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=actual_suffix)
-        temp_file.write(data)
-        temp_file.close()
+        def make_fetcher(company: str):
+            async def fetch(etag: str | None) -> FetchResult | None:
+                result = await asset_mgmt_client.download_template(company, location_key, format=format, etag=etag)
+                if not result:
+                    return None
+                return FetchResult(path=result.path, etag=result.etag, not_modified=result.not_modified)
+            return fetch
+
+        companies = self._ordered_companies(company_hint)
+        candidates = [
+            (template_cache_key(company, location_key, format), make_fetcher(company))
+            for company in companies
+        ]
+
+        # Shared disk cache - repeat proposals for a location skip the download
+        found = await get_asset_file_cache().fetch_first(candidates, actual_suffix)
+        if not found:
+            self.logger.warning(f"[TEMPLATE_SERVICE] Template not found in any company: {location_key} (format={format})")
+            return None
+        path, index = found
 
         # Cache the path for subsequent requests within this instance
-        self._downloaded_templates[cache_key] = temp_file.name
+        self._downloaded_templates[cache_key] = str(path)
 
-        self.logger.info(f"[TEMPLATE_SERVICE] Template saved to: {temp_file.name}")
-        return temp_file.name
+        self.logger.info(f"[TEMPLATE_SERVICE] Template saved to: {path} ({companies[index]})")
+        return str(path)
 
     async def get_intro_outro_pdf(
         self,
@@ -355,7 +384,8 @@ class TemplateService:
         Download intro/outro PDF to a temporary file.
 
         Uses request-scoped cache to avoid re-downloading the same PDF
-        multiple times within a single request (e.g., combined proposals).
+        multiple times within a single request (e.g., combined proposals),
+        backed by the shared disk cache across requests.
 
         Args:
             pdf_name: Name of PDF (e.g., "landmark_series", "rest")
@@ -376,19 +406,30 @@ class TemplateService:
                 self.logger.debug(f"[TEMPLATE_SERVICE] Cached PDF deleted, re-downloading: {pdf_name}")
                 del self._downloaded_intro_outro[pdf_name]
 
-        data, _ = await self.get_intro_outro_pdf(pdf_name, company_hint=company_hint)
-        if not data:
+        def make_fetcher(company: str):
+            async def fetch(etag: str | None) -> FetchResult | None:
+                result = await asset_mgmt_client.download_intro_outro_pdf(company, pdf_name, etag=etag)
+                if not result:
+                    return None
+                return FetchResult(path=result.path, etag=result.etag, not_modified=result.not_modified)
+            return fetch
+
+        candidates = [
+            (intro_outro_cache_key(company, pdf_name), make_fetcher(company))
+            for company in self._ordered_companies(company_hint)
+        ]
+
+        found = await get_asset_file_cache().fetch_first(candidates, ".pdf")
+        if not found:
+            self.logger.debug(f"[TEMPLATE_SERVICE] Intro/outro PDF not found: {pdf_name}")
             return None
-
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        temp_file.write(data)
-        temp_file.close()
+        path, _ = found
 
         # Cache the path for subsequent requests within this instance
-        self._downloaded_intro_outro[pdf_name] = temp_file.name
+        self._downloaded_intro_outro[pdf_name] = str(path)
 
-        self.logger.info(f"[TEMPLATE_SERVICE] Intro/outro PDF saved to: {temp_file.name}")
-        return temp_file.name
+        self.logger.info(f"[TEMPLATE_SERVICE] Intro/outro PDF saved to: {path}")
+        return str(path)
 
     async def upload(
         self,
@@ -423,6 +464,9 @@ class TemplateService:
         if result and result.get("success"):
             # Invalidate cache for this company
             await self.refresh_cache(company)
+            await asyncio.to_thread(
+                get_asset_file_cache().invalidate, template_cache_key(company, location_key, "*")
+            )
             self.logger.info(f"[TEMPLATE_SERVICE] Template uploaded to {company}: {location_key}")
             return True
         self.logger.error(f"[TEMPLATE_SERVICE] Failed to upload template: {location_key}")
@@ -475,6 +519,9 @@ class TemplateService:
         if result and result.get("success"):
             # Invalidate cache for this company
             await self.refresh_cache(company)
+            await asyncio.to_thread(
+                get_asset_file_cache().invalidate, template_cache_key(company, location_key, "*")
+            )
             self.logger.info(f"[TEMPLATE_SERVICE] Template deleted from {company}: {location_key}")
             return True
         self.logger.error(f"[TEMPLATE_SERVICE] Failed to delete template: {location_key}")
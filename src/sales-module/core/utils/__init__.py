@@ -6,6 +6,7 @@ to eliminate code duplication and ensure consistency.
 """
 
 from core.utils.location_matcher import (
+    LocationIndex,
     match_location_key,
     validate_location_exists,
     get_location_display_name,
@@ -88,6 +89,7 @@ from core.utils.constants import (
 
 __all__ = [
     # Location utilities
+    "LocationIndex",
     "match_location_key",
     "validate_location_exists",
     "get_location_display_name",
@@ -30,8 +30,11 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
+from crm_security import AuditSink
+
 from core.utils.logging import get_request_id
 from core.utils.time import get_uae_time
+from db.executor import run_db
 
 logger = logging.getLogger("proposal-bot")
 
@@ -144,7 +147,8 @@ class AuditLogger:
     Audit logger that persists events to the database.
 
     Features:
-    - Async logging to database
+    - Events are queued and written in batches off the request path
+      (spilled to a local file while the database is unavailable)
     - Request context extraction (IP, user agent)
     - Structured event format
     - Query/filtering support
@@ -170,6 +174,7 @@ class AuditLogger:
 
     def __init__(self):
         self._db = None
+        self._sink = AuditSink(self._write_batch, name="sales-module-audit-log")
 
     def _get_db(self):
         """Lazy load database to avoid circular imports."""
@@ -178,6 +183,31 @@ class AuditLogger:
             self._db = db
         return self._db
 
+    async def _write_batch(self, events: list[dict[str, Any]]) -> int:
+        """Insert a batch of queued events (raises so the sink can retry)."""
+        return await run_db(self._get_db().log_audit_events, events)
+
+    def _enqueue(self, event: AuditEvent) -> None:
+        """Queue an event for the next batch insert."""
+        self._sink.emit({
+            "timestamp": event.timestamp,
+            "user_id": event.user_id,
+            "action": event.action,
+            "resource_type": event.resource_type,
+            "resource_id": event.resource_id,
+            "details_json": json.dumps(event.details) if event.details else None,
+            "ip_address": event.ip_address,
+            "user_agent": event.user_agent,
+        })
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth, lag, drops and spill backlog of pending audit writes."""
+        return self._sink.stats()
+
+    async def close(self) -> None:
+        """Write out queued events (call on shutdown)."""
+        await self._sink.close()
+
     def _extract_request_info(self, request) -> dict[str, str | None]:
         """Extract IP address and user agent from a request object."""
         ip_address = None
@@ -243,19 +273,9 @@ class AuditLogger:
             user_agent=user_agent or request_info["user_agent"],
         )
 
-        # Persist to database
+        # Queue for a batched database write
         try:
-            db = self._get_db()
-            db.log_audit_event(
-                timestamp=event.timestamp,
-                user_id=event.user_id,
-                action=event.action,
-                resource_type=event.resource_type,
-                resource_id=event.resource_id,
-                details_json=json.dumps(event.details) if event.details else None,
-                ip_address=event.ip_address,
-                user_agent=event.user_agent,
-            )
+            self._enqueue(event)
 
             # Also log to regular logger for immediate visibility
             logger.info(
@@ -301,17 +321,7 @@ class AuditLogger:
         )
 
         try:
-            db = self._get_db()
-            db.log_audit_event(
-                timestamp=event.timestamp,
-                user_id=event.user_id,
-                action=event.action,
-                resource_type=event.resource_type,
-                resource_id=event.resource_id,
-                details_json=json.dumps(event.details) if event.details else None,
-                ip_address=event.ip_address,
-                user_agent=event.user_agent,
-            )
+            self._enqueue(event)
 
             logger.info(
                 f"[AUDIT] {event.action} by user={event.user_id} "
@@ -0,0 +1,569 @@
+"""
+Disk Cache - Persistent, content-addressed LRU cache for downloaded files.
+
+Used for mockup photos, proposal templates and intro/outro PDFs fetched from
+Asset-Management, so repeat mockups and proposals for popular locations are
+served from local disk instead of the network.
+
+Layout:
+    {root}/blobs/ab/abcdef...   File bodies, named by SHA-256 of the content
+    {root}/index.db             SQLite index: key -> digest, size, etag, timestamps
+    {root}/tmp/                 Per-caller hardlinks handed out by fetch_to_path()
+
+Features:
+- Byte-size budget with least-recently-used eviction
+- Identical bodies stored under different keys are kept once
+- Freshness window (max_age); after it, entries are revalidated with the
+  stored ETag (fetchers may answer "not modified") or re-downloaded
+- Stale entries are served if revalidation fails (Asset-Management down);
+  an entry the origin no longer has (fetcher returns None) is dropped
+- Glob invalidation, hooked into invalidate_mockup_caches()
+- Index and file I/O run in a thread; concurrent misses for a key share one fetch
+
+Usage:
+    from core.utils.disk_cache import FetchResult, get_asset_file_cache
+
+    async def fetch(etag: str | None) -> FetchResult | None:
+        # None means not found; raise if Asset-Management is unavailable
+        result = await asset_mgmt_client.download_template(company, location_key, etag=etag)
+        if not result:
+            return None
+        return FetchResult(path=result.path, etag=result.etag, not_modified=result.not_modified)
+
+    cache = get_asset_file_cache()
+    path = await cache.fetch_to_path(f"template/{company}/{location_key}/pptx", fetch, ".pptx")
+    # path is a private hardlink - the caller may delete it
+
+Configuration:
+    ASSET_CACHE_DIR: Cache root (default: /data/cache/assets or ./data/cache/assets)
+    ASSET_CACHE_MAX_MB: Byte budget in MB (default: 1024)
+    ASSET_CACHE_MAX_AGE: Seconds before an entry is revalidated (default: 3600)
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+from core.utils.logging import get_logger
+
+logger = get_logger("utils.disk_cache")
+
+
+@dataclass
+class FetchResult:
+    """
+    Result of a fetch callback passed to DiskCache.
+
+    The body is either data, or path: a file the cache takes ownership of
+    (moved into the cache, or deleted), so large downloads never have to
+    be held in memory.
+    """
+    data: bytes | None = None
+    etag: str | None = None
+    not_modified: bool = False
+    path: Path | None = None
+
+
+@dataclass
+class CacheEntry:
+    """Index row for a cached key."""
+    key: str
+    digest: str
+    size: int
+    etag: str | None
+    validated_at: float
+    accessed_at: float
+
+
+Fetcher = Callable[[str | None], Awaitable[FetchResult | None]]
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    validated_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at);
+CREATE INDEX IF NOT EXISTS idx_entries_digest ON entries(digest);
+"""
+
+
+class DiskCache:
+    """
+    Content-addressed file cache with an LRU byte budget.
+
+    Safe to share between coroutines and threads of one process; the SQLite
+    index (WAL mode) also keeps several worker processes consistent.
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int, max_age: float = 3600.0):
+        """
+        Initialize disk cache.
+
+        Args:
+            root: Cache root directory (created if missing)
+            max_bytes: Total size budget for cached bodies
+            max_age: Seconds an entry is served without revalidation
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._blobs = self.root / "blobs"
+        self._tmp = self.root / "tmp"
+        self._blobs.mkdir(parents=True, exist_ok=True)
+        self._tmp.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._conn = sqlite3.connect(str(self.root / "index.db"), check_same_thread=False, timeout=10.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._sweep_tmp()
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stale_served = 0
+        self.evictions = 0
+
+    # =========================================================================
+    # INDEX
+    # =========================================================================
+
+    def _sweep_tmp(self, older_than: float = 86400.0) -> None:
+        """Remove handed-out files that callers never deleted (e.g. after a crash)."""
+        cutoff = time.time() - older_than
+        for path in self._tmp.iterdir():
+            try:
+                # ctime changes on link/unlink, so live hardlinks look recent
+                if path.stat().st_ctime < cutoff:
+                    path.unlink()
+            except OSError:
+                continue
+
+    def _blob_path(self, digest: str) -> Path:
+        return self._blobs / digest[:2] / digest
+
+    def _get_entry(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key, digest, size, etag, validated_at, accessed_at FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+        return CacheEntry(*row) if row else None
+
+    def _touch(self, key: str, validated: bool = False) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            if validated:
+                self._conn.execute(
+                    "UPDATE entries SET accessed_at = ?, validated_at = ? WHERE key = ?", (now, now, key)
+                )
+            else:
+                self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+
+    def _drop_keys(self, keys: list[str]) -> None:
+        """Remove keys from the index and delete blobs nothing references anymore."""
+        if not keys:
+            return
+        with self._lock, self._conn:
+            digests = set()
+            for key in keys:
+                row = self._conn.execute("SELECT digest FROM entries WHERE key = ?", (key,)).fetchone()
+                if row:
+                    digests.add(row[0])
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            orphaned = [
+                d for d in digests
+                if not self._conn.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (d,)).fetchone()
+            ]
+        for digest in orphaned:
+            with contextlib.suppress(FileNotFoundError):
+                self._blob_path(digest).unlink()
+
+    def put(self, key: str, data: bytes, etag: str | None = None) -> CacheEntry:
+        """
+        Store a body under key (replacing any previous body) and enforce the budget.
+
+        Args:
+            key: Cache key
+            data: File contents
+            etag: Optional validator from the origin
+
+        Returns:
+            The stored entry
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        blob = self._blob_path(digest)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            partial = blob.with_suffix(f".{uuid.uuid4().hex}.part")
+            partial.write_bytes(data)
+            os.replace(partial, blob)
+        return self._index(key, digest, len(data), etag)
+
+    def put_file(self, key: str, path: Path, etag: str | None = None) -> CacheEntry:
+        """
+        Move a file into the cache under key (see put()).
+
+        The file is hashed in chunks and renamed into place (copied if it
+        is on another filesystem), so its contents are never held in memory.
+        The cache owns path afterwards.
+        """
+        digest = file_digest(path)
+        size = path.stat().st_size
+        blob = self._blob_path(digest)
+        if blob.exists():
+            path.unlink(missing_ok=True)
+        else:
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            partial = blob.with_suffix(f".{uuid.uuid4().hex}.part")
+            shutil.move(path, partial)
+            os.replace(partial, blob)
+        return self._index(key, digest, size, etag)
+
+    def _index(self, key: str, digest: str, size: int, etag: str | None) -> CacheEntry:
+        """Point key at a stored blob and enforce the budget."""
+        previous = self._get_entry(key)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, digest, size, etag, validated_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, digest, size, etag, now, now),
+            )
+        if previous and previous.digest != digest:
+            self._delete_blob_if_orphaned(previous.digest)
+
+        self._evict()
+        return CacheEntry(key, digest, size, etag, now, now)
+
+    def _delete_blob_if_orphaned(self, digest: str) -> None:
+        with self._lock:
+            referenced = self._conn.execute(
+                "SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)
+            ).fetchone()
+        if not referenced:
+            with contextlib.suppress(FileNotFoundError):
+                self._blob_path(digest).unlink()
+
+    def _total_bytes(self) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM (SELECT MAX(size) AS size FROM entries GROUP BY digest)"
+            ).fetchone()
+        return row[0]
+
+    def _evict(self) -> None:
+        """Drop least-recently-used keys until the blob total fits the budget."""
+        total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, digest, size FROM entries ORDER BY accessed_at ASC"
+            ).fetchall()
+
+        refs: dict[str, int] = {}
+        for _, digest, _ in rows:
+            refs[digest] = refs.get(digest, 0) + 1
+
+        victims = []
+        for key, digest, size in rows:
+            if total <= self.max_bytes:
+                break
+            victims.append(key)
+            refs[digest] -= 1
+            if refs[digest] == 0:
+                # Shared bodies are only freed with their last key
+                total -= size
+        self._drop_keys(victims)
+        self.evictions += len(victims)
+        logger.info(f"[DISK_CACHE] Evicted {len(victims)} entr(y/ies) to stay under {self.max_bytes} bytes")
+
+    # =========================================================================
+    # PUBLIC API
+    # =========================================================================
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Check whether an entry can be served without revalidation."""
+        return time.time() - entry.validated_at < self.max_age
+
+    def peek(self, key: str) -> CacheEntry | None:
+        """Return the entry if it is cached, fresh and its body exists (no network)."""
+        entry = self._get_entry(key)
+        if entry and self.is_fresh(entry) and self._blob_path(entry.digest).exists():
+            return entry
+        return None
+
+    async def get_or_fetch(self, key: str, fetch: Fetcher) -> CacheEntry | None:
+        """
+        Return a cached entry, fetching or revalidating it when needed.
+
+        Index and file work runs in a thread, off the event loop. Concurrent
+        calls for the same key share one lookup and fetch.
+
+        Args:
+            key: Cache key
+            fetch: Callback receiving the stored ETag (or None); returns None
+                if the origin has no such file, raises if it is unavailable
+
+        Returns:
+            Cache entry, or None if the origin has no such file (any cached
+            copy is dropped) or it is unavailable and nothing is cached
+        """
+        loop = asyncio.get_running_loop()
+        pending = self._inflight.get(key)
+        if pending is None or pending.get_loop() is not loop:
+            pending = loop.create_task(self._get_or_fetch(key, fetch))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda task: self._forget_inflight(key, task))
+        # Shielded so one caller being cancelled doesn't fail the others
+        return await asyncio.shield(pending)
+
+    def _forget_inflight(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def _get_or_fetch(self, key: str, fetch: Fetcher) -> CacheEntry | None:
+        entry = await asyncio.to_thread(self._lookup, key)
+        if entry and self.is_fresh(entry):
+            self.hits += 1
+            await asyncio.to_thread(self._touch, key)
+            return entry
+
+        self.misses += 1
+        try:
+            result = await fetch(entry.etag if entry else None)
+        except Exception as e:
+            logger.warning(f"[DISK_CACHE] Fetch failed for {key}: {e}")
+            return await asyncio.to_thread(self._serve_stale, key, entry)
+
+        return await asyncio.to_thread(self._store, key, entry, result)
+
+    def _lookup(self, key: str) -> CacheEntry | None:
+        """Index lookup that drops keys whose body has gone missing."""
+        entry = self._get_entry(key)
+        if entry and not self._blob_path(entry.digest).exists():
+            self._drop_keys([key])
+            return None
+        return entry
+
+    def _store(self, key: str, entry: CacheEntry | None, result: FetchResult | None) -> CacheEntry | None:
+        """Apply a fetch result to the cache and return the entry to serve."""
+        if result and result.not_modified and entry:
+            self.revalidated += 1
+            self._touch(key, validated=True)
+            return entry
+
+        if result and result.path is not None:
+            if entry and not result.etag and file_digest(result.path) == entry.digest:
+                result.path.unlink(missing_ok=True)
+                self.revalidated += 1
+                self._touch(key, validated=True)
+                return entry
+            return self.put_file(key, result.path, result.etag)
+
+        if result and result.data is not None:
+            if entry and not result.etag and hashlib.sha256(result.data).hexdigest() == entry.digest:
+                self.revalidated += 1
+                self._touch(key, validated=True)
+                return entry
+            return self.put(key, result.data, result.etag)
+
+        if entry:
+            # Deleted at the origin - stop serving the local copy
+            logger.info(f"[DISK_CACHE] Dropping {key}: no longer found at the origin")
+            self._drop_keys([key])
+        return None
+
+    def _serve_stale(self, key: str, entry: CacheEntry | None) -> CacheEntry | None:
+        """Serve the cached entry after a failed fetch, if there is one."""
+        if entry:
+            # Origin unavailable - a stale copy beats failing the mockup/proposal
+            self.stale_served += 1
+            logger.warning(f"[DISK_CACHE] Serving stale entry for {key}")
+            self._touch(key)
+        return entry
+
+    def read_bytes(self, entry: CacheEntry) -> bytes:
+        """Read an entry's body."""
+        return self._blob_path(entry.digest).read_bytes()
+
+    def materialize(self, entry: CacheEntry, suffix: str = "") -> Path:
+        """
+        Hand out a private path to an entry's body.
+
+        Uses a hardlink (no copy) when possible, so callers can delete the
+        returned path like any temp file without touching the cache.
+
+        Args:
+            entry: Cache entry
+            suffix: File extension for the returned path
+
+        Returns:
+            Path the caller owns
+        """
+        target = self._tmp / f"{uuid.uuid4().hex}{suffix}"
+        blob = self._blob_path(entry.digest)
+        try:
+            os.link(blob, target)
+        except OSError:
+            shutil.copyfile(blob, target)
+        return target
+
+    async def fetch_to_path(self, key: str, fetch: Fetcher, suffix: str = "") -> Path | None:
+        """
+        get_or_fetch() followed by materialize().
+
+        Args:
+            key: Cache key
+            fetch: Fetch callback
+            suffix: File extension for the returned path
+
+        Returns:
+            Path the caller owns, or None if not found
+        """
+        entry = await self.get_or_fetch(key, fetch)
+        if not entry:
+            return None
+        try:
+            return await asyncio.to_thread(self.materialize, entry, suffix)
+        except FileNotFoundError:
+            # Body evicted by another process between lookup and link
+            await asyncio.to_thread(self._drop_keys, [key])
+            entry = await self.get_or_fetch(key, fetch)
+            return await asyncio.to_thread(self.materialize, entry, suffix) if entry else None
+
+    async def fetch_first(
+        self,
+        candidates: list[tuple[str, Fetcher]],
+        suffix: str = "",
+    ) -> tuple[Path, int] | None:
+        """
+        Resolve the first candidate key that exists, preferring fresh local copies.
+
+        Used where a file may live under one of several companies: a fresh
+        entry under any candidate is served without network I/O, otherwise
+        candidates are fetched in order.
+
+        Args:
+            candidates: (key, fetch) pairs in preference order
+            suffix: File extension for the returned path
+
+        Returns:
+            (path the caller owns, index of the matching candidate) or None
+        """
+        local = await asyncio.to_thread(self._materialize_first_fresh, [key for key, _ in candidates], suffix)
+        if local:
+            return local
+
+        for index, (key, fetch) in enumerate(candidates):
+            path = await self.fetch_to_path(key, fetch, suffix)
+            if path:
+                return path, index
+        return None
+
+    def _materialize_first_fresh(self, keys: list[str], suffix: str) -> tuple[Path, int] | None:
+        for index, key in enumerate(keys):
+            entry = self.peek(key)
+            if entry:
+                try:
+                    self.hits += 1
+                    self._touch(key)
+                    return self.materialize(entry, suffix), index
+                except FileNotFoundError:
+                    break
+        return None
+
+    def invalidate(self, pattern: str = "*") -> int:
+        """
+        Drop all keys matching a glob pattern.
+
+        Args:
+            pattern: fnmatch-style pattern (e.g. "mockup/backlite_dubai/*")
+
+        Returns:
+            Number of keys dropped
+        """
+        with self._lock:
+            keys = [row[0] for row in self._conn.execute("SELECT key FROM entries")]
+        matched = [k for k in keys if fnmatchcase(k, pattern)]
+        self._drop_keys(matched)
+        if matched:
+            logger.info(f"[DISK_CACHE] Invalidated {len(matched)} entr(y/ies) matching {pattern}")
+        return len(matched)
+
+    def stats(self) -> dict:
+        """Get cache statistics."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {
+            "entries": entries,
+            "size_bytes": self._total_bytes(),
+            "max_bytes": self.max_bytes,
+            "max_age": self.max_age,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "stale_served": self.stale_served,
+            "evictions": self.evictions,
+        }
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def default_cache_root(name: str) -> Path:
+    """Cache directory under /data/cache (production) or ./data/cache (local)."""
+    if os.path.exists("/data/"):
+        return Path("/data/cache") / name
+    return Path(__file__).resolve().parents[2] / "data" / "cache" / name
+
+
+# Global cache instance for Asset-Management files
+_asset_file_cache: DiskCache | None = None
+
+
+def get_asset_file_cache() -> DiskCache:
+    """Get or create the shared cache for photos, templates and intro/outro PDFs."""
+    global _asset_file_cache
+    if _asset_file_cache is None:
+        from app_settings import settings
+
+        root = Path(settings.asset_cache_dir) if settings.asset_cache_dir else default_cache_root("assets")
+
+        _asset_file_cache = DiskCache(
+            root=root,
+            max_bytes=settings.asset_cache_max_mb * 1024 * 1024,
+            max_age=settings.asset_cache_max_age,
+        )
+        logger.info(f"[DISK_CACHE] Asset file cache at {root} ({settings.asset_cache_max_mb}MB)")
+    return _asset_file_cache
+
+
+def set_asset_file_cache(cache: DiskCache | None) -> None:
+    """Set a custom asset file cache (for testing)."""
+    global _asset_file_cache
+    _asset_file_cache = cache
@@ -39,41 +39,47 @@ async def download_fonts_from_storage() -> bool:
 
         storage = SupabaseStorageProvider()
 
-        # Ensure local font directory exists
-        FONT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-
-        # List all fonts in storage
-        result = await storage.list_files("fonts", prefix="Sofia-Pro")
-
-        if not result.success:
-            logger.warning(f"[FONTS] Failed to list fonts: {result.error}")
-            return False
-
-        if not result.files:
-            logger.info("[FONTS] No fonts found in storage")
-            return False
-
-        # Download each font file
-        downloaded = 0
-        for font_file in result.files:
-            local_path = FONT_CACHE_DIR / font_file.name
-
-            # Skip if already cached
-            if local_path.exists():
-                logger.debug(f"[FONTS] Already cached: {font_file.name}")
-                continue
-
-            # Download from storage
-            download_result = await storage.download("fonts", font_file.key)
-            if download_result.success and download_result.data:
-                local_path.write_bytes(download_result.data)
-                logger.info(f"[FONTS] Downloaded: {font_file.name}")
-                downloaded += 1
-            else:
-                logger.warning(f"[FONTS] Failed to download: {font_file.name}")
-
-        logger.info(f"[FONTS] Downloaded {downloaded} new fonts, {len(result.files)} total in storage")
-        return True
+        try:
+            # Ensure local font directory exists
+            FONT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+            # List all fonts in storage
+            result = await storage.list_files("fonts", prefix="Sofia-Pro")
+
+            if not result.success:
+                logger.warning(f"[FONTS] Failed to list fonts: {result.error}")
+                return False
+
+            if not result.files:
+                logger.info("[FONTS] No fonts found in storage")
+                return False
+
+            # Download missing font files concurrently, streaming straight to disk
+            destinations = {}
+            for font_file in result.files:
+                local_path = FONT_CACHE_DIR / font_file.name
+
+                # Skip if already cached
+                if local_path.exists():
+                    logger.debug(f"[FONTS] Already cached: {font_file.name}")
+                    continue
+                destinations[font_file.key] = local_path
+
+            results = await storage.download_many_to_paths("fonts", destinations)
+
+            downloaded = 0
+            for key, download_result in results.items():
+                name = destinations[key].name
+                if download_result.success:
+                    logger.info(f"[FONTS] Downloaded: {name}")
+                    downloaded += 1
+                else:
+                    logger.warning(f"[FONTS] Failed to download: {name}")
+
+            logger.info(f"[FONTS] Downloaded {downloaded} new fonts, {len(result.files)} total in storage")
+            return True
+        finally:
+            await storage.close()
 
     except Exception as e:
         logger.error(f"[FONTS] Failed to download fonts from storage: {e}")
@@ -3,14 +3,209 @@ Location matching utilities for Sales-Module.
 
 Provides consistent location key matching and validation across proposals and mockups.
 Uses database or Asset-Management provided locations (caller's responsibility).
+
+For repeated lookups (e.g. validating every line of a proposal), build a
+LocationIndex once and pass it instead of the raw list - every function here
+accepts either. The index precomputes normalised keys and display names plus
+a trigram index for the substring strategy, so lookups no longer rescan and
+re-lowercase the whole location list.
 """
 
+from collections.abc import Iterable
 from typing import Any
 
 
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class LocationIndex:
+    """
+    Precomputed lookup structures over a list of locations.
+
+    - Exact location_key and display_name lookups are dict hits
+    - Substring (fuzzy) matching narrows candidates with a trigram index,
+      verifies them, and ranks them by how closely the input and the matched
+      name overlap (ties keep list order)
+
+    Built once per WorkflowContext (or validator/coordinator) and reused for
+    every lookup in the workflow. The trigram index is built on first fuzzy use.
+
+    Example:
+        >>> index = LocationIndex(locations)
+        >>> index.match("gateway")
+        'dubai_gateway'
+        >>> index.candidates("mall")
+        [('dubai_jawhara', 0.33)]
+    """
+
+    def __init__(self, locations: Iterable[dict[str, Any]] = ()):
+        """
+        Initialize the index.
+
+        Args:
+            locations: Location dicts with location_key and optional display_name.
+                Rows without a location_key are kept in .locations but not indexed.
+        """
+        self.locations: list[dict[str, Any]] = list(locations)
+        self._by_key: dict[str, dict[str, Any]] = {}
+        self._by_display: dict[str, dict[str, Any]] = {}
+        # Locations that have a key (nothing else can be matched to), and
+        # (key_lower, display_name_lower) for each, in list order
+        self._keyed: list[dict[str, Any]] = []
+        self._names: list[tuple[str, str]] = []
+
+        for loc in self.locations:
+            key = (loc.get("location_key") or "").lower()
+            if not key:
+                continue
+            display_name = (loc.get("display_name") or "").lower()
+            self._by_key.setdefault(key, loc)
+            if display_name:
+                self._by_display.setdefault(display_name, loc)
+            self._keyed.append(loc)
+            self._names.append((key, display_name))
+
+        # Built lazily. Name ids are position * 2 + (0 for key, 1 for display name)
+        self._postings: dict[str, set[int]] | None = None
+        self._gram_counts: list[int] = []
+        self._short_names: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+    def get(self, key_or_name: str) -> dict[str, Any] | None:
+        """Look up a location by exact key, then exact display name (case-insensitive)."""
+        if not key_or_name:
+            return None
+        normalized = key_or_name.strip().lower()
+        return self._by_key.get(normalized) or self._by_display.get(normalized)
+
+    def exists(self, location_key: str) -> bool:
+        """Check whether an exact location_key is present."""
+        return bool(location_key) and location_key.lower() in self._by_key
+
+    def metadata(self, location_key: str) -> dict[str, Any]:
+        """Get the location dict for an exact location_key (empty dict if unknown)."""
+        if not location_key:
+            return {}
+        return self._by_key.get(location_key.lower(), {})
+
+    def display_name(self, location_key: str) -> str:
+        """Get the display name for a location_key, falling back to the title-cased key."""
+        if not location_key:
+            return ""
+        loc = self._by_key.get(location_key.lower())
+        if loc:
+            return loc.get("display_name") or loc["location_key"].replace("_", " ").title()
+        return location_key.replace("_", " ").title()
+
+    def match(self, location_input: str) -> str | None:
+        """
+        Match a user-provided location string to its canonical location_key.
+
+        Matching strategy:
+        1. Exact location_key match
+        2. Exact display_name match (case-insensitive)
+        3. Best-ranked substring match (see candidates())
+        """
+        normalized = (location_input or "").strip().lower()
+        if not normalized:
+            return None
+
+        loc = self._by_key.get(normalized) or self._by_display.get(normalized)
+        if loc:
+            return loc.get("location_key")
+
+        ranked = self.candidates(normalized, limit=1)
+        return ranked[0][0] if ranked else None
+
+    def candidates(self, location_input: str, limit: int = 5) -> list[tuple[str, float]]:
+        """
+        Rank locations whose key or display name contains, or is contained in, the input.
+
+        Args:
+            location_input: User-provided location string
+            limit: Maximum number of candidates
+
+        Returns:
+            (location_key, score) pairs, best first. Score is the length ratio of
+            the shorter to the longer of input and matched name (1.0 = identical).
+        """
+        query = (location_input or "").strip().lower()
+        if not query or not self._keyed:
+            return []
+
+        scored: list[tuple[float, int]] = []
+        for position in self._fuzzy_positions(query):
+            best = 0.0
+            for name in self._names[position]:
+                if name and (query in name or name in query):
+                    best = max(best, min(len(name), len(query)) / max(len(name), len(query)))
+            if best:
+                scored.append((best, position))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [
+            (self._keyed[position].get("location_key"), round(score, 2))
+            for score, position in scored[:limit]
+        ]
+
+    def _fuzzy_positions(self, query: str) -> set[int]:
+        """Positions of locations that may substring-match the query (unverified superset)."""
+        if len(query) < 3:
+            # Too short to use the index: any name may contain it
+            return set(range(len(self._keyed)))
+
+        self._build_trigrams()
+
+        # Names shorter than a trigram are always checked directly
+        name_ids = set(self._short_names)
+
+        # Names containing the query have all of its trigrams;
+        # names contained in the query have all of theirs in it
+        containing: set[int] | None = None
+        hits: dict[int, int] = {}
+        for gram in _trigrams(query):
+            posting = self._postings.get(gram, set())
+            containing = set(posting) if containing is None else containing & posting
+            for name_id in posting:
+                hits[name_id] = hits.get(name_id, 0) + 1
+
+        name_ids.update(containing or ())
+        name_ids.update(name_id for name_id, count in hits.items() if count == self._gram_counts[name_id])
+        return {name_id // 2 for name_id in name_ids}
+
+    def _build_trigrams(self) -> None:
+        if self._postings is not None:
+            return
+        postings: dict[str, set[int]] = {}
+        gram_counts: list[int] = []
+        short_names: list[int] = []
+        for position, names in enumerate(self._names):
+            for field_idx, name in enumerate(names):
+                name_id = position * 2 + field_idx
+                grams = _trigrams(name)
+                gram_counts.append(len(grams))
+                if name and not grams:
+                    short_names.append(name_id)
+                for gram in grams:
+                    postings.setdefault(gram, set()).add(name_id)
+        self._gram_counts = gram_counts
+        self._short_names = short_names
+        self._postings = postings
+
+
+def _as_index(available_locations: "list[dict[str, Any]] | LocationIndex") -> LocationIndex:
+    """Use a prebuilt index as-is; index a plain list for this call."""
+    if isinstance(available_locations, LocationIndex):
+        return available_locations
+    return LocationIndex(available_locations)
+
+
 def match_location_key(
     location_input: str,
-    available_locations: list[dict[str, Any]],
+    available_locations: "list[dict[str, Any]] | LocationIndex",
 ) -> str | None:
     """
     Match a location input (display name or partial match) to its canonical location_key.
@@ -18,7 +213,7 @@ def match_location_key(
     Matching strategy:
     1. Exact location_key match
     2. Exact display_name match (case-insensitive)
-    3. Fuzzy substring matching (legacy compatibility)
+    3. Fuzzy substring matching, best-ranked candidate first
 
     Args:
         location_input: User-provided location string (can be display name, partial name, or key)
@@ -43,40 +238,12 @@ def match_location_key(
     if not location_input or not available_locations:
         return None
 
-    location_normalized = location_input.strip().lower()
-
-    # Strategy 1: Exact location_key match
-    for loc in available_locations:
-        key = loc.get("location_key", "")
-        if key.lower() == location_normalized:
-            return key
-
-    # Strategy 2: Exact display_name match (case-insensitive)
-    for loc in available_locations:
-        display_name = loc.get("display_name", "")
-        if display_name and display_name.lower() == location_normalized:
-            return loc.get("location_key")
-
-    # Strategy 3: Fuzzy substring matching (legacy compatibility)
-    # Check if input is substring of key or display_name
-    for loc in available_locations:
-        key = loc.get("location_key", "").lower()
-        display_name = loc.get("display_name", "").lower()
-
-        # Check if input matches key
-        if key and (location_normalized in key or key in location_normalized):
-            return loc.get("location_key")
-
-        # Check if input matches display name
-        if display_name and (location_normalized in display_name or display_name in location_normalized):
-            return loc.get("location_key")
-
-    return None
+    return _as_index(available_locations).match(location_input)
 
 
 def validate_location_exists(
     location_key: str,
-    available_locations: list[dict[str, Any]],
+    available_locations: "list[dict[str, Any]] | LocationIndex",
 ) -> bool:
     """
     Validate that a location_key exists in the available locations.
@@ -98,19 +265,12 @@ def validate_location_exists(
     if not location_key or not available_locations:
         return False
 
-    location_key_lower = location_key.lower()
-
-    for loc in available_locations:
-        key = loc.get("location_key", "")
-        if key.lower() == location_key_lower:
-            return True
-
-    return False
+    return _as_index(available_locations).exists(location_key)
 
 
 def get_location_display_name(
     location_key: str,
-    available_locations: list[dict[str, Any]],
+    available_locations: "list[dict[str, Any]] | LocationIndex",
 ) -> str:
     """
     Get the human-readable display name for a location key.
@@ -135,21 +295,12 @@ def get_location_display_name(
     if not available_locations:
         return location_key.replace("_", " ").title()
 
-    location_key_lower = location_key.lower()
-
-    for loc in available_locations:
-        key = loc.get("location_key", "")
-        if key.lower() == location_key_lower:
-            display_name = loc.get("display_name")
-            return display_name or key.replace("_", " ").title()
-
-    # Fall back to title-cased key if not found
-    return location_key.replace("_", " ").title()
+    return _as_index(available_locations).display_name(location_key)
 
 
 def match_and_validate(
     location_input: str,
-    available_locations: list[dict[str, Any]],
+    available_locations: "list[dict[str, Any]] | LocationIndex",
 ) -> tuple[str | None, str | None]:
     """
     Match and validate a location input, returning both the key and any error message.
@@ -178,13 +329,15 @@ def match_and_validate(
     if not available_locations:
         return None, "No locations available for your company access"
 
-    matched_key = match_location_key(location_input, available_locations)
+    # One index for both steps: matching and the existence check are hash lookups
+    index = _as_index(available_locations)
+    matched_key = index.match(location_input)
 
     if not matched_key:
         return None, f"Unknown location '{location_input}'"
 
     # Double-check validation (should always pass if match succeeded)
-    if not validate_location_exists(matched_key, available_locations):
+    if not index.exists(matched_key):
         return None, f"Location '{matched_key}' not found in available locations"
 
     return matched_key, None
@@ -192,7 +345,7 @@ def match_and_validate(
 
 def get_location_metadata(
     location_key: str,
-    available_locations: list[dict[str, Any]],
+    available_locations: "list[dict[str, Any]] | LocationIndex",
 ) -> dict[str, Any]:
     """
     Get full metadata dictionary for a location.
@@ -212,11 +365,4 @@ def get_location_metadata(
     if not location_key or not available_locations:
         return {}
 
-    location_key_lower = location_key.lower()
-
-    for loc in available_locations:
-        key = loc.get("location_key", "")
-        if key.lower() == location_key_lower:
-            return loc
-
-    return {}
+    return _as_index(available_locations).metadata(location_key)
@@ -0,0 +1,343 @@
+"""
+Render Pool - Process-pool executor for CPU-heavy mockup rendering.
+
+Keeps OpenCV/numpy work (LANCZOS4 warpPerspective, GaussianBlur, float
+blends) off the asyncio event loop so SSE streams and other requests on the
+same worker keep flowing while mockups render.
+
+Features:
+- Long-lived worker processes that pre-import cv2/numpy/effects on start
+- Configurable worker count and a bounded pending queue (back-pressure)
+- In-memory images reach workers as shared-memory buffers, not pickled arrays
+- Per-worker utilisation stats (tasks, busy seconds, utilisation %)
+
+Usage:
+    from core.utils.render_pool import get_render_pool
+
+    pool = get_render_pool()
+
+    # File-based jobs (see generators.mockup.MockupRenderJob)
+    paths = await pool.render_jobs(jobs)
+
+    # Decoded arrays (e.g. preview uploads) via shared memory
+    result = await pool.composite(billboard, creative, points, config, "day")
+
+Configuration:
+    RENDER_POOL_WORKERS: Worker processes (default: 2)
+    RENDER_POOL_MAX_PENDING: Max jobs queued or running before rejecting (default: 16)
+"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from core.utils.logging import get_logger
+
+logger = get_logger("utils.render_pool")
+
+
+class RenderPoolFullError(RuntimeError):
+    """Raised when the render pool's pending queue is at capacity."""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after  # Seconds until a slot is likely free
+
+
+# =============================================================================
+# WORKER SIDE (runs in child processes)
+# =============================================================================
+
+
+def _init_worker(cv2_threads: int) -> None:
+    """Pre-import the imaging stack so the first job doesn't pay for it."""
+    import cv2
+
+    import generators.effects  # noqa: F401
+    import generators.mockup  # noqa: F401
+
+    cv2.setNumThreads(cv2_threads)
+
+
+def _attach(ref: tuple[str, tuple, str]) -> tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Map a shared-memory block described by (name, shape, dtype) as an array."""
+    name, shape, dtype = ref
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def _timed(func, *args) -> tuple[int, float, Any]:
+    """Run func and report (worker pid, busy seconds, result)."""
+    start = time.monotonic()
+    result = func(*args)
+    return os.getpid(), time.monotonic() - start, result
+
+
+def _render_jobs_in_worker(jobs: list) -> list[Path | None]:
+    """Render file-based jobs; photos and creatives are decoded in the worker."""
+    from generators.mockup import render_mockups_batch
+
+    return render_mockups_batch(jobs)
+
+
+def _composite_in_worker(
+    billboard_ref: tuple[str, tuple, str],
+    creative_ref: tuple[str, tuple, str],
+    output_ref: tuple[str, tuple, str],
+    frame_points: list[list[float]],
+    config: dict | None,
+    time_of_day: str,
+) -> None:
+    """Composite shared-memory inputs and write the result into the output block."""
+    from generators.effects import warp_creative_to_billboard
+
+    blocks = []
+    try:
+        billboard_shm, billboard = _attach(billboard_ref)
+        blocks.append(billboard_shm)
+        creative_shm, creative = _attach(creative_ref)
+        blocks.append(creative_shm)
+        output_shm, output = _attach(output_ref)
+        blocks.append(output_shm)
+
+        output[:] = warp_creative_to_billboard(
+            billboard, creative, frame_points, config=config, time_of_day=time_of_day
+        )
+        del billboard, creative, output
+    finally:
+        for shm in blocks:
+            shm.close()
+
+
+# =============================================================================
+# PARENT SIDE
+# =============================================================================
+
+
+def _to_shared(array: np.ndarray) -> tuple[shared_memory.SharedMemory, tuple[str, tuple, str]]:
+    """Copy an array into a new shared-memory block."""
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    view[:] = array
+    del view
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+class RenderPool:
+    """
+    Bounded process pool for mockup rendering.
+
+    Workers are spawned lazily on first use (spawn context, so no locks or
+    sockets are inherited from the event-loop process).
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 16):
+        """
+        Initialize the render pool.
+
+        Args:
+            max_workers: Number of worker processes
+            max_pending: Max jobs queued or running before submissions are rejected
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, max_workers)
+        self._executor: ProcessPoolExecutor | None = None
+        self._started_at: float | None = None
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._workers: dict[int, dict[str, float]] = {}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get or create the process pool."""
+        if self._executor is None:
+            cv2_threads = max(1, (os.cpu_count() or 1) // self.max_workers)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(cv2_threads,),
+            )
+            self._started_at = time.monotonic()
+            self._workers.clear()
+            logger.info(
+                f"[RENDER_POOL] Started {self.max_workers} worker(s) "
+                f"(cv2 threads/worker: {cv2_threads}, max pending: {self.max_pending})"
+            )
+        return self._executor
+
+    async def _submit(self, func, *args) -> Any:
+        """Run func(*args) in a worker, enforcing the pending-queue bound."""
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise RenderPoolFullError(
+                f"Render pool is full ({self._pending}/{self.max_pending} pending)",
+                retry_after=self._retry_after(),
+            )
+
+        self._pending += 1
+        executor = self._get_executor()
+        try:
+            loop = asyncio.get_running_loop()
+            pid, busy, result = await loop.run_in_executor(executor, _timed, func, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed) - drop the pool so the next job
+            # respawns it, unless another caller has already done so
+            self._failed += 1
+            if self._executor is executor:
+                logger.error("[RENDER_POOL] Worker process died, restarting pool")
+                self.shutdown(wait=False)
+            raise
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        self._completed += 1
+        worker = self._workers.setdefault(pid, {"tasks": 0, "busy_seconds": 0.0, "last_task_at": 0.0})
+        worker["tasks"] += 1
+        worker["busy_seconds"] += busy
+        worker["last_task_at"] = time.time()
+        return result
+
+    def _retry_after(self) -> int:
+        """Estimate seconds until the pending jobs have run, from the average job time."""
+        tasks = sum(stats["tasks"] for stats in self._workers.values())
+        if not tasks:
+            return 1
+        average = sum(stats["busy_seconds"] for stats in self._workers.values()) / tasks
+        return max(1, math.ceil(average * self._pending / self.max_workers))
+
+    async def render_jobs(self, jobs: list) -> list[Path | None]:
+        """
+        Render MockupRenderJobs in a worker process.
+
+        Jobs reference photos and creatives by path, so only paths cross the
+        process boundary; outputs are written to disk by the worker.
+
+        Args:
+            jobs: List of generators.mockup.MockupRenderJob
+
+        Returns:
+            Output path per job (None for failures), in job order
+        """
+        if not jobs:
+            return []
+        return await self._submit(_render_jobs_in_worker, jobs)
+
+    async def composite(
+        self,
+        billboard: np.ndarray,
+        creative: np.ndarray,
+        frame_points: list[list[float]],
+        config: dict | None = None,
+        time_of_day: str = "day",
+    ) -> np.ndarray:
+        """
+        Composite decoded images in a worker via shared memory.
+
+        Args:
+            billboard: Billboard photo (BGR, uint8)
+            creative: Creative image (BGR, uint8)
+            frame_points: 4 corner points defining the billboard frame
+            config: Optional effect config dict
+            time_of_day: "day" or "night"
+
+        Returns:
+            Composited result (BGR, uint8)
+        """
+        blocks = []
+        try:
+            billboard_shm, billboard_ref = _to_shared(np.ascontiguousarray(billboard))
+            blocks.append(billboard_shm)
+            creative_shm, creative_ref = _to_shared(np.ascontiguousarray(creative))
+            blocks.append(creative_shm)
+            output_shm = shared_memory.SharedMemory(create=True, size=billboard.nbytes)
+            blocks.append(output_shm)
+            output_ref = (output_shm.name, billboard.shape, np.dtype(np.uint8).str)
+
+            await self._submit(
+                _composite_in_worker,
+                billboard_ref, creative_ref, output_ref, frame_points, config, time_of_day,
+            )
+
+            return np.ndarray(billboard.shape, dtype=np.uint8, buffer=output_shm.buf).copy()
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get pool statistics including per-worker utilisation."""
+        uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+
+        workers = {
+            str(pid): {
+                "tasks": int(stats["tasks"]),
+                "busy_seconds": round(stats["busy_seconds"], 2),
+                "utilisation": round(stats["busy_seconds"] / uptime, 3) if uptime else 0.0,
+            }
+            for pid, stats in self._workers.items()
+        }
+
+        return {
+            "running": self._executor is not None,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "uptime_seconds": round(uptime, 1),
+            "workers": workers,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
+            logger.info("[RENDER_POOL] Shut down")
+
+
+# Global pool instance
+_pool: RenderPool | None = None
+
+
+def get_render_pool() -> RenderPool:
+    """Get or create the global render pool."""
+    global _pool
+    if _pool is None:
+        from app_settings import settings
+
+        _pool = RenderPool(
+            max_workers=settings.render_pool_workers,
+            max_pending=settings.render_pool_max_pending,
+        )
+    return _pool
+
+
+def set_render_pool(pool: RenderPool) -> None:
+    """Set a custom render pool (for testing)."""
+    global _pool
+    _pool = pool
+
+
+def shutdown_render_pool() -> None:
+    """Stop the global render pool's workers, if it was started."""
+    if _pool is not None:
+        _pool.shutdown()
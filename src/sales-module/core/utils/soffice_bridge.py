@@ -0,0 +1,105 @@
+"""
+Soffice Bridge - UNO helper process for the soffice conversion pool.
+
+Runs under an interpreter that can `import uno` (LibreOffice's bundled
+python or the system python3 with python3-uno), so it must only depend on
+the standard library and pyuno. Not imported by the application.
+
+Protocol (one JSON object per line on stdin/stdout):
+    -> {"op": "ping"}
+    <- {"ok": true}
+    -> {"op": "convert", "src": "/tmp/a.pptx", "dst": "/tmp/a.pdf"}
+    <- {"ok": true} | {"ok": false, "error": "..."}
+
+Usage:
+    python3 soffice_bridge.py <port>
+"""
+
+import json
+import os
+import sys
+import time
+
+import uno
+from com.sun.star.beans import PropertyValue
+
+CONNECT_TIMEOUT = 60.0
+
+EXPORT_FILTERS = {
+    ".pptx": "impress_pdf_Export",
+    ".ppt": "impress_pdf_Export",
+    ".odp": "impress_pdf_Export",
+    ".docx": "writer_pdf_Export",
+    ".doc": "writer_pdf_Export",
+    ".odt": "writer_pdf_Export",
+}
+
+
+def _prop(name, value):
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+def _connect(port):
+    """Connect to the soffice instance, retrying while it starts up."""
+    local = uno.getComponentContext()
+    resolver = local.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local)
+    url = f"uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"
+
+    deadline = time.monotonic() + CONNECT_TIMEOUT
+    while True:
+        try:
+            ctx = resolver.resolve(url)
+            return ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.25)
+
+
+def _convert(desktop, src, dst):
+    ext = os.path.splitext(src)[1].lower()
+    doc = desktop.loadComponentFromURL(
+        uno.systemPathToFileUrl(os.path.abspath(src)),
+        "_blank",
+        0,
+        (_prop("Hidden", True), _prop("ReadOnly", True)),
+    )
+    if doc is None:
+        raise RuntimeError(f"soffice could not load {src}")
+    try:
+        doc.storeToURL(
+            uno.systemPathToFileUrl(os.path.abspath(dst)),
+            (_prop("FilterName", EXPORT_FILTERS.get(ext, "impress_pdf_Export")),),
+        )
+    finally:
+        doc.close(True)
+
+
+def _reply(**payload):
+    sys.stdout.write(json.dumps(payload) + "\n")
+    sys.stdout.flush()
+
+
+def main():
+    desktop = _connect(int(sys.argv[1]))
+    _reply(ok=True, ready=True)
+
+    for line in sys.stdin:
+        try:
+            request = json.loads(line)
+            if request.get("op") == "ping":
+                desktop.getComponents()
+            elif request.get("op") == "convert":
+                _convert(desktop, request["src"], request["dst"])
+            else:
+                raise ValueError(f"unknown op: {request.get('op')}")
+            _reply(ok=True)
+        except Exception as e:
+            _reply(ok=False, error=f"{type(e).__name__}: {e}")
+
+
+if __name__ == "__main__":
+    main()
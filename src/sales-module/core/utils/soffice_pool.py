@@ -0,0 +1,508 @@
+"""
+Soffice Pool - Long-lived headless LibreOffice instances for PPTX -> PDF.
+
+Running `libreoffice --headless --convert-to pdf` per deck pays 2-5s of
+cold start every time. This pool keeps N soffice processes running, each
+with its own user profile and UNO socket, and drives conversions through a
+small bridge process (core/utils/soffice_bridge.py) that holds the UNO
+connection.
+
+Features:
+- One profile dir and port per instance (no profile lock contention)
+- Health check (process alive + UNO ping) before reusing an idle instance
+- Automatic restart after N conversions, on failure, or on a hung conversion
+- Queue-depth, busy and restart metrics
+
+Requires an interpreter with pyuno (`python3-uno` on Debian, or the python
+bundled with LibreOffice). When it or soffice is missing, `available` is
+False and callers fall back to per-call conversion.
+
+Usage:
+    from core.utils.soffice_pool import get_soffice_pool
+
+    pool = get_soffice_pool()
+    if pool.available:
+        pool.convert("/tmp/deck.pptx", "/tmp/deck.pdf")      # blocking
+        await pool.convert_async("/tmp/deck.pptx", "/tmp/deck.pdf")
+
+Configuration:
+    SOFFICE_POOL_SIZE: Number of soffice instances (default: 2, 0 disables)
+    SOFFICE_MAX_CONVERSIONS: Conversions before an instance is recycled (default: 200)
+    SOFFICE_CONVERT_TIMEOUT: Seconds before a conversion counts as hung (default: 60)
+    SOFFICE_PYTHON: Interpreter with pyuno (default: auto-detected)
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import queue
+import select
+import shutil
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from core.utils.logging import get_logger
+
+logger = get_logger("utils.soffice_pool")
+
+SOFFICE_CANDIDATES = [
+    "/usr/bin/soffice",
+    "/usr/bin/libreoffice",
+    "/opt/libreoffice/program/soffice",
+    "/usr/local/bin/libreoffice",
+    "/opt/homebrew/bin/soffice",
+    "soffice",
+    "libreoffice",
+    "/Applications/LibreOffice.app/Contents/MacOS/soffice",
+]
+
+UNO_PYTHON_CANDIDATES = [
+    "/usr/lib/libreoffice/program/python",
+    "/opt/libreoffice/program/python",
+    "/usr/bin/python3",
+    "/Applications/LibreOffice.app/Contents/Resources/python",
+]
+
+BRIDGE_SCRIPT = Path(__file__).with_name("soffice_bridge.py")
+
+# Idle instances older than this are pinged before reuse; one failing the ping
+# is restarted and another tried, up to HEALTH_CHECK_ATTEMPTS in all
+HEALTH_CHECK_INTERVAL = 30.0
+HEALTH_CHECK_ATTEMPTS = 2
+STARTUP_TIMEOUT = 60.0
+
+
+class SofficePoolError(RuntimeError):
+    """Raised when a conversion could not be completed by the pool."""
+
+
+def _find_soffice() -> str | None:
+    for candidate in SOFFICE_CANDIDATES:
+        path = shutil.which(candidate) or (candidate if os.path.exists(candidate) else None)
+        if path:
+            return path
+    return None
+
+
+def _find_uno_python(configured: str | None) -> str | None:
+    candidates = [configured] if configured else UNO_PYTHON_CANDIDATES
+    for candidate in candidates:
+        if not candidate or not (shutil.which(candidate) or os.path.exists(candidate)):
+            continue
+        try:
+            result = subprocess.run([candidate, "-c", "import uno"], capture_output=True, timeout=15)
+            if result.returncode == 0:
+                return candidate
+        except Exception:
+            continue
+    return None
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class _SofficeInstance:
+    """One soffice process plus the bridge process talking UNO to it."""
+
+    def __init__(self, index: int, soffice: str, uno_python: str, profile_root: Path):
+        self.index = index
+        self.soffice = soffice
+        self.uno_python = uno_python
+        self.profile_dir = profile_root / f"instance_{index}"
+        self.port = 0
+        self.office: subprocess.Popen | None = None
+        self.bridge: subprocess.Popen | None = None
+        self._buffer = b""
+        self.conversions = 0
+        self.restarts = 0
+        self.last_used = 0.0
+
+    def start(self) -> None:
+        """Launch soffice and the bridge; wait until the bridge is connected."""
+        self.stop()
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        self.port = _free_port()
+        self.office = subprocess.Popen(
+            [
+                self.soffice,
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--norestore",
+                "--nodefault",
+                "--nolockcheck",
+                "--nofirststartwizard",
+                f"-env:UserInstallation={self.profile_dir.as_uri()}",
+                f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext",
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        self.bridge = subprocess.Popen(
+            [self.uno_python, str(BRIDGE_SCRIPT), str(self.port)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        self._buffer = b""
+        reply = self._read_reply(STARTUP_TIMEOUT)
+        if not reply.get("ready"):
+            raise SofficePoolError(f"soffice instance {self.index} failed to start: {reply}")
+        self.conversions = 0
+        self.last_used = time.monotonic()
+        logger.info(f"[SOFFICE_POOL] Instance {self.index} ready on port {self.port}")
+
+    def stop(self) -> None:
+        """Terminate both processes (process groups, so soffice.bin goes too)."""
+        for proc in (self.bridge, self.office):
+            if proc is None or proc.poll() is not None:
+                continue
+            try:
+                os.killpg(proc.pid, signal.SIGTERM)
+                proc.wait(timeout=5)
+            except Exception:
+                with contextlib.suppress(Exception):
+                    os.killpg(proc.pid, signal.SIGKILL)
+        self.bridge = None
+        self.office = None
+
+    def is_alive(self) -> bool:
+        return (
+            self.office is not None and self.office.poll() is None
+            and self.bridge is not None and self.bridge.poll() is None
+        )
+
+    def _read_reply(self, timeout: float) -> dict[str, Any]:
+        """Read one JSON line from the bridge, raising on timeout or EOF."""
+        fd = self.bridge.stdout.fileno()
+        deadline = time.monotonic() + timeout
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"soffice instance {self.index} did not answer within {timeout:.0f}s")
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise SofficePoolError(f"soffice instance {self.index} bridge exited")
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def call(self, request: dict[str, Any], timeout: float) -> dict[str, Any]:
+        """Send a request to the bridge and wait for its reply."""
+        self.bridge.stdin.write(json.dumps(request).encode() + b"\n")
+        self.bridge.stdin.flush()
+        return self._read_reply(timeout)
+
+    def ping(self, timeout: float = 5.0) -> bool:
+        if not self.is_alive():
+            return False
+        try:
+            return bool(self.call({"op": "ping"}, timeout).get("ok"))
+        except Exception:
+            return False
+
+
+class SofficePool:
+    """
+    Thread-safe pool of persistent soffice instances.
+
+    convert() blocks (it is called from executor threads by the PDF
+    generators); convert_async() wraps it for coroutines.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_conversions: int = 200,
+        convert_timeout: float = 60.0,
+        uno_python: str | None = None,
+        profile_root: str | Path | None = None,
+    ):
+        """
+        Initialize the pool (instances are started lazily or via start()).
+
+        Args:
+            size: Number of soffice instances (0 disables the pool)
+            max_conversions: Conversions before an instance is recycled
+            convert_timeout: Seconds before a conversion counts as hung
+            uno_python: Interpreter with pyuno (auto-detected if None)
+            profile_root: Parent dir for per-instance profiles
+        """
+        self.size = size
+        self.max_conversions = max_conversions
+        self.convert_timeout = convert_timeout
+        self._uno_python_setting = uno_python
+        self._profile_root = Path(profile_root or Path(tempfile.gettempdir()) / "soffice_pool")
+
+        self._instances: list[_SofficeInstance] = []
+        self._idle: queue.Queue[_SofficeInstance] = queue.Queue()
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._started = False
+        self._available: bool | None = None
+
+        self._waiting = 0
+        self._busy = 0
+        self._completed = 0
+        self._failed = 0
+        self._restarts = 0
+        self._total_seconds = 0.0
+
+    # =========================================================================
+    # LIFECYCLE
+    # =========================================================================
+
+    @property
+    def available(self) -> bool:
+        """Whether the pool can run (soffice and a pyuno interpreter found)."""
+        if self._available is None:
+            self._detect()
+        return bool(self._available)
+
+    def _detect(self) -> None:
+        # Bridge I/O uses select() on pipes and process groups
+        if self.size < 1 or os.name != "posix":
+            self._available = False
+            return
+        self._soffice = _find_soffice()
+        self._uno_python = _find_uno_python(self._uno_python_setting) if self._soffice else None
+        self._available = bool(self._soffice and self._uno_python)
+        if not self._available:
+            logger.warning(
+                "[SOFFICE_POOL] Disabled - "
+                + ("soffice not found" if not self._soffice else "no interpreter with pyuno (install python3-uno)")
+                + "; falling back to per-call conversion"
+            )
+
+    def start(self) -> bool:
+        """
+        Start all instances (idempotent). Safe to call at app startup to
+        take the cold start off the first proposal.
+
+        Returns:
+            True if at least one instance is running
+        """
+        with self._start_lock:
+            if self._started:
+                return bool(self._instances)
+            if not self.available:
+                return False
+
+            instances = [
+                _SofficeInstance(i, self._soffice, self._uno_python, self._profile_root)
+                for i in range(self.size)
+            ]
+            errors: list[Exception] = []
+
+            def _start(instance: _SofficeInstance) -> None:
+                try:
+                    instance.start()
+                except Exception as e:
+                    instance.stop()
+                    errors.append(e)
+
+            threads = [threading.Thread(target=_start, args=(inst,), daemon=True) for inst in instances]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            for instance in instances:
+                if instance.is_alive():
+                    self._instances.append(instance)
+                    self._idle.put(instance)
+            for error in errors:
+                logger.error(f"[SOFFICE_POOL] {error}")
+
+            self._started = True
+            if not self._instances:
+                self._available = False
+                logger.error("[SOFFICE_POOL] No instance started; falling back to per-call conversion")
+                return False
+
+            logger.info(f"[SOFFICE_POOL] Started {len(self._instances)}/{self.size} instance(s)")
+            return True
+
+    def shutdown(self) -> None:
+        """Stop all instances."""
+        with self._start_lock:
+            for instance in self._instances:
+                instance.stop()
+            if self._instances:
+                logger.info("[SOFFICE_POOL] Shut down")
+            self._instances.clear()
+            self._idle = queue.Queue()
+            self._started = False
+
+    def _restart(self, instance: _SofficeInstance, reason: str) -> None:
+        """Restart an instance and return it to the idle queue."""
+        logger.warning(f"[SOFFICE_POOL] Restarting instance {instance.index}: {reason}")
+        with self._stats_lock:
+            self._restarts += 1
+        instance.restarts += 1
+        try:
+            instance.start()
+        except Exception as e:
+            logger.error(f"[SOFFICE_POOL] Instance {instance.index} failed to restart: {e}")
+            instance.stop()
+            with self._start_lock:
+                if instance in self._instances:
+                    self._instances.remove(instance)
+            if not self._instances:
+                self._available = False
+                logger.error("[SOFFICE_POOL] No healthy instances left; falling back to per-call conversion")
+            return
+        self._idle.put(instance)
+
+    def _release(self, instance: _SofficeInstance, healthy: bool, reason: str = "") -> None:
+        """Return an instance to the pool, restarting it in the background if needed."""
+        if healthy and instance.conversions < self.max_conversions:
+            self._idle.put(instance)
+            return
+        if healthy:
+            reason = f"reached {self.max_conversions} conversions"
+        threading.Thread(target=self._restart, args=(instance, reason), daemon=True).start()
+
+    def _acquire(self) -> _SofficeInstance:
+        """Take an idle instance, waiting up to convert_timeout."""
+        with self._stats_lock:
+            self._waiting += 1
+        try:
+            return self._idle.get(timeout=self.convert_timeout)
+        except queue.Empty:
+            raise SofficePoolError(f"no soffice instance free within {self.convert_timeout:.0f}s")
+        finally:
+            with self._stats_lock:
+                self._waiting -= 1
+
+    # =========================================================================
+    # CONVERSION
+    # =========================================================================
+
+    def convert(self, src: str, dst: str) -> str:
+        """
+        Convert a document to PDF on a pooled instance (blocking).
+
+        Args:
+            src: Input document path (.pptx)
+            dst: Output PDF path
+
+        Returns:
+            dst
+
+        Raises:
+            SofficePoolError: Pool unavailable, no instance free in time, or
+                the conversion failed (the caller should fall back)
+        """
+        if not self.start():
+            raise SofficePoolError("soffice pool unavailable")
+
+        # An instance failing its health check is restarted and the next free
+        # one tried; a second failure means soffice itself is broken
+        for _ in range(HEALTH_CHECK_ATTEMPTS):
+            instance = self._acquire()
+            if time.monotonic() - instance.last_used <= HEALTH_CHECK_INTERVAL or instance.ping():
+                break
+            self._release(instance, healthy=False, reason="failed health check")
+        else:
+            raise SofficePoolError(f"no soffice instance passed a health check in {HEALTH_CHECK_ATTEMPTS} attempts")
+
+        with self._stats_lock:
+            self._busy += 1
+        start = time.monotonic()
+        try:
+            reply = instance.call({"op": "convert", "src": src, "dst": dst}, self.convert_timeout)
+        except Exception as e:
+            # Hung or crashed - kill it so the next caller gets a fresh instance
+            with self._stats_lock:
+                self._failed += 1
+            self._release(instance, healthy=False, reason=str(e))
+            raise SofficePoolError(f"conversion failed: {e}") from e
+        finally:
+            with self._stats_lock:
+                self._busy -= 1
+
+        elapsed = time.monotonic() - start
+        instance.conversions += 1
+        instance.last_used = time.monotonic()
+
+        if not reply.get("ok") or not os.path.exists(dst) or os.path.getsize(dst) == 0:
+            with self._stats_lock:
+                self._failed += 1
+            self._release(instance, healthy=instance.is_alive(), reason="instance died")
+            raise SofficePoolError(f"conversion failed: {reply.get('error', 'no output produced')}")
+
+        with self._stats_lock:
+            self._completed += 1
+            self._total_seconds += elapsed
+        self._release(instance, healthy=True)
+        logger.info(f"[SOFFICE_POOL] Converted '{src}' on instance {instance.index} in {elapsed * 1000:.0f}ms")
+        return dst
+
+    async def convert_async(self, src: str, dst: str) -> str:
+        """Async wrapper for convert()."""
+        return await asyncio.to_thread(self.convert, src, dst)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get pool statistics (queue depth, utilisation, restarts)."""
+        with self._stats_lock:
+            completed = self._completed
+            return {
+                "available": self._available,
+                "size": self.size,
+                "running": sum(1 for inst in self._instances if inst.is_alive()),
+                "idle": self._idle.qsize(),
+                "busy": self._busy,
+                "queue_depth": self._waiting,
+                "completed": completed,
+                "failed": self._failed,
+                "restarts": self._restarts,
+                "avg_conversion_ms": round(self._total_seconds / completed * 1000) if completed else 0,
+            }
+
+
+# Global pool instance
+_pool: SofficePool | None = None
+
+
+def get_soffice_pool() -> SofficePool:
+    """Get or create the global soffice pool."""
+    global _pool
+    if _pool is None:
+        from app_settings import settings
+
+        _pool = SofficePool(
+            size=settings.soffice_pool_size,
+            max_conversions=settings.soffice_max_conversions,
+            convert_timeout=settings.soffice_convert_timeout,
+            uno_python=settings.soffice_python,
+        )
+    return _pool
+
+
+def set_soffice_pool(pool: SofficePool | None) -> None:
+    """Set a custom soffice pool (for testing)."""
+    global _pool
+    _pool = pool
+
+
+def shutdown_soffice_pool() -> None:
+    """Stop the global pool's soffice instances, if it was started."""
+    if _pool is not None:
+        _pool.shutdown()
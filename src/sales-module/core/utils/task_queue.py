@@ -1,6 +1,7 @@
 """
 Task queue manager for mockup generation.
 Limits concurrent mockup generation tasks to prevent memory exhaustion.
+CPU-heavy rendering is dispatched into the process-based RenderPool.
 """
 
 import asyncio
@@ -12,8 +13,11 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
+import numpy as np
 import psutil
 
+from core.utils.render_pool import RenderPool, get_render_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -54,16 +58,21 @@ class MockupTaskQueue:
     """
     Queue manager for mockup generation tasks.
     Limits concurrent executions to prevent memory exhaustion.
+
+    Tasks themselves are async (fetching photos/frames); the OpenCV work they
+    need is dispatched through render() / composite() into the RenderPool.
     """
 
-    def __init__(self, max_concurrent: int = 3):
+    def __init__(self, max_concurrent: int = 3, render_pool: RenderPool | None = None):
         """
         Initialize the task queue.
 
         Args:
             max_concurrent: Maximum number of concurrent mockup generation tasks (default: 3)
+            render_pool: Process pool for rendering (default: global render pool)
         """
         self.max_concurrent = max_concurrent
+        self._render_pool = render_pool
         self.current_tasks = 0
         self.queue: list[QueuedTask] = []
         self.active_tasks: dict[str, QueuedTask] = {}
@@ -238,6 +247,48 @@ class MockupTaskQueue:
             # Process next queued task
             await self._process_queue()
 
+    @property
+    def render_pool(self) -> RenderPool:
+        """Process pool that executes the CPU-heavy rendering."""
+        if self._render_pool is None:
+            self._render_pool = get_render_pool()
+        return self._render_pool
+
+    async def render(self, jobs: list) -> list:
+        """
+        Render mockup jobs in the render pool (off the event loop).
+
+        Args:
+            jobs: List of generators.mockup.MockupRenderJob
+
+        Returns:
+            Output path per job (None for failures), in job order
+        """
+        return await self.render_pool.render_jobs(jobs)
+
+    async def composite(
+        self,
+        billboard: np.ndarray,
+        creative: np.ndarray,
+        frame_points: list[list[float]],
+        config: dict | None = None,
+        time_of_day: str = "day",
+    ) -> np.ndarray:
+        """
+        Composite decoded images in the render pool via shared memory.
+
+        Args:
+            billboard: Billboard photo (BGR, uint8)
+            creative: Creative image (BGR, uint8)
+            frame_points: 4 corner points defining the billboard frame
+            config: Optional effect config dict
+            time_of_day: "day" or "night"
+
+        Returns:
+            Composited result (BGR, uint8)
+        """
+        return await self.render_pool.composite(billboard, creative, frame_points, config, time_of_day)
+
     def get_queue_status(self) -> dict:
         """Get current queue status for monitoring."""
         pending_count = len([t for t in self.queue if t.started_at is None])
@@ -248,7 +299,8 @@ class MockupTaskQueue:
             "active_tasks": active_count,
             "queued_tasks": pending_count,
             "available_slots": self.max_concurrent - active_count,
-            "active_task_ids": list(self.active_tasks.keys())
+            "active_task_ids": list(self.active_tasks.keys()),
+            "render_pool": self.render_pool.get_stats(),
         }
 
     async def update_max_concurrent(self, new_max: int):
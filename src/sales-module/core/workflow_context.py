@@ -6,6 +6,7 @@ This module provides a context object that can be passed through workflows
 
 Key optimizations:
 - Locations are loaded once at workflow start and reused
+- A LocationIndex is built once for name/fuzzy matching across the workflow
 - Frames are cached per-location within the workflow
 - O(1) lookups instead of database queries
 """
@@ -13,6 +14,8 @@ Key optimizations:
 from dataclasses import dataclass, field
 from typing import Any
 
+from core.utils.location_matcher import LocationIndex
+
 
 @dataclass
 class WorkflowContext:
@@ -38,6 +41,7 @@ class WorkflowContext:
     user_name: str | None = None
     user_companies: list[str] = field(default_factory=list)
     locations: dict[str, dict[str, Any]] = field(default_factory=dict)
+    location_index: LocationIndex = field(default_factory=LocationIndex)
     _frames_cache: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
     _networks_cache: dict[str, dict[str, Any]] = field(default_factory=dict)
 
@@ -77,6 +81,7 @@ class WorkflowContext:
             user_name=user_name,
             user_companies=user_companies or [],
             locations=locations_dict,
+            location_index=LocationIndex(locations_list or []),
         )
 
     def get_display_name(self) -> str:
@@ -10,9 +10,20 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from crm_utils import PooledConnection, SQLiteConnectionPool
+
+from app_settings import settings
+from core.utils.time import get_uae_time
 from db.base import DatabaseBackend
+from db.chat_messages import message_to_row, page_bounds, row_to_message
+from db.cost_rollups import (
+    ROLLUP_FIELDS,
+    ROLLUP_KEY,
+    group_raw_costs,
+    plan_cost_range,
+    summarize_cost_buckets,
+)
 from db.schema import get_sqlite_schema
-from core.utils.time import get_uae_time
 
 logger = logging.getLogger("proposal-bot")
 
@@ -21,6 +32,28 @@ logger = logging.getLogger("proposal-bot")
 # To modify the schema, edit db/schema.py and run: python -m db.schema --generate sqlite
 SCHEMA = get_sqlite_schema()
 
+_ROLLUP_COLUMNS = ", ".join((*ROLLUP_KEY, "calls", *ROLLUP_FIELDS))
+_ROLLUP_UPDATES = ",\n            ".join(
+    f"{f} = {f} + excluded.{f}" for f in ("calls", *ROLLUP_FIELDS)
+)
+_ROLLUP_BUCKETS = {"ai_costs_daily": 10, "ai_costs_hourly": 13}  # Timestamp prefix length
+
+# Keep ai_costs_daily/ai_costs_hourly current in the inserting transaction
+AI_COSTS_ROLLUP_TRIGGER = "CREATE TRIGGER IF NOT EXISTS ai_costs_rollup AFTER INSERT ON ai_costs\nBEGIN\n" + "".join(
+    f"""
+    INSERT INTO {table} ({_ROLLUP_COLUMNS})
+    VALUES (
+        substr(NEW.timestamp, 1, {length}), NEW.call_type, COALESCE(NEW.workflow, ''), NEW.model,
+        COALESCE(NEW.user_id, ''), 1, COALESCE(NEW.total_tokens, 0), COALESCE(NEW.total_cost, 0),
+        COALESCE(NEW.input_tokens, 0), COALESCE(NEW.output_tokens, 0),
+        COALESCE(NEW.reasoning_tokens, 0), COALESCE(NEW.cached_input_tokens, 0)
+    )
+    ON CONFLICT ({", ".join(ROLLUP_KEY)}) DO UPDATE SET
+            {_ROLLUP_UPDATES};
+"""
+    for table, length in _ROLLUP_BUCKETS.items()
+) + "END;"
+
 
 class SQLiteBackend(DatabaseBackend):
     """SQLite database backend implementation."""
@@ -56,18 +89,28 @@ class SQLiteBackend(DatabaseBackend):
                     self._db_path = Path(__file__).parent.parent / "proposals.db"
                     logger.info(f"[DB] Using local development database at {self._db_path}")
 
+        self._pool = SQLiteConnectionPool(
+            self._db_path,
+            setup=self._configure_connection,
+            max_size=settings.db_pool_size,
+            cached_statements=settings.db_statement_cache_size,
+        )
+
     @property
     def name(self) -> str:
         return "sqlite"
 
-    def _connect(self) -> sqlite3.Connection:
-        """Create a database connection."""
-        conn = sqlite3.connect(self._db_path, timeout=5.0, isolation_level=None)
+    @staticmethod
+    def _configure_connection(conn: sqlite3.Connection) -> None:
+        """PRAGMAs for a new connection (runs once per pooled connection)."""
         conn.execute("PRAGMA journal_mode=WAL;")
         conn.execute("PRAGMA busy_timeout=5000;")
         conn.execute("PRAGMA synchronous=NORMAL;")
         conn.execute("PRAGMA cache_size=-2000;")
-        return conn
+
+    def _connect(self) -> PooledConnection:
+        """Get this thread's pooled connection; close() returns it to the pool."""
+        return self._pool.connect()
 
     def init_db(self) -> None:
         """Initialize database with schema."""
@@ -75,10 +118,39 @@ class SQLiteBackend(DatabaseBackend):
         try:
             self._run_migrations(conn)
             conn.executescript(SCHEMA)
+            self._ensure_cost_rollups(conn)
+            self._migrate_chat_blobs(conn)
             logger.info("[DB] Database initialized with current schema")
         finally:
             conn.close()
 
+    def _ensure_cost_rollups(self, conn: sqlite3.Connection) -> None:
+        """Create the ai_costs rollup trigger, backfilling rollups for existing rows."""
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type='trigger' AND name='ai_costs_rollup'").fetchone():
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM ai_costs_daily")
+            conn.execute("DELETE FROM ai_costs_hourly")
+            sums = ", ".join(f"COALESCE(SUM({f}), 0)" for f in ROLLUP_FIELDS)
+            for table, length in _ROLLUP_BUCKETS.items():
+                conn.execute(
+                    f"""
+                    INSERT INTO {table} ({_ROLLUP_COLUMNS})
+                    SELECT substr(timestamp, 1, {length}), call_type, COALESCE(workflow, ''), model,
+                           COALESCE(user_id, ''), COUNT(*), {sums}
+                    FROM ai_costs
+                    GROUP BY 1, 2, 3, 4, 5
+                    """
+                )
+            conn.execute(AI_COSTS_ROLLUP_TRIGGER)
+            conn.execute("COMMIT")
+            logger.info("[DB MIGRATION] Created ai_costs rollups")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
     def _run_migrations(self, conn: sqlite3.Connection) -> None:
         """Run database migrations for existing tables."""
         cursor = conn.cursor()
@@ -905,6 +977,129 @@ class SQLiteBackend(DatabaseBackend):
         finally:
             conn.close()
 
+    def log_ai_costs(self, rows: list[dict[str, Any]]) -> int:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN")
+            conn.executemany(
+                """
+                INSERT INTO ai_costs (
+                    timestamp, call_type, workflow, model, user_id, context,
+                    input_tokens, cached_input_tokens, output_tokens, reasoning_tokens, total_tokens,
+                    input_cost, output_cost, reasoning_cost, total_cost,
+                    metadata_json
+                ) VALUES (
+                    :timestamp, :call_type, :workflow, :model, :user_id, :context,
+                    :input_tokens, :cached_input_tokens, :output_tokens, :reasoning_tokens, :total_tokens,
+                    :input_cost, :output_cost, :reasoning_cost, :total_cost,
+                    :metadata_json
+                )
+                """,
+                rows,
+            )
+            conn.execute("COMMIT")
+            return len(rows)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _ai_costs_where(
+        self,
+        start_date: str | None,
+        end_date: str | None,
+        call_type: str | None,
+        workflow: str | None,
+        user_id: str | None,
+    ) -> tuple[str, list[Any]]:
+        """Build the WHERE clause shared by the AI cost queries."""
+        where_parts = []
+        params = []
+
+        if start_date:
+            where_parts.append("timestamp >= ?")
+            params.append(start_date)
+        if end_date:
+            end_date_full = f"{end_date}T23:59:59" if 'T' not in end_date else end_date
+            where_parts.append("timestamp <= ?")
+            params.append(end_date_full)
+        if call_type:
+            where_parts.append("call_type = ?")
+            params.append(call_type)
+        if workflow:
+            where_parts.append("workflow = ?")
+            params.append(workflow)
+        if user_id:
+            where_parts.append("user_id = ?")
+            params.append(user_id)
+
+        return (" AND ".join(where_parts) if where_parts else "1=1"), params
+
+    def _recent_ai_costs(
+        self,
+        cursor: sqlite3.Cursor,
+        where_clause: str,
+        params: list[Any],
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        cursor.execute(
+            f"""
+            SELECT id, timestamp, call_type, workflow, model, input_tokens, output_tokens,
+                   reasoning_tokens, cached_input_tokens, total_cost, user_id
+            FROM ai_costs WHERE {where_clause}
+            ORDER BY timestamp DESC LIMIT ?
+            """,
+            [*params, limit]
+        )
+        return [{
+            "id": r[0], "timestamp": r[1], "call_type": r[2], "workflow": r[3],
+            "model": r[4], "input_tokens": r[5], "output_tokens": r[6],
+            "reasoning_tokens": r[7], "cached_input_tokens": r[8],
+            "total_cost": r[9], "user_id": r[10]
+        } for r in cursor.fetchall()]
+
+    def get_ai_cost_rollup(self) -> list[dict[str, Any]]:
+        conn = self._connect()
+        try:
+            return self._cost_rollup_rows(conn, "ai_costs_daily", [], [])
+        finally:
+            conn.close()
+
+    def _cost_rollup_rows(
+        self,
+        conn: sqlite3.Connection,
+        table: str,
+        where_parts: list[str],
+        params: list[Any],
+    ) -> list[dict[str, Any]]:
+        where_clause = " AND ".join(where_parts) if where_parts else "1=1"
+        cursor = conn.execute(f"SELECT {_ROLLUP_COLUMNS} FROM {table} WHERE {where_clause}", params)
+        columns = [d[0] for d in cursor.description]
+        rows = []
+        for r in cursor.fetchall():
+            row = dict(zip(columns, r, strict=True))
+            row["workflow"] = row["workflow"] or None
+            row["user_id"] = row["user_id"] or None
+            rows.append(row)
+        return rows
+
+    def get_recent_ai_costs(
+        self,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        call_type: str | None = None,
+        workflow: str | None = None,
+        user_id: str | None = None,
+        limit: int = 100,
+    ) -> list[dict[str, Any]]:
+        conn = self._connect()
+        try:
+            where_clause, params = self._ai_costs_where(start_date, end_date, call_type, workflow, user_id)
+            return self._recent_ai_costs(conn.cursor(), where_clause, params, limit)
+        finally:
+            conn.close()
+
     def get_ai_costs_summary(
         self,
         start_date: str | None = None,
@@ -913,143 +1108,53 @@ class SQLiteBackend(DatabaseBackend):
         workflow: str | None = None,
         user_id: str | None = None,
     ) -> dict[str, Any]:
+        """Summarise AI costs from the rollup tables (see db/cost_rollups.py)."""
+        key_parts = []
+        key_params = []
+        for column, value in (("call_type", call_type), ("workflow", workflow), ("user_id", user_id)):
+            if value:
+                key_parts.append(f"{column} = ?")
+                key_params.append(value)
+
+        plan = plan_cost_range(start_date, end_date)
         conn = self._connect()
         try:
-            where_parts = []
-            params = []
-
-            if start_date:
-                where_parts.append("timestamp >= ?")
-                params.append(start_date)
-            if end_date:
-                end_date_full = f"{end_date}T23:59:59" if 'T' not in end_date else end_date
-                where_parts.append("timestamp <= ?")
-                params.append(end_date_full)
-            if call_type:
-                where_parts.append("call_type = ?")
-                params.append(call_type)
-            if workflow:
-                where_parts.append("workflow = ?")
-                params.append(workflow)
-            if user_id:
-                where_parts.append("user_id = ?")
-                params.append(user_id)
-
-            where_clause = " AND ".join(where_parts) if where_parts else "1=1"
-
-            cursor = conn.cursor()
-
-            # Get totals
-            cursor.execute(
-                f"""
-                SELECT
-                    COUNT(*) as total_calls,
-                    SUM(total_tokens) as total_tokens,
-                    SUM(total_cost) as total_cost,
-                    SUM(input_tokens) as total_input_tokens,
-                    SUM(output_tokens) as total_output_tokens,
-                    SUM(reasoning_tokens) as total_reasoning_tokens
-                FROM ai_costs
-                WHERE {where_clause}
-                """,
-                params
-            )
-            row = cursor.fetchone()
-
-            # Get breakdown by call_type
-            cursor.execute(
-                f"""
-                SELECT call_type, COUNT(*) as calls, SUM(total_tokens) as tokens, SUM(total_cost) as cost
-                FROM ai_costs WHERE {where_clause}
-                GROUP BY call_type ORDER BY cost DESC
-                """,
-                params
-            )
-            by_call_type = {r[0]: {"calls": r[1], "tokens": r[2], "cost": r[3]} for r in cursor.fetchall()}
-
-            # Get breakdown by workflow
-            cursor.execute(
-                f"""
-                SELECT workflow, COUNT(*) as calls, SUM(total_tokens) as tokens, SUM(total_cost) as cost
-                FROM ai_costs WHERE {where_clause}
-                GROUP BY workflow ORDER BY cost DESC
-                """,
-                params
-            )
-            by_workflow = {r[0]: {"calls": r[1], "tokens": r[2], "cost": r[3]} for r in cursor.fetchall()}
-
-            # Get breakdown by model
-            cursor.execute(
-                f"""
-                SELECT model, COUNT(*) as calls, SUM(total_tokens) as tokens, SUM(total_cost) as cost
-                FROM ai_costs WHERE {where_clause}
-                GROUP BY model ORDER BY cost DESC
-                """,
-                params
-            )
-            by_model = {r[0]: {"calls": r[1], "tokens": r[2], "cost": r[3]} for r in cursor.fetchall()}
-
-            # Get breakdown by user
-            cursor.execute(
-                f"""
-                SELECT user_id, COUNT(*) as calls, SUM(total_tokens) as tokens, SUM(total_cost) as cost
-                FROM ai_costs WHERE {where_clause} AND user_id IS NOT NULL
-                GROUP BY user_id ORDER BY cost DESC
-                """,
-                params
-            )
-            by_user = {r[0]: {"calls": r[1], "tokens": r[2], "cost": r[3]} for r in cursor.fetchall()}
-
-            # Get daily breakdown
-            cursor.execute(
-                f"""
-                SELECT DATE(timestamp) as date, COUNT(*) as calls, SUM(total_cost) as cost
-                FROM ai_costs WHERE {where_clause}
-                GROUP BY DATE(timestamp) ORDER BY date ASC
-                """,
-                params
-            )
-            daily_costs = [{"date": r[0], "calls": r[1], "cost": r[2]} for r in cursor.fetchall()]
+            buckets = []
+            for table, bounds, upper in (
+                ("ai_costs_daily", plan.daily, "<="),
+                ("ai_costs_hourly", plan.hourly, "<"),
+            ):
+                if bounds is None:
+                    continue
+                where_parts = list(key_parts)
+                params = list(key_params)
+                if bounds[0]:
+                    where_parts.append("bucket >= ?")
+                    params.append(bounds[0])
+                if bounds[1]:
+                    where_parts.append(f"bucket {upper} ?")
+                    params.append(bounds[1])
+                buckets.extend(self._cost_rollup_rows(conn, table, where_parts, params))
+
+            # Partial hours at the edges of a time-of-day filter
+            for range_start, range_end, inclusive in plan.raw:
+                where_parts = [*key_parts, "timestamp >= ?", f"timestamp {'<=' if inclusive else '<'} ?"]
+                cursor = conn.execute(
+                    f"""
+                    SELECT timestamp, {", ".join(ROLLUP_KEY[1:])}, {", ".join(ROLLUP_FIELDS)}
+                    FROM ai_costs WHERE {" AND ".join(where_parts)}
+                    """,
+                    [*key_params, range_start, range_end],
+                )
+                columns = [d[0] for d in cursor.description]
+                buckets.extend(group_raw_costs([dict(zip(columns, r, strict=True)) for r in cursor.fetchall()]))
 
-            # Get cached tokens total
-            cursor.execute(
-                f"SELECT SUM(cached_input_tokens) FROM ai_costs WHERE {where_clause}",
-                params
-            )
-            total_cached_tokens = cursor.fetchone()[0] or 0
+            summary = summarize_cost_buckets(buckets)
 
             # Get recent calls
-            cursor.execute(
-                f"""
-                SELECT id, timestamp, call_type, workflow, model, input_tokens, output_tokens,
-                       reasoning_tokens, cached_input_tokens, total_cost, user_id
-                FROM ai_costs WHERE {where_clause}
-                ORDER BY timestamp DESC LIMIT 100
-                """,
-                params
-            )
-            calls = [{
-                "id": r[0], "timestamp": r[1], "call_type": r[2], "workflow": r[3],
-                "model": r[4], "input_tokens": r[5], "output_tokens": r[6],
-                "reasoning_tokens": r[7], "cached_input_tokens": r[8],
-                "total_cost": r[9], "user_id": r[10]
-            } for r in cursor.fetchall()]
-
-            return {
-                "total_calls": row[0] or 0,
-                "total_tokens": row[1] or 0,
-                "total_cost": row[2] or 0.0,
-                "total_input_tokens": row[3] or 0,
-                "total_output_tokens": row[4] or 0,
-                "total_reasoning_tokens": row[5] or 0,
-                "total_cached_tokens": total_cached_tokens,
-                "by_call_type": by_call_type,
-                "by_workflow": by_workflow,
-                "by_model": by_model,
-                "by_user": by_user,
-                "daily_costs": daily_costs,
-                "calls": calls
-            }
+            where_clause, params = self._ai_costs_where(start_date, end_date, call_type, workflow, user_id)
+            summary["calls"] = self._recent_ai_costs(conn.cursor(), where_clause, params, 100)
+            return summary
         finally:
             conn.close()
 
@@ -1058,6 +1163,8 @@ class SQLiteBackend(DatabaseBackend):
         try:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM ai_costs")
+            cursor.execute("DELETE FROM ai_costs_daily")
+            cursor.execute("DELETE FROM ai_costs_hourly")
             conn.commit()
             logger.info("[DB] Cleared all AI cost tracking data")
         finally:
@@ -1608,6 +1715,32 @@ class SQLiteBackend(DatabaseBackend):
         finally:
             conn.close()
 
+    def log_audit_events(self, events: list[dict[str, Any]]) -> int:
+        """Log many audit events in one transaction. Raises on failure."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN")
+            conn.executemany(
+                """
+                INSERT INTO audit_log (
+                    timestamp, user_id, action, resource_type, resource_id,
+                    details_json, ip_address, user_agent
+                ) VALUES (
+                    :timestamp, :user_id, :action, :resource_type, :resource_id,
+                    :details_json, :ip_address, :user_agent
+                )
+                """,
+                events,
+            )
+            conn.execute("COMMIT")
+            return len(events)
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
     def query_audit_log(
         self,
         user_id: str | None = None,
@@ -1692,15 +1825,96 @@ class SQLiteBackend(DatabaseBackend):
     # CHAT SESSIONS
     # =========================================================================
 
+    def _insert_chat_messages(
+        self,
+        conn: sqlite3.Connection,
+        user_id: str,
+        session_id: str,
+        first_seq: int,
+        messages: list[dict[str, Any]],
+        now: str,
+    ) -> None:
+        rows = []
+        for seq, message in enumerate(messages, start=first_seq):
+            row = message_to_row(message)
+            rows.append((
+                user_id, session_id, seq, row["role"], row["content"],
+                json.dumps(row["attachments"]) if row["attachments"] is not None else None,
+                json.dumps(row["extra"]) if row["extra"] is not None else None,
+                now,
+            ))
+        conn.executemany(
+            """
+            INSERT INTO chat_messages (user_id, session_id, seq, role, content, attachments, extra, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+
+    def _read_chat_messages(
+        self,
+        conn: sqlite3.Connection,
+        user_id: str,
+        start: int,
+        end: int,
+    ) -> list[dict[str, Any]]:
+        cursor = conn.execute(
+            """
+            SELECT role, content, attachments, extra FROM chat_messages
+            WHERE user_id = ? AND seq >= ? AND seq < ?
+            ORDER BY seq
+            """,
+            (user_id, start, end),
+        )
+        return [
+            row_to_message({
+                "role": role,
+                "content": content,
+                "attachments": json.loads(attachments) if attachments else None,
+                "extra": json.loads(extra) if extra else None,
+            })
+            for role, content, attachments, extra in cursor.fetchall()
+        ]
+
+    def _migrate_chat_blobs(self, conn: sqlite3.Connection) -> None:
+        """Move chat_sessions.messages blobs into chat_messages rows."""
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(chat_sessions)").fetchall()]
+        if "message_count" not in columns:
+            logger.info("[DB MIGRATION] Adding message_count column to chat_sessions")
+            conn.execute("ALTER TABLE chat_sessions ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0")
+
+        pending = conn.execute(
+            "SELECT user_id, session_id, messages FROM chat_sessions WHERE messages != '[]'"
+        ).fetchall()
+        if not pending:
+            return
+
+        now = datetime.now().isoformat()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for user_id, session_id, blob in pending:
+                messages = [m for m in json.loads(blob or "[]") if isinstance(m, dict)]
+                conn.execute("DELETE FROM chat_messages WHERE user_id = ?", (user_id,))
+                self._insert_chat_messages(conn, user_id, session_id, 0, messages, now)
+                conn.execute(
+                    "UPDATE chat_sessions SET messages = '[]', message_count = ? WHERE user_id = ?",
+                    (len(messages), user_id),
+                )
+            conn.execute("COMMIT")
+            logger.info(f"[DB MIGRATION] Moved {len(pending)} chat sessions to chat_messages")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
     def save_chat_session(
         self,
         user_id: str,
         messages: list[dict[str, Any]],
         session_id: str | None = None,
     ) -> bool:
-        """Save or update a user's chat session."""
+        """Save or update a user's chat session (full replacement)."""
         import uuid
-        from datetime import datetime
 
         now = datetime.now().isoformat()
         if not session_id:
@@ -1708,63 +1922,92 @@ class SQLiteBackend(DatabaseBackend):
 
         conn = self._connect()
         try:
-            conn.execute("BEGIN")
+            conn.execute("BEGIN IMMEDIATE")
             conn.execute(
                 """
-                INSERT INTO chat_sessions (user_id, session_id, messages, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT INTO chat_sessions (user_id, session_id, messages, message_count, created_at, updated_at)
+                VALUES (?, ?, '[]', ?, ?, ?)
                 ON CONFLICT(user_id) DO UPDATE SET
-                    messages = excluded.messages,
+                    message_count = excluded.message_count,
                     updated_at = excluded.updated_at
                 """,
-                (user_id, session_id, json.dumps(messages), now, now),
+                (user_id, session_id, len(messages), now, now),
             )
+            (session_id,) = conn.execute(
+                "SELECT session_id FROM chat_sessions WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            conn.execute("DELETE FROM chat_messages WHERE user_id = ?", (user_id,))
+            self._insert_chat_messages(conn, user_id, session_id, 0, messages, now)
             conn.execute("COMMIT")
             logger.debug(f"[DB] Saved chat session for user: {user_id} ({len(messages)} messages)")
             return True
         except Exception as e:
-            conn.execute("ROLLBACK")
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
             logger.error(f"[DB] Error saving chat session for {user_id}: {e}")
             return False
         finally:
             conn.close()
 
-    def get_chat_session(self, user_id: str) -> dict[str, Any] | None:
+    def get_chat_session(self, user_id: str, include_messages: bool = True) -> dict[str, Any] | None:
         """Get a user's chat session."""
         conn = self._connect()
         try:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT session_id, messages, created_at, updated_at FROM chat_sessions WHERE user_id = ?",
+            row = conn.execute(
+                "SELECT session_id, message_count, created_at, updated_at FROM chat_sessions WHERE user_id = ?",
                 (user_id,)
-            )
-            row = cursor.fetchone()
+            ).fetchone()
             if not row:
                 return None
 
-            return {
+            session = {
                 "session_id": row[0],
-                "messages": json.loads(row[1]) if row[1] else [],
+                "message_count": row[1],
                 "created_at": row[2],
                 "updated_at": row[3],
             }
+            if include_messages:
+                session["messages"] = self._read_chat_messages(conn, user_id, 0, row[1])
+            return session
         except Exception as e:
             logger.error(f"[DB] Error getting chat session for {user_id}: {e}")
             return None
         finally:
             conn.close()
 
+    def get_chat_messages(
+        self,
+        user_id: str,
+        limit: int | None = None,
+        offset: int = 0,
+        newest_first: bool = False,
+    ) -> list[dict[str, Any]]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT message_count FROM chat_sessions WHERE user_id = ?", (user_id,)).fetchone()
+            if not row:
+                return []
+            start, end = page_bounds(row[0], limit, offset, newest_first)
+            return self._read_chat_messages(conn, user_id, start, end)
+        except Exception as e:
+            logger.error(f"[DB] Error getting chat messages for {user_id}: {e}")
+            return []
+        finally:
+            conn.close()
+
     def delete_chat_session(self, user_id: str) -> bool:
         """Delete a user's chat session."""
         conn = self._connect()
         try:
             conn.execute("BEGIN")
+            conn.execute("DELETE FROM chat_messages WHERE user_id = ?", (user_id,))
             conn.execute("DELETE FROM chat_sessions WHERE user_id = ?", (user_id,))
             conn.execute("COMMIT")
             logger.info(f"[DB] Deleted chat session for user: {user_id}")
             return True
         except Exception as e:
-            conn.execute("ROLLBACK")
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
             logger.error(f"[DB] Error deleting chat session for {user_id}: {e}")
             return False
         finally:
@@ -1779,11 +2022,10 @@ class SQLiteBackend(DatabaseBackend):
         """
         Append messages to a user's chat session.
 
-        For SQLite, we read-modify-write since we don't have RPC.
-        Uses a transaction for safety.
+        Reserves a seq range by bumping message_count, then inserts only the
+        new rows. BEGIN IMMEDIATE serialises concurrent appends.
         """
         import uuid
-        from datetime import datetime
 
         if not new_messages:
             return True
@@ -1791,41 +2033,30 @@ class SQLiteBackend(DatabaseBackend):
         now = datetime.now().isoformat()
         conn = self._connect()
         try:
-            conn.execute("BEGIN")
-
-            # Get existing messages
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT session_id, messages FROM chat_sessions WHERE user_id = ?",
-                (user_id,)
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                """
+                INSERT INTO chat_sessions (user_id, session_id, messages, message_count, created_at, updated_at)
+                VALUES (?, ?, '[]', ?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    message_count = message_count + excluded.message_count,
+                    updated_at = excluded.updated_at
+                """,
+                (user_id, session_id or str(uuid.uuid4()), len(new_messages), now, now),
+            )
+            existing_session_id, message_count = conn.execute(
+                "SELECT session_id, message_count FROM chat_sessions WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            self._insert_chat_messages(
+                conn, user_id, existing_session_id, message_count - len(new_messages), new_messages, now
             )
-            row = cursor.fetchone()
-
-            if row:
-                existing_session_id = row[0]
-                existing_messages = json.loads(row[1]) if row[1] else []
-                combined = existing_messages + new_messages
-
-                conn.execute(
-                    "UPDATE chat_sessions SET messages = ?, updated_at = ? WHERE user_id = ?",
-                    (json.dumps(combined), now, user_id)
-                )
-            else:
-                # No existing session - create one
-                new_session_id = session_id or str(uuid.uuid4())
-                conn.execute(
-                    """
-                    INSERT INTO chat_sessions (user_id, session_id, messages, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
-                    (user_id, new_session_id, json.dumps(new_messages), now, now)
-                )
 
             conn.execute("COMMIT")
             logger.info(f"[DB] Appended {len(new_messages)} messages for user: {user_id}")
             return True
         except Exception as e:
-            conn.execute("ROLLBACK")
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
             logger.error(f"[DB] Error appending chat messages for {user_id}: {e}")
             return False
         finally:
@@ -21,6 +21,14 @@ from typing import Any
 
 from config import COMPANY_SCHEMAS
 from db.base import DatabaseBackend
+from db.chat_messages import page_bounds, row_to_message
+from db.cost_rollups import (
+    ROLLUP_FIELDS,
+    ROLLUP_KEY,
+    group_raw_costs,
+    plan_cost_range,
+    summarize_cost_buckets,
+)
 from db.schema import get_table_names
 from core.utils.time import get_uae_time
 
@@ -1144,6 +1152,107 @@ class SupabaseBackend(DatabaseBackend):
             logger.error(f"[SUPABASE] Failed to log AI cost for {call_type}: {e}", exc_info=True)
             # Don't raise - cost logging is non-critical and shouldn't block main flow
 
+    def log_ai_costs(self, rows: list[dict[str, Any]]) -> int:
+        client = self._get_client()
+        client.table("ai_costs").insert(rows).execute()
+        return len(rows)
+
+    def get_ai_cost_rollup(self) -> list[dict[str, Any]]:
+        return self._cost_rollup_rows("ai_costs_daily")
+
+    def _cost_rollup_rows(
+        self,
+        table: str,
+        bucket_from: str | None = None,
+        bucket_to: str | None = None,
+        to_inclusive: bool = True,
+        filters: dict[str, str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Read a cost rollup table, paging through rows."""
+        client = self._get_client()
+        rows: list[dict[str, Any]] = []
+        page_size = 1000
+        offset = 0
+
+        while True:
+            query = client.table(table).select(",".join(("calls", *ROLLUP_KEY, *ROLLUP_FIELDS)))
+            if bucket_from:
+                query = query.gte("bucket", bucket_from)
+            if bucket_to:
+                query = query.lte("bucket", bucket_to) if to_inclusive else query.lt("bucket", bucket_to)
+            for column, value in (filters or {}).items():
+                query = query.eq(column, value)
+            for column in ROLLUP_KEY:
+                query = query.order(column)
+            page = query.range(offset, offset + page_size - 1).execute().data or []
+
+            for r in page:
+                r["workflow"] = r["workflow"] or None
+                r["user_id"] = r["user_id"] or None
+            rows.extend(page)
+
+            if len(page) < page_size:
+                return rows
+            offset += page_size
+
+    def _raw_cost_buckets(
+        self,
+        range_start: str,
+        range_end: str,
+        to_inclusive: bool,
+        filters: dict[str, str],
+    ) -> list[dict[str, Any]]:
+        """Group raw ai_costs rows in a UAE-local timestamp range into hourly buckets."""
+        client = self._get_client()
+        rows: list[dict[str, Any]] = []
+        page_size = 1000
+        offset = 0
+
+        while True:
+            query = client.table("ai_costs").select(
+                ",".join(("id", "timestamp", *ROLLUP_KEY[1:], *ROLLUP_FIELDS))
+            ).gte("timestamp", f"{range_start}+04:00")
+            if to_inclusive:
+                query = query.lte("timestamp", f"{range_end}+04:00")
+            else:
+                query = query.lt("timestamp", f"{range_end}+04:00")
+            for column, value in filters.items():
+                query = query.eq(column, value)
+            page = query.order("id").range(offset, offset + page_size - 1).execute().data or []
+            rows.extend(page)
+
+            if len(page) < page_size:
+                return group_raw_costs(rows, local_hours=True)
+            offset += page_size
+
+    def get_recent_ai_costs(
+        self,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        call_type: str | None = None,
+        workflow: str | None = None,
+        user_id: str | None = None,
+        limit: int = 100,
+    ) -> list[dict[str, Any]]:
+        client = self._get_client()
+        query = client.table("ai_costs").select(
+            "id,timestamp,call_type,workflow,model,input_tokens,output_tokens,reasoning_tokens,cached_input_tokens,total_cost,user_id"
+        )
+        if start_date:
+            query = query.gte("timestamp", start_date)
+        if end_date:
+            end_date_full = f"{end_date}T23:59:59" if 'T' not in end_date else end_date
+            query = query.lte("timestamp", end_date_full)
+        if call_type:
+            query = query.eq("call_type", call_type)
+        if workflow:
+            query = query.eq("workflow", workflow)
+        if user_id:
+            query = query.eq("user_id", user_id)
+
+        response = query.order("timestamp", desc=True).limit(limit).execute()
+        return response.data or []
+
     def get_ai_costs_summary(
         self,
         start_date: str | None = None,
@@ -1174,119 +1283,27 @@ class SupabaseBackend(DatabaseBackend):
             return cached
 
         try:
-            client = self._get_client()
-
-            # Build query with filters
-            query = client.table("ai_costs").select("*")
-
-            if start_date:
-                query = query.gte("timestamp", start_date)
-            if end_date:
-                end_date_full = f"{end_date}T23:59:59" if 'T' not in end_date else end_date
-                query = query.lte("timestamp", end_date_full)
-            if call_type:
-                query = query.eq("call_type", call_type)
-            if workflow:
-                query = query.eq("workflow", workflow)
-            if user_id:
-                query = query.eq("user_id", user_id)
-
-            response = query.execute()
-            all_costs = response.data or []
-
-            # Calculate aggregations
-            total_calls = len(all_costs)
-            total_tokens = sum(c.get("total_tokens", 0) for c in all_costs)
-            total_cost = sum(c.get("total_cost", 0) for c in all_costs)
-            total_input = sum(c.get("input_tokens", 0) for c in all_costs)
-            total_output = sum(c.get("output_tokens", 0) for c in all_costs)
-            total_reasoning = sum(c.get("reasoning_tokens", 0) for c in all_costs)
-            total_cached = sum(c.get("cached_input_tokens", 0) for c in all_costs)
-
-            # Group by call_type
-            by_call_type = {}
-            for c in all_costs:
-                ct = c.get("call_type", "unknown")
-                if ct not in by_call_type:
-                    by_call_type[ct] = {"calls": 0, "tokens": 0, "cost": 0}
-                by_call_type[ct]["calls"] += 1
-                by_call_type[ct]["tokens"] += c.get("total_tokens", 0)
-                by_call_type[ct]["cost"] += c.get("total_cost", 0)
-
-            # Group by workflow
-            by_workflow = {}
-            for c in all_costs:
-                wf = c.get("workflow") or "none"
-                if wf not in by_workflow:
-                    by_workflow[wf] = {"calls": 0, "tokens": 0, "cost": 0}
-                by_workflow[wf]["calls"] += 1
-                by_workflow[wf]["tokens"] += c.get("total_tokens", 0)
-                by_workflow[wf]["cost"] += c.get("total_cost", 0)
-
-            # Group by model
-            by_model = {}
-            for c in all_costs:
-                m = c.get("model", "unknown")
-                if m not in by_model:
-                    by_model[m] = {"calls": 0, "tokens": 0, "cost": 0}
-                by_model[m]["calls"] += 1
-                by_model[m]["tokens"] += c.get("total_tokens", 0)
-                by_model[m]["cost"] += c.get("total_cost", 0)
-
-            # Group by user
-            by_user = {}
-            for c in all_costs:
-                u = c.get("user_id")
-                if u:
-                    if u not in by_user:
-                        by_user[u] = {"calls": 0, "tokens": 0, "cost": 0}
-                    by_user[u]["calls"] += 1
-                    by_user[u]["tokens"] += c.get("total_tokens", 0)
-                    by_user[u]["cost"] += c.get("total_cost", 0)
-
-            # Daily costs
-            daily = {}
-            for c in all_costs:
-                date = c.get("timestamp", "")[:10]
-                if date not in daily:
-                    daily[date] = {"calls": 0, "cost": 0}
-                daily[date]["calls"] += 1
-                daily[date]["cost"] += c.get("total_cost", 0)
-
-            daily_costs = [{"date": d, "calls": v["calls"], "cost": v["cost"]} for d, v in sorted(daily.items())]
-
-            # Recent calls
-            recent_response = client.table("ai_costs").select(
-                "id,timestamp,call_type,workflow,model,input_tokens,output_tokens,reasoning_tokens,cached_input_tokens,total_cost,user_id"
-            ).order("timestamp", desc=True).limit(100).execute()
-
-            calls = [
-                {
-                    "id": r["id"], "timestamp": r["timestamp"], "call_type": r["call_type"],
-                    "workflow": r["workflow"], "model": r["model"], "input_tokens": r["input_tokens"],
-                    "output_tokens": r["output_tokens"], "reasoning_tokens": r["reasoning_tokens"],
-                    "cached_input_tokens": r["cached_input_tokens"], "total_cost": r["total_cost"],
-                    "user_id": r["user_id"]
-                }
-                for r in (recent_response.data or [])
-            ]
-
-            result = {
-                "total_calls": total_calls,
-                "total_tokens": total_tokens,
-                "total_cost": total_cost,
-                "total_input_tokens": total_input,
-                "total_output_tokens": total_output,
-                "total_reasoning_tokens": total_reasoning,
-                "total_cached_tokens": total_cached,
-                "by_call_type": by_call_type,
-                "by_workflow": by_workflow,
-                "by_model": by_model,
-                "by_user": by_user,
-                "daily_costs": daily_costs,
-                "calls": calls
+            filters = {
+                column: value
+                for column, value in (("call_type", call_type), ("workflow", workflow), ("user_id", user_id))
+                if value
             }
 
+            # Whole days/hours come from the rollup tables, partial edge hours from raw rows
+            plan = plan_cost_range(start_date, end_date)
+            buckets = []
+            if plan.daily is not None:
+                buckets.extend(self._cost_rollup_rows("ai_costs_daily", *plan.daily, filters=filters))
+            if plan.hourly is not None:
+                buckets.extend(self._cost_rollup_rows(
+                    "ai_costs_hourly", *plan.hourly, to_inclusive=False, filters=filters
+                ))
+            for range_start, range_end, inclusive in plan.raw:
+                buckets.extend(self._raw_cost_buckets(range_start, range_end, inclusive, filters))
+
+            result = summarize_cost_buckets(buckets)
+            result["calls"] = self.get_recent_ai_costs(start_date, end_date, call_type, workflow, user_id)
+
             # Cache the result
             _run_async(self._cache_set(cache_key, result, ttl=AI_COSTS_CACHE_TTL))
 
@@ -1315,6 +1332,8 @@ class SupabaseBackend(DatabaseBackend):
             client = self._get_client()
             # Delete all records - Supabase doesn't have a truncate
             client.table("ai_costs").delete().neq("id", 0).execute()
+            client.table("ai_costs_daily").delete().neq("bucket", "").execute()
+            client.table("ai_costs_hourly").delete().neq("bucket", "").execute()
             logger.info("[SUPABASE] Cleared all AI cost tracking data")
         except Exception as e:
             logger.error(f"[SUPABASE] Failed to clear AI costs: {e}", exc_info=True)
@@ -1888,6 +1907,12 @@ class SupabaseBackend(DatabaseBackend):
         except Exception as e:
             logger.error(f"[SUPABASE] Error logging audit event: {e}")
 
+    def log_audit_events(self, events: list[dict[str, Any]]) -> int:
+        """Log many audit events in one insert. Raises on failure."""
+        client = self._get_client()
+        client.table("audit_log").insert(events).execute()
+        return len(events)
+
     def query_audit_log(
         self,
         user_id: str | None = None,
@@ -1962,14 +1987,13 @@ class SupabaseBackend(DatabaseBackend):
         try:
             client = self._get_client()
 
-            # Upsert based on user_id (one session per user)
-            client.table("chat_sessions").upsert({
-                "user_id": user_id,
-                "session_id": session_id,
-                "messages": messages,  # Supabase handles JSON serialization
-                "created_at": now,
-                "updated_at": now,
-            }, on_conflict="user_id").execute()
+            # Rewrites the session's chat_messages rows in one transaction
+            client.rpc("replace_chat_messages", {
+                "p_user_id": user_id,
+                "p_session_id": session_id,
+                "p_messages": messages,
+                "p_updated_at": now,
+            }).execute()
 
             # Invalidate cache
             _run_async(self._cache_delete(f"chat:{user_id}"))
@@ -1989,8 +2013,9 @@ class SupabaseBackend(DatabaseBackend):
         """
         Atomically append messages to a user's chat session.
 
-        This uses PostgreSQL's JSONB concatenation to prevent race conditions
-        where concurrent saves could lose messages. Much safer than read-modify-write.
+        The append_chat_message_rows RPC reserves a seq range on the session
+        row and inserts one chat_messages row per message, creating the
+        session if needed. Concurrent appends never overwrite each other.
 
         Args:
             user_id: The user's ID
@@ -2011,32 +2036,12 @@ class SupabaseBackend(DatabaseBackend):
 
         try:
             client = self._get_client()
-
-            # First check if session exists (don't use .single() - it throws on 0 rows)
-            logger.info(f"[SUPABASE] Checking for existing chat session for user: {user_id}")
-            existing = client.table("chat_sessions").select("session_id").eq("user_id", user_id).execute()
-
-            if existing.data and len(existing.data) > 0:
-                # Atomic append using PostgreSQL JSONB concatenation
-                # This is race-condition safe - concurrent appends both succeed
-                logger.info(f"[SUPABASE] Calling RPC append_chat_messages for user: {user_id}, {len(new_messages)} messages")
-                client.rpc("append_chat_messages", {
-                    "p_user_id": user_id,
-                    "p_new_messages": new_messages,
-                    "p_updated_at": now,
-                }).execute()
-                logger.info(f"[SUPABASE] RPC append_chat_messages succeeded for user: {user_id}")
-            else:
-                # Create new session with initial messages
-                logger.info(f"[SUPABASE] Creating new chat session for user: {user_id}")
-                client.table("chat_sessions").insert({
-                    "user_id": user_id,
-                    "session_id": session_id,
-                    "messages": new_messages,
-                    "created_at": now,
-                    "updated_at": now,
-                }).execute()
-                logger.info(f"[SUPABASE] Created new chat session for user: {user_id}")
+            client.rpc("append_chat_message_rows", {
+                "p_user_id": user_id,
+                "p_session_id": session_id,
+                "p_messages": new_messages,
+                "p_updated_at": now,
+            }).execute()
 
             # Invalidate cache
             _run_async(self._cache_delete(f"chat:{user_id}"))
@@ -2044,94 +2049,27 @@ class SupabaseBackend(DatabaseBackend):
             logger.info(f"[SUPABASE] Successfully appended {len(new_messages)} messages for user: {user_id}")
             return True
         except Exception as e:
-            # If RPC doesn't exist, fall back to full save
-            if "function" in str(e).lower() and "not exist" in str(e).lower():
-                logger.warning(f"[SUPABASE] append_chat_messages RPC not found, using fallback")
-                return self._append_chat_messages_fallback(user_id, new_messages, session_id)
             logger.error(f"[SUPABASE] Error appending chat messages for {user_id}: {e}")
             return False
 
-    def _append_chat_messages_fallback(
-        self,
-        user_id: str,
-        new_messages: list[dict[str, Any]],
-        session_id: str | None = None,
-    ) -> bool:
-        """
-        Fallback append using optimistic locking pattern.
-
-        If the RPC function doesn't exist, this provides a safer alternative
-        to raw read-modify-write by using updated_at as a version check.
-        """
-        import uuid
+    def _read_chat_messages(self, user_id: str, start: int, end: int) -> list[dict[str, Any]]:
+        """Read chat_messages rows with seq in [start, end), paging through rows."""
+        client = self._get_client()
+        messages: list[dict[str, Any]] = []
+        page_size = 1000
 
-        now = datetime.now().isoformat()
-        if not session_id:
-            session_id = str(uuid.uuid4())
+        while start < end:
+            response = client.table("chat_messages").select(
+                "seq,role,content,attachments,extra"
+            ).eq("user_id", user_id).gte("seq", start).lt("seq", min(end, start + page_size)).order("seq").execute()
+            rows = response.data or []
+            messages.extend(row_to_message(r) for r in rows)
+            start += page_size
 
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                client = self._get_client()
-
-                # Read current state (don't use .single() - it throws on 0 rows)
-                result = client.table("chat_sessions").select("*").eq("user_id", user_id).execute()
-                existing_data = result.data[0] if result.data and len(result.data) > 0 else None
-
-                if existing_data:
-                    current_messages = existing_data.get("messages", [])
-                    current_updated = existing_data.get("updated_at")
-
-                    # Append new messages
-                    updated_messages = current_messages + new_messages
-
-                    # Optimistic lock: only update if updated_at hasn't changed
-                    result = client.table("chat_sessions").update({
-                        "messages": updated_messages,
-                        "updated_at": now,
-                    }).eq("user_id", user_id).eq("updated_at", current_updated).execute()
-
-                    if result.data:
-                        _run_async(self._cache_delete(f"chat:{user_id}"))
-                        return True
-                    else:
-                        # Conflict - retry
-                        logger.warning(f"[SUPABASE] Optimistic lock conflict for {user_id}, retry {attempt + 1}")
-                        continue
-                else:
-                    # Create new
-                    client.table("chat_sessions").insert({
-                        "user_id": user_id,
-                        "session_id": session_id,
-                        "messages": new_messages,
-                        "created_at": now,
-                        "updated_at": now,
-                    }).execute()
-                    _run_async(self._cache_delete(f"chat:{user_id}"))
-                    return True
+        return messages
 
-            except Exception as e:
-                if "PGRST116" in str(e):  # No row found, create new
-                    try:
-                        client.table("chat_sessions").insert({
-                            "user_id": user_id,
-                            "session_id": session_id,
-                            "messages": new_messages,
-                            "created_at": now,
-                            "updated_at": now,
-                        }).execute()
-                        _run_async(self._cache_delete(f"chat:{user_id}"))
-                        return True
-                    except Exception as insert_err:
-                        logger.error(f"[SUPABASE] Error creating chat session: {insert_err}")
-                        return False
-                logger.error(f"[SUPABASE] Error in fallback append for {user_id}: {e}")
-
-        logger.error(f"[SUPABASE] Failed to append messages after {max_retries} retries")
-        return False
-
-    def get_chat_session(self, user_id: str) -> dict[str, Any] | None:
-        """Get a user's chat session (cached with short TTL)."""
+    def _get_chat_session_header(self, user_id: str) -> dict[str, Any] | None:
+        """Get session_id, message_count and timestamps (cached with short TTL)."""
         cache_key = f"chat:{user_id}"
 
         # Try cache first
@@ -2140,33 +2078,54 @@ class SupabaseBackend(DatabaseBackend):
             logger.debug(f"[CACHE] Chat session cache hit: {user_id}")
             return cached
 
-        try:
-            client = self._get_client()
-            response = client.table("chat_sessions").select("*").eq("user_id", user_id).single().execute()
+        client = self._get_client()
+        response = client.table("chat_sessions").select(
+            "session_id,message_count,created_at,updated_at"
+        ).eq("user_id", user_id).limit(1).execute()
+        if not response.data:
+            return None
 
-            if not response.data:
-                return None
+        result = dict(response.data[0])
+        _run_async(self._cache_set(cache_key, result, ttl=CHAT_CACHE_TTL))
+        return result
 
-            result = {
-                "session_id": response.data.get("session_id"),
-                "messages": response.data.get("messages", []),
-                "created_at": response.data.get("created_at"),
-                "updated_at": response.data.get("updated_at"),
-            }
+    def get_chat_session(self, user_id: str, include_messages: bool = True) -> dict[str, Any] | None:
+        """Get a user's chat session."""
+        try:
+            header = self._get_chat_session_header(user_id)
+            if header is None:
+                return None
 
-            _run_async(self._cache_set(cache_key, result, ttl=CHAT_CACHE_TTL))
-            return result
+            session = dict(header)
+            if include_messages:
+                session["messages"] = self._read_chat_messages(user_id, 0, header["message_count"])
+            return session
         except Exception as e:
-            # single() throws if no row found, which is expected
-            if "PGRST116" in str(e):  # Row not found
-                return None
             logger.error(f"[SUPABASE] Error getting chat session for {user_id}: {e}")
             return None
 
+    def get_chat_messages(
+        self,
+        user_id: str,
+        limit: int | None = None,
+        offset: int = 0,
+        newest_first: bool = False,
+    ) -> list[dict[str, Any]]:
+        try:
+            header = self._get_chat_session_header(user_id)
+            if header is None:
+                return []
+            start, end = page_bounds(header["message_count"], limit, offset, newest_first)
+            return self._read_chat_messages(user_id, start, end)
+        except Exception as e:
+            logger.error(f"[SUPABASE] Error getting chat messages for {user_id}: {e}")
+            return []
+
     def delete_chat_session(self, user_id: str) -> bool:
         """Delete a user's chat session."""
         try:
             client = self._get_client()
+            client.table("chat_messages").delete().eq("user_id", user_id).execute()
             client.table("chat_sessions").delete().eq("user_id", user_id).execute()
 
             # Invalidate cache
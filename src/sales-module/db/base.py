@@ -333,6 +333,43 @@ class DatabaseBackend(ABC):
         """Log an AI API cost entry."""
         pass
 
+    @abstractmethod
+    def log_ai_costs(self, rows: list[dict[str, Any]]) -> int:
+        """
+        Log many AI API cost entries in one write.
+
+        Rows are keyed by ai_costs column names. Raises on failure so the
+        write-behind cost tracker can keep the batch and retry.
+
+        Returns:
+            Number of rows written
+        """
+        pass
+
+    @abstractmethod
+    def get_ai_cost_rollup(self) -> list[dict[str, Any]]:
+        """
+        Get the ai_costs_daily rollup rows (see db/cost_rollups.py).
+
+        Each row has bucket (UAE date), call_type, workflow, model, user_id,
+        calls and the summed token/cost fields. Used to seed in-memory
+        aggregates.
+        """
+        pass
+
+    @abstractmethod
+    def get_recent_ai_costs(
+        self,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        call_type: str | None = None,
+        workflow: str | None = None,
+        user_id: str | None = None,
+        limit: int = 100,
+    ) -> list[dict[str, Any]]:
+        """Get the most recent AI cost entries matching the filters."""
+        pass
+
     @abstractmethod
     def get_ai_costs_summary(
         self,
@@ -573,6 +610,21 @@ class DatabaseBackend(ABC):
         """
         pass
 
+    def log_audit_events(self, events: list[dict[str, Any]]) -> int:
+        """
+        Log many audit events at once.
+
+        Each event carries the keyword arguments of log_audit_event. Backends
+        should override this with a single multi-row insert that raises on
+        failure, so the buffered audit logger can keep the batch and retry.
+
+        Returns:
+            Number of events written
+        """
+        for event in events:
+            self.log_audit_event(**event)
+        return len(events)
+
     @abstractmethod
     def query_audit_log(
         self,
@@ -628,15 +680,64 @@ class DatabaseBackend(ABC):
         pass
 
     @abstractmethod
-    def get_chat_session(self, user_id: str) -> dict[str, Any] | None:
+    def append_chat_messages(
+        self,
+        user_id: str,
+        new_messages: list[dict[str, Any]],
+        session_id: str | None = None,
+    ) -> bool:
+        """
+        Append messages to a user's chat session, creating it if needed.
+
+        Only the new rows are written (see db/chat_messages.py); concurrent
+        appends each get their own seq range.
+
+        Args:
+            user_id: User's unique ID
+            new_messages: Messages to append
+            session_id: Session ID to use if the session is created
+
+        Returns:
+            True if successful
+        """
+        pass
+
+    @abstractmethod
+    def get_chat_session(self, user_id: str, include_messages: bool = True) -> dict[str, Any] | None:
         """
         Get a user's chat session.
 
         Args:
             user_id: User's unique ID
+            include_messages: Load every message; pass False for the session
+                header only and page with get_chat_messages()
+
+        Returns:
+            Dict with session_id, messages (if included), message_count,
+            created_at, updated_at or None
+        """
+        pass
+
+    @abstractmethod
+    def get_chat_messages(
+        self,
+        user_id: str,
+        limit: int | None = None,
+        offset: int = 0,
+        newest_first: bool = False,
+    ) -> list[dict[str, Any]]:
+        """
+        Get a page of a user's chat messages, oldest first.
+
+        Args:
+            user_id: User's unique ID
+            limit: Maximum messages (None = all after offset)
+            offset: Messages to skip, from the start or, with newest_first and
+                a limit, from the end (offset=0, limit=N is the last N messages)
+            newest_first: Count offset from the newest message
 
         Returns:
-            Dict with session_id, messages, created_at, updated_at or None
+            List of message dictionaries
         """
         pass
 
@@ -0,0 +1,64 @@
+"""
+Chat message rows.
+
+Chat history is stored one row per message in chat_messages, keyed by
+(user_id, seq). seq is dense and starts at 0; chat_sessions.message_count
+is the next seq to allocate, so appends only insert the new rows and
+"last N" / page reads are an index range scan on (user_id, seq).
+
+role, content and attachments have their own columns. Any other message
+keys (id, parent_id, timestamp, files, ...) are kept in the extra JSON
+column so a message round-trips unchanged.
+"""
+
+from typing import Any
+
+MESSAGE_COLUMNS = ("role", "content", "attachments")
+
+
+def message_to_row(message: dict[str, Any]) -> dict[str, Any]:
+    """Split a message dict into chat_messages column values (JSON not yet serialised)."""
+    return {
+        "role": message.get("role") or "",
+        "content": message.get("content"),
+        "attachments": message.get("attachments"),
+        "extra": {k: v for k, v in message.items() if k not in MESSAGE_COLUMNS} or None,
+    }
+
+
+def row_to_message(row: dict[str, Any]) -> dict[str, Any]:
+    """Rebuild a message dict from a chat_messages row (JSON already parsed)."""
+    message = dict(row.get("extra") or {})
+    message["role"] = row["role"]
+    message["content"] = row["content"]
+    if row.get("attachments") is not None:
+        message["attachments"] = row["attachments"]
+    return message
+
+
+def page_bounds(
+    total: int,
+    limit: int | None = None,
+    offset: int = 0,
+    newest_first: bool = False,
+) -> tuple[int, int]:
+    """
+    Map a page request onto a [start, end) seq range.
+
+    Args:
+        total: Number of messages in the session (message_count)
+        limit: Page size (None = everything after the first offset messages)
+        offset: Messages to skip, from the start or, with newest_first and
+            a limit, from the end (offset=0, limit=50 is the last 50 messages)
+        newest_first: Count offset from the newest message
+
+    Returns:
+        (start, end) seq bounds; messages are still returned oldest first
+    """
+    if limit is None:
+        return min(total, offset), total
+    if newest_first:
+        end = max(0, total - offset)
+        return max(0, end - limit), end
+    start = min(total, offset)
+    return start, min(total, start + limit)
@@ -0,0 +1,163 @@
+"""
+AI cost rollups.
+
+ai_costs is summarised into two rollup tables, ai_costs_daily and
+ai_costs_hourly. Each holds one row per (bucket, call_type, workflow, model,
+user_id) with summed call, token and cost counters. A bucket is the UAE
+local date ('YYYY-MM-DD') or hour ('YYYY-MM-DDTHH') of the row's timestamp.
+NULL workflow/user_id are stored as '' so the key can be unique.
+
+Both backends update the rollups in the same transaction as the insert
+(triggers), so they are always current. Summaries read daily rollups for
+date filters. For time-of-day filters they read hourly rollups for whole
+hours and scan raw rows only for the partial hours at either end.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from core.utils.time import UAE_TZ
+
+ROLLUP_FIELDS = (
+    "total_tokens",
+    "total_cost",
+    "input_tokens",
+    "output_tokens",
+    "reasoning_tokens",
+    "cached_input_tokens",
+)
+
+ROLLUP_KEY = ("bucket", "call_type", "workflow", "model", "user_id")
+
+
+@dataclass
+class CostRangePlan:
+    """Which sources answer a summary's date range."""
+    daily: tuple[str | None, str | None] | None = None   # Inclusive date bounds
+    hourly: tuple[str | None, str | None] | None = None  # [from, to) hour buckets
+    raw: list[tuple[str, str, bool]] = field(default_factory=list)  # (from, to, to_inclusive) local timestamps
+
+
+def _parse_local(value: str, end_of_day: bool = False) -> datetime:
+    """Parse a filter value as a naive UAE-local datetime."""
+    if "T" not in value:
+        value = f"{value}T23:59:59" if end_of_day else f"{value}T00:00:00"
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(UAE_TZ).replace(tzinfo=None)
+    return parsed
+
+
+def _hour_bucket(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H")
+
+
+def plan_cost_range(start_date: str | None, end_date: str | None) -> CostRangePlan:
+    """
+    Split a summary date range into rollup and raw-row sources.
+
+    Date-only bounds are answered entirely from daily rollups. Otherwise
+    whole hours come from hourly rollups and the partial hours at the edges
+    from raw rows, with the same inclusive bounds as a raw timestamp filter.
+    """
+    if "T" not in (start_date or "") and "T" not in (end_date or ""):
+        return CostRangePlan(daily=(start_date, end_date))
+
+    start = _parse_local(start_date) if start_date else None
+    end = _parse_local(end_date, end_of_day=True) if end_date else None
+
+    first_full = None
+    if start is not None:
+        first_full = start.replace(minute=0, second=0, microsecond=0)
+        if first_full < start:
+            first_full += timedelta(hours=1)
+    last_edge = end.replace(minute=0, second=0, microsecond=0) if end is not None else None
+
+    if first_full is not None and last_edge is not None and first_full > last_edge:
+        return CostRangePlan(raw=[(start.isoformat(), end.isoformat(), True)])
+
+    plan = CostRangePlan(hourly=(
+        _hour_bucket(first_full) if first_full else None,
+        _hour_bucket(last_edge) if last_edge else None,
+    ))
+    if start is not None and start < first_full:
+        plan.raw.append((start.isoformat(), first_full.isoformat(), False))
+    if end is not None:
+        plan.raw.append((last_edge.isoformat(), end.isoformat(), True))
+    return plan
+
+
+def group_raw_costs(rows: list[dict[str, Any]], local_hours: bool = False) -> list[dict[str, Any]]:
+    """
+    Group raw ai_costs rows into hourly rollup rows.
+
+    Args:
+        rows: Rows with timestamp, key columns and ROLLUP_FIELDS
+        local_hours: Convert timestamps to UAE time before bucketing
+            (for backends that return them in UTC)
+    """
+    groups: dict[tuple, dict[str, Any]] = {}
+    for r in rows:
+        timestamp = r["timestamp"]
+        if local_hours:
+            bucket = _hour_bucket(datetime.fromisoformat(timestamp).astimezone(UAE_TZ))
+        else:
+            bucket = timestamp[:13]
+        key = (bucket, r["call_type"], r.get("workflow") or "", r["model"], r.get("user_id") or "")
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {**dict(zip(ROLLUP_KEY, key, strict=True)), "calls": 0, **dict.fromkeys(ROLLUP_FIELDS, 0)}
+        group["calls"] += 1
+        for f in ROLLUP_FIELDS:
+            group[f] += r.get(f) or 0
+    return list(groups.values())
+
+
+def summarize_cost_buckets(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Build a costs summary from rollup rows.
+
+    Returns the shape of get_ai_costs_summary() without the recent
+    'calls' list. Breakdowns are ordered by cost, highest first.
+    """
+    totals = dict.fromkeys(("calls", *ROLLUP_FIELDS), 0)
+    by_call_type: dict[str, dict] = {}
+    by_workflow: dict[str, dict] = {}
+    by_model: dict[str, dict] = {}
+    by_user: dict[str, dict] = {}
+    daily: dict[str, dict] = {}
+
+    for r in rows:
+        for f in totals:
+            totals[f] += r[f] or 0
+        breakdowns = [(by_call_type, r["call_type"]), (by_workflow, r["workflow"] or "none"), (by_model, r["model"])]
+        if r["user_id"]:
+            breakdowns.append((by_user, r["user_id"]))
+        for breakdown, name in breakdowns:
+            entry = breakdown.setdefault(name, {"calls": 0, "tokens": 0, "cost": 0})
+            entry["calls"] += r["calls"]
+            entry["tokens"] += r["total_tokens"] or 0
+            entry["cost"] += r["total_cost"] or 0
+        date = r["bucket"][:10]
+        day = daily.setdefault(date, {"date": date, "calls": 0, "cost": 0})
+        day["calls"] += r["calls"]
+        day["cost"] += r["total_cost"] or 0
+
+    def by_cost(breakdown: dict[str, dict]) -> dict[str, dict]:
+        return dict(sorted(breakdown.items(), key=lambda item: item[1]["cost"], reverse=True))
+
+    return {
+        "total_calls": totals["calls"],
+        "total_tokens": totals["total_tokens"],
+        "total_cost": totals["total_cost"],
+        "total_input_tokens": totals["input_tokens"],
+        "total_output_tokens": totals["output_tokens"],
+        "total_reasoning_tokens": totals["reasoning_tokens"],
+        "total_cached_tokens": totals["cached_input_tokens"],
+        "by_call_type": by_cost(by_call_type),
+        "by_workflow": by_cost(by_workflow),
+        "by_model": by_cost(by_model),
+        "by_user": by_cost(by_user),
+        "daily_costs": [daily[date] for date in sorted(daily)],
+    }
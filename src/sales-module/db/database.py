@@ -294,6 +294,25 @@ class _DatabaseNamespace:
             user_id, workflow, cached_input_tokens, context, metadata_json, timestamp
         )
 
+    def log_ai_costs(self, rows: list[dict[str, Any]]) -> int:
+        return self._backend.log_ai_costs(rows)
+
+    def get_ai_cost_rollup(self) -> list[dict[str, Any]]:
+        return self._backend.get_ai_cost_rollup()
+
+    def get_recent_ai_costs(
+        self,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        call_type: str | None = None,
+        workflow: str | None = None,
+        user_id: str | None = None,
+        limit: int = 100,
+    ) -> list[dict[str, Any]]:
+        return self._backend.get_recent_ai_costs(
+            start_date, end_date, call_type, workflow, user_id, limit
+        )
+
     def get_ai_costs_summary(
         self,
         start_date: str | None = None,
@@ -425,6 +444,9 @@ class _DatabaseNamespace:
             details_json, ip_address, user_agent
         )
 
+    def log_audit_events(self, events: list[dict[str, Any]]) -> int:
+        return self._backend.log_audit_events(events)
+
     def query_audit_log(
         self,
         user_id: str | None = None,
@@ -454,9 +476,19 @@ class _DatabaseNamespace:
         """Save or update a user's chat session."""
         return self._backend.save_chat_session(user_id, messages, session_id)
 
-    def get_chat_session(self, user_id: str) -> dict[str, Any] | None:
+    def get_chat_session(self, user_id: str, include_messages: bool = True) -> dict[str, Any] | None:
         """Get a user's chat session."""
-        return self._backend.get_chat_session(user_id)
+        return self._backend.get_chat_session(user_id, include_messages)
+
+    def get_chat_messages(
+        self,
+        user_id: str,
+        limit: int | None = None,
+        offset: int = 0,
+        newest_first: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Get a page of a user's chat messages, oldest first."""
+        return self._backend.get_chat_messages(user_id, limit, offset, newest_first)
 
     def delete_chat_session(self, user_id: str) -> bool:
         """Delete a user's chat session."""
@@ -470,7 +502,7 @@ class _DatabaseNamespace:
     ) -> bool:
         """
         Atomically append messages to a user's chat session.
-        Uses PostgreSQL RPC for atomic append on Supabase, with fallback on SQLite.
+        Inserts one chat_messages row per message; earlier messages are not rewritten.
         """
         return self._backend.append_chat_messages(user_id, new_messages, session_id)
 
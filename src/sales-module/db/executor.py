@@ -0,0 +1,55 @@
+"""
+Database executor.
+
+The database backends are synchronous. Async code runs their calls here
+instead of on the event loop, using a fixed pool of
+settings.db_executor_workers threads. Keeping the thread set fixed also
+means each thread keeps its pooled SQLite connection (see
+crm_utils.sqlite_pool).
+
+Usage:
+    from db.executor import run_db
+
+    proposals = await run_db(db.get_proposals, limit=20)
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from app_settings import settings
+
+logger = logging.getLogger("proposal-bot")
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Get the shared database executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.db_executor_workers, thread_name_prefix="db")
+    return _executor
+
+
+async def run_db(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run a blocking database call on the database executor (like asyncio.to_thread)."""
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_db_executor(), call)
+
+
+def shutdown_db_executor() -> None:
+    """Wait for running database calls and stop the executor."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+        logger.info("[DB] Database executor stopped")
@@ -0,0 +1,136 @@
+-- =============================================================================
+-- ADD AI COST ROLLUP TABLES
+-- =============================================================================
+-- Migration: 06_add_ai_cost_rollups
+-- Description: Daily and hourly ai_costs totals per (call_type, workflow, model,
+--              user_id), kept current by an insert trigger so the cost
+--              dashboard no longer aggregates raw ai_costs rows
+-- Date: 2026-10-16
+-- =============================================================================
+
+-- Buckets are UAE-local 'YYYY-MM-DD' / 'YYYY-MM-DDTHH' strings. NULL workflow
+-- and user_id are stored as '' so the key can be unique.
+CREATE TABLE IF NOT EXISTS public.ai_costs_daily (
+    bucket TEXT NOT NULL,
+    call_type TEXT NOT NULL,
+    workflow TEXT NOT NULL DEFAULT '',
+    model TEXT NOT NULL,
+    user_id TEXT NOT NULL DEFAULT '',
+    calls BIGINT NOT NULL DEFAULT 0,
+    total_tokens BIGINT NOT NULL DEFAULT 0,
+    total_cost DOUBLE PRECISION NOT NULL DEFAULT 0,
+    input_tokens BIGINT NOT NULL DEFAULT 0,
+    output_tokens BIGINT NOT NULL DEFAULT 0,
+    reasoning_tokens BIGINT NOT NULL DEFAULT 0,
+    cached_input_tokens BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT ai_costs_daily_key UNIQUE (bucket, call_type, workflow, model, user_id)
+);
+
+CREATE TABLE IF NOT EXISTS public.ai_costs_hourly (
+    bucket TEXT NOT NULL,
+    call_type TEXT NOT NULL,
+    workflow TEXT NOT NULL DEFAULT '',
+    model TEXT NOT NULL,
+    user_id TEXT NOT NULL DEFAULT '',
+    calls BIGINT NOT NULL DEFAULT 0,
+    total_tokens BIGINT NOT NULL DEFAULT 0,
+    total_cost DOUBLE PRECISION NOT NULL DEFAULT 0,
+    input_tokens BIGINT NOT NULL DEFAULT 0,
+    output_tokens BIGINT NOT NULL DEFAULT 0,
+    reasoning_tokens BIGINT NOT NULL DEFAULT 0,
+    cached_input_tokens BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT ai_costs_hourly_key UNIQUE (bucket, call_type, workflow, model, user_id)
+);
+
+-- Keep rollups current in the same transaction as each insert
+CREATE OR REPLACE FUNCTION public.ai_costs_rollup()
+RETURNS TRIGGER AS $$
+DECLARE
+    local_ts TIMESTAMP := COALESCE(NEW.timestamp, NOW()) AT TIME ZONE 'Asia/Dubai';
+BEGIN
+    INSERT INTO public.ai_costs_daily AS r (
+        bucket, call_type, workflow, model, user_id, calls, total_tokens, total_cost,
+        input_tokens, output_tokens, reasoning_tokens, cached_input_tokens
+    ) VALUES (
+        to_char(local_ts, 'YYYY-MM-DD'), NEW.call_type, COALESCE(NEW.workflow, ''), NEW.model,
+        COALESCE(NEW.user_id, ''), 1, COALESCE(NEW.total_tokens, 0), COALESCE(NEW.total_cost, 0),
+        COALESCE(NEW.input_tokens, 0), COALESCE(NEW.output_tokens, 0),
+        COALESCE(NEW.reasoning_tokens, 0), COALESCE(NEW.cached_input_tokens, 0)
+    )
+    ON CONFLICT ON CONSTRAINT ai_costs_daily_key DO UPDATE SET
+        calls = r.calls + 1,
+        total_tokens = r.total_tokens + EXCLUDED.total_tokens,
+        total_cost = r.total_cost + EXCLUDED.total_cost,
+        input_tokens = r.input_tokens + EXCLUDED.input_tokens,
+        output_tokens = r.output_tokens + EXCLUDED.output_tokens,
+        reasoning_tokens = r.reasoning_tokens + EXCLUDED.reasoning_tokens,
+        cached_input_tokens = r.cached_input_tokens + EXCLUDED.cached_input_tokens;
+
+    INSERT INTO public.ai_costs_hourly AS r (
+        bucket, call_type, workflow, model, user_id, calls, total_tokens, total_cost,
+        input_tokens, output_tokens, reasoning_tokens, cached_input_tokens
+    ) VALUES (
+        to_char(local_ts, 'YYYY-MM-DD"T"HH24'), NEW.call_type, COALESCE(NEW.workflow, ''), NEW.model,
+        COALESCE(NEW.user_id, ''), 1, COALESCE(NEW.total_tokens, 0), COALESCE(NEW.total_cost, 0),
+        COALESCE(NEW.input_tokens, 0), COALESCE(NEW.output_tokens, 0),
+        COALESCE(NEW.reasoning_tokens, 0), COALESCE(NEW.cached_input_tokens, 0)
+    )
+    ON CONFLICT ON CONSTRAINT ai_costs_hourly_key DO UPDATE SET
+        calls = r.calls + 1,
+        total_tokens = r.total_tokens + EXCLUDED.total_tokens,
+        total_cost = r.total_cost + EXCLUDED.total_cost,
+        input_tokens = r.input_tokens + EXCLUDED.input_tokens,
+        output_tokens = r.output_tokens + EXCLUDED.output_tokens,
+        reasoning_tokens = r.reasoning_tokens + EXCLUDED.reasoning_tokens,
+        cached_input_tokens = r.cached_input_tokens + EXCLUDED.cached_input_tokens;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS ai_costs_rollup_trigger ON public.ai_costs;
+CREATE TRIGGER ai_costs_rollup_trigger
+    AFTER INSERT ON public.ai_costs
+    FOR EACH ROW EXECUTE FUNCTION public.ai_costs_rollup();
+
+-- Backfill from existing rows
+TRUNCATE public.ai_costs_daily, public.ai_costs_hourly;
+
+INSERT INTO public.ai_costs_daily (
+    bucket, call_type, workflow, model, user_id, calls, total_tokens, total_cost,
+    input_tokens, output_tokens, reasoning_tokens, cached_input_tokens
+)
+SELECT
+    to_char(timestamp AT TIME ZONE 'Asia/Dubai', 'YYYY-MM-DD'), call_type, COALESCE(workflow, ''), model,
+    COALESCE(user_id, ''), COUNT(*), COALESCE(SUM(total_tokens), 0), COALESCE(SUM(total_cost), 0),
+    COALESCE(SUM(input_tokens), 0), COALESCE(SUM(output_tokens), 0),
+    COALESCE(SUM(reasoning_tokens), 0), COALESCE(SUM(cached_input_tokens), 0)
+FROM public.ai_costs
+GROUP BY 1, 2, 3, 4, 5;
+
+INSERT INTO public.ai_costs_hourly (
+    bucket, call_type, workflow, model, user_id, calls, total_tokens, total_cost,
+    input_tokens, output_tokens, reasoning_tokens, cached_input_tokens
+)
+SELECT
+    to_char(timestamp AT TIME ZONE 'Asia/Dubai', 'YYYY-MM-DD"T"HH24'), call_type, COALESCE(workflow, ''), model,
+    COALESCE(user_id, ''), COUNT(*), COALESCE(SUM(total_tokens), 0), COALESCE(SUM(total_cost), 0),
+    COALESCE(SUM(input_tokens), 0), COALESCE(SUM(output_tokens), 0),
+    COALESCE(SUM(reasoning_tokens), 0), COALESCE(SUM(cached_input_tokens), 0)
+FROM public.ai_costs
+GROUP BY 1, 2, 3, 4, 5;
+
+-- Same access as ai_costs
+ALTER TABLE public.ai_costs_daily ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.ai_costs_hourly ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Service role full access" ON public.ai_costs_daily;
+DROP POLICY IF EXISTS "Service role full access" ON public.ai_costs_hourly;
+
+CREATE POLICY "Service role full access" ON public.ai_costs_daily FOR ALL USING (true);
+CREATE POLICY "Service role full access" ON public.ai_costs_hourly FOR ALL USING (true);
+
+GRANT ALL ON public.ai_costs_daily, public.ai_costs_hourly TO service_role;
+
+COMMENT ON TABLE public.ai_costs_daily IS 'ai_costs totals per UAE date, maintained by ai_costs_rollup_trigger';
+COMMENT ON TABLE public.ai_costs_hourly IS 'ai_costs totals per UAE hour, maintained by ai_costs_rollup_trigger';
@@ -0,0 +1,139 @@
+-- =============================================================================
+-- ADD CHAT MESSAGES TABLE
+-- =============================================================================
+-- Migration: 07_add_chat_messages
+-- Description: Store chat history one row per message instead of rewriting
+--              the chat_sessions.messages JSONB blob on every turn
+-- Date: 2026-10-16
+-- =============================================================================
+
+-- message_count is the next seq to allocate for the session
+ALTER TABLE public.chat_sessions
+    ADD COLUMN IF NOT EXISTS message_count INTEGER NOT NULL DEFAULT 0;
+
+-- role/content/attachments have columns; other message keys
+-- (id, parent_id, timestamp, files, ...) are kept in extra
+CREATE TABLE IF NOT EXISTS public.chat_messages (
+    id BIGSERIAL PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT,
+    attachments JSONB,
+    extra JSONB,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    CONSTRAINT chat_messages_user_seq UNIQUE (user_id, seq)
+);
+
+CREATE INDEX IF NOT EXISTS idx_chat_messages_session ON public.chat_messages(session_id);
+
+-- Insert p_messages as rows starting at p_first_seq
+CREATE OR REPLACE FUNCTION public.insert_chat_message_rows(
+    p_user_id TEXT,
+    p_session_id TEXT,
+    p_first_seq INTEGER,
+    p_messages JSONB
+)
+RETURNS VOID AS $$
+    INSERT INTO public.chat_messages (user_id, session_id, seq, role, content, attachments, extra)
+    SELECT
+        p_user_id,
+        p_session_id,
+        p_first_seq + (m.ordinality - 1)::INTEGER,
+        COALESCE(m.value->>'role', ''),
+        m.value->>'content',
+        NULLIF(m.value->'attachments', 'null'::jsonb),
+        NULLIF(m.value - 'role' - 'content' - 'attachments', '{}'::jsonb)
+    FROM jsonb_array_elements(p_messages) WITH ORDINALITY AS m
+    WHERE jsonb_typeof(m.value) = 'object';
+$$ LANGUAGE sql;
+
+-- Append messages; the session row update reserves the seq range, so
+-- concurrent appends for the same user are serialised on that row
+CREATE OR REPLACE FUNCTION public.append_chat_message_rows(
+    p_user_id TEXT,
+    p_session_id TEXT,
+    p_messages JSONB,
+    p_updated_at TIMESTAMPTZ DEFAULT NOW()
+)
+RETURNS INTEGER AS $$
+DECLARE
+    added INTEGER := (
+        SELECT COUNT(*) FROM jsonb_array_elements(p_messages) AS m WHERE jsonb_typeof(m) = 'object'
+    );
+    v_session_id TEXT;
+    v_count INTEGER;
+BEGIN
+    INSERT INTO public.chat_sessions AS s (user_id, session_id, messages, message_count, created_at, updated_at)
+    VALUES (p_user_id, p_session_id, '[]', added, p_updated_at, p_updated_at)
+    ON CONFLICT (user_id) DO UPDATE SET
+        message_count = s.message_count + EXCLUDED.message_count,
+        updated_at = EXCLUDED.updated_at
+    RETURNING s.session_id, s.message_count INTO v_session_id, v_count;
+
+    PERFORM public.insert_chat_message_rows(p_user_id, v_session_id, v_count - added, p_messages);
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Replace a session's messages (full save). Like the chat_sessions upsert
+-- save_chat_session used before, this also sets session_id; appends keep
+-- the existing one.
+CREATE OR REPLACE FUNCTION public.replace_chat_messages(
+    p_user_id TEXT,
+    p_session_id TEXT,
+    p_messages JSONB,
+    p_updated_at TIMESTAMPTZ DEFAULT NOW()
+)
+RETURNS INTEGER AS $$
+DECLARE
+    total INTEGER := (
+        SELECT COUNT(*) FROM jsonb_array_elements(p_messages) AS m WHERE jsonb_typeof(m) = 'object'
+    );
+    v_session_id TEXT;
+BEGIN
+    INSERT INTO public.chat_sessions AS s (user_id, session_id, messages, message_count, created_at, updated_at)
+    VALUES (p_user_id, p_session_id, '[]', total, p_updated_at, p_updated_at)
+    ON CONFLICT (user_id) DO UPDATE SET
+        session_id = EXCLUDED.session_id,
+        message_count = EXCLUDED.message_count,
+        updated_at = EXCLUDED.updated_at
+    RETURNING s.session_id INTO v_session_id;
+
+    DELETE FROM public.chat_messages WHERE user_id = p_user_id;
+    PERFORM public.insert_chat_message_rows(p_user_id, v_session_id, 0, p_messages);
+    RETURN total;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Move existing blobs into rows
+DO $$
+DECLARE
+    s RECORD;
+BEGIN
+    FOR s IN
+        SELECT user_id, session_id, messages FROM public.chat_sessions
+        WHERE messages IS NOT NULL AND messages <> '[]'::jsonb
+        FOR UPDATE
+    LOOP
+        PERFORM public.replace_chat_messages(s.user_id, s.session_id, s.messages, NOW());
+        UPDATE public.chat_sessions SET messages = '[]' WHERE user_id = s.user_id;
+    END LOOP;
+END;
+$$;
+
+-- The old blob-append RPC is no longer used
+DROP FUNCTION IF EXISTS public.append_chat_messages(TEXT, JSONB, TIMESTAMPTZ);
+
+-- Same access as chat_sessions
+ALTER TABLE public.chat_messages ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Service role full access" ON public.chat_messages;
+CREATE POLICY "Service role full access" ON public.chat_messages FOR ALL USING (true);
+
+GRANT ALL ON public.chat_messages TO service_role;
+GRANT USAGE, SELECT ON SEQUENCE public.chat_messages_id_seq TO service_role;
+
+COMMENT ON TABLE public.chat_messages IS 'Chat history, one row per message; chat_sessions.message_count is the next seq';
+COMMENT ON COLUMN public.chat_sessions.messages IS 'Legacy message blob, migrated to chat_messages';
@@ -765,6 +765,50 @@ SALES_TABLES: dict[str, Table] = {
         ],
     ),
 
+    # -------------------------------------------------------------------------
+    # AI_COSTS_DAILY - ai_costs totals per UAE date (see db/cost_rollups.py)
+    # -------------------------------------------------------------------------
+    "ai_costs_daily": Table(
+        name="ai_costs_daily",
+        columns=[
+            Column("bucket", ColumnType.TEXT, nullable=False),
+            Column("call_type", ColumnType.TEXT, nullable=False),
+            Column("workflow", ColumnType.TEXT, nullable=False, default=""),
+            Column("model", ColumnType.TEXT, nullable=False),
+            Column("user_id", ColumnType.TEXT, nullable=False, default=""),
+            Column("calls", ColumnType.INTEGER, nullable=False, default=0),
+            Column("total_tokens", ColumnType.INTEGER, nullable=False, default=0),
+            Column("total_cost", ColumnType.REAL, nullable=False, default=0),
+            Column("input_tokens", ColumnType.INTEGER, nullable=False, default=0),
+            Column("output_tokens", ColumnType.INTEGER, nullable=False, default=0),
+            Column("reasoning_tokens", ColumnType.INTEGER, nullable=False, default=0),
+            Column("cached_input_tokens", ColumnType.INTEGER, nullable=False, default=0),
+        ],
+        unique_constraints=[["bucket", "call_type", "workflow", "model", "user_id"]],
+    ),
+
+    # -------------------------------------------------------------------------
+    # AI_COSTS_HOURLY - ai_costs totals per UAE hour
+    # -------------------------------------------------------------------------
+    "ai_costs_hourly": Table(
+        name="ai_costs_hourly",
+        columns=[
+            Column("bucket", ColumnType.TEXT, nullable=False),
+            Column("call_type", ColumnType.TEXT, nullable=False),
+            Column("workflow", ColumnType.TEXT, nullable=False, default=""),
+            Column("model", ColumnType.TEXT, nullable=False),
+            Column("user_id", ColumnType.TEXT, nullable=False, default=""),
+            Column("calls", ColumnType.INTEGER, nullable=False, default=0),
+            Column("total_tokens", ColumnType.INTEGER, nullable=False, default=0),
+            Column("total_cost", ColumnType.REAL, nullable=False, default=0),
+            Column("input_tokens", ColumnType.INTEGER, nullable=False, default=0),
+            Column("output_tokens", ColumnType.INTEGER, nullable=False, default=0),
+            Column("reasoning_tokens", ColumnType.INTEGER, nullable=False, default=0),
+            Column("cached_input_tokens", ColumnType.INTEGER, nullable=False, default=0),
+        ],
+        unique_constraints=[["bucket", "call_type", "workflow", "model", "user_id"]],
+    ),
+
     # -------------------------------------------------------------------------
     # CHAT_SESSIONS - Persistent chat history per user
     # -------------------------------------------------------------------------
@@ -774,7 +818,8 @@ SALES_TABLES: dict[str, Table] = {
             Column("id", ColumnType.INTEGER, primary_key=True),
             Column("user_id", ColumnType.TEXT, nullable=False, unique=True),
             Column("session_id", ColumnType.TEXT, nullable=False),
-            Column("messages", ColumnType.JSON, nullable=False),  # Array of message objects
+            Column("messages", ColumnType.JSON, nullable=False, default="[]"),  # Legacy blob, migrated to chat_messages
+            Column("message_count", ColumnType.INTEGER, nullable=False, default=0),  # Next chat_messages.seq
             Column("created_at", ColumnType.TEXT, nullable=False),
             Column("updated_at", ColumnType.TEXT, nullable=False),
         ],
@@ -783,6 +828,28 @@ SALES_TABLES: dict[str, Table] = {
             Index("idx_chat_sessions_updated", ["updated_at"]),
         ],
     ),
+
+    # -------------------------------------------------------------------------
+    # CHAT_MESSAGES - One row per chat message (see db/chat_messages.py)
+    # -------------------------------------------------------------------------
+    "chat_messages": Table(
+        name="chat_messages",
+        columns=[
+            Column("id", ColumnType.INTEGER, primary_key=True),
+            Column("user_id", ColumnType.TEXT, nullable=False),
+            Column("session_id", ColumnType.TEXT, nullable=False),
+            Column("seq", ColumnType.INTEGER, nullable=False),
+            Column("role", ColumnType.TEXT, nullable=False),
+            Column("content", ColumnType.TEXT),
+            Column("attachments", ColumnType.JSON),
+            Column("extra", ColumnType.JSON),  # Remaining message keys (id, parent_id, timestamp, ...)
+            Column("created_at", ColumnType.TEXT, nullable=False),
+        ],
+        indexes=[
+            Index("idx_chat_messages_session", ["session_id"]),
+        ],
+        unique_constraints=[["user_id", "seq"]],  # Tail and page reads
+    ),
 }
 
 
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: SQLite backend ops/sec with and without connection pooling.
+
+"unpooled" opens a new connection (and runs the PRAGMAs) for every call,
+which is how the backend worked before the connection pool. "pooled"
+reuses one connection per thread. Each mode runs the same mix of small
+reads and writes against a fresh temporary database, single-threaded and
+from the DB executor's worker threads.
+
+Usage:
+    python db/scripts/benchmark_sqlite_pool.py
+    python db/scripts/benchmark_sqlite_pool.py --ops 5000 --threads 8
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from crm_utils import SQLiteConnectionPool  # noqa: E402
+
+from db.backends.sqlite import SQLiteBackend  # noqa: E402
+
+
+def _make_backend(path: Path, pooled: bool) -> SQLiteBackend:
+    backend = SQLiteBackend(path)
+    if not pooled:
+        # max_size=0 keeps nothing: every call opens and closes a connection
+        backend._pool = SQLiteConnectionPool(path, setup=backend._configure_connection, max_size=0)
+    backend.init_db()
+    backend.append_chat_messages("bench", [{"role": "user", "content": f"message {n}"} for n in range(200)])
+    return backend
+
+
+def _op(backend: SQLiteBackend, n: int) -> None:
+    """One unit of work: mostly reads, some appends."""
+    if n % 10 == 0:
+        backend.append_chat_messages(f"user-{n % 7}", [{"role": "user", "content": f"hello {n}"}])
+    elif n % 2 == 0:
+        backend.get_chat_messages("bench", limit=20, newest_first=True)
+    else:
+        backend.get_proposals(limit=20)
+
+
+def _run(backend: SQLiteBackend, ops: int, threads: int) -> float:
+    start = time.perf_counter()
+    if threads == 1:
+        for n in range(ops):
+            _op(backend, n)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda n: _op(backend, n), range(ops)))
+    return ops / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=2000, help="Operations per run")
+    parser.add_argument("--threads", type=int, default=4, help="Worker threads for the concurrent run")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    results: dict[tuple[str, int], float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("unpooled", "pooled"):
+            for threads in (1, args.threads):
+                backend = _make_backend(Path(tmp) / f"{mode}-{threads}.db", pooled=mode == "pooled")
+                _run(backend, min(200, args.ops), threads)  # Warm up
+                results[(mode, threads)] = _run(backend, args.ops, threads)
+
+    print(f"{'threads':>8} {'unpooled ops/s':>16} {'pooled ops/s':>14} {'speedup':>8}")
+    for threads in (1, args.threads):
+        before, after = results[("unpooled", threads)], results[("pooled", threads)]
+        print(f"{threads:>8} {before:>16,.0f} {after:>14,.0f} {after / before:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ Usage:
     result = compositor.composite(billboard, creative, points)
 """
 
+from generators.effects.cache import PreparedCreativeCache, creative_digest, prepared_creative_cache
 from generators.effects.color import ColorAdjustment, ImageBlur, OverlayBlending, Sharpening
 from generators.effects.compositor import BillboardCompositor, order_points, warp_creative_to_billboard
 from generators.effects.config import DEFAULT_CONFIG, EffectConfig
@@ -28,6 +29,10 @@ __all__ = [
     "BillboardCompositor",
     "warp_creative_to_billboard",
     "order_points",
+    # Creative preparation cache
+    "PreparedCreativeCache",
+    "prepared_creative_cache",
+    "creative_digest",
     # Configuration
     "EffectConfig",
     "DEFAULT_CONFIG",
@@ -0,0 +1,127 @@
+"""
+Prepared Creative Cache - Reuse creative preparation across mockup renders.
+
+BillboardCompositor.prepare_creative() (2x upscale, image blur, border
+extension) depends only on the creative pixels and two config values, so the
+result can be shared by every frame, photo and request that uses the same
+creative with the same settings.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from generators.effects.compositor import BillboardCompositor
+
+logger = logging.getLogger(__name__)
+
+# Default byte budget for prepared creatives (a 2x-upscaled 4K creative is ~100MB)
+DEFAULT_MAX_BYTES = int(os.getenv("MOCKUP_CREATIVE_CACHE_MB", "256")) * 1024 * 1024
+
+
+def creative_digest(data: bytes) -> str:
+    """Content hash used as the creative part of the cache key."""
+    return hashlib.sha1(data).hexdigest()
+
+
+class PreparedCreativeCache:
+    """
+    Thread-safe, byte-bounded LRU cache of prepared creatives.
+
+    Entries are keyed by (creative digest, image_blur, edge_blur) - the only
+    inputs prepare_creative() depends on. Cached arrays are marked read-only
+    so a caller can't corrupt a shared entry.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize cache.
+
+        Args:
+            max_bytes: Total size budget for cached arrays
+        """
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, np.ndarray] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(digest: str, compositor: BillboardCompositor) -> tuple:
+        """Build the cache key for a creative prepared by this compositor."""
+        return (digest, compositor.config.image_blur, compositor.config.edge_blur)
+
+    def get_or_prepare(
+        self,
+        digest: str,
+        creative_image: np.ndarray,
+        compositor: BillboardCompositor,
+    ) -> np.ndarray:
+        """
+        Return the prepared creative, running prepare_creative() on a miss.
+
+        Args:
+            digest: Content hash of the encoded creative (see creative_digest)
+            creative_image: Decoded creative (BGR)
+            compositor: Compositor whose config determines preparation
+
+        Returns:
+            Prepared creative (read-only array)
+        """
+        key = self.make_key(digest, compositor)
+
+        with self._lock:
+            prepared = self._entries.get(key)
+            if prepared is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                logger.debug(f"[CREATIVE_CACHE] Hit {digest[:12]}")
+                return prepared
+            self.misses += 1
+
+        # Prepare outside the lock - it's the expensive part
+        prepared = compositor.prepare_creative(creative_image)
+        prepared.setflags(write=False)
+        self._put(key, prepared)
+        return prepared
+
+    def _put(self, key: tuple, prepared: np.ndarray) -> None:
+        """Insert an entry and evict least-recently-used ones over budget."""
+        if prepared.nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = prepared
+            self._size += prepared.nbytes
+
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.nbytes
+
+    def clear(self) -> None:
+        """Drop all cached creatives."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        """Get cache statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Global cache instance
+prepared_creative_cache = PreparedCreativeCache()
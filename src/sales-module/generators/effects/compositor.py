@@ -7,6 +7,9 @@ This module provides the main compositing pipeline that:
 3. Creates and processes the mask
 4. Applies all effects (depth, color, edge)
 5. Composites the final result
+
+By default steps 2-5 run on the frame's padded bounding box (ROI) rather
+than the full photo; see EffectConfig.roi_compositing.
 """
 
 import logging
@@ -194,19 +197,52 @@ class BillboardCompositor:
 
         return warped
 
+    def roi_bounds(
+        self,
+        image_shape: tuple[int, ...],
+        dst_pts: np.ndarray,
+    ) -> tuple[int, int, int, int] | None:
+        """
+        Compute the padded bounding box of the frame, clipped to the image.
+
+        Args:
+            image_shape: Shape of billboard image (h, w, ...)
+            dst_pts: Ordered destination polygon points
+
+        Returns:
+            (x0, y0, x1, y1) slice bounds, or None if the frame lies outside the image
+        """
+        h, w = image_shape[:2]
+        pad = self.config.roi_padding
+
+        x0 = max(int(np.floor(dst_pts[:, 0].min())) - pad, 0)
+        y0 = max(int(np.floor(dst_pts[:, 1].min())) - pad, 0)
+        x1 = min(int(np.ceil(dst_pts[:, 0].max())) + pad + 1, w)
+        y1 = min(int(np.ceil(dst_pts[:, 1].max())) + pad + 1, h)
+
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return x0, y0, x1, y1
+
     def composite(
         self,
         billboard_image: np.ndarray,
         creative_image: np.ndarray,
         frame_points: list[list[float]],
+        creative_prepared: np.ndarray | None = None,
     ) -> np.ndarray:
         """
         Full compositing pipeline.
 
+        When config.roi_compositing is enabled, every step after creative
+        preparation runs on the frame's padded bounding box instead of the
+        full photo, and only that slice is written back.
+
         Args:
             billboard_image: Billboard photo (BGR)
             creative_image: Creative to place (BGR)
             frame_points: 4 corner points defining the billboard frame
+            creative_prepared: Optional output of prepare_creative() to reuse
 
         Returns:
             Composited result (BGR, uint8)
@@ -214,9 +250,44 @@ class BillboardCompositor:
         # Order points consistently
         dst_pts = order_points(np.array(frame_points))
 
-        # Step 1: Prepare creative
-        creative_prepared = self.prepare_creative(creative_image)
+        # Step 1: Prepare creative (skipped when the caller already has it cached)
+        if creative_prepared is None:
+            creative_prepared = self.prepare_creative(creative_image)
+
+        bounds = self.roi_bounds(billboard_image.shape, dst_pts) if self.config.roi_compositing else None
+        if bounds is None:
+            return self._composite_region(billboard_image, creative_prepared, dst_pts)
+
+        x0, y0, x1, y1 = bounds
+        roi_pts = dst_pts - np.array([x0, y0], dtype=np.float32)
+        region = self._composite_region(billboard_image[y0:y1, x0:x1], creative_prepared, roi_pts)
 
+        result = billboard_image.copy()
+        result[y0:y1, x0:x1] = region
+
+        logger.info(
+            f"[COMPOSITOR] ROI compositing: {x1 - x0}x{y1 - y0} of "
+            f"{billboard_image.shape[1]}x{billboard_image.shape[0]}"
+        )
+        return result
+
+    def _composite_region(
+        self,
+        billboard_image: np.ndarray,
+        creative_prepared: np.ndarray,
+        dst_pts: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Run steps 2-11 of the pipeline on a canvas (full photo or ROI slice).
+
+        Args:
+            billboard_image: Billboard canvas (BGR)
+            creative_prepared: Prepared creative image
+            dst_pts: Ordered frame points in canvas coordinates
+
+        Returns:
+            Composited canvas (BGR, uint8)
+        """
         # Step 2: Warp to billboard perspective
         warped = self.warp_creative(creative_prepared, billboard_image.shape, dst_pts)
 
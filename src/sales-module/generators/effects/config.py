@@ -83,6 +83,20 @@ class EffectConfig:
     # Sharpening: Unsharp mask strength (0-100, 0 = disabled)
     sharpening: int = 0
 
+    # =========================================================================
+    # PERFORMANCE
+    # =========================================================================
+
+    # ROI compositing: run the warp, mask and effect pipeline on the frame's
+    # padded bounding box only, then blend that slice back into the photo.
+    # Output matches the full-resolution path within rounding tolerance.
+    roi_compositing: bool = True
+
+    # Padding around the frame bounding box in ROI mode (16-256 px).
+    # Must cover the widest kernel in the pipeline (edge blur + luminance
+    # adaptation + sharpening), otherwise edges get clipped at the ROI border.
+    roi_padding: int = 64
+
     # =========================================================================
     # ADVANCED EDGE EFFECTS (auto-enabled based on edge_blur)
     # =========================================================================
@@ -127,6 +141,8 @@ class EffectConfig:
 
         self.sharpening = self._clamp(self.sharpening, 0, 100)
 
+        self.roi_padding = self._clamp(self.roi_padding, 16, 256)
+
         return self
 
     @staticmethod
@@ -162,6 +178,8 @@ class EffectConfig:
             "depthMultiplier": "depth_multiplier",
             "shadowIntensity": "shadow_intensity",
             "overlayOpacity": "overlay_opacity",
+            "roiCompositing": "roi_compositing",
+            "roiPadding": "roi_padding",
         }
 
         # Convert camelCase keys to snake_case
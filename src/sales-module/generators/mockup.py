@@ -1,13 +1,21 @@
 import logging
 import os
+import tempfile
+from dataclasses import dataclass
 from pathlib import Path
 
 import cv2
 import numpy as np
 
 # Import compositing from effects module
-from generators.effects import warp_creative_to_billboard
+from generators.effects import (
+    BillboardCompositor,
+    EffectConfig,
+    creative_digest,
+    prepared_creative_cache,
+)
 from core.utils.memory import cleanup_memory
+from core.utils.render_pool import RenderPoolFullError
 
 logger = logging.getLogger("proposal-bot")
 
@@ -162,8 +170,6 @@ async def generate_ai_creative(
     Returns:
         Path to generated image, or None if failed
     """
-    import tempfile
-
     from integrations.llm import LLMClient
     from integrations.llm.prompts.mockup import get_mockup_prompt
 
@@ -325,6 +331,95 @@ async def delete_location_photo(
 # =============================================================================
 
 
+async def _fetch_mockup_inputs(
+    service,
+    storage_key: str,
+    specific_photo: str | None,
+    time_of_day: str,
+    side: str,
+    environment: str,
+    company_hint: str | None,
+) -> tuple[Path, str, str, list[dict], dict | None] | None:
+    """
+    Fetch photo, frames and config for one mockup from Asset-Management.
+
+    Args:
+        service: MockupFrameService instance
+        storage_key: Storage key of the location (or asset type)
+        specific_photo: Optional specific photo filename
+        time_of_day: Time of day variation ("day", "night", "all")
+        side: Billboard side ("gold", "silver", "single_side", "all")
+        environment: Environment ("indoor", "outdoor", "all")
+        company_hint: Optional company to try first
+
+    Returns:
+        Tuple of (photo_path, photo_filename, selected_tod, frames_data, photo_config), or None
+    """
+    if specific_photo:
+        # Use specific photo
+        # For specific photos, we assume the caller passes the correct storage_key
+        # (e.g., from the templates endpoint which returns storage_key per template)
+        selected_tod = time_of_day if time_of_day != "all" else "day"
+        selected_side = side if side != "all" else "gold"
+        selected_env = environment if environment != "all" else "outdoor"
+
+        photo_path = await service.download_photo(
+            storage_key, selected_tod, selected_side, specific_photo,
+            environment=selected_env,
+            company_hint=company_hint,
+        )
+        if not photo_path:
+            logger.error(f"[MOCKUP_ASYNC] Failed to download specific photo: {specific_photo}")
+            return None
+
+        photo_filename = specific_photo
+    else:
+        # Get random photo
+        result = await service.get_random_photo(
+            storage_key, time_of_day, side, environment=environment, company_hint=company_hint
+        )
+        if not result:
+            logger.error(f"[MOCKUP_ASYNC] No photos available for {storage_key}")
+            return None
+
+        # Unpack including storage_key (for traditional networks, this may differ from location_key)
+        photo_filename, selected_tod, selected_side, selected_env, photo_path, storage_key = result
+
+    # Get frame data - use storage_key instead of location_key for traditional networks
+    frames_data = await service.get_frames(
+        storage_key, selected_tod, selected_side, photo_filename,
+        environment=selected_env,
+        company_hint=company_hint,
+    )
+    if not frames_data:
+        logger.error(f"[MOCKUP_ASYNC] No frame data for {storage_key}/{photo_filename}")
+        # Cleanup downloaded photo
+        if photo_path and photo_path.exists():
+            photo_path.unlink()
+        return None
+
+    # Get config if available - use storage_key for traditional networks
+    photo_config = await service.get_config(
+        storage_key, selected_tod, selected_side, photo_filename,
+        environment=selected_env,
+        company_hint=company_hint,
+    )
+
+    logger.info(
+        f"[MOCKUP_ASYNC] Fetched photo and {len(frames_data)} frame(s) from Asset-Management"
+    )
+    return photo_path, photo_filename, selected_tod, frames_data, photo_config
+
+
+def _cleanup_photo(photo_path: Path | None) -> None:
+    """Delete a downloaded photo temp file."""
+    if photo_path and photo_path.exists():
+        try:
+            photo_path.unlink()
+        except OSError:
+            pass
+
+
 async def generate_mockup_async(
     location_key: str,
     creative_images: list[Path],
@@ -343,7 +438,8 @@ async def generate_mockup_async(
     This wrapper:
     1. Fetches mockup photo from Asset-Management storage
     2. Gets frame data from Asset-Management API
-    3. Calls the sync generator with the fetched data
+    3. Renders in the process-based render pool via mockup_queue, so OpenCV
+       never runs on the event loop
 
     Args:
         location_key: The location identifier
@@ -361,6 +457,7 @@ async def generate_mockup_async(
         Tuple of (Path to generated mockup, photo_filename used), or (None, None)
     """
     from core.services.mockup_frame_service import MockupFrameService
+    from core.utils.task_queue import mockup_queue
 
     # Require company_schemas - no fallback to hardcoded company
     if not company_schemas:
@@ -370,118 +467,191 @@ async def generate_mockup_async(
 
     logger.info(f"[MOCKUP_ASYNC] Generating mockup for {location_key} via Asset-Management")
 
+    photo_path = None
     try:
-        # Initialize storage_key - will be updated for traditional networks
-        storage_key = location_key
-
-        # Get photo and frame data from Asset-Management
-        if specific_photo:
-            # Use specific photo
-            # For specific photos, we assume the caller passes the correct storage_key
-            # (e.g., from the templates endpoint which returns storage_key per template)
-            selected_tod = time_of_day if time_of_day != "all" else "day"
-            selected_side = side if side != "all" else "gold"
-            selected_env = environment if environment != "all" else "outdoor"
-
-            photo_path = await service.download_photo(
-                storage_key, selected_tod, selected_side, specific_photo,
-                environment=selected_env,
-                company_hint=company_hint,
-            )
-            if not photo_path:
-                logger.error(f"[MOCKUP_ASYNC] Failed to download specific photo: {specific_photo}")
-                return None, None
-
-            photo_filename = specific_photo
-        else:
-            # Get random photo
-            result = await service.get_random_photo(
-                location_key, time_of_day, side, environment=environment, company_hint=company_hint
-            )
-            if not result:
-                logger.error(f"[MOCKUP_ASYNC] No photos available for {location_key}")
-                return None, None
-
-            # Unpack including storage_key (for traditional networks, this may differ from location_key)
-            photo_filename, selected_tod, selected_side, selected_env, photo_path, storage_key = result
-
-        # Get frame data - use storage_key instead of location_key for traditional networks
-        frames_data = await service.get_frames(
-            storage_key, selected_tod, selected_side, photo_filename,
-            environment=selected_env,
-            company_hint=company_hint,
+        inputs = await _fetch_mockup_inputs(
+            service, location_key, specific_photo, time_of_day, side, environment, company_hint
         )
-        if not frames_data:
-            logger.error(f"[MOCKUP_ASYNC] No frame data for {storage_key}/{photo_filename}")
-            # Cleanup downloaded photo
-            if photo_path and photo_path.exists():
-                photo_path.unlink()
+        if not inputs:
             return None, None
-
-        # Get config if available - use storage_key for traditional networks
-        photo_config = await service.get_config(
-            storage_key, selected_tod, selected_side, photo_filename,
-            environment=selected_env,
-            company_hint=company_hint,
-        )
-
-        logger.info(
-            f"[MOCKUP_ASYNC] Fetched photo and {len(frames_data)} frame(s) from Asset-Management"
-        )
-
-        # Now generate the mockup using the sync generator
-        result_path = _generate_mockup_with_data(
-            photo_path=photo_path,
-            frames_data=frames_data,
-            creative_images=creative_images,
-            output_path=output_path,
-            photo_config=photo_config,
-            config_override=config_override,
-            time_of_day=selected_tod,
-        )
-
-        # Cleanup downloaded photo temp file
-        if photo_path and photo_path.exists():
-            try:
-                photo_path.unlink()
-            except OSError:
-                pass
+        photo_path, photo_filename, selected_tod, frames_data, photo_config = inputs
+
+        # Now render the mockup in a worker process
+        [result_path] = await mockup_queue.render([
+            MockupRenderJob(
+                photo_path=photo_path,
+                frames_data=frames_data,
+                creative_images=creative_images,
+                output_path=output_path,
+                photo_config=photo_config,
+                config_override=config_override,
+                time_of_day=selected_tod,
+            )
+        ])
 
         if result_path:
             return result_path, photo_filename
         return None, None
 
+    except RenderPoolFullError:
+        # Saturation is retryable, so let the caller answer 503 rather than "failed"
+        raise
     except Exception as e:
         logger.error(f"[MOCKUP_ASYNC] Error generating mockup: {e}", exc_info=True)
         return None, None
+    finally:
+        # Cleanup downloaded photo temp file
+        _cleanup_photo(photo_path)
 
 
-def _generate_mockup_with_data(
-    photo_path: Path,
-    frames_data: list[dict],
+async def generate_mockups_batch_async(
+    storage_keys: list[str],
     creative_images: list[Path],
-    output_path: Path | None = None,
-    photo_config: dict | None = None,
+    time_of_day: str = "all",
+    side: str = "all",
+    environment: str = "all",
     config_override: dict | None = None,
-    time_of_day: str = "day",
-) -> Path | None:
+    company_schemas: list[str] | None = None,
+    company_hint: str | None = None,
+) -> list[tuple[Path | None, str | None]]:
     """
-    Core mockup generation with pre-fetched photo and frame data.
+    Generate one mockup per storage key with the same creative(s) in one render call.
+
+    Photo/frame fetches run concurrently; rendering happens in one render-pool
+    call that decodes each creative once and reuses its prepared form across
+    every frame and photo.
 
     Args:
-        photo_path: Path to the background photo
-        frames_data: List of frame dicts with "points" and optional "config"
-        creative_images: List of creative image paths
-        output_path: Optional output path
-        photo_config: Optional photo-level config
-        config_override: Optional config override
-        time_of_day: Time of day for effects
+        storage_keys: Locations (or asset-type storage keys) to render
+        creative_images: List of creative/ad image paths shared by all outputs
+        time_of_day: Time of day variation ("day", "night", "all")
+        side: Billboard side ("gold", "silver", "single_side", "all")
+        environment: Environment ("indoor", "outdoor", "all")
+        config_override: Optional config dict to override saved frame config
+        company_schemas: List of company schemas to search
+        company_hint: Optional company to try first
 
     Returns:
-        Path to the generated mockup, or None
+        List of (Path to generated mockup, photo_filename used) per storage key,
+        (None, None) for keys that failed
     """
-    num_frames = len(frames_data)
-    num_creatives = len(creative_images)
+    import asyncio
+
+    from core.services.mockup_frame_service import MockupFrameService
+    from core.utils.task_queue import mockup_queue
+
+    if not company_schemas:
+        raise ValueError("company_schemas is required for generate_mockups_batch_async")
+    service = MockupFrameService(companies=company_schemas)
+
+    logger.info(f"[MOCKUP_ASYNC] Batch generating {len(storage_keys)} mockup(s) via Asset-Management")
+
+    fetched = await asyncio.gather(
+        *[
+            _fetch_mockup_inputs(service, key, None, time_of_day, side, environment, company_hint)
+            for key in storage_keys
+        ],
+        return_exceptions=True,
+    )
+
+    jobs: list[MockupRenderJob] = []
+    job_index: dict[int, int] = {}
+    photo_filenames: dict[int, str] = {}
+    for i, inputs in enumerate(fetched):
+        if isinstance(inputs, BaseException):
+            logger.error(f"[MOCKUP_ASYNC] Error fetching inputs for {storage_keys[i]}: {inputs}")
+            continue
+        if not inputs:
+            continue
+        photo_path, photo_filename, selected_tod, frames_data, photo_config = inputs
+        job_index[i] = len(jobs)
+        photo_filenames[i] = photo_filename
+        jobs.append(MockupRenderJob(
+            photo_path=photo_path,
+            frames_data=frames_data,
+            creative_images=creative_images,
+            photo_config=photo_config,
+            config_override=config_override,
+            time_of_day=selected_tod,
+        ))
+
+    try:
+        rendered = await mockup_queue.render(jobs)
+    except RenderPoolFullError:
+        raise
+    except Exception as e:
+        logger.error(f"[MOCKUP_ASYNC] Error in batch render: {e}", exc_info=True)
+        rendered = [None] * len(jobs)
+    finally:
+        for job in jobs:
+            _cleanup_photo(job.photo_path)
+
+    results: list[tuple[Path | None, str | None]] = []
+    for i in range(len(storage_keys)):
+        result_path = rendered[job_index[i]] if i in job_index else None
+        results.append((result_path, photo_filenames[i]) if result_path else (None, None))
+    return results
+
+
+# =============================================================================
+# BATCH RENDERER
+# =============================================================================
+
+
+@dataclass
+class MockupRenderJob:
+    """One mockup output: a photo, its frames and the creative(s) to place."""
+
+    photo_path: Path
+    frames_data: list[dict]
+    creative_images: list[Path]
+    output_path: Path | None = None
+    photo_config: dict | None = None
+    config_override: dict | None = None
+    time_of_day: str = "day"
+
+
+def _load_creative(
+    creative_path: Path,
+    creatives: dict[str, tuple[str, np.ndarray] | None],
+) -> tuple[str, np.ndarray] | None:
+    """Decode a creative once per batch, returning (digest, image)."""
+    key = str(creative_path)
+    if key not in creatives:
+        try:
+            data = Path(creative_path).read_bytes()
+            image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+            creatives[key] = (creative_digest(data), image) if image is not None else None
+        except Exception as e:
+            logger.error(f"[MOCKUP] Error loading creative {creative_path}: {e}")
+            creatives[key] = None
+        if creatives[key] is None:
+            logger.error(f"[MOCKUP] Failed to load creative: {creative_path}")
+    return creatives[key]
+
+
+def _load_photo(photo_path: Path, photos: dict[str, np.ndarray | None]) -> np.ndarray | None:
+    """Decode a billboard photo once per batch."""
+    key = str(photo_path)
+    if key not in photos:
+        try:
+            photos[key] = cv2.imread(key)
+        except Exception as e:
+            logger.error(f"[MOCKUP] Error loading billboard: {e}")
+            photos[key] = None
+        if photos[key] is None:
+            logger.error(f"[MOCKUP] Failed to load billboard image: {photo_path}")
+    return photos[key]
+
+
+def _render_job(
+    job: MockupRenderJob,
+    photos: dict[str, np.ndarray | None],
+    creatives: dict[str, tuple[str, np.ndarray] | None],
+) -> Path | None:
+    """Render a single job using batch-shared decoded images."""
+    num_frames = len(job.frames_data)
+    num_creatives = len(job.creative_images)
 
     logger.info(f"[MOCKUP] Using {num_frames} frame(s), {num_creatives} creative(s)")
 
@@ -492,75 +662,129 @@ def _generate_mockup_with_data(
         )
         return None
 
-    # Load billboard
-    try:
-        billboard = cv2.imread(str(photo_path))
-        if billboard is None:
-            logger.error(f"[MOCKUP] Failed to load billboard image: {photo_path}")
-            return None
-    except Exception as e:
-        logger.error(f"[MOCKUP] Error loading billboard: {e}")
+    billboard = _load_photo(job.photo_path, photos)
+    if billboard is None:
         return None
 
-    # Start with the billboard as the result
-    result = billboard.copy()
+    # Composite returns a new array, so the decoded photo stays reusable across jobs
+    result = billboard
 
     # Apply each creative to each frame
-    for i, frame_data in enumerate(frames_data):
+    for i, frame_data in enumerate(job.frames_data):
         frame_points = frame_data["points"]
         frame_config = frame_data.get("config", {})
 
         # Merge configs: photo_config < frame_config < config_override
-        merged_config = photo_config.copy() if photo_config else {}
+        merged_config = job.photo_config.copy() if job.photo_config else {}
         merged_config.update(frame_config)
-        if config_override:
-            merged_config.update(config_override)
+        if job.config_override:
+            merged_config.update(job.config_override)
 
         # Determine which creative to use
-        creative_path = creative_images[0] if num_creatives == 1 else creative_images[i]
-
-        # Load creative
-        try:
-            creative = cv2.imread(str(creative_path))
-            if creative is None:
-                logger.error(f"[MOCKUP] Failed to load creative: {creative_path}")
-                return None
-        except Exception as e:
-            logger.error(f"[MOCKUP] Error loading creative {i}: {e}")
+        creative_path = job.creative_images[0] if num_creatives == 1 else job.creative_images[i]
+        loaded = _load_creative(creative_path, creatives)
+        if loaded is None:
             return None
+        digest, creative = loaded
 
-        # Warp creative onto this frame
+        # Warp creative onto this frame, reusing the prepared creative when cached
         try:
-            result = warp_creative_to_billboard(
-                result, creative, frame_points, config=merged_config, time_of_day=time_of_day
-            )
+            compositor = BillboardCompositor(EffectConfig.from_dict(merged_config), job.time_of_day)
+            prepared = prepared_creative_cache.get_or_prepare(digest, creative, compositor)
+            result = compositor.composite(result, creative, frame_points, creative_prepared=prepared)
             logger.info(f"[MOCKUP] Applied creative {i+1}/{num_frames}")
         except Exception as e:
             logger.error(f"[MOCKUP] Error warping creative {i}: {e}")
-            del billboard, result, creative
+            del result
             cleanup_memory(context="mockup_warp_error", aggressive=False, log_stats=False)
             return None
 
-        del creative
-
     # Save result
+    output_path = job.output_path
     if not output_path:
-        import tempfile
-        output_path = Path(tempfile.mktemp(suffix=".jpg"))
+        fd, temp_name = tempfile.mkstemp(suffix=".jpg")
+        os.close(fd)
+        output_path = Path(temp_name)
 
     try:
         cv2.imwrite(str(output_path), result)
         logger.info(f"[MOCKUP] Generated mockup saved to: {output_path}")
-
-        del billboard, result
-        cleanup_memory(context="mockup_save", aggressive=False, log_stats=False)
-
         return output_path
     except Exception as e:
         logger.error(f"[MOCKUP] Error saving mockup: {e}")
-        try:
-            del billboard, result
-        except NameError:
-            pass
-        cleanup_memory(context="mockup_save_error", aggressive=False, log_stats=False)
         return None
+    finally:
+        del result
+
+
+def render_mockups_batch(jobs: list[MockupRenderJob]) -> list[Path | None]:
+    """
+    Render several mockups in one call.
+
+    Each distinct photo and creative file is decoded once for the whole batch,
+    and prepared creatives come from the shared PreparedCreativeCache, so the
+    same creative across N locations (or N creatives on one photo) only pays
+    decode and preparation once.
+
+    Args:
+        jobs: Mockups to render
+
+    Returns:
+        Output path per job (None for jobs that failed), in job order
+    """
+    photos: dict[str, np.ndarray | None] = {}
+    creatives: dict[str, tuple[str, np.ndarray] | None] = {}
+
+    try:
+        results = [_render_job(job, photos, creatives) for job in jobs]
+    finally:
+        photos.clear()
+        creatives.clear()
+        cleanup_memory(context="mockup_save", aggressive=False, log_stats=False)
+
+    if len(jobs) > 1:
+        logger.info(
+            f"[MOCKUP] Batch rendered {sum(1 for r in results if r)}/{len(jobs)} mockup(s), "
+            f"creative cache: {prepared_creative_cache.stats()}"
+        )
+    return results
+
+
+def _generate_mockup_with_data(
+    photo_path: Path,
+    frames_data: list[dict],
+    creative_images: list[Path],
+    output_path: Path | None = None,
+    photo_config: dict | None = None,
+    config_override: dict | None = None,
+    time_of_day: str = "day",
+) -> Path | None:
+    """
+    Core mockup generation with pre-fetched photo and frame data.
+
+    Single-job wrapper around render_mockups_batch().
+
+    Args:
+        photo_path: Path to the background photo
+        frames_data: List of frame dicts with "points" and optional "config"
+        creative_images: List of creative image paths
+        output_path: Optional output path
+        photo_config: Optional photo-level config
+        config_override: Optional config override
+        time_of_day: Time of day for effects
+
+    Returns:
+        Path to the generated mockup, or None
+    """
+    [result_path] = render_mockups_batch([
+        MockupRenderJob(
+            photo_path=photo_path,
+            frames_data=frames_data,
+            creative_images=creative_images,
+            output_path=output_path,
+            photo_config=photo_config,
+            config_override=config_override,
+            time_of_day=time_of_day,
+        )
+    ])
+    return result_path
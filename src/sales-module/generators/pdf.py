@@ -7,9 +7,10 @@ import tempfile
 import time
 
 from pptx import Presentation
-from pypdf import PdfReader, PdfWriter
 
 import config
+from core.utils.soffice_pool import SofficePoolError, get_soffice_pool
+from generators.pdf_merge import PdfMergeStream
 
 # Limit concurrent conversions to avoid CPU/app contention
 # With 2 CPUs, we can handle more concurrent conversions
@@ -31,6 +32,14 @@ def convert_pptx_to_pdf(pptx_path: str) -> str:
     pdf_file.close()
     logger.info(f"[PDF_CONVERT] Target PDF path: '{pdf_file.name}'")
 
+    # Persistent soffice instances - no per-deck LibreOffice cold start
+    pool = get_soffice_pool()
+    if pool.available:
+        try:
+            return pool.convert(pptx_path, pdf_file.name)
+        except SofficePoolError as e:
+            logger.warning(f"[PDF_CONVERT] Soffice pool failed, falling back to one-shot LibreOffice: {e}")
+
     system = platform.system()
     logger.info(f"[PDF_CONVERT] Operating system: {system}")
 
@@ -168,23 +177,15 @@ def merge_pdfs(pdf_files: list) -> str:
     for idx, pdf in enumerate(pdf_files):
         logger.info(f"[PDF_MERGE]   File {idx + 1}: '{pdf}'")
 
-    output_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-    output_file.close()
-    logger.info(f"[PDF_MERGE] Output file: '{output_file.name}'")
-
-    pdf_writer = PdfWriter()
-    for pdf_path in pdf_files:
-        pdf_reader = PdfReader(pdf_path)
-        page_count = len(pdf_reader.pages)
-        logger.info(f"[PDF_MERGE] Adding {page_count} pages from '{pdf_path}'")
-        for page in pdf_reader.pages:
-            pdf_writer.add_page(page)
-
-    with open(output_file.name, 'wb') as output:
-        pdf_writer.write(output)
+    # Streaming merge: one source open at a time, shared images/fonts stored once
+    with PdfMergeStream() as merger:
+        for pdf_path in pdf_files:
+            page_count = merger.append(pdf_path)
+            logger.info(f"[PDF_MERGE] Added {page_count} pages from '{pdf_path}'")
+        output_path = merger.finish()
 
-    logger.info(f"[PDF_MERGE] Successfully merged PDFs to '{output_file.name}'")
-    return output_file.name
+    logger.info(f"[PDF_MERGE] Successfully merged PDFs to '{output_path}'")
+    return output_path
 
 
 async def remove_slides_and_convert_to_pdf(pptx_path: str, remove_first: bool = False, remove_last: bool = False) -> str:
@@ -217,9 +218,9 @@ async def remove_slides_and_convert_to_pdf(pptx_path: str, remove_first: bool =
         pres.save(temp_pptx.name)
         slide_removal_time = (time.time() - t0) * 1000
 
-        # PDF conversion
+        # PDF conversion (off the event loop; pooled soffice when available)
         t0 = time.time()
-        pdf_path = convert_pptx_to_pdf(temp_pptx.name)
+        pdf_path = await asyncio.to_thread(convert_pptx_to_pdf, temp_pptx.name)
         conversion_time = (time.time() - t0) * 1000
 
         try:
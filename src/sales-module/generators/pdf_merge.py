@@ -0,0 +1,266 @@
+"""
+Streaming PDF merge engine.
+
+Proposal PDFs are assembled from per-location template PDFs, financial
+slides and the intro/outro pages. Loading every input through pypdf and
+writing one file at the end keeps all pages (and their high-res photos)
+in memory at once and only starts after every location has finished.
+
+PdfMergeStream appends pages as each input becomes available:
+
+- Pages are copied with MuPDF (insert_pdf), so content and image streams
+  are never decoded
+- Identical objects (images, embedded fonts, ICC profiles and the
+  colour-space arrays and dictionaries that point at them) are shared
+  instead of duplicated - e.g. the financial-slide header image or the
+  intro/outro background appearing for every location
+- Every `spill_pages` pages the document is written incrementally to a
+  spill file and reopened, so memory stays bounded by the spill window
+  rather than the page count
+
+Usage:
+    from generators.pdf_merge import PdfMergeStream
+
+    with PdfMergeStream() as merger:
+        merger.append(intro_pdf)
+        merger.append(template_pdf, pages=[1, 2, 3])
+        merger.append(financial_pdf)
+        merged_path = merger.finish()
+
+All methods are blocking; call them from an executor thread when used on
+the event loop. A single stream must not be used from two threads at once.
+"""
+
+import contextlib
+import hashlib
+import os
+import re
+import tempfile
+from collections.abc import Sequence
+
+import fitz
+
+from core.utils.logging import get_logger
+
+logger = get_logger("generators.pdf_merge")
+
+_REF_RE = re.compile(rb"(\d+) 0 R\b")
+# Objects that must stay distinct even when identical (page tree nodes, annotations)
+_UNSHARED_RE = re.compile(rb"/Type\s*/(?:Pages?|Annot)\b")
+
+
+def pdf_page_count(pdf_path: str) -> int:
+    """Count pages without loading the document's pages."""
+    with fitz.open(pdf_path) as doc:
+        return doc.page_count
+
+
+def _page_runs(pages: Sequence[int], page_count: int) -> list[tuple[int, int]]:
+    """Group page numbers into contiguous (from, to) runs, dropping out-of-range pages."""
+    runs: list[tuple[int, int]] = []
+    for page in pages:
+        if not 0 <= page < page_count:
+            continue
+        if runs and runs[-1][1] + 1 == page:
+            runs[-1] = (runs[-1][0], page)
+        else:
+            runs.append((page, page))
+    return runs
+
+
+class PdfMergeStream:
+    """Incrementally merge PDFs into one output with bounded memory."""
+
+    def __init__(self, spill_pages: int | None = None):
+        """
+        Initialize the merge stream.
+
+        Args:
+            spill_pages: Pages to accumulate in memory before spilling to disk
+                         (default: settings.pdf_merge_spill_pages)
+        """
+        if spill_pages is None:
+            from app_settings import settings
+
+            spill_pages = settings.pdf_merge_spill_pages
+
+        self.spill_pages = max(1, spill_pages)
+        self._doc: fitz.Document = fitz.open()
+        self._spill_path: str | None = None
+        self._unspilled = 0
+        self._object_digests: dict[bytes, int] = {}
+        self.page_count = 0
+        self.inputs = 0
+        self.shared_objects = 0
+
+    def __enter__(self) -> "PdfMergeStream":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def append(self, pdf_path: str, pages: Sequence[int] | None = None) -> int:
+        """
+        Append pages from a PDF.
+
+        Args:
+            pdf_path: Source PDF path (read once, closed before returning)
+            pages: 0-indexed pages to copy, in order (None copies all pages)
+
+        Returns:
+            Number of pages appended
+        """
+        if self._doc is None:
+            raise RuntimeError("PdfMergeStream is closed")
+
+        first_new_xref = self._doc.xref_length()
+        with fitz.open(pdf_path) as src:
+            runs = [(0, src.page_count - 1)] if pages is None else _page_runs(pages, src.page_count)
+            for from_page, to_page in runs:
+                if to_page >= from_page:
+                    self._doc.insert_pdf(src, from_page=from_page, to_page=to_page)
+
+        added = sum(to_page - from_page + 1 for from_page, to_page in runs)
+        if not added:
+            return 0
+
+        self.shared_objects += self._share_objects(first_new_xref)
+        self.page_count += added
+        self.inputs += 1
+        self._unspilled += added
+        if self._unspilled >= self.spill_pages:
+            self._spill()
+        return added
+
+    def finish(self, output_path: str | None = None) -> str:
+        """
+        Write the merged PDF and close the stream.
+
+        Args:
+            output_path: Destination path (default: a new temp file)
+
+        Returns:
+            Path to the merged PDF
+        """
+        if self._doc is None:
+            raise RuntimeError("PdfMergeStream is closed")
+        if not self.page_count:
+            raise ValueError("No pages to merge")
+
+        if output_path is None:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as output_file:
+                output_path = output_file.name
+
+        # Full rewrite drops streams orphaned by sharing and merges duplicate
+        # dictionaries; stream data is copied from the spill file, not held in memory
+        self._doc.save(output_path, garbage=3)
+        logger.info(
+            f"[PDF_MERGE] Merged {self.page_count} pages from {self.inputs} files "
+            f"({self.shared_objects} shared objects) to '{output_path}'"
+        )
+        self.close()
+        return output_path
+
+    def close(self) -> None:
+        """Release the document and remove the spill file."""
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+        if self._spill_path:
+            with contextlib.suppress(OSError):
+                os.unlink(self._spill_path)
+            self._spill_path = None
+        self._object_digests.clear()
+
+    def _spill(self) -> None:
+        """Flush appended objects to the spill file and reopen it lazily."""
+        if self._spill_path is None:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".merge.pdf") as spill_file:
+                self._spill_path = spill_file.name
+            self._doc.save(self._spill_path)
+        else:
+            self._doc.saveIncr()
+
+        # Reopening drops MuPDF's cached objects; xref numbers are unchanged
+        self._doc.close()
+        self._doc = fitz.open(self._spill_path)
+        self._unspilled = 0
+
+    def _share_objects(self, first_new_xref: int) -> int:
+        """
+        Point references at already-merged copies of identical objects.
+
+        Streams and the plain objects around them (e.g. an image's
+        [/ICCBased N 0 R] colour space) are both canonicalised: an image can
+        only match once everything it references has been shared. Only
+        objects added by the last append can reference its new objects, so
+        rewriting is limited to them. Runs to a fixpoint for that reason.
+
+        Returns:
+            Number of objects replaced by an existing copy
+        """
+        doc = self._doc
+        new_xrefs = range(first_new_xref, doc.xref_length())
+        pending = [xref for xref in new_xrefs if self._shareable(xref)]
+        remap: dict[int, int] = {}
+
+        while pending:
+            waiting = set(pending) - remap.keys()
+            unresolved = []
+            for xref in pending:
+                definition = self._remapped(doc.xref_object(xref, compressed=True).encode(), remap)
+                if any(int(ref) in waiting and int(ref) != xref for ref in _REF_RE.findall(definition)):
+                    unresolved.append(xref)
+                    continue
+                existing = self._object_digests.setdefault(self._digest(xref, definition), xref)
+                if existing != xref:
+                    remap[xref] = existing
+            if len(unresolved) == len(pending):
+                # Reference cycle between new objects: keep them as-is
+                for xref in unresolved:
+                    definition = doc.xref_object(xref, compressed=True).encode()
+                    self._object_digests.setdefault(self._digest(xref, definition), xref)
+                break
+            pending = unresolved
+
+        if remap:
+            for xref in new_xrefs:
+                if xref in remap:
+                    continue
+                definition = doc.xref_object(xref, compressed=True).encode()
+                rewritten = self._remapped(definition, remap)
+                if rewritten != definition:
+                    doc.update_object(xref, rewritten.decode())
+        return len(remap)
+
+    def _shareable(self, xref: int) -> bool:
+        if self._doc.xref_is_stream(xref):
+            return True
+        return not _UNSHARED_RE.search(self._doc.xref_object(xref, compressed=True).encode())
+
+    def _digest(self, xref: int, definition: bytes) -> bytes:
+        if not self._doc.xref_is_stream(xref):
+            return hashlib.sha256(b"obj\0" + definition).digest()
+        return hashlib.sha256(b"stream\0" + definition + b"\0" + self._doc.xref_stream_raw(xref)).digest()
+
+    @staticmethod
+    def _remapped(definition: bytes, remap: dict[int, int]) -> bytes:
+        if not remap:
+            return definition
+        return _REF_RE.sub(lambda m: b"%d 0 R" % remap.get(int(m.group(1)), int(m.group(1))), definition)
+
+
+def extract_pdf_pages(pdf_path: str, pages: Sequence[int]) -> str:
+    """
+    Copy selected pages of a PDF into a new temp PDF.
+
+    Args:
+        pdf_path: Source PDF path
+        pages: 0-indexed pages to keep, in order
+
+    Returns:
+        Path to the new PDF
+    """
+    with PdfMergeStream(spill_pages=len(pages) + 1) as merger:
+        merger.append(pdf_path, pages)
+        return merger.finish()
@@ -14,6 +14,9 @@ import config
 
 logger = logging.getLogger("proposal-bot")
 
+# Bump when the financial slide layout changes so cached renders are not reused
+FINANCIAL_SLIDE_VERSION = 1
+
 # Static asset cache - use /data if writable, otherwise /tmp
 if os.path.exists("/data") and os.access("/data", os.W_OK):
     STATIC_CACHE_DIR = Path("/data/static")
@@ -47,7 +50,10 @@ def _get_header_image_path() -> Path | None:
 
         # Run async download - handle both sync and async contexts
         async def _download():
-            return await storage.download("static", "image.png")
+            try:
+                return await storage.download_to_path("static", "image.png", cached_path)
+            finally:
+                await storage.close()
 
         try:
             loop = asyncio.get_running_loop()
@@ -59,8 +65,7 @@ def _get_header_image_path() -> Path | None:
             # No running loop - safe to use asyncio.run
             result = asyncio.run(_download())
 
-        if result.success and result.data:
-            cached_path.write_bytes(result.data)
+        if result.success:
             logger.info("[PPTX] Downloaded header image from storage")
             return cached_path
         else:
@@ -396,7 +396,10 @@ class ToolRouter:
         # Update status
         await self._channel.update_message(channel_id=channel, message_id=status_ts, content="⏳ _Building Proposal..._")
 
-        result = await process_proposals(proposals_data, "separate", None, user_id, client_name, payment_terms, currency, user_companies)
+        result = await process_proposals(
+            proposals_data, "separate", None, user_id, client_name, payment_terms, currency, user_companies,
+            location_index=workflow_ctx.location_index if workflow_ctx else None,
+        )
         await self._handle_proposal_result(result, channel, status_ts)
 
     async def _handle_combined_proposal(self, args: dict, ctx: dict) -> None:
@@ -479,7 +482,10 @@ class ToolRouter:
                 proposal["durations"] = [proposal.pop("duration")]
                 logger.info(f"[COMBINED] Transformed proposal: {proposal}")
 
-        result = await process_proposals(proposals_data, "combined", combined_net_rate, user_id, client_name, payment_terms, currency, user_companies)
+        result = await process_proposals(
+            proposals_data, "combined", combined_net_rate, user_id, client_name, payment_terms, currency, user_companies,
+            location_index=workflow_ctx.location_index if workflow_ctx else None,
+        )
         await self._handle_proposal_result(result, channel, status_ts)
 
     async def _handle_proposal_result(self, result: dict, channel: str, status_ts: str) -> None:
@@ -1062,6 +1068,7 @@ class ToolRouter:
             company_hint=company_hint,
             venue_type=args.get("venue_type", "").strip().lower() or "all",
             asset_type_key=args.get("asset_type_key"),
+            location_index=workflow_ctx.location_index if workflow_ctx else None,
         )
 
 
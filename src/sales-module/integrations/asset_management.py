@@ -16,7 +16,12 @@ Usage:
     eligibility = await asset_mgmt_client.check_location_eligibility("backlite_dubai", 123)
 """
 
+import asyncio
 import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 from urllib.parse import quote
 
@@ -26,6 +31,36 @@ from app_settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Downloaded bytes held in memory before each write to the temp file
+_DOWNLOAD_WRITE_BYTES = 1024 * 1024
+
+
+@dataclass
+class FileDownload:
+    """
+    Result of a binary file download.
+
+    The body is streamed to path, a temp file the caller owns (move it into
+    place or delete it). path is None for a 304.
+    """
+    path: Path | None = None
+    etag: str | None = None
+    not_modified: bool = False
+
+
+def _read_and_remove(path: Path) -> bytes:
+    try:
+        return path.read_bytes()
+    finally:
+        path.unlink(missing_ok=True)
+
+
+async def _read_download(result: FileDownload | None) -> bytes | None:
+    """Body of a download as bytes, removing its temp file."""
+    if not result or not result.path:
+        return None
+    return await asyncio.to_thread(_read_and_remove, result.path)
+
 
 class AssetManagementClient:
     """
@@ -155,6 +190,88 @@ class AssetManagementClient:
             logger.error(f"[ASSET CLIENT] Request error for {endpoint}: {e}")
             raise ConnectionError(f"Request to asset-management failed: {e}")
 
+    async def _download(
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        etag: str | None = None,
+    ) -> FileDownload | None:
+        """
+        Stream a binary file from one of asset-management's /raw endpoints.
+
+        The body is written to a temp file as it arrives (off the event
+        loop, about a megabyte at a time), so memory use does not grow with
+        the file size - no JSON/base64 round trip. If etag is given it is
+        sent as If-None-Match and a 304 comes back as
+        FileDownload(not_modified=True).
+
+        Args:
+            endpoint: API endpoint (e.g., "/api/storage/templates/x/y/raw")
+            params: Optional query parameters
+            etag: ETag of a previously downloaded copy
+
+        Returns:
+            FileDownload, or None if 404
+
+        Raises:
+            ConnectionError: If unable to connect to asset-management
+            httpx.HTTPStatusError: For non-404 error responses
+        """
+        headers = self._get_headers()
+        headers.pop("Content-Type", None)
+        if etag:
+            headers["If-None-Match"] = etag
+
+        client = await self._get_http_client()
+
+        try:
+            async with client.stream("GET", endpoint, params=params, headers=headers) as response:
+                if response.status_code == 404:
+                    return None
+                if response.status_code == 304:
+                    return FileDownload(etag=response.headers.get("etag", etag), not_modified=True)
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+
+                path = await self._stream_to_file(response)
+                return FileDownload(path=path, etag=response.headers.get("etag"))
+
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"[ASSET CLIENT] HTTP error {e.response.status_code} "
+                f"for GET {endpoint}: {e.response.text}"
+            )
+            raise
+
+        except httpx.ConnectError as e:
+            logger.error(f"[ASSET CLIENT] Connection failed to {self.base_url}{endpoint}: {e}")
+            raise ConnectionError(f"Failed to connect to asset-management: {e}")
+
+        except httpx.RequestError as e:
+            logger.error(f"[ASSET CLIENT] Request error for {endpoint}: {e}")
+            raise ConnectionError(f"Request to asset-management failed: {e}")
+
+    @staticmethod
+    async def _stream_to_file(response: httpx.Response) -> Path:
+        """Write a streamed response body to a new temp file and return its path."""
+        fd, name = tempfile.mkstemp(prefix="asset-", suffix=".part")
+        path = Path(name)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                buffer = bytearray()
+                async for chunk in response.aiter_bytes():
+                    buffer += chunk
+                    if len(buffer) >= _DOWNLOAD_WRITE_BYTES:
+                        await asyncio.to_thread(f.write, buffer)
+                        buffer.clear()
+                if buffer:
+                    await asyncio.to_thread(f.write, buffer)
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        return path
+
     # =========================================================================
     # NETWORKS
     # =========================================================================
@@ -494,19 +611,40 @@ class AssetManagementClient:
             Template file bytes or None if not found
         """
         try:
-            response = await self._request(
-                "GET",
-                f"/api/storage/templates/{company}/{location_key}",
-                params={"format": format},
-            )
-            if response and "data" in response:
-                import base64
-                return base64.b64decode(response["data"])
-            return None
+            return await _read_download(await self.download_template(company, location_key, format=format))
         except Exception as e:
             logger.error(f"[ASSET CLIENT] Failed to get template {location_key} ({format}): {e}")
             return None
 
+    async def download_template(
+        self,
+        company: str,
+        location_key: str,
+        format: str = "pptx",
+        etag: str | None = None,
+    ) -> FileDownload | None:
+        """
+        Stream template file from Asset-Management storage.
+
+        Args:
+            company: Company schema (e.g., "backlite_dubai")
+            location_key: Location identifier (e.g., "dubai_mall")
+            format: File format - "pptx" (default) or "pdf"
+            etag: ETag of a cached copy (revalidation)
+
+        Returns:
+            FileDownload (body in a temp file the caller owns) or None if not found
+
+        Raises:
+            ConnectionError: If unable to connect to asset-management
+            httpx.HTTPStatusError: For non-404 error responses
+        """
+        return await self._download(
+            f"/api/storage/templates/{company}/{location_key}/raw",
+            params={"format": format},
+            etag=etag,
+        )
+
     async def get_template_url(
         self,
         company: str,
@@ -889,23 +1027,52 @@ class AssetManagementClient:
             Photo bytes or None if not found
         """
         try:
-            # URL-encode location_key to handle traditional networks with slashes
-            encoded_location = quote(location_key, safe='')
-            # Use simplified path for indoor
-            if environment == "indoor":
-                endpoint = f"/api/storage/mockups/{company}/{encoded_location}/indoor/{photo_filename}"
-            else:
-                endpoint = f"/api/storage/mockups/{company}/{encoded_location}/{environment}/{time_of_day}/{side}/{photo_filename}"
-
-            response = await self._request("GET", endpoint)
-            if response and "data" in response:
-                import base64
-                return base64.b64decode(response["data"])
-            return None
+            return await _read_download(
+                await self.download_mockup_photo(company, location_key, time_of_day, side, photo_filename, environment)
+            )
         except Exception as e:
             logger.error(f"[ASSET CLIENT] Failed to get mockup photo: {e}")
             return None
 
+    async def download_mockup_photo(
+        self,
+        company: str,
+        location_key: str,
+        time_of_day: str,
+        side: str,
+        photo_filename: str,
+        environment: str = "outdoor",
+        etag: str | None = None,
+    ) -> FileDownload | None:
+        """
+        Stream mockup background photo from Asset-Management storage.
+
+        Args:
+            company: Company schema
+            location_key: Location identifier
+            time_of_day: "day" or "night" (ignored for indoor)
+            side: "gold", "silver", or "single_side" (ignored for indoor)
+            photo_filename: Photo filename
+            environment: "indoor" or "outdoor"
+            etag: ETag of a cached copy (revalidation)
+
+        Returns:
+            FileDownload (body in a temp file the caller owns) or None if not found
+
+        Raises:
+            ConnectionError: If unable to connect to asset-management
+            httpx.HTTPStatusError: For non-404 error responses
+        """
+        # URL-encode location_key to handle traditional networks with slashes
+        encoded_location = quote(location_key, safe='')
+        # Use simplified path for indoor
+        if environment == "indoor":
+            endpoint = f"/api/storage/mockups/{company}/{encoded_location}/indoor/{photo_filename}/raw"
+        else:
+            endpoint = f"/api/storage/mockups/{company}/{encoded_location}/{environment}/{time_of_day}/{side}/{photo_filename}/raw"
+
+        return await self._download(endpoint, etag=etag)
+
     async def get_mockup_photo_url(
         self,
         company: str,
@@ -954,18 +1121,34 @@ class AssetManagementClient:
             PDF bytes or None if not found
         """
         try:
-            response = await self._request(
-                "GET",
-                f"/api/storage/intro-outro/{company}/{pdf_name}",
-            )
-            if response and "data" in response:
-                import base64
-                return base64.b64decode(response["data"])
-            return None
-        except Exception as e:
+            return await _read_download(await self.download_intro_outro_pdf(company, pdf_name))
+        except Exception:
             logger.debug(f"[ASSET CLIENT] Intro/outro PDF not found: {pdf_name}")
             return None
 
+    async def download_intro_outro_pdf(
+        self,
+        company: str,
+        pdf_name: str,
+        etag: str | None = None,
+    ) -> FileDownload | None:
+        """
+        Stream intro/outro PDF from Asset-Management storage.
+
+        Args:
+            company: Company schema
+            pdf_name: PDF name (e.g., "landmark_series", "rest")
+            etag: ETag of a cached copy (revalidation)
+
+        Returns:
+            FileDownload (body in a temp file the caller owns) or None if not found
+
+        Raises:
+            ConnectionError: If unable to connect to asset-management
+            httpx.HTTPStatusError: For non-404 error responses
+        """
+        return await self._download(f"/api/storage/intro-outro/{company}/{pdf_name}/raw", etag=etag)
+
     # =========================================================================
     # MOCKUP STORAGE INFO (Unified Architecture Support)
     # =========================================================================
@@ -11,12 +11,17 @@ Trusted Headers (set by unified-ui proxy):
 - X-Trusted-User-Name: User's display name
 - X-Trusted-User-Profile: User's RBAC profile name
 - X-Trusted-User-Permissions: JSON array of permission strings
+- X-Trusted-User-Context: signed RBAC context token; decoded by
+  crm_security's TrustedUserMiddleware (used when the permissions
+  header is not sent)
 """
 
 import json
 import logging
 from typing import Any
 
+from crm_security import get_current_user_permissions
+
 from integrations.auth.base import (
     AuthProvider,
     AuthResult,
@@ -106,6 +111,9 @@ class SupabaseAuthProvider(AuthProvider):
                     permissions = json.loads(permissions_json)
                 except json.JSONDecodeError:
                     logger.warning("[AUTH:SUPABASE] Failed to parse permissions JSON")
+            else:
+                # Sent in X-Trusted-User-Context instead
+                permissions = get_current_user_permissions()
 
             # Build user from headers
             user = AuthUser(
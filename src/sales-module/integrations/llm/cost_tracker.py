@@ -13,17 +13,300 @@ The cost tracker maintains data accuracy by preserving all cost breakdowns:
 - Image costs (per-image or token-based)
 
 All costs are logged with full metadata for analytics and debugging.
+
+Rows are written behind: track_cost() queues the row and a background
+writer batch-inserts it, so LLM calls never wait on the database. The
+tracker also keeps running totals per (date, call_type, workflow, model,
+user_id). The /costs dashboard is served from those totals instead of
+aggregating ai_costs on every request.
 """
 
 import json
 import logging
+import threading
+import time
+from collections import deque
 from typing import Any
 
 from crm_llm import CostInfo
+from crm_utils import BackgroundFlusher
+
+from app_settings import settings
+from core.utils.time import get_uae_time
+from db.cost_rollups import ROLLUP_FIELDS, ROLLUP_KEY, summarize_cost_buckets
 from db.database import db
+from db.executor import run_db
 
 logger = logging.getLogger("proposal-bot")
 
+# Seconds before retrying a failed aggregate load
+_REFRESH_RETRY_SECONDS = 60.0
+
+
+class CostAggregates:
+    """
+    Running AI cost totals per (date, call_type, workflow, model, user_id).
+
+    The in-memory copy of the ai_costs_daily rollup (see db/cost_rollups.py),
+    which is enough to answer the cost dashboard's date, call type, workflow
+    and user filters without querying the database.
+    """
+
+    def __init__(self):
+        self._groups: dict[tuple, dict[str, Any]] = {}
+
+    @classmethod
+    def from_rollup(cls, rollup: list[dict[str, Any]]) -> "CostAggregates":
+        """Build from db.get_ai_cost_rollup() rows."""
+        aggregates = cls()
+        for r in rollup:
+            aggregates._add((r["bucket"], r["call_type"], r["workflow"], r["model"], r["user_id"]), r["calls"], r)
+        return aggregates
+
+    def add(self, row: dict[str, Any]) -> None:
+        """Count one ai_costs row."""
+        key = (row["timestamp"][:10], row["call_type"], row["workflow"], row["model"], row["user_id"])
+        self._add(key, 1, row)
+
+    def _add(self, key: tuple, calls: int, values: dict[str, Any]) -> None:
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = {**dict(zip(ROLLUP_KEY, key, strict=True)), "calls": 0, **dict.fromkeys(ROLLUP_FIELDS, 0)}
+        group["calls"] += calls
+        for field in ROLLUP_FIELDS:
+            group[field] += values.get(field) or 0
+
+    def summary(
+        self,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        call_type: str | None = None,
+        workflow: str | None = None,
+        user_id: str | None = None,
+    ) -> dict[str, Any]:
+        """Summary in the shape of db.get_ai_costs_summary(), without recent calls."""
+        return summarize_cost_buckets([
+            group
+            for (date, ct, wf, _, user), group in self._groups.items()
+            if not (
+                (start_date and date < start_date)
+                or (end_date and date > end_date)
+                or (call_type and ct != call_type)
+                or (workflow and wf != workflow)
+                or (user_id and user != user_id)
+            )
+        ])
+
+
+class CostTracker(BackgroundFlusher):
+    """
+    Write-behind queue for ai_costs rows plus in-memory aggregates.
+
+    record() is non-blocking and thread-safe. A writer task on the event
+    loop (see BackgroundFlusher) batch-inserts queued rows by size or
+    interval; if the database is
+    unavailable the rows stay queued (up to cost_max_pending, oldest dropped)
+    and are retried on the next flush. Aggregates are loaded from the
+    database when the writer starts, then updated per row and reloaded
+    every cost_aggregates_refresh seconds to pick up other instances.
+    """
+
+    def __init__(
+        self,
+        database: Any | None = None,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+        max_pending: int | None = None,
+        refresh_interval: int | None = None,
+    ):
+        super().__init__(flush_interval or settings.cost_flush_interval, "ai-costs")
+        self._db = database or db
+        self._batch_size = batch_size or settings.cost_batch_size
+        self._max_pending = max_pending or settings.cost_max_pending
+        self._refresh_interval = settings.cost_aggregates_refresh if refresh_interval is None else refresh_interval
+
+        self._pending: deque[dict[str, Any]] = deque()
+        self._lock = threading.Lock()  # Guards _pending, _aggregates and _reload_rows
+        self._aggregates: CostAggregates | None = None  # None until loaded
+        self._reload_rows: list[dict[str, Any]] | None = None
+        self._next_refresh = 0.0
+
+        self.written = 0
+        self.dropped = 0
+        self._failing = False
+
+    def record(self, row: dict[str, Any]) -> None:
+        """Queue an ai_costs row and count it in the aggregates."""
+        with self._lock:
+            if len(self._pending) >= self._max_pending:
+                self._pending.popleft()
+                self.dropped += 1
+            self._pending.append(row)
+            if self._aggregates is not None:
+                self._aggregates.add(row)
+            if self._reload_rows is not None:
+                self._reload_rows.append(row)
+            pending = len(self._pending)
+
+        self.notify(batch_ready=pending >= self._batch_size)
+
+    def aggregate_summary(
+        self,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        call_type: str | None = None,
+        workflow: str | None = None,
+        user_id: str | None = None,
+    ) -> dict[str, Any] | None:
+        """
+        Aggregated summary, or None if it cannot be answered from memory
+        (aggregates not loaded yet, or a date filter finer than a day).
+        """
+        if any(date and "T" in date for date in (start_date, end_date)):
+            return None
+        with self._lock:
+            if self._aggregates is None:
+                return None
+            return self._aggregates.summary(start_date, end_date, call_type, workflow, user_id)
+
+    async def get_summary(
+        self,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        call_type: str | None = None,
+        workflow: str | None = None,
+        user_id: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        AI costs summary in the shape of db.get_ai_costs_summary().
+
+        Served from the aggregates plus an indexed read of the most recent
+        calls; falls back to the full database summary until the aggregates
+        are loaded.
+        """
+        summary = self.aggregate_summary(start_date, end_date, call_type, workflow, user_id)
+        if summary is None:
+            return await run_db(
+                self._db.get_ai_costs_summary, start_date, end_date, call_type, workflow, user_id
+            )
+
+        try:
+            await self.flush()
+            summary["calls"] = await run_db(
+                self._db.get_recent_ai_costs, start_date, end_date, call_type, workflow, user_id, 100
+            )
+        except Exception as e:
+            logger.error(f"[COSTS] Failed to load recent calls: {e}")
+            summary["calls"] = []
+        return summary
+
+    def clear(self) -> None:
+        """Drop queued rows and reset aggregates (after ai_costs is cleared)."""
+        with self._lock:
+            self._pending.clear()
+            if self._aggregates is not None:
+                self._aggregates = CostAggregates()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    # =========================================================================
+    # WRITER
+    # =========================================================================
+
+    async def on_start(self) -> None:
+        if time.monotonic() >= self._next_refresh:
+            await self.refresh()
+
+    async def on_interval(self) -> None:
+        await self.flush()
+        if time.monotonic() >= self._next_refresh:
+            await self.refresh()
+
+    async def flush(self) -> None:
+        """Write all queued rows in batches."""
+        async with self.flush_lock():
+            while self._pending:
+                with self._lock:
+                    batch = [self._pending.popleft() for _ in range(min(self._batch_size, len(self._pending)))]
+                try:
+                    await run_db(self._db.log_ai_costs, batch)
+                except Exception as e:
+                    with self._lock:
+                        self._pending.extendleft(reversed(batch))
+                    if not self._failing:
+                        logger.error(f"[COSTS] Failed to write {len(batch)} cost rows, will retry: {e}")
+                    self._failing = True
+                    return
+
+                self._failing = False
+                self.written += len(batch)
+                logger.debug(f"[COSTS] Wrote {len(batch)} cost rows")
+
+    async def refresh(self) -> None:
+        """Reload the aggregates from the database."""
+        # Hold the flush lock so queued rows are not written while the
+        # rollup is read; they are added on top of it instead.
+        async with self.flush_lock():
+            with self._lock:
+                self._reload_rows = list(self._pending)
+            try:
+                rollup = await run_db(self._db.get_ai_cost_rollup)
+            except Exception as e:
+                logger.error(f"[COSTS] Failed to load cost aggregates: {e}")
+                with self._lock:
+                    self._reload_rows = None
+                self._next_refresh = time.monotonic() + _REFRESH_RETRY_SECONDS
+                return
+
+            aggregates = CostAggregates.from_rollup(rollup)
+            with self._lock:
+                for row in self._reload_rows:
+                    aggregates.add(row)
+                self._aggregates = aggregates
+                self._reload_rows = None
+            self._next_refresh = (
+                time.monotonic() + self._refresh_interval if self._refresh_interval else float("inf")
+            )
+            logger.info(f"[COSTS] Loaded cost aggregates ({len(rollup)} groups)")
+
+    async def close(self) -> None:
+        """Stop the writer and write out queued rows."""
+        await super().close()
+        if self._pending:
+            logger.error(f"[COSTS] {len(self._pending)} cost rows could not be written on shutdown")
+
+
+# Global tracker instance
+_tracker = CostTracker()
+
+
+def get_cost_tracker() -> CostTracker:
+    """Get the global cost tracker."""
+    return _tracker
+
+
+def start_cost_tracker() -> None:
+    """Start the background cost writer (call on startup)."""
+    _tracker.start()
+
+
+async def close_cost_tracker() -> None:
+    """Write out queued cost rows (call on shutdown)."""
+    await _tracker.close()
+
+
+async def get_costs_summary(
+    start_date: str | None = None,
+    end_date: str | None = None,
+    call_type: str | None = None,
+    workflow: str | None = None,
+    user_id: str | None = None,
+) -> dict[str, Any]:
+    """AI costs summary for the dashboard (see CostTracker.get_summary)."""
+    return await _tracker.get_summary(start_date, end_date, call_type, workflow, user_id)
+
 
 def track_cost(
     cost: CostInfo,
@@ -71,23 +354,25 @@ def track_cost(
         if cost.reasoning_tokens > 0 and cost.reasoning_cost > 0:
             reasoning_cost = cost.reasoning_cost
 
-        # Log to database with full accuracy
-        db.log_ai_cost(
-            call_type=call_type,
-            model=cost.model,
-            input_tokens=cost.input_tokens,
-            output_tokens=cost.output_tokens,
-            reasoning_tokens=cost.reasoning_tokens,
-            input_cost=cost.input_cost,
-            output_cost=cost.output_cost,
-            reasoning_cost=reasoning_cost,
-            total_cost=cost.total_cost,
-            user_id=user_id,
-            workflow=workflow,
-            cached_input_tokens=cost.cached_tokens,
-            context=context,
-            metadata_json=metadata_json,
-        )
+        # Queue for the write-behind batch insert, with full accuracy
+        _tracker.record({
+            "timestamp": get_uae_time().isoformat(),
+            "call_type": call_type,
+            "workflow": workflow,
+            "model": cost.model,
+            "user_id": user_id,
+            "context": context,
+            "input_tokens": cost.input_tokens,
+            "cached_input_tokens": cost.cached_tokens,
+            "output_tokens": cost.output_tokens,
+            "reasoning_tokens": cost.reasoning_tokens,
+            "total_tokens": cost.input_tokens + cost.output_tokens + cost.reasoning_tokens,
+            "input_cost": cost.input_cost,
+            "output_cost": cost.output_cost,
+            "reasoning_cost": reasoning_cost,
+            "total_cost": cost.total_cost,
+            "metadata_json": metadata_json,
+        })
 
         # Log detailed summary
         _log_cost_summary(cost, call_type)
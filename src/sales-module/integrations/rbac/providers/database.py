@@ -16,6 +16,7 @@ This provider reads from trusted headers and performs permission checks.
 """
 
 import logging
+from contextvars import ContextVar
 
 from integrations.rbac.base import (
     AccessLevel,
@@ -33,14 +34,32 @@ from integrations.rbac.base import (
 
 # Import from crm-security SDK
 from crm_security import (
+    CompiledPermissions,
     set_user_context,
     get_user_context,
     clear_user_context,
-    has_permission as _has_permission,
+    compile_permissions,
 )
 
 logger = logging.getLogger("proposal-bot")
 
+# The permission list the current request's checks were compiled from, and
+# its compiled form. The context keeps one list per request, so matching it
+# by identity skips re-hashing the whole list on every check.
+_request_permissions: ContextVar[tuple[list[str], CompiledPermissions] | None] = ContextVar(
+    "rbac_request_permissions", default=None
+)
+
+
+def _compiled_for_request(permissions: list[str]) -> CompiledPermissions:
+    """Get the compiled form of the current request's permission list."""
+    cached = _request_permissions.get()
+    if cached is not None and cached[0] is permissions:
+        return cached[1]
+    compiled = compile_permissions(permissions)
+    _request_permissions.set((permissions, compiled))
+    return compiled
+
 
 def can_access_user_data(target_user_id: str) -> bool:
     """
@@ -203,7 +222,7 @@ class DatabaseRBACProvider(RBACProvider):
         permissions = await self.get_user_permissions(user_id)
 
         # Use shared security module's permission checking
-        if _has_permission(permissions, permission):
+        if _compiled_for_request(permissions).has(permission):
             return True
 
         # Check ownership if context provided
@@ -5,7 +5,9 @@ Each provider implements their own storage-specific operations.
 Follows the same pattern as integrations/auth/base.py and integrations/llm/base.py.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -394,6 +396,126 @@ class StorageProvider(ABC):
                 result[key] = url
         return result
 
+    # =========================================================================
+    # BATCH OPERATIONS
+    # =========================================================================
+
+    async def download_many(
+        self,
+        bucket: str,
+        keys: list[str],
+        concurrency: int | None = None,
+    ) -> dict[str, DownloadResult]:
+        """
+        Download multiple files concurrently.
+
+        Args:
+            bucket: Source bucket/container name
+            keys: File keys/paths within the bucket
+            concurrency: Maximum transfers in flight (default: settings.storage_batch_concurrency)
+
+        Returns:
+            Dictionary mapping key -> DownloadResult
+        """
+        results = await self._gather_bounded(
+            [self.download(bucket, key) for key in keys], concurrency
+        )
+        return dict(zip(keys, results, strict=True))
+
+    async def download_many_to_paths(
+        self,
+        bucket: str,
+        destinations: dict[str, str | Path],
+        concurrency: int | None = None,
+    ) -> dict[str, DownloadResult]:
+        """
+        Download multiple files concurrently to the local filesystem.
+
+        Args:
+            bucket: Source bucket/container name
+            destinations: Dictionary mapping key -> local path
+            concurrency: Maximum transfers in flight (default: settings.storage_batch_concurrency)
+
+        Returns:
+            Dictionary mapping key -> DownloadResult (file info only, no data)
+        """
+        results = await self._gather_bounded(
+            [self.download_to_path(bucket, key, path) for key, path in destinations.items()],
+            concurrency,
+        )
+        return dict(zip(destinations, results, strict=True))
+
+    async def upload_many(
+        self,
+        bucket: str,
+        files: dict[str, bytes | Path],
+        concurrency: int | None = None,
+    ) -> dict[str, UploadResult]:
+        """
+        Upload multiple files concurrently.
+
+        Args:
+            bucket: Target bucket/container name
+            files: Dictionary mapping key -> contents (bytes) or local file (Path)
+            concurrency: Maximum transfers in flight (default: settings.storage_batch_concurrency)
+
+        Returns:
+            Dictionary mapping key -> UploadResult
+        """
+        results = await self._gather_bounded(
+            [
+                self.upload_from_path(bucket, key, source)
+                if isinstance(source, Path)
+                else self.upload(bucket, key, source)
+                for key, source in files.items()
+            ],
+            concurrency,
+        )
+        return dict(zip(files, results, strict=True))
+
+    async def delete_many(
+        self,
+        bucket: str,
+        keys: list[str],
+        concurrency: int | None = None,
+    ) -> dict[str, bool]:
+        """
+        Delete multiple files.
+
+        Args:
+            bucket: Bucket/container name
+            keys: File keys/paths to delete
+            concurrency: Maximum requests in flight (default: settings.storage_batch_concurrency)
+
+        Returns:
+            Dictionary mapping key -> True if deleted
+        """
+        # Default implementation: bounded individual calls
+        # Providers like Supabase override this with a single bulk request
+        results = await self._gather_bounded(
+            [self.delete(bucket, key) for key in keys], concurrency
+        )
+        return dict(zip(keys, results, strict=True))
+
+    async def _gather_bounded(
+        self,
+        coros: list[Awaitable[Any]],
+        concurrency: int | None = None,
+    ) -> list[Any]:
+        """Await coroutines with at most `concurrency` running at once, preserving order."""
+        if concurrency is None:
+            from app_settings import settings
+
+            concurrency = settings.storage_batch_concurrency
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def bounded(coro: Awaitable[Any]) -> Any:
+            async with semaphore:
+                return await coro
+
+        return await asyncio.gather(*(bounded(coro) for coro in coros))
+
     # =========================================================================
     # BUCKET OPERATIONS
     # =========================================================================
@@ -430,6 +552,9 @@ class StorageProvider(ABC):
     # UTILITY METHODS
     # =========================================================================
 
+    async def close(self) -> None:  # noqa: B027 - optional hook; providers without connections keep the no-op
+        """Release connections held by the provider (no-op by default)."""
+
     def get_content_type(self, filename: str) -> str:
         """
         Determine MIME type from filename.
@@ -380,6 +380,86 @@ class StorageClient:
         """
         return await self._provider.get_signed_urls_batch(bucket, keys, expires_in)
 
+    # =========================================================================
+    # BATCH OPERATIONS
+    # =========================================================================
+
+    async def download_many(
+        self,
+        bucket: str,
+        keys: list[str],
+        concurrency: int | None = None,
+    ) -> dict[str, DownloadResult]:
+        """
+        Download multiple files concurrently.
+
+        Args:
+            bucket: Source bucket/container name
+            keys: File keys/paths within the bucket
+            concurrency: Maximum transfers in flight (default: settings.storage_batch_concurrency)
+
+        Returns:
+            Dictionary mapping key -> DownloadResult
+        """
+        return await self._provider.download_many(bucket, keys, concurrency)
+
+    async def download_many_to_paths(
+        self,
+        bucket: str,
+        destinations: dict[str, str | Path],
+        concurrency: int | None = None,
+    ) -> dict[str, DownloadResult]:
+        """
+        Download multiple files concurrently to the local filesystem.
+
+        Args:
+            bucket: Source bucket/container name
+            destinations: Dictionary mapping key -> local path
+            concurrency: Maximum transfers in flight (default: settings.storage_batch_concurrency)
+
+        Returns:
+            Dictionary mapping key -> DownloadResult (file info only, no data)
+        """
+        return await self._provider.download_many_to_paths(bucket, destinations, concurrency)
+
+    async def upload_many(
+        self,
+        bucket: str,
+        files: dict[str, bytes | Path],
+        concurrency: int | None = None,
+    ) -> dict[str, UploadResult]:
+        """
+        Upload multiple files concurrently.
+
+        Args:
+            bucket: Target bucket/container name
+            files: Dictionary mapping key -> contents (bytes) or local file (Path)
+            concurrency: Maximum transfers in flight (default: settings.storage_batch_concurrency)
+
+        Returns:
+            Dictionary mapping key -> UploadResult
+        """
+        return await self._provider.upload_many(bucket, files, concurrency)
+
+    async def delete_many(
+        self,
+        bucket: str,
+        keys: list[str],
+        concurrency: int | None = None,
+    ) -> dict[str, bool]:
+        """
+        Delete multiple files.
+
+        Args:
+            bucket: Bucket/container name
+            keys: File keys/paths to delete
+            concurrency: Maximum requests in flight (default: settings.storage_batch_concurrency)
+
+        Returns:
+            Dictionary mapping key -> True if deleted
+        """
+        return await self._provider.delete_many(bucket, keys, concurrency)
+
     # =========================================================================
     # BUCKET OPERATIONS
     # =========================================================================
@@ -424,6 +504,10 @@ class StorageClient:
             await self.ensure_bucket(bucket_type.value)
         logger.info("[STORAGE] Default buckets ensured")
 
+    async def close(self) -> None:
+        """Release connections held by the provider."""
+        await self._provider.close()
+
 
 # =============================================================================
 # MODULE-LEVEL FUNCTIONS (like integrations/auth/client.py)
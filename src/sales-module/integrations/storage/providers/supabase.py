@@ -3,16 +3,24 @@ Supabase Storage provider.
 
 Implements StorageProvider using Supabase Storage (S3-compatible).
 Recommended for production deployments already using Supabase.
+
+All calls go through storage3's async client on a pooled httpx.AsyncClient,
+so transfers never block the event loop. Downloads to disk and uploads from
+disk are streamed in chunks rather than held in memory.
 """
 
+import asyncio
 import contextlib
-import json
 import logging
-import time
+import os
+import tempfile
+import weakref
 from datetime import datetime
 from pathlib import Path
 from typing import Any, BinaryIO
 
+import httpx
+
 from integrations.storage.base import (
     DownloadResult,
     ListResult,
@@ -62,7 +70,12 @@ class SupabaseStorageProvider(StorageProvider):
         """
         self._url = supabase_url
         self._key = supabase_key
-        self._client = None
+        # httpx connections are bound to the loop that opened them, and sync
+        # callers (e.g. font/header downloads) run their own short-lived loops
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._closing: set[asyncio.Future] = set()
 
         # Load from settings if not provided
         if not self._url or not self._key:
@@ -94,24 +107,86 @@ class SupabaseStorageProvider(StorageProvider):
             logger.warning(f"[STORAGE:SUPABASE] Failed to load settings: {e}")
 
     def _get_client(self):
-        """Get or create Supabase client."""
-        if self._client is None:
-            try:
-                from supabase import create_client
-                from supabase.lib.client_options import ClientOptions
+        """Get or create the async storage client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            self._close_idle_clients()
+            from app_settings import settings
 
-                # Use longer timeouts (seconds) to handle slow network conditions
-                options = ClientOptions(
-                    postgrest_client_timeout=30,
-                    storage_client_timeout=60,  # Storage operations can be slower
-                )
-                self._client = create_client(self._url, self._key, options=options)
-            except ImportError:
-                raise ImportError(
-                    "supabase package is required for SupabaseStorageProvider. "
-                    "Install with: pip install supabase"
-                )
-        return self._client
+            client = self._create_client(
+                timeout=httpx.Timeout(settings.storage_timeout, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=settings.storage_max_connections,
+                    max_keepalive_connections=settings.storage_max_connections,
+                ),
+            )
+            self._clients[loop] = client
+        return client
+
+    def _create_client(self, **http_options):
+        """
+        Build a storage client on a pooled httpx.AsyncClient.
+
+        The httpx client carries the storage base URL and auth headers itself:
+        storage3 2.x uses it as given, and download_to_path() streams through
+        it with relative paths.
+        """
+        try:
+            from storage3 import AsyncStorageClient
+        except ImportError:
+            raise ImportError(
+                "supabase package is required for SupabaseStorageProvider. "
+                "Install with: pip install supabase"
+            )
+
+        headers = {"apikey": self._key, "Authorization": f"Bearer {self._key}"}
+        http_client = httpx.AsyncClient(
+            base_url=f"{self._url}/storage/v1/",
+            headers=headers,
+            follow_redirects=True,
+            **http_options,
+        )
+        return AsyncStorageClient(f"{self._url}/storage/v1", headers, http_client=http_client)
+
+    def _close_idle_clients(self) -> None:
+        """
+        Close clients whose event loop is no longer running.
+
+        Those belong to sync callers' short-lived loops. Clients of loops still
+        running in other threads (the server's) are kept. Best effort: once a
+        loop has closed, its sockets may only be released when garbage collected.
+        """
+        for loop, client in list(self._clients.items()):
+            if not loop.is_running():
+                del self._clients[loop]
+                future = asyncio.ensure_future(self._aclose_quietly(client))
+                self._closing.add(future)
+                future.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _aclose_quietly(client) -> None:
+        try:
+            await client.session.aclose()
+        except Exception as e:
+            logger.debug(f"[STORAGE:SUPABASE] Could not close client from a previous event loop: {e}")
+
+    async def close(self) -> None:
+        """Close the pooled connections opened on the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.session.aclose()
+            logger.info("[STORAGE:SUPABASE] Connection pool closed")
+
+    @staticmethod
+    def _response_error(response: httpx.Response) -> str:
+        """Extract the storage API error message from a failed response."""
+        with contextlib.suppress(ValueError, AttributeError):
+            message = response.json().get("message")
+            if message:
+                return message
+        return f"HTTP {response.status_code}"
 
     @property
     def name(self) -> str:
@@ -181,7 +256,7 @@ class SupabaseStorageProvider(StorageProvider):
                 data = data.read()
 
             # Upload to Supabase Storage
-            client.storage.from_(bucket).upload(
+            await client.from_(bucket).upload(
                 path=key,
                 file=data,
                 file_options={
@@ -216,12 +291,29 @@ class SupabaseStorageProvider(StorageProvider):
             if not local_path.exists():
                 return UploadResult(success=False, error=f"Source file not found: {local_path}")
 
-            data = local_path.read_bytes()
+            client = self._get_client()
+            key = self.normalize_key(key)
 
             if not content_type:
                 content_type = self.get_content_type(local_path.name)
 
-            return await self.upload(bucket, key, data, content_type, metadata)
+            # Passing the file lets httpx stream it from disk in chunks
+            with open(local_path, "rb") as f:
+                await client.from_(bucket).upload(
+                    path=key,
+                    file=f,
+                    file_options={
+                        "content-type": content_type,
+                        "upsert": "true",
+                    },
+                )
+
+            file_info = self._storage_file_from_response(bucket, key)
+            file_info.size = local_path.stat().st_size
+            file_info.content_type = content_type
+
+            logger.info(f"[STORAGE:SUPABASE] Uploaded {bucket}/{key} from {local_path} ({file_info.size} bytes)")
+            return UploadResult(success=True, file=file_info)
 
         except Exception as e:
             logger.error(f"[STORAGE:SUPABASE] Upload from path failed {bucket}/{key}: {e}")
@@ -242,7 +334,7 @@ class SupabaseStorageProvider(StorageProvider):
             key = self.normalize_key(key)
 
             # Download from Supabase Storage
-            response = client.storage.from_(bucket).download(key)
+            response = await client.from_(bucket).download(key)
 
             file_info = self._storage_file_from_response(bucket, key)
             file_info.size = len(response)
@@ -260,24 +352,56 @@ class SupabaseStorageProvider(StorageProvider):
         key: str,
         local_path: str | Path,
     ) -> DownloadResult:
-        """Download file to local filesystem."""
-        try:
-            result = await self.download(bucket, key)
+        """
+        Stream a file to the local filesystem.
 
-            if not result.success:
-                return result
+        The body is written chunk by chunk to a temp file next to the
+        destination and renamed into place, so the file is never held in
+        memory and a failed transfer never leaves a partial destination.
+        """
+        part_path = None
+        try:
+            session = self._get_client().session
+            key = self.normalize_key(key)
 
             dest_path = Path(local_path)
             dest_path.parent.mkdir(parents=True, exist_ok=True)
-            dest_path.write_bytes(result.data)
 
-            logger.debug(f"[STORAGE:SUPABASE] Downloaded {bucket}/{key} to {local_path}")
-            return DownloadResult(success=True, file=result.file)
+            async with session.stream("GET", f"object/{bucket}/{key}") as response:
+                if response.is_error:
+                    await response.aread()
+                    error = self._response_error(response)
+                    logger.error(f"[STORAGE:SUPABASE] Download to path failed {bucket}/{key}: {error}")
+                    return DownloadResult(success=False, error=error)
+
+                fd, part_path = tempfile.mkstemp(dir=dest_path.parent, prefix=f".{dest_path.name}.", suffix=".part")
+                size = 0
+                with os.fdopen(fd, "wb") as part_file:
+                    async for chunk in response.aiter_bytes():
+                        part_file.write(chunk)
+                        size += len(chunk)
+                content_type = response.headers.get("content-type")
+
+            os.replace(part_path, dest_path)
+            part_path = None
+
+            file_info = self._storage_file_from_response(bucket, key)
+            file_info.size = size
+            if content_type:
+                file_info.content_type = content_type.split(";")[0].strip()
+
+            logger.debug(f"[STORAGE:SUPABASE] Downloaded {bucket}/{key} to {local_path} ({size} bytes)")
+            return DownloadResult(success=True, file=file_info)
 
         except Exception as e:
             logger.error(f"[STORAGE:SUPABASE] Download to path failed {bucket}/{key}: {e}")
             return DownloadResult(success=False, error=str(e))
 
+        finally:
+            if part_path:
+                with contextlib.suppress(OSError):
+                    os.unlink(part_path)
+
     # =========================================================================
     # FILE OPERATIONS
     # =========================================================================
@@ -292,7 +416,7 @@ class SupabaseStorageProvider(StorageProvider):
             client = self._get_client()
             key = self.normalize_key(key)
 
-            client.storage.from_(bucket).remove([key])
+            await client.from_(bucket).remove([key])
 
             logger.info(f"[STORAGE:SUPABASE] Deleted {bucket}/{key}")
             return True
@@ -301,6 +425,29 @@ class SupabaseStorageProvider(StorageProvider):
             logger.error(f"[STORAGE:SUPABASE] Delete failed {bucket}/{key}: {e}")
             return False
 
+    async def delete_many(
+        self,
+        bucket: str,
+        keys: list[str],
+        concurrency: int | None = None,
+    ) -> dict[str, bool]:
+        """Delete multiple files with a single bulk remove request."""
+        if not keys:
+            return {}
+
+        try:
+            client = self._get_client()
+            normalized = {self.normalize_key(k): k for k in keys}
+
+            await client.from_(bucket).remove(list(normalized))
+
+            logger.info(f"[STORAGE:SUPABASE] Deleted {len(normalized)} files from {bucket}")
+            return dict.fromkeys(keys, True)
+
+        except Exception as e:
+            logger.error(f"[STORAGE:SUPABASE] Bulk delete failed for {bucket}: {e}")
+            return dict.fromkeys(keys, False)
+
     async def exists(
         self,
         bucket: str,
@@ -317,7 +464,7 @@ class SupabaseStorageProvider(StorageProvider):
             if parent_path == ".":
                 parent_path = ""
 
-            response = client.storage.from_(bucket).list(parent_path)
+            response = await client.from_(bucket).list(parent_path)
 
             filename = Path(key).name
             return any(item.get("name") == filename for item in response)
@@ -341,7 +488,7 @@ class SupabaseStorageProvider(StorageProvider):
             if parent_path == ".":
                 parent_path = ""
 
-            response = client.storage.from_(bucket).list(parent_path)
+            response = await client.from_(bucket).list(parent_path)
 
             filename = Path(key).name
             for item in response:
@@ -374,7 +521,7 @@ class SupabaseStorageProvider(StorageProvider):
                 options["offset"] = int(continuation_token)
 
             path = self.normalize_key(prefix) if prefix else ""
-            response = client.storage.from_(bucket).list(path, options)
+            response = await client.from_(bucket).list(path, options)
 
             files = []
             for item in response:
@@ -406,21 +553,23 @@ class SupabaseStorageProvider(StorageProvider):
     ) -> UploadResult:
         """Copy a file within Supabase Storage."""
         try:
-            self._get_client()
             source_key = self.normalize_key(source_key)
             dest_key = self.normalize_key(dest_key)
 
-            # Supabase doesn't have native copy - download and reupload
-            result = await self.download(source_bucket, source_key)
-            if not result.success:
-                return UploadResult(success=False, error=f"Source not found: {source_bucket}/{source_key}")
-
-            return await self.upload(
-                dest_bucket,
-                dest_key,
-                result.data,
-                result.file.content_type if result.file else None,
-            )
+            # Stream through a temp file (download and upsert re-upload) so
+            # existing destinations are overwritten and memory stays flat
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                tmp_path = Path(tmp_dir) / Path(source_key).name
+                result = await self.download_to_path(source_bucket, source_key, tmp_path)
+                if not result.success:
+                    return UploadResult(success=False, error=f"Source not found: {source_bucket}/{source_key}")
+
+                return await self.upload_from_path(
+                    dest_bucket,
+                    dest_key,
+                    tmp_path,
+                    result.file.content_type if result.file else None,
+                )
 
         except Exception as e:
             logger.error(f"[STORAGE:SUPABASE] Copy failed: {e}")
@@ -441,7 +590,7 @@ class SupabaseStorageProvider(StorageProvider):
 
             if source_bucket == dest_bucket:
                 # Same bucket - use move
-                client.storage.from_(source_bucket).move(source_key, dest_key)
+                await client.from_(source_bucket).move(source_key, dest_key)
                 file_info = self._storage_file_from_response(dest_bucket, dest_key)
                 logger.info(f"[STORAGE:SUPABASE] Moved {source_bucket}/{source_key} to {dest_key}")
                 return UploadResult(success=True, file=file_info)
@@ -470,7 +619,7 @@ class SupabaseStorageProvider(StorageProvider):
             client = self._get_client()
             key = self.normalize_key(key)
 
-            response = client.storage.from_(bucket).get_public_url(key)
+            response = await client.from_(bucket).get_public_url(key)
             return response
 
         except Exception as e:
@@ -487,7 +636,7 @@ class SupabaseStorageProvider(StorageProvider):
         try:
             client = self._get_client()
             key = self.normalize_key(key)
-            response = client.storage.from_(bucket).create_signed_url(key, expires_in)
+            response = await client.from_(bucket).create_signed_url(key, expires_in)
 
             signed_url = response.get("signedURL") or response.get("signedUrl")
             if signed_url:
@@ -531,7 +680,7 @@ class SupabaseStorageProvider(StorageProvider):
             logger.info(f"[STORAGE:SUPABASE] Batch signed URLs: {len(keys)} files from {bucket}")
 
             # Use Supabase's batch signed URL method
-            response = client.storage.from_(bucket).create_signed_urls(
+            response = await client.from_(bucket).create_signed_urls(
                 normalized_keys,
                 expires_in
             )
@@ -571,7 +720,7 @@ class SupabaseStorageProvider(StorageProvider):
 
             # Try to create bucket (will fail if exists, which is fine)
             try:
-                client.storage.create_bucket(
+                await client.create_bucket(
                     bucket,
                     options={
                         "public": public,
@@ -593,7 +742,7 @@ class SupabaseStorageProvider(StorageProvider):
         """List all buckets in Supabase Storage."""
         try:
             client = self._get_client()
-            response = client.storage.list_buckets()
+            response = await client.list_buckets()
 
             return [b.name for b in response] if response else []
 
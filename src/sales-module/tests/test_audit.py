@@ -0,0 +1,194 @@
+"""
+Tests for buffered audit logging.
+
+These tests verify:
+- Events are written in batches instead of one insert per event
+- Batches are spilled to disk while the database is down and replayed in order,
+  each sink to its own file
+- Buffer overflow drops the oldest events and is reported in stats
+- The SQLite batch insert reports the real error when BEGIN fails
+- AuditClient closes its pooled client when used from a new event loop
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+
+import pytest
+from crm_security import AuditSink
+from crm_security.audit import AuditClient
+from crm_security.config import security_config
+
+from core.utils.audit import AuditAction, AuditLogger
+from db.backends.sqlite import SQLiteBackend
+
+
+class FakeAuditDB:
+    """Records batch inserts; raises while marked down."""
+
+    def __init__(self):
+        self.batches: list[list[dict]] = []
+        self.down = False
+
+    def log_audit_events(self, events: list[dict]) -> int:
+        if self.down:
+            raise ConnectionError("database unavailable")
+        self.batches.append(events)
+        return len(events)
+
+    @property
+    def actions(self) -> list[str]:
+        return [event["action"] for batch in self.batches for event in batch]
+
+
+@pytest.fixture
+def db() -> FakeAuditDB:
+    return FakeAuditDB()
+
+
+@pytest.fixture
+async def audit(db, tmp_path):
+    audit = AuditLogger()
+    audit._db = db
+    audit._sink = AuditSink(
+        audit._write_batch,
+        name="test",
+        buffer_size=8,
+        batch_size=3,
+        flush_interval=0.02,
+        spill_path=tmp_path / "audit.jsonl",
+    )
+    yield audit
+    await audit.close()
+
+
+class TestBufferedAuditLogger:
+    """AuditLogger batching, spill and metrics."""
+
+    async def test_events_are_batched(self, audit, db):
+        """Test that events are written in batches, not one insert per event."""
+        for n in range(7):
+            await audit.log(AuditAction.PROPOSAL_CREATE, user_id=f"u{n}", details={"n": n})
+        await audit.close()
+
+        assert [len(batch) for batch in db.batches] == [3, 3, 1]
+        assert json.loads(db.batches[2][0]["details_json"]) == {"n": 6}
+        assert audit.stats()["sent"] == 7
+
+    async def test_spills_while_down_and_replays_in_order(self, audit, db, tmp_path):
+        """Test that batches spill to disk while the database is down and replay in order."""
+        db.down = True
+        for n in range(4):
+            audit.log_sync(f"event.{n}")
+        await audit.log("event.4")
+        await asyncio.sleep(0.1)
+
+        stats = audit.stats()
+        assert stats["spill_backlog"] == 5 and stats["last_error"] == "database unavailable"
+        assert (tmp_path / "audit.jsonl").read_text().count("\n") == 5
+
+        db.down = False
+        await audit.log("event.5")
+        await asyncio.sleep(0.1)
+
+        assert db.actions == [f"event.{n}" for n in range(6)]
+        assert audit.stats()["spill_backlog"] == 0
+        assert not (tmp_path / "audit.jsonl").exists()
+
+    def test_sinks_spill_to_their_own_files(self, tmp_path, monkeypatch):
+        """Test that each audit sink spills to its own file."""
+        monkeypatch.setattr(security_config, "audit_spill_dir", str(tmp_path))
+
+        client = AuditClient(service_name="sales-module")
+        logger = AuditLogger()
+
+        assert client.sink._spill_path.parent == tmp_path
+        assert logger._sink._spill_path.parent == tmp_path
+        assert client.sink._spill_path != logger._sink._spill_path
+
+    async def test_overflow_drops_oldest(self, audit, db):
+        """Test that buffer overflow drops the oldest events."""
+        for n in range(10):
+            audit.log_sync(f"event.{n}")
+
+        stats = audit.stats()
+        assert stats["queued"] == 8 and stats["dropped"] == 2
+        await audit.close()
+        assert db.actions == [f"event.{n}" for n in range(2, 10)]
+
+
+class FailingBegin:
+    """Connection proxy whose BEGIN fails before a transaction starts."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def execute(self, sql, *args):
+        if sql == "BEGIN":
+            raise sqlite3.OperationalError("disk I/O error")
+        return self._conn.execute(sql, *args)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class TestSQLiteAuditBatch:
+    """SQLiteBackend.log_audit_events()."""
+
+    def test_failed_begin_raises_its_own_error(self, tmp_path, monkeypatch):
+        """Test that a BEGIN failure is not hidden by a ROLLBACK without a transaction."""
+        backend = SQLiteBackend(tmp_path / "audit.db")
+        backend.init_db()
+        connect = backend._connect
+        monkeypatch.setattr(backend, "_connect", lambda: FailingBegin(connect()))
+
+        with pytest.raises(sqlite3.OperationalError, match="disk I/O error"):
+            backend.log_audit_events([{"action": "event.0"}])
+
+
+async def closed(client) -> bool:
+    """Wait for a client to be closed (the close is scheduled, not awaited)."""
+    for _ in range(50):
+        if client.is_closed:
+            return True
+        await asyncio.sleep(0.01)
+    return False
+
+
+class TestAuditClient:
+    """AuditClient connection pool per event loop."""
+
+    async def test_client_of_finished_loop_is_closed(self):
+        """Test that the pooled client of a finished event loop is closed."""
+        client = AuditClient(service_name="test")
+
+        async def get_client():
+            return client._get_client()
+
+        old = await asyncio.to_thread(asyncio.run, get_client())
+        current = client._get_client()
+
+        assert current is not old
+        assert await closed(old)
+        await client.close()
+
+    async def test_client_is_closed_on_its_running_loop(self):
+        """Test that the old pooled client is closed on the loop it runs on."""
+        client = AuditClient(service_name="test")
+        other = asyncio.new_event_loop()
+        thread = threading.Thread(target=other.run_forever)
+        thread.start()
+        try:
+            async def get_client():
+                return client._get_client()
+
+            old = asyncio.run_coroutine_threadsafe(get_client(), other).result(5)
+            client._get_client()
+
+            assert await closed(old)
+            await client.close()
+        finally:
+            other.call_soon_threadsafe(other.stop)
+            thread.join()
+            other.close()
@@ -0,0 +1,144 @@
+"""
+Tests for row-per-message chat storage.
+
+These tests verify:
+- Appends insert only the new rows and keep messages round-tripping unchanged
+- "Last N" and newest-first paging read the right seq range
+- A write that cannot start its transaction fails cleanly
+- Existing chat_sessions.messages blobs are migrated to rows on init
+- core.chat_persistence works on top of the new storage
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from core import chat_persistence
+from db.backends.sqlite import SQLiteBackend
+
+
+def _message(n: int, **extra) -> dict:
+    role = "user" if n % 2 == 0 else "assistant"
+    message = {"id": f"m{n}", "role": role, "content": f"message {n}", "timestamp": f"2026-10-16T10:{n:02d}:00"}
+    if role == "assistant":
+        message["parent_id"] = f"m{n - 1}"
+    message.update(extra)
+    return message
+
+
+@pytest.fixture
+def backend(tmp_path) -> SQLiteBackend:
+    backend = SQLiteBackend(tmp_path / "chat.db")
+    backend.init_db()
+    return backend
+
+
+def _row_count(backend: SQLiteBackend, user_id: str) -> int:
+    conn = sqlite3.connect(backend._db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM chat_messages WHERE user_id = ?", (user_id,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestChatMessageRows:
+    """Append, load and paging."""
+
+    def test_append_round_trips(self, backend):
+        first = [_message(0, attachments=[{"file_id": "f1", "filename": "a.png"}]), _message(1)]
+        second = [_message(2, files=[{"file_id": "f2"}]), _message(3)]
+
+        assert backend.append_chat_messages("u1", first, "s1")
+        assert backend.append_chat_messages("u1", second, "ignored")
+
+        session = backend.get_chat_session("u1")
+        assert session["session_id"] == "s1" and session["message_count"] == 4
+        assert session["messages"] == first + second
+        assert _row_count(backend, "u1") == 4
+
+    def test_last_n_and_paging(self, backend):
+        messages = [_message(n) for n in range(25)]
+        for n in range(0, 25, 5):
+            backend.append_chat_messages("u1", messages[n:n + 5])
+
+        assert backend.get_chat_messages("u1", limit=10, newest_first=True) == messages[15:]
+        assert backend.get_chat_messages("u1", limit=10, offset=10, newest_first=True) == messages[5:15]
+        assert backend.get_chat_messages("u1", limit=10, offset=20, newest_first=True) == messages[:5]
+        assert backend.get_chat_messages("u1", limit=10, offset=20) == messages[20:]
+        assert backend.get_chat_messages("u1") == messages
+        assert backend.get_chat_messages("nobody", limit=10) == []
+
+    def test_save_replaces_and_delete_clears(self, backend):
+        backend.append_chat_messages("u1", [_message(n) for n in range(6)], "s1")
+        backend.save_chat_session("u1", [_message(0), _message(1)])
+
+        session = backend.get_chat_session("u1", include_messages=False)
+        assert session["session_id"] == "s1" and session["message_count"] == 2 and "messages" not in session
+        assert _row_count(backend, "u1") == 2
+
+        backend.append_chat_messages("u1", [_message(2)])
+        assert [m["id"] for m in backend.get_chat_messages("u1")] == ["m0", "m1", "m2"]
+
+        assert backend.delete_chat_session("u1")
+        assert backend.get_chat_session("u1") is None and _row_count(backend, "u1") == 0
+
+    def test_failed_begin_returns_false(self, backend):
+        # Another writer holds the lock, so BEGIN fails before a transaction starts
+        conn = backend._connect()
+        conn.execute("PRAGMA busy_timeout=0")
+        conn.close()
+        writer = sqlite3.connect(backend._db_path)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            assert not backend.save_chat_session("u1", [_message(0)])
+            assert not backend.append_chat_messages("u1", [_message(0)])
+        finally:
+            writer.rollback()
+            writer.close()
+
+        assert backend.append_chat_messages("u1", [_message(0)])
+        assert _row_count(backend, "u1") == 1
+
+    def test_blob_sessions_are_migrated(self, backend):
+        legacy = [_message(n) for n in range(3)]
+        conn = sqlite3.connect(backend._db_path)
+        conn.execute(
+            "INSERT INTO chat_sessions (user_id, session_id, messages, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            ("u1", "s1", json.dumps([*legacy, None]), "2026-10-01", "2026-10-01"),
+        )
+        conn.commit()
+        conn.close()
+
+        backend.init_db()
+        assert backend.get_chat_session("u1")["messages"] == legacy
+
+        backend.append_chat_messages("u1", [_message(3)])
+        assert backend.get_chat_messages("u1", limit=2, newest_first=True) == [legacy[2], _message(3)]
+
+
+class TestChatPersistence:
+    """core.chat_persistence on the row storage."""
+
+    @pytest.fixture(autouse=True)
+    def use_backend(self, backend, monkeypatch):
+        monkeypatch.setattr(chat_persistence, "_get_db", lambda: backend)
+
+    def test_append_load_and_info(self):
+        messages = [_message(n) for n in range(8)]
+        assert chat_persistence.append_chat_messages("u1", messages[:4], "s1")
+        assert chat_persistence.append_chat_messages("u1", messages[4:])
+
+        assert chat_persistence.load_chat_messages("u1") == messages
+        assert chat_persistence.load_chat_messages("u1", limit=3) == messages[5:]
+        info = chat_persistence.get_chat_session_info("u1")
+        assert info["session_id"] == "s1" and info["message_count"] == 8
+
+    def test_save_orders_pairs(self):
+        # Assistant reply to m0 finishes after m2 was sent
+        messages = [_message(0), _message(2), _message(3), _message(1)]
+        assert chat_persistence.save_chat_messages("u1", messages)
+        assert [m["id"] for m in chat_persistence.load_chat_messages("u1")] == ["m0", "m1", "m2", "m3"]
+
+        assert chat_persistence.clear_chat_messages("u1")
+        assert chat_persistence.load_chat_messages("u1") == []
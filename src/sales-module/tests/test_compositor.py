@@ -0,0 +1,125 @@
+"""
+Tests for the billboard compositor.
+
+These tests verify:
+- ROI compositing matches the full-resolution pipeline
+- Pixels outside the padded frame bounding box are untouched
+- Prepared creatives are cached by content and config
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from generators.effects import BillboardCompositor, EffectConfig, PreparedCreativeCache, creative_digest
+
+FRAME_POINTS = [[300, 180], [620, 200], [610, 420], [290, 400]]
+
+
+@pytest.fixture
+def billboard() -> np.ndarray:
+    """Synthetic billboard photo with low-frequency texture."""
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 255, (720, 960, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(noise, (9, 9), 3)
+
+
+@pytest.fixture
+def creative() -> np.ndarray:
+    """Synthetic creative image."""
+    rng = np.random.default_rng(1)
+    noise = rng.integers(0, 255, (200, 300, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(noise, (5, 5), 2)
+
+
+class TestRoiCompositing:
+    """ROI mode must be indistinguishable from the full-frame path."""
+
+    @pytest.mark.parametrize("time_of_day", ["day", "night"])
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {},
+            {"edge_blur": 21, "depth_multiplier": 25, "vignette": 40, "sharpening": 50},
+            {"edge_blur": 15, "shadow_intensity": 30, "saturation": 130, "overlay_opacity": 20},
+        ],
+    )
+    def test_matches_full_resolution(self, billboard, creative, overrides, time_of_day):
+        """Test that ROI output matches the full-resolution output."""
+        full = BillboardCompositor(
+            EffectConfig(**overrides, roi_compositing=False).validate(), time_of_day
+        ).composite(billboard, creative, FRAME_POINTS)
+        roi = BillboardCompositor(
+            EffectConfig(**overrides).validate(), time_of_day
+        ).composite(billboard, creative, FRAME_POINTS)
+
+        diff = np.abs(full.astype(np.int16) - roi.astype(np.int16))
+        assert diff.max() <= 1
+
+    def test_frame_touching_image_border(self, billboard, creative):
+        """Test that frames clipped by the photo edge still match."""
+        points = [[-20, -10], [200, 0], [210, 150], [0, 160]]
+        config = {"edge_blur": 15}
+
+        full = BillboardCompositor(
+            EffectConfig(**config, roi_compositing=False).validate()
+        ).composite(billboard, creative, points)
+        roi = BillboardCompositor(EffectConfig(**config).validate()).composite(
+            billboard, creative, points
+        )
+
+        diff = np.abs(full.astype(np.int16) - roi.astype(np.int16))
+        assert diff.max() <= 1
+
+    def test_pixels_outside_roi_untouched(self, billboard, creative):
+        """Test that only the padded bounding box is written."""
+        compositor = BillboardCompositor(EffectConfig(edge_blur=21).validate())
+        result = compositor.composite(billboard, creative, FRAME_POINTS)
+
+        outside = np.ones(billboard.shape[:2], dtype=bool)
+        x0, y0, x1, y1 = compositor.roi_bounds(
+            billboard.shape, np.array(FRAME_POINTS, dtype=np.float32)
+        )
+        outside[y0:y1, x0:x1] = False
+
+        assert np.array_equal(result[outside], billboard[outside])
+
+
+class TestPreparedCreativeCache:
+    """Prepared creatives are shared across renders with the same inputs."""
+
+    def test_reuses_prepared_creative(self, creative):
+        """Test that a second lookup with the same config is a cache hit."""
+        cache = PreparedCreativeCache(max_bytes=64 * 1024 * 1024)
+        compositor = BillboardCompositor(EffectConfig().validate())
+        digest = creative_digest(creative.tobytes())
+
+        first = cache.get_or_prepare(digest, creative, compositor)
+        second = cache.get_or_prepare(digest, creative, compositor)
+
+        assert first is second
+        assert cache.stats()["hits"] == 1
+        assert not first.flags.writeable
+
+    def test_config_change_misses(self, creative):
+        """Test that preparation-relevant config is part of the key."""
+        cache = PreparedCreativeCache(max_bytes=64 * 1024 * 1024)
+        digest = creative_digest(creative.tobytes())
+
+        cache.get_or_prepare(digest, creative, BillboardCompositor(EffectConfig().validate()))
+        cache.get_or_prepare(digest, creative, BillboardCompositor(EffectConfig(image_blur=4).validate()))
+
+        assert cache.stats()["misses"] == 2
+
+    def test_evicts_over_budget(self, creative):
+        """Test that the byte budget is enforced with LRU eviction."""
+        compositor = BillboardCompositor(EffectConfig().validate())
+        entry_bytes = compositor.prepare_creative(creative).nbytes
+        cache = PreparedCreativeCache(max_bytes=entry_bytes)
+
+        cache.get_or_prepare("a", creative, compositor)
+        cache.get_or_prepare("b", creative, compositor)
+
+        stats = cache.stats()
+        assert stats["entries"] == 1
+        assert stats["size_bytes"] <= entry_bytes
@@ -0,0 +1,170 @@
+"""
+Tests for AI cost rollup tables.
+
+These tests verify:
+- The insert trigger keeps daily and hourly rollups equal to a raw GROUP BY
+- Rollups are backfilled when an existing database is opened
+- Summaries from rollups (plus raw edge hours) match a raw-row scan
+"""
+
+import random
+import sqlite3
+
+import pytest
+
+from db.backends.sqlite import SQLiteBackend
+from db.cost_rollups import ROLLUP_FIELDS, group_raw_costs, plan_cost_range, summarize_cost_buckets
+
+CALL_TYPES = ["main_llm", "mockup_analysis", "image_generation"]
+WORKFLOWS = ["proposal_generation", "mockup_ai", None]
+MODELS = ["gpt-5", "gpt-image-1"]
+USERS = ["u1", "u2", None]
+
+
+def _row(rng: random.Random) -> dict:
+    input_tokens, output_tokens = rng.randint(10, 5000), rng.randint(10, 2000)
+    input_cost, output_cost = input_tokens * 1e-6, output_tokens * 4e-6
+    return {
+        "timestamp": (
+            f"2026-10-{rng.randint(1, 6):02d}T{rng.randint(0, 23):02d}:"
+            f"{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}+04:00"
+        ),
+        "call_type": rng.choice(CALL_TYPES),
+        "workflow": rng.choice(WORKFLOWS),
+        "model": rng.choice(MODELS),
+        "user_id": rng.choice(USERS),
+        "context": None,
+        "input_tokens": input_tokens,
+        "cached_input_tokens": rng.randint(0, input_tokens),
+        "output_tokens": output_tokens,
+        "reasoning_tokens": rng.randint(0, 100),
+        "total_tokens": input_tokens + output_tokens,
+        "input_cost": input_cost,
+        "output_cost": output_cost,
+        "reasoning_cost": 0.0,
+        "total_cost": input_cost + output_cost,
+        "metadata_json": None,
+    }
+
+
+@pytest.fixture
+def backend(tmp_path) -> SQLiteBackend:
+    backend = SQLiteBackend(tmp_path / "costs.db")
+    backend.init_db()
+    rng = random.Random(7)
+    backend.log_ai_costs([_row(rng) for _ in range(400)])
+    return backend
+
+
+def _raw_rows(backend: SQLiteBackend) -> list[dict]:
+    conn = sqlite3.connect(backend._db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return [dict(r) for r in conn.execute("SELECT * FROM ai_costs")]
+    finally:
+        conn.close()
+
+
+def _rollup(backend: SQLiteBackend, table: str) -> dict[tuple, tuple]:
+    conn = sqlite3.connect(backend._db_path)
+    try:
+        return {
+            tuple(r[:5]): (r[5], *(round(v, 9) for v in r[6:]))
+            for r in conn.execute(
+                f"SELECT bucket, call_type, workflow, model, user_id, calls, {', '.join(ROLLUP_FIELDS)} FROM {table}"
+            )
+        }
+    finally:
+        conn.close()
+
+
+def _expected_rollup(rows: list[dict], length: int) -> dict[tuple, tuple]:
+    buckets = group_raw_costs(rows)
+    grouped: dict[tuple, list] = {}
+    for b in buckets:
+        key = (b["bucket"][:length], b["call_type"], b["workflow"], b["model"], b["user_id"])
+        totals = grouped.setdefault(key, [0] * (1 + len(ROLLUP_FIELDS)))
+        for i, f in enumerate(("calls", *ROLLUP_FIELDS)):
+            totals[i] += b[f]
+    return {k: (v[0], *(round(x, 9) for x in v[1:])) for k, v in grouped.items()}
+
+
+def _scan_summary(rows: list[dict], start_date=None, end_date=None, **filters) -> dict:
+    """Reference summary straight from raw rows, with the raw timestamp filter semantics."""
+    end_full = f"{end_date}T23:59:59" if end_date and "T" not in end_date else end_date
+    selected = [
+        r for r in rows
+        if (not start_date or r["timestamp"] >= start_date)
+        and (not end_full or r["timestamp"] <= end_full)
+        and all(r[k] == v for k, v in filters.items() if v)
+    ]
+    return summarize_cost_buckets(group_raw_costs(selected))
+
+
+def _rounded(summary: dict) -> dict:
+    def clean(value):
+        if isinstance(value, float):
+            return round(value, 9)
+        if isinstance(value, dict):
+            return {k: clean(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [clean(v) for v in value]
+        return value
+
+    return clean({k: v for k, v in summary.items() if k != "calls"})
+
+
+class TestRollupMaintenance:
+    """Trigger and backfill keep rollups equal to the raw rows."""
+
+    def test_trigger_matches_raw_group_by(self, backend):
+        rows = _raw_rows(backend)
+        assert _rollup(backend, "ai_costs_hourly") == _expected_rollup(rows, 13)
+        assert _rollup(backend, "ai_costs_daily") == _expected_rollup(rows, 10)
+
+    def test_backfill_on_open(self, backend):
+        conn = sqlite3.connect(backend._db_path)
+        conn.execute("DROP TRIGGER ai_costs_rollup")
+        conn.execute("DELETE FROM ai_costs_daily")
+        conn.commit()
+        conn.close()
+
+        backend.init_db()
+        assert _rollup(backend, "ai_costs_daily") == _expected_rollup(_raw_rows(backend), 10)
+
+    def test_clear_empties_rollups(self, backend):
+        backend.clear_ai_costs()
+        assert _rollup(backend, "ai_costs_daily") == {} and _rollup(backend, "ai_costs_hourly") == {}
+        assert backend.get_ai_cost_rollup() == []
+
+
+class TestRollupSummary:
+    """Rollup-backed summaries against a raw scan."""
+
+    @pytest.mark.parametrize("filters", [
+        {},
+        {"start_date": "2026-10-02", "end_date": "2026-10-04"},
+        {"start_date": "2026-10-02T09:17:30", "end_date": "2026-10-05T14:42:10"},
+        {"start_date": "2026-10-03T10:00:00", "end_date": "2026-10-03T18:00:00"},
+        {"start_date": "2026-10-04T11:05:00", "end_date": "2026-10-04T11:55:00"},
+        {"start_date": "2026-10-02T22:30:00", "call_type": "main_llm"},
+        {"end_date": "2026-10-03T06:20:00", "workflow": "mockup_ai", "user_id": "u1"},
+    ])
+    def test_summary_matches_raw_scan(self, backend, filters):
+        summary = backend.get_ai_costs_summary(**filters)
+        expected = _scan_summary(_raw_rows(backend), **filters)
+
+        assert _rounded(summary) == _rounded(expected)
+        assert summary["total_calls"] > 0
+
+    def test_date_filters_use_daily_rollups(self):
+        plan = plan_cost_range("2026-10-02", "2026-10-04")
+        assert plan.daily == ("2026-10-02", "2026-10-04") and plan.hourly is None and plan.raw == []
+
+    def test_time_filters_scan_only_edge_hours(self):
+        plan = plan_cost_range("2026-10-02T09:17:30", "2026-10-05T14:42:10")
+        assert plan.hourly == ("2026-10-02T10", "2026-10-05T14")
+        assert plan.raw == [
+            ("2026-10-02T09:17:30", "2026-10-02T10:00:00", False),
+            ("2026-10-05T14:00:00", "2026-10-05T14:42:10", True),
+        ]
@@ -0,0 +1,151 @@
+"""
+Tests for write-behind AI cost tracking.
+
+These tests verify:
+- Rows are batch-inserted by the background writer and on close
+- Rows stay queued while the database fails and are written once it recovers
+- The in-memory summary matches the SQL summary for the same filters
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from db.backends.sqlite import SQLiteBackend
+from integrations.llm.cost_tracker import CostTracker
+
+CALL_TYPES = ["main_llm", "mockup_analysis", "image_generation"]
+WORKFLOWS = ["proposal_generation", "mockup_ai", None]
+MODELS = ["gpt-5", "gpt-image-1"]
+USERS = ["u1", "u2", None]
+
+
+def _row(rng: random.Random, day: int) -> dict:
+    input_tokens, output_tokens = rng.randint(10, 5000), rng.randint(10, 2000)
+    input_cost, output_cost = input_tokens * 1e-6, output_tokens * 4e-6
+    return {
+        "timestamp": f"2026-10-{day:02d}T{rng.randint(4, 23):02d}:00:00+04:00",
+        "call_type": rng.choice(CALL_TYPES),
+        "workflow": rng.choice(WORKFLOWS),
+        "model": rng.choice(MODELS),
+        "user_id": rng.choice(USERS),
+        "context": None,
+        "input_tokens": input_tokens,
+        "cached_input_tokens": rng.randint(0, input_tokens),
+        "output_tokens": output_tokens,
+        "reasoning_tokens": 0,
+        "total_tokens": input_tokens + output_tokens,
+        "input_cost": input_cost,
+        "output_cost": output_cost,
+        "reasoning_cost": 0.0,
+        "total_cost": input_cost + output_cost,
+        "metadata_json": None,
+    }
+
+
+class CountingBackend(SQLiteBackend):
+    """SQLite backend that records batch sizes and can be made to fail."""
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.batches: list[int] = []
+        self.down = False
+
+    def log_ai_costs(self, rows):
+        if self.down:
+            raise ConnectionError("database unavailable")
+        self.batches.append(len(rows))
+        return super().log_ai_costs(rows)
+
+
+@pytest.fixture
+def backend(tmp_path) -> CountingBackend:
+    backend = CountingBackend(tmp_path / "costs.db")
+    backend.init_db()
+    return backend
+
+
+@pytest.fixture
+async def tracker(backend):
+    tracker = CostTracker(database=backend, batch_size=4, flush_interval=0.02, refresh_interval=0)
+    yield tracker
+    await tracker.close()
+
+
+def _rounded(summary: dict) -> dict:
+    def clean(value):
+        if isinstance(value, float):
+            return round(value, 9)
+        if isinstance(value, dict):
+            return {k: clean(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [clean(v) for v in value]
+        return value
+
+    return clean(summary)
+
+
+class TestCostWriter:
+    """Write-behind batching."""
+
+    async def test_rows_are_batched(self, tracker, backend):
+        rng = random.Random(1)
+        for _ in range(10):
+            tracker.record(_row(rng, 1))
+        await asyncio.sleep(0.1)
+        await tracker.close()
+
+        assert sum(backend.batches) == 10 and max(backend.batches) == 4
+        assert backend.get_ai_costs_summary()["total_calls"] == 10
+        assert tracker.pending == 0
+
+    async def test_rows_wait_for_database(self, tracker, backend):
+        rng = random.Random(2)
+        backend.down = True
+        for _ in range(3):
+            tracker.record(_row(rng, 2))
+        await asyncio.sleep(0.1)
+        assert tracker.pending == 3
+
+        backend.down = False
+        await asyncio.sleep(0.1)
+        assert tracker.pending == 0
+        assert backend.get_ai_costs_summary()["total_calls"] == 3
+
+
+class TestCostAggregates:
+    """In-memory summary against the SQL summary."""
+
+    @pytest.mark.parametrize("filters", [
+        {},
+        {"start_date": "2026-10-03", "end_date": "2026-10-05"},
+        {"call_type": "main_llm"},
+        {"workflow": "mockup_ai", "user_id": "u1"},
+        {"user_id": "u2", "end_date": "2026-10-04"},
+    ])
+    async def test_summary_matches_sql(self, tracker, backend, filters):
+        rng = random.Random(3)
+        backend.log_ai_costs([_row(rng, day) for day in range(1, 7) for _ in range(15)])
+        tracker.start()
+        await asyncio.sleep(0.05)
+
+        # Rows recorded after the aggregates were loaded are counted too
+        for _ in range(20):
+            tracker.record(_row(rng, 6))
+
+        summary = await tracker.get_summary(**filters)
+        expected = backend.get_ai_costs_summary(**filters)
+
+        assert _rounded(summary) == _rounded(expected)
+        assert summary["total_calls"] > 0
+
+    async def test_clear_resets_aggregates(self, tracker, backend):
+        tracker.start()
+        await asyncio.sleep(0.05)
+        tracker.record(_row(random.Random(4), 1))
+
+        tracker.clear()
+        backend.clear_ai_costs()
+        summary = await tracker.get_summary()
+        assert summary["total_calls"] == 0 and summary["calls"] == []
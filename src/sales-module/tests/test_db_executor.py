@@ -0,0 +1,22 @@
+"""
+Tests for the DB executor (db/executor.py).
+
+These tests verify:
+- run_db runs calls on the DB executor threads
+"""
+
+import threading
+
+from db.executor import run_db
+
+
+class TestDBExecutor:
+    """run_db offloads to the database executor."""
+
+    async def test_run_db_uses_executor_threads(self):
+        def whoami(suffix: str = "") -> str:
+            return threading.current_thread().name + suffix
+
+        name = await run_db(whoami, suffix="!")
+        assert name.startswith("db") and name.endswith("!")
+        assert name != threading.current_thread().name
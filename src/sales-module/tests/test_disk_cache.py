@@ -0,0 +1,179 @@
+"""
+Tests for the persistent asset file cache.
+
+These tests verify:
+- Fresh entries are served without calling the fetcher
+- Expired entries are revalidated via ETag and refreshed on change
+- A stale entry is served while the origin is unavailable, and dropped
+  once the origin no longer has it
+- Identical bodies are stored once and the LRU budget is enforced
+- Glob invalidation and caller-owned materialized paths
+- Bodies fetched to a file are moved into the cache, not read into memory
+- Concurrent misses for one key share a single fetch
+"""
+
+import asyncio
+
+import pytest
+
+from core.utils.disk_cache import DiskCache, FetchResult
+
+
+class CountingFetcher:
+    """Fetcher stub that records calls and returns a configurable body."""
+
+    def __init__(self, data: bytes | None, etag: str | None = None):
+        self.data = data
+        self.etag = etag
+        self.fail = False
+        self.calls: list[str | None] = []
+
+    async def __call__(self, etag: str | None) -> FetchResult | None:
+        self.calls.append(etag)
+        if self.fail:
+            raise ConnectionError("asset-management unavailable")
+        if self.data is None:
+            return None
+        if etag is not None and etag == self.etag:
+            return FetchResult(not_modified=True)
+        return FetchResult(data=self.data, etag=self.etag)
+
+
+@pytest.fixture
+def cache(tmp_path) -> DiskCache:
+    return DiskCache(tmp_path / "cache", max_bytes=1024, max_age=3600)
+
+
+class TestDiskCache:
+    """DiskCache behaviour."""
+
+    async def test_fresh_hit_skips_fetch(self, cache):
+        """Test that a fresh entry is served without calling the fetcher."""
+        fetch = CountingFetcher(b"photo", etag="v1")
+
+        first = await cache.fetch_to_path("mockup/a/loc/photo.jpg", fetch, ".jpg")
+        second = await cache.fetch_to_path("mockup/a/loc/photo.jpg", fetch, ".jpg")
+
+        assert fetch.calls == [None]
+        assert first != second
+        assert first.read_bytes() == second.read_bytes() == b"photo"
+
+        # Callers own their paths
+        first.unlink()
+        assert second.read_bytes() == b"photo"
+
+    async def test_expired_entry_revalidates(self, cache):
+        """Test that an expired entry is revalidated by ETag and refreshed on change."""
+        cache.max_age = 0
+        fetch = CountingFetcher(b"v1 body", etag="v1")
+
+        await cache.get_or_fetch("template/a/loc/pptx", fetch)
+        entry = await cache.get_or_fetch("template/a/loc/pptx", fetch)
+        assert fetch.calls == [None, "v1"]
+        assert cache.revalidated == 1
+        assert cache.read_bytes(entry) == b"v1 body"
+
+        fetch.data, fetch.etag = b"v2 body", "v2"
+        entry = await cache.get_or_fetch("template/a/loc/pptx", fetch)
+        assert cache.read_bytes(entry) == b"v2 body"
+        assert entry.etag == "v2"
+
+    async def test_stale_entry_served_when_origin_fails(self, cache):
+        """Test that a stale entry is served while the origin is unavailable."""
+        cache.max_age = 0
+        fetch = CountingFetcher(b"body")
+        await cache.get_or_fetch("intro_outro/a/rest", fetch)
+
+        fetch.fail = True
+        entry = await cache.get_or_fetch("intro_outro/a/rest", fetch)
+        assert entry is not None
+        assert cache.read_bytes(entry) == b"body"
+        assert cache.stale_served == 1
+
+    async def test_entry_deleted_at_origin_is_dropped(self, cache):
+        """Test that an entry deleted at the origin is dropped, not served stale."""
+        cache.max_age = 0
+        fetch = CountingFetcher(b"body")
+        entry = await cache.get_or_fetch("intro_outro/a/rest", fetch)
+        blob = cache._blob_path(entry.digest)
+
+        fetch.data = None
+        assert await cache.get_or_fetch("intro_outro/a/rest", fetch) is None
+        assert cache.stale_served == 0
+        assert cache.stats()["entries"] == 0
+        assert not blob.exists()
+
+        # Still gone while the origin is down
+        fetch.fail = True
+        assert await cache.get_or_fetch("intro_outro/a/rest", fetch) is None
+
+    async def test_dedup_and_lru_eviction(self, cache):
+        """Test that identical bodies are stored once and the LRU budget holds."""
+        await cache.get_or_fetch("k1", CountingFetcher(b"x" * 400))
+        await cache.get_or_fetch("k2", CountingFetcher(b"x" * 400))
+        assert cache.stats()["size_bytes"] == 400
+
+        await cache.get_or_fetch("k3", CountingFetcher(b"y" * 400))
+        await cache.get_or_fetch("k1", CountingFetcher(b"unused"))  # touch k1
+        await cache.get_or_fetch("k4", CountingFetcher(b"z" * 400))
+
+        stats = cache.stats()
+        assert stats["size_bytes"] <= cache.max_bytes
+        assert cache.peek("k3") is None
+        assert cache.peek("k1") is not None
+        assert cache.peek("k4") is not None
+
+    async def test_invalidate_and_fetch_first(self, cache):
+        """Test glob invalidation and fetch_first() preferring fresh local copies."""
+        await cache.get_or_fetch("mockup/a/loc1/x.jpg", CountingFetcher(b"1"))
+        await cache.get_or_fetch("mockup/b/loc1/x.jpg", CountingFetcher(b"2"))
+        await cache.get_or_fetch("mockup/b/loc2/x.jpg", CountingFetcher(b"3"))
+
+        assert cache.invalidate("mockup/*/loc1/*") == 2
+        assert cache.peek("mockup/b/loc2/x.jpg") is not None
+
+        missing = CountingFetcher(None)
+        cached = CountingFetcher(b"unused")
+        path, index = await cache.fetch_first(
+            [("mockup/a/loc2/x.jpg", missing), ("mockup/b/loc2/x.jpg", cached)], ".jpg"
+        )
+        assert index == 1
+        assert path.read_bytes() == b"3"
+        assert missing.calls == [] and cached.calls == []
+
+    async def test_fetched_file_is_moved_into_cache(self, cache, tmp_path):
+        """Test that a body fetched to a file is moved into the cache."""
+        cache.max_age = 0
+        download = tmp_path / "download.part"
+
+        async def fetch(etag: str | None) -> FetchResult:
+            download.write_bytes(b"streamed body")
+            return FetchResult(path=download)
+
+        entry = await cache.get_or_fetch("template/a/loc/pdf", fetch)
+        assert cache.read_bytes(entry) == b"streamed body"
+        assert not download.exists()
+
+        # Same body without an ETag counts as revalidated; the file is still consumed
+        await cache.get_or_fetch("template/a/loc/pdf", fetch)
+        assert cache.revalidated == 1
+        assert not download.exists()
+
+    async def test_concurrent_misses_share_one_fetch(self, cache):
+        """Test that concurrent misses for one key share a single fetch."""
+        release = asyncio.Event()
+        calls = []
+
+        async def fetch(etag: str | None) -> FetchResult:
+            calls.append(etag)
+            await release.wait()
+            return FetchResult(data=b"photo", etag="v1")
+
+        waiters = [asyncio.create_task(cache.get_or_fetch("mockup/a/loc/photo.jpg", fetch)) for _ in range(5)]
+        await asyncio.sleep(0.1)
+        release.set()
+        entries = await asyncio.gather(*waiters)
+
+        assert len(calls) == 1
+        assert {entry.digest for entry in entries} == {entries[0].digest}
+        assert not cache._inflight
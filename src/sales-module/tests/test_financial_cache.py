@@ -0,0 +1,88 @@
+"""
+Tests for the rendered financial-slide cache.
+
+These tests verify:
+- Keys are independent of dict ordering but sensitive to inputs and currency
+- Keys track config.LOCATION_METADATA for locations without their own metadata
+- Stored PDFs and metadata round-trip, with caller-owned paths
+- A disabled cache never hits
+"""
+
+import pytest
+
+import config
+from core.proposals.financial_cache import FinancialSlideCache
+from core.utils.disk_cache import DiskCache
+
+FINANCIAL_DATA = {
+    "location": "dubai_gateway",
+    "durations": ["2 Weeks", "4 Weeks"],
+    "net_rates": ["AED 100,000", "AED 180,000"],
+    "spots": 1,
+    "client_name": "ABC Corp",
+    "payment_terms": "100% upfront",
+    "location_metadata": {"display_name": "Dubai Gateway", "series": "The Landmark Series"},
+    "start_date": "1st December 2025",
+}
+
+
+@pytest.fixture
+def cache(tmp_path) -> FinancialSlideCache:
+    return FinancialSlideCache(DiskCache(tmp_path / "fin", max_bytes=1024 * 1024, max_age=float("inf")))
+
+
+class TestFinancialSlideCache:
+    """FinancialSlideCache behaviour."""
+
+    def test_key_is_canonical(self, cache):
+        """Test that the key ignores dict ordering and treats "aed" as the default currency."""
+        reordered = dict(reversed(list(FINANCIAL_DATA.items())))
+        assert cache.make_key("separate", FINANCIAL_DATA, "aed") == cache.make_key("separate", reordered, None)
+
+    def test_key_tracks_inputs(self, cache):
+        """Test that the key changes with the financial inputs, currency and layout."""
+        base = cache.make_key("separate", FINANCIAL_DATA, None)
+        changed = {**FINANCIAL_DATA, "net_rates": ["AED 100,000", "AED 170,000"]}
+        assert cache.make_key("separate", changed, None) != base
+        assert cache.make_key("separate", FINANCIAL_DATA, "USD") != base
+        assert cache.make_key("combined", FINANCIAL_DATA, None) != base
+
+    def test_key_tracks_fallback_location_metadata(self, cache, monkeypatch):
+        """Test that the key tracks config metadata for locations without their own."""
+        bare = {**FINANCIAL_DATA, "location_metadata": {}}
+        combined = {"proposals": [bare], "combined_net_rate": "AED 250,000"}
+        monkeypatch.setattr(config, "LOCATION_METADATA", {"dubai_gateway": {"display_name": "Dubai Gateway"}})
+        separate = cache.make_key("separate", bare, None)
+        package = cache.make_key("combined", combined, None)
+        own_metadata = cache.make_key("separate", FINANCIAL_DATA, None)
+
+        monkeypatch.setattr(config, "LOCATION_METADATA", {"dubai_gateway": {"display_name": "The Gateway"}})
+        assert cache.make_key("separate", bare, None) != separate
+        assert cache.make_key("combined", combined, None) != package
+        # Metadata passed with the proposal wins, so the config doesn't matter
+        assert cache.make_key("separate", FINANCIAL_DATA, None) == own_metadata
+
+    def test_round_trip(self, cache, tmp_path):
+        """Test that a stored PDF and its metadata round-trip to caller-owned paths."""
+        pdf = tmp_path / "slide.pdf"
+        pdf.write_bytes(b"%PDF-1.4 financial")
+        key = cache.make_key("separate", FINANCIAL_DATA, None)
+
+        assert cache.get(key) is None
+        cache.put(key, str(pdf), {"vat_amounts": ["AED 5,000"], "total_amounts": ["AED 105,000"]})
+
+        path, meta = cache.get(key)
+        assert path.read_bytes() == pdf.read_bytes()
+        assert meta["total_amounts"] == ["AED 105,000"]
+        path.unlink()
+        assert cache.get(key) is not None
+        assert cache.stats()["hits"] == 2
+
+    def test_disabled(self, tmp_path):
+        """Test that a disabled cache never hits."""
+        cache = FinancialSlideCache(None)
+        pdf = tmp_path / "slide.pdf"
+        pdf.write_bytes(b"%PDF")
+        key = cache.make_key("separate", FINANCIAL_DATA, None)
+        cache.put(key, str(pdf), {})
+        assert cache.get(key) is None
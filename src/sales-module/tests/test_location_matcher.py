@@ -0,0 +1,113 @@
+"""
+Tests for location matching and the LocationIndex.
+
+These tests verify:
+- Exact key and display-name lookups
+- The trigram-filtered substring strategy finds the same locations as a full scan
+- Substring candidates are ranked by closeness
+- Module functions accept either a list or a prebuilt index
+"""
+
+import random
+import string
+
+import pytest
+
+from core.utils.location_matcher import (
+    LocationIndex,
+    get_location_display_name,
+    get_location_metadata,
+    match_and_validate,
+    match_location_key,
+    validate_location_exists,
+)
+
+LOCATIONS = [
+    {"location_key": "dubai_gateway", "display_name": "The Gateway"},
+    {"location_key": "dubai_jawhara", "display_name": "Jawhara Mall"},
+    {"location_key": "gateway_tower", "display_name": "Gateway Tower"},
+    {"location_key": "mz", "display_name": None},
+]
+
+
+def _scan_matches(query: str, locations: list[dict]) -> set[str]:
+    """Reference substring strategy: check every key and display name."""
+    matches = set()
+    for loc in locations:
+        for name in (loc["location_key"].lower(), (loc.get("display_name") or "").lower()):
+            if name and (query in name or name in query):
+                matches.add(loc["location_key"])
+    return matches
+
+
+@pytest.fixture
+def index() -> LocationIndex:
+    return LocationIndex(LOCATIONS)
+
+
+class TestLocationIndex:
+    """LocationIndex lookups."""
+
+    def test_exact_lookups(self, index):
+        """Test exact key and display-name lookups, ignoring case and whitespace."""
+        assert index.match("DUBAI_GATEWAY") == "dubai_gateway"
+        assert index.match("  the gateway ") == "dubai_gateway"
+        assert index.get("jawhara mall")["location_key"] == "dubai_jawhara"
+        assert index.exists("Gateway_Tower")
+        assert not index.exists("gateway")
+        assert index.display_name("mz") == "Mz"
+        assert index.display_name("unknown_key") == "Unknown Key"
+
+    def test_substring_candidates_are_ranked(self, index):
+        """Test that substring candidates are ranked by closeness to the input."""
+        ranked = index.candidates("gateway")
+        assert [key for key, _ in ranked] == ["dubai_gateway", "gateway_tower"]
+        assert ranked[0][1] > ranked[1][1]
+        assert index.match("jawhara mall dubai") == "dubai_jawhara"
+        assert index.match("mz outdoor") == "mz"
+        assert index.match("nonexistent") is None
+
+    def test_rows_without_a_key_are_skipped(self):
+        """Test that location rows without a location_key are not matched and do not raise."""
+        index = LocationIndex([{"display_name": "Gateway Plaza"}, {"location_key": None}, *LOCATIONS])
+
+        assert len(index) == len(LOCATIONS) + 2
+        assert index.match("gateway plaza") is None
+        assert [key for key, _ in index.candidates("gateway")] == ["dubai_gateway", "gateway_tower"]
+        assert [key for key, _ in index.candidates("ga")] == ["dubai_gateway", "gateway_tower"]
+        assert not index.exists("gateway plaza")
+
+    def test_trigram_filter_matches_full_scan(self):
+        """Test that the trigram filter finds the same locations as a full scan."""
+        rng = random.Random(7)
+        words = ["".join(rng.choices(string.ascii_lowercase[:6], k=rng.randint(2, 7))) for _ in range(60)]
+        locations = [
+            {"location_key": f"{a}_{b}", "display_name": f"{b} {c}".title()}
+            for a, b, c in zip(words[:20], words[20:40], words[40:], strict=True)
+        ]
+        index = LocationIndex(locations)
+
+        for query in words + ["a", "ab", "abc_def", "zzz"]:
+            assert {key for key, _ in index.candidates(query, limit=len(locations))} == _scan_matches(query, locations)
+
+
+class TestModuleFunctions:
+    """Module-level helpers over lists and indexes."""
+
+    @pytest.mark.parametrize("source", [LOCATIONS, LocationIndex(LOCATIONS)])
+    def test_accepts_list_or_index(self, source):
+        """Test that module functions accept a location list or a prebuilt index."""
+        assert match_location_key("The Gateway", source) == "dubai_gateway"
+        assert validate_location_exists("dubai_jawhara", source)
+        assert get_location_display_name("dubai_jawhara", source) == "Jawhara Mall"
+        assert get_location_metadata("gateway_tower", source)["display_name"] == "Gateway Tower"
+        assert match_and_validate("jawhara", source) == ("dubai_jawhara", None)
+        assert match_and_validate("invalid", source) == (None, "Unknown location 'invalid'")
+
+    def test_empty_locations(self):
+        """Test that no locations means no match and an access error."""
+        assert match_location_key("gateway", []) is None
+        assert match_and_validate("gateway", LocationIndex()) == (
+            None,
+            "No locations available for your company access",
+        )
@@ -0,0 +1,100 @@
+"""
+Tests for the streaming PDF merge engine.
+
+These tests verify:
+- Pages are appended in order with page selection
+- Identical images are stored once across inputs
+- Spilling to disk mid-merge produces the same document
+"""
+
+import io
+
+import fitz
+import pytest
+from PIL import Image
+
+from generators.pdf_merge import PdfMergeStream, extract_pdf_pages, pdf_page_count
+
+
+def _png(color: tuple[int, int, int]) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGBA", (64, 64), color + (128,)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _make_pdf(path, tag: str, pages: int = 3, image: bytes | None = None) -> str:
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_text((50, 50), f"{tag}-{number}")
+        if image:
+            page.insert_image(fitz.Rect(0, 100, 64, 164), stream=image)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def _page_texts(pdf_path: str) -> list[str]:
+    with fitz.open(pdf_path) as doc:
+        return [page.get_text().strip() for page in doc]
+
+
+class TestPdfMergeStream:
+    """PdfMergeStream behaviour."""
+
+    def test_appends_in_order_with_page_selection(self, tmp_path):
+        a = _make_pdf(tmp_path / "a.pdf", "a")
+        b = _make_pdf(tmp_path / "b.pdf", "b")
+
+        with PdfMergeStream(spill_pages=100) as merger:
+            assert merger.append(a, [1, 2]) == 2
+            assert merger.append(b) == 3
+            assert merger.append(a, [0, 7]) == 1
+            merged = merger.finish(str(tmp_path / "out.pdf"))
+
+        assert _page_texts(merged) == ["a-1", "a-2", "b-0", "b-1", "b-2", "a-0"]
+
+    def test_identical_images_are_shared(self, tmp_path):
+        red, green = _png((255, 0, 0)), _png((0, 255, 0))
+        inputs = [
+            _make_pdf(tmp_path / "r1.pdf", "r1", pages=1, image=red),
+            _make_pdf(tmp_path / "g.pdf", "g", pages=1, image=green),
+            _make_pdf(tmp_path / "r2.pdf", "r2", pages=1, image=red),
+        ]
+
+        with PdfMergeStream(spill_pages=100) as merger:
+            for pdf_path in inputs:
+                merger.append(pdf_path)
+            assert merger.shared_objects > 0
+            merged = merger.finish(str(tmp_path / "out.pdf"))
+
+        with fitz.open(merged) as doc:
+            images = [doc[number].get_images()[0][0] for number in range(3)]
+            assert images[0] == images[2] != images[1]
+            pixels = [doc[number].get_pixmap(clip=fitz.Rect(10, 110, 11, 111)).pixel(0, 0) for number in range(3)]
+        assert pixels[0] == pixels[2] != pixels[1]
+
+    def test_spill_matches_in_memory_merge(self, tmp_path):
+        image = _png((0, 0, 255))
+        inputs = [_make_pdf(tmp_path / f"{n}.pdf", str(n), image=image) for n in range(5)]
+
+        outputs = []
+        for spill_pages in (1, 100):
+            with PdfMergeStream(spill_pages=spill_pages) as merger:
+                for pdf_path in inputs:
+                    merger.append(pdf_path, [0, 2])
+                outputs.append(merger.finish(str(tmp_path / f"out{spill_pages}.pdf")))
+
+        assert _page_texts(outputs[0]) == _page_texts(outputs[1])
+        assert pdf_page_count(outputs[0]) == 10
+
+    def test_finish_requires_pages(self, tmp_path):
+        merger = PdfMergeStream(spill_pages=1)
+        with pytest.raises(ValueError):
+            merger.finish()
+        merger.close()
+
+    def test_extract_pages(self, tmp_path):
+        source = _make_pdf(tmp_path / "src.pdf", "s", pages=4)
+        extracted = extract_pdf_pages(source, [3, 0])
+        assert _page_texts(extracted) == ["s-3", "s-0"]
@@ -0,0 +1,227 @@
+"""
+Tests for the mockup render pool and its dispatch from the task queue.
+
+These tests verify:
+- A saturated pool rejects work with RenderPoolFullError and a Retry-After
+  estimate, which the API answers as 503 rather than 500
+- A crashed worker fails only its own job; the pool respawns on the next one,
+  and a late failure never tears down a pool that was already respawned
+- Concurrent jobs get their own results, and render_jobs() keeps job order
+- MockupTaskQueue limits concurrent tasks, hands each caller its own result
+  and dispatches render() / composite() into the pool
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import cv2
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.exceptions import setup_exception_handlers
+from core.utils.render_pool import RenderPool, RenderPoolFullError
+from core.utils.task_queue import MockupTaskQueue
+from generators.mockup import MockupRenderJob
+
+# Worker functions run in spawned processes, so they live at module level
+
+
+def _echo_after(delay: float, value):
+    time.sleep(delay)
+    return value
+
+
+def _crash():
+    os._exit(1)
+
+
+@pytest.fixture
+def pool():
+    pool = RenderPool(max_workers=2, max_pending=2)
+    yield pool
+    pool.shutdown()
+
+
+class TestRenderPool:
+    """RenderPool back-pressure, crash recovery and result ordering."""
+
+    async def test_rejects_when_saturated(self, pool):
+        running = [asyncio.create_task(pool._submit(_echo_after, 0.5, n)) for n in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(RenderPoolFullError) as excinfo:
+            await pool._submit(_echo_after, 0, "rejected")
+        assert excinfo.value.retry_after >= 1
+
+        assert await asyncio.gather(*running) == [0, 1]
+        stats = pool.get_stats()
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 2
+        assert stats["pending"] == 0
+
+    def test_retry_after_follows_average_job_time(self, pool):
+        pool._workers = {1: {"tasks": 2, "busy_seconds": 6.0}, 2: {"tasks": 1, "busy_seconds": 3.0}}
+        pool._pending = 4
+        # 3 seconds per job, 4 pending jobs over 2 workers
+        assert pool._retry_after() == 6
+
+    async def test_worker_crash_respawns_pool(self, pool):
+        assert await pool._submit(_echo_after, 0, "before") == "before"
+        first_workers = set(pool.get_stats()["workers"])
+
+        with pytest.raises(BrokenProcessPool):
+            await pool._submit(_crash)
+        assert pool.get_stats()["running"] is False
+        assert pool.get_stats()["failed"] == 1
+
+        assert await pool._submit(_echo_after, 0, "after") == "after"
+        assert pool.get_stats()["running"] is True
+        assert set(pool.get_stats()["workers"]) - first_workers
+
+    async def test_late_failure_keeps_a_respawned_pool(self, pool):
+        broken = pool._get_executor()
+        job = asyncio.create_task(pool._submit(_echo_after, 5, "never"))
+        await asyncio.sleep(0.2)
+
+        # Another caller has already replaced the pool when this job fails
+        pool._executor = None
+        replacement = pool._get_executor()
+        for process in list(broken._processes.values()):
+            process.kill()
+
+        with pytest.raises(BrokenProcessPool):
+            await job
+        assert pool._executor is replacement
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def test_concurrent_jobs_get_their_own_results(self, pool):
+        # The first job finishes last
+        results = await asyncio.gather(
+            pool._submit(_echo_after, 0.4, "slow"),
+            pool._submit(_echo_after, 0.0, "fast"),
+        )
+        assert results == ["slow", "fast"]
+
+    async def test_render_jobs_keeps_job_order(self, pool, tmp_path):
+        creative = tmp_path / "creative.png"
+        cv2.imwrite(str(creative), np.full((40, 60, 3), 200, np.uint8))
+        sizes = [(120, 160), (90, 200), (150, 150)]
+        jobs = []
+        for i, (height, width) in enumerate(sizes):
+            photo = tmp_path / f"photo{i}.jpg"
+            cv2.imwrite(str(photo), np.full((height, width, 3), 50, np.uint8))
+            jobs.append(MockupRenderJob(
+                photo_path=photo,
+                frames_data=[{"points": [[10, 10], [50, 10], [50, 40], [10, 40]]}],
+                creative_images=[creative],
+                output_path=tmp_path / f"out{i}.jpg",
+            ))
+        jobs.insert(1, MockupRenderJob(
+            photo_path=tmp_path / "missing.jpg",
+            frames_data=jobs[0].frames_data,
+            creative_images=[creative],
+        ))
+
+        results = await pool.render_jobs(jobs)
+
+        assert results[1] is None
+        rendered = [results[0], results[2], results[3]]
+        assert rendered == [tmp_path / f"out{i}.jpg" for i in range(3)]
+        assert [cv2.imread(str(path)).shape[:2] for path in rendered] == sizes
+
+
+class TestRenderPoolFullResponse:
+    """The API answer for a saturated pool."""
+
+    def test_maps_to_503_with_retry_after(self):
+        app = FastAPI()
+        setup_exception_handlers(app)
+
+        @app.get("/render")
+        async def render():
+            raise RenderPoolFullError("Render pool is full (16/16 pending)", retry_after=7)
+
+        response = TestClient(app).get("/render")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "7"
+        assert response.json()["error"]["code"] == "RENDER_POOL_FULL"
+
+
+class FakePool:
+    """Stands in for RenderPool, recording what the queue dispatches."""
+
+    def __init__(self):
+        self.calls: list[tuple] = []
+
+    async def render_jobs(self, jobs):
+        self.calls.append(("render_jobs", jobs))
+        return [f"out-{job}" for job in jobs]
+
+    async def composite(self, billboard, creative, frame_points, config, time_of_day):
+        self.calls.append(("composite", frame_points, config, time_of_day))
+        return billboard
+
+    def get_stats(self):
+        return {"running": True}
+
+
+async def released(queue: MockupTaskQueue) -> bool:
+    """Wait for slots to be released (that happens after a short settle delay)."""
+    for _ in range(50):
+        if queue.current_tasks == 0:
+            return True
+        await asyncio.sleep(0.05)
+    return False
+
+
+class TestMockupTaskQueue:
+    """MockupTaskQueue dispatch."""
+
+    async def test_limits_concurrency_and_returns_each_result(self):
+        queue = MockupTaskQueue(max_concurrent=2, render_pool=FakePool())
+        running, peak = 0, 0
+
+        async def task(value, delay):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(delay)
+            running -= 1
+            return value
+
+        results = await asyncio.gather(*[
+            queue.submit(task, n, delay) for n, delay in enumerate([0.05, 0.0, 0.03, 0.0])
+        ])
+
+        assert results == [0, 1, 2, 3]
+        assert peak == 2
+        assert await released(queue)
+        assert queue.get_queue_status()["active_tasks"] == 0
+        assert queue.queue == []
+
+    async def test_render_pool_full_reaches_the_caller(self):
+        queue = MockupTaskQueue(max_concurrent=1, render_pool=FakePool())
+
+        async def task():
+            raise RenderPoolFullError("full", retry_after=3)
+
+        with pytest.raises(RenderPoolFullError):
+            await queue.submit(task)
+        assert await released(queue)
+
+    async def test_dispatches_into_render_pool(self):
+        pool = FakePool()
+        queue = MockupTaskQueue(render_pool=pool)
+        billboard = np.zeros((4, 4, 3), np.uint8)
+
+        assert await queue.render(["a", "b"]) == ["out-a", "out-b"]
+        assert await queue.composite(billboard, billboard, [[0, 0]] * 4, {"blur": 1}, "night") is billboard
+        assert pool.calls == [
+            ("render_jobs", ["a", "b"]),
+            ("composite", [[0, 0]] * 4, {"blur": 1}, "night"),
+        ]
+        assert queue.get_queue_status()["render_pool"] == {"running": True}
@@ -0,0 +1,201 @@
+"""
+Tests for the persistent soffice pool.
+
+These tests verify:
+- Instances are recycled after max_conversions
+- Idle instances failing the health check are restarted before reuse, and a
+  soffice that keeps failing it makes convert() raise instead of retrying
+- Without soffice (or a startable instance) the pool is unavailable and
+  PDF conversion falls back to one-shot LibreOffice
+"""
+
+import os
+import time
+
+import pytest
+
+from core.utils import soffice_pool
+from core.utils.soffice_pool import (
+    HEALTH_CHECK_ATTEMPTS,
+    HEALTH_CHECK_INTERVAL,
+    SofficePool,
+    SofficePoolError,
+)
+from generators import pdf
+
+
+class FakeInstance(soffice_pool._SofficeInstance):
+    """Instance stub that "converts" by writing the output file itself."""
+
+    fail_start = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.starts = 0
+        self.healthy = True
+        self.running = False
+
+    def start(self) -> None:
+        if self.fail_start:
+            raise SofficePoolError(f"soffice instance {self.index} failed to start")
+        self.starts += 1
+        self.running = True
+        self.healthy = True
+        self.conversions = 0
+        self.last_used = time.monotonic()
+
+    def stop(self) -> None:
+        self.running = False
+
+    def is_alive(self) -> bool:
+        return self.running
+
+    def ping(self, timeout: float = 5.0) -> bool:
+        return self.running and self.healthy
+
+    def call(self, request, timeout):
+        with open(request["dst"], "wb") as f:
+            f.write(b"%PDF-1.4")
+        return {"ok": True}
+
+
+@pytest.fixture
+def make_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(soffice_pool, "_SofficeInstance", FakeInstance)
+    monkeypatch.setattr(soffice_pool, "_find_soffice", lambda: "/usr/bin/soffice")
+    monkeypatch.setattr(soffice_pool, "_find_uno_python", lambda configured: "/usr/bin/python3")
+    pools = []
+
+    def _make(**kwargs) -> SofficePool:
+        kwargs.setdefault("convert_timeout", 5.0)
+        pool = SofficePool(profile_root=tmp_path / "profiles", **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield _make
+    for pool in pools:
+        pool.shutdown()
+
+
+def convert(pool: SofficePool, tmp_path) -> None:
+    dst = tmp_path / "deck.pdf"
+    assert pool.convert(str(tmp_path / "deck.pptx"), str(dst)) == str(dst)
+    assert dst.read_bytes() == b"%PDF-1.4"
+
+
+class TestSofficePool:
+    """Recycling and health checks on a single fake instance."""
+
+    def test_restarts_after_max_conversions(self, make_pool, tmp_path):
+        """Test that an instance is restarted after max_conversions."""
+        pool = make_pool(size=1, max_conversions=2)
+
+        convert(pool, tmp_path)
+        convert(pool, tmp_path)
+        # The restart runs in the background; this waits for it on the idle queue
+        convert(pool, tmp_path)
+
+        instance = pool._instances[0]
+        assert instance.starts == 2
+        assert instance.restarts == 1
+        assert instance.conversions == 1
+        stats = pool.get_stats()
+        assert stats["restarts"] == 1
+        assert stats["completed"] == 3
+
+    def test_failed_health_check_recycles_idle_instance(self, make_pool, tmp_path):
+        """Test that an idle instance failing the health check is restarted."""
+        pool = make_pool(size=1)
+        convert(pool, tmp_path)
+
+        instance = pool._instances[0]
+        instance.healthy = False
+        instance.last_used = time.monotonic() - HEALTH_CHECK_INTERVAL - 1
+        convert(pool, tmp_path)
+
+        assert instance.restarts == 1
+        assert instance.starts == 2
+        assert pool.get_stats()["completed"] == 2
+
+    def test_recently_used_instance_skips_health_check(self, make_pool, tmp_path):
+        """Test that an instance used recently is not pinged before reuse."""
+        pool = make_pool(size=1)
+        convert(pool, tmp_path)
+
+        pool._instances[0].healthy = False
+        convert(pool, tmp_path)
+
+        assert pool._instances[0].restarts == 0
+
+    def test_always_failing_health_check_raises(self, make_pool, tmp_path, monkeypatch):
+        """Test that convert() gives up after one restart when soffice never answers."""
+        pings = []
+
+        def start(self):
+            # Starts, but stays unresponsive: every restart is due a health check again
+            self.running = True
+            self.last_used = time.monotonic() - HEALTH_CHECK_INTERVAL - 1
+
+        def ping(self, timeout=5.0):
+            pings.append(self.index)
+            return False
+
+        monkeypatch.setattr(FakeInstance, "start", start)
+        monkeypatch.setattr(FakeInstance, "ping", ping)
+        pool = make_pool(size=1)
+
+        with pytest.raises(SofficePoolError, match="health check"):
+            pool.convert(str(tmp_path / "deck.pptx"), str(tmp_path / "deck.pdf"))
+
+        assert len(pings) == HEALTH_CHECK_ATTEMPTS
+        assert pool.get_stats()["queue_depth"] == 0
+        assert not (tmp_path / "deck.pdf").exists()
+
+
+class TestFallback:
+    """Behaviour when the pool cannot run."""
+
+    def test_unavailable_without_soffice(self, make_pool, monkeypatch):
+        """Test that the pool is unavailable when soffice is not installed."""
+        monkeypatch.setattr(soffice_pool, "_find_soffice", lambda: None)
+        pool = make_pool(size=2)
+
+        assert pool.available is False
+        assert pool.start() is False
+        with pytest.raises(SofficePoolError):
+            pool.convert("/tmp/deck.pptx", "/tmp/deck.pdf")
+
+    def test_unavailable_when_no_instance_starts(self, make_pool, monkeypatch):
+        """Test that the pool is unavailable when no instance starts."""
+        monkeypatch.setattr(FakeInstance, "fail_start", True)
+        pool = make_pool(size=2)
+
+        assert pool.start() is False
+        assert pool.available is False
+        assert pool.get_stats()["running"] == 0
+
+    def test_pdf_conversion_falls_back_to_one_shot(self, make_pool, tmp_path, monkeypatch):
+        """Test that PDF conversion falls back to one-shot LibreOffice."""
+        monkeypatch.setattr(soffice_pool, "_find_soffice", lambda: None)
+        monkeypatch.setattr(soffice_pool, "_pool", make_pool(size=2))
+        commands = []
+
+        def fake_run(cmd, **kwargs):
+            commands.append(cmd)
+            outdir = cmd[cmd.index("--outdir") + 1]
+            name = os.path.splitext(os.path.basename(cmd[-1]))[0]
+            with open(os.path.join(outdir, f"{name}.pdf"), "wb") as f:
+                f.write(b"%PDF-1.4")
+            return pdf.subprocess.CompletedProcess(cmd, 0, "", "")
+
+        monkeypatch.setattr(pdf.shutil, "which", lambda path: path)
+        monkeypatch.setattr(pdf.subprocess, "run", fake_run)
+
+        result = pdf.convert_pptx_to_pdf(str(tmp_path / "deck.pptx"))
+        try:
+            with open(result, "rb") as f:
+                assert f.read() == b"%PDF-1.4"
+            assert len(commands) == 1
+            assert "--convert-to" in commands[0]
+        finally:
+            os.unlink(result)
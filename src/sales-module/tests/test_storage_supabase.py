@@ -0,0 +1,169 @@
+"""
+Tests for the async Supabase storage provider.
+
+These tests verify:
+- Downloads and uploads go through the pooled async client
+- Streaming downloads land atomically and leave nothing behind on failure
+- Batch downloads are bounded and bulk deletes use one request
+- Uploads from disk close the file, and clients of event loops that have
+  stopped are closed when another loop needs one
+"""
+
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from integrations.storage.providers import supabase as supabase_module
+from integrations.storage.providers.supabase import SupabaseStorageProvider
+
+BASE_URL = "https://project.supabase.co"
+
+
+class FakeStorageAPI:
+    """In-memory Supabase Storage object API served through httpx.MockTransport."""
+
+    def __init__(self, objects: dict[str, bytes] | None = None):
+        self.objects = dict(objects or {})
+        self.requests: list[tuple[str, str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/storage/v1/object/")
+        self.requests.append((request.method, path))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if request.method == "GET":
+                if path not in self.objects:
+                    return httpx.Response(400, json={"statusCode": "404", "error": "not_found", "message": "Object not found"})
+                return httpx.Response(200, content=self.objects[path], headers={"content-type": "application/pdf"})
+            if request.method == "POST":
+                body = await request.aread()
+                boundary = request.headers["content-type"].split("boundary=")[1].encode()
+                [file_part] = [part for part in body.split(b"--" + boundary) if b"filename=" in part]
+                self.objects[path] = file_part.split(b"\r\n\r\n", 1)[1].removesuffix(b"\r\n")
+                return httpx.Response(200, json={"Key": path})
+            if request.method == "DELETE":
+                prefixes = json.loads(await request.aread())["prefixes"]
+                for key in prefixes:
+                    self.objects.pop(f"{path}/{key}", None)
+                return httpx.Response(200, json=[{"name": key} for key in prefixes])
+            return httpx.Response(405)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def api() -> FakeStorageAPI:
+    return FakeStorageAPI({"proposals/a.pdf": b"%PDF-a" * 1000, "proposals/b.pdf": b"%PDF-b"})
+
+
+@pytest.fixture
+async def provider(api):
+    provider = SupabaseStorageProvider(supabase_url=BASE_URL, supabase_key="service-key")
+    provider._clients[asyncio.get_running_loop()] = provider._create_client(transport=httpx.MockTransport(api))
+    yield provider
+    await provider.close()
+
+
+class TestSupabaseStorageProvider:
+    """SupabaseStorageProvider transfers."""
+
+    async def test_download_and_upload(self, provider, api):
+        result = await provider.download("proposals", "/b.pdf")
+        assert result.success and result.data == b"%PDF-b"
+
+        upload = await provider.upload("proposals", "c.pdf", b"%PDF-c")
+        assert upload.success and upload.file.size == 6
+        assert api.objects["proposals/c.pdf"] == b"%PDF-c"
+
+    async def test_upload_from_path(self, provider, api, tmp_path, monkeypatch):
+        source = tmp_path / "deck.pdf"
+        source.write_bytes(b"%PDF-deck")
+        opened = []
+
+        def tracking_open(*args, **kwargs):
+            opened.append(open(*args, **kwargs))  # noqa: SIM115 - closing it is what is tested
+            return opened[-1]
+
+        monkeypatch.setattr(supabase_module, "open", tracking_open, raising=False)
+
+        upload = await provider.upload_from_path("proposals", "2024/deck.pdf", source)
+        assert upload.success and upload.file.size == 9
+        assert api.objects["proposals/2024/deck.pdf"] == b"%PDF-deck"
+        assert len(opened) == 1 and opened[0].closed
+
+    async def test_download_to_path_streams_atomically(self, provider, tmp_path):
+        dest = tmp_path / "out" / "a.pdf"
+        result = await provider.download_to_path("proposals", "a.pdf", dest)
+        assert result.success and result.data is None
+        assert result.file.size == 6000 and result.file.content_type == "application/pdf"
+        assert dest.read_bytes() == b"%PDF-a" * 1000
+
+        missing = await provider.download_to_path("proposals", "missing.pdf", tmp_path / "missing.pdf")
+        assert not missing.success and missing.error == "Object not found"
+        assert sorted(p.name for p in tmp_path.rglob("*")) == ["a.pdf", "out"]
+
+    async def test_download_many_is_bounded(self, provider, api):
+        keys = ["a.pdf", "b.pdf", "missing.pdf"] * 4
+        results = await provider.download_many("proposals", keys, concurrency=2)
+
+        assert results["b.pdf"].data == b"%PDF-b"
+        assert not results["missing.pdf"].success
+        assert api.max_in_flight == 2
+
+    async def test_delete_many_uses_one_request(self, provider, api):
+        results = await provider.delete_many("proposals", ["a.pdf", "/b.pdf"])
+
+        assert results == {"a.pdf": True, "/b.pdf": True}
+        assert api.requests == [("DELETE", "proposals")]
+        assert not api.objects
+
+
+class FakeSession:
+    """Stands in for a client's httpx session, recording aclose()."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+class TestClientPerLoop:
+    """One pooled client per event loop."""
+
+    async def test_stopped_loops_clients_are_closed(self):
+        provider = SupabaseStorageProvider(supabase_url=BASE_URL, supabase_key="service-key")
+        # A sync caller's loop that has finished, and the server's loop in another thread
+        finished = asyncio.new_event_loop()
+        server = asyncio.new_event_loop()
+        started = threading.Event()
+        server.call_soon(started.set)
+        thread = threading.Thread(target=server.run_forever)
+        thread.start()
+        try:
+            assert started.wait(5)
+            finished_client = SimpleNamespace(session=FakeSession())
+            server_client = SimpleNamespace(session=FakeSession())
+            provider._clients[finished] = finished_client
+            provider._clients[server] = server_client
+
+            client = provider._get_client()
+            await asyncio.sleep(0)
+
+            assert finished_client.session.closed
+            assert not server_client.session.closed
+            assert dict(provider._clients) == {server: server_client, asyncio.get_running_loop(): client}
+            await provider.close()
+        finally:
+            server.call_soon_threadsafe(server.stop)
+            thread.join()
+            server.close()
+            finished.close()
@@ -27,6 +27,7 @@ from typing import Any
 
 import config
 from db.database import db
+from db.executor import run_db
 from integrations.llm import LLMClient, LLMMessage, ReasoningEffort
 from integrations.llm.prompts.bo_editing import get_coordinator_thread_prompt
 from integrations.llm.schemas.bo_editing import get_coordinator_response_schema
@@ -713,8 +714,8 @@ async def handle_hos_approval(workflow_id: str, user_id: str, response_url: str)
         # Copy all fields from workflow["data"]
         **workflow["data"]
     }
-    # Run synchronous DB operation in thread pool to avoid blocking event loop
-    await asyncio.to_thread(db.save_booking_order, db_data)
+    # Run synchronous DB operation on the DB executor to avoid blocking event loop
+    await run_db(db.save_booking_order, db_data)
 
     # Update workflow with remaining fields (hos_approved already set above)
     await update_workflow(workflow_id, {
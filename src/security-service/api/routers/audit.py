@@ -4,12 +4,14 @@ Audit Logging API endpoints.
 Handles audit event logging and querying.
 """
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from api.dependencies import require_service_auth, get_client_ip, get_request_id
 from core import audit_service
 from models import (
     AuditLogRequest,
+    AuditLogBatchRequest,
+    AuditLogBatchResponse,
     AuditLogResponse,
     AuditLogQuery,
     AuditLogListResponse,
@@ -60,6 +62,39 @@ async def log_audit_event(
     )
 
 
+@router.post("/log/batch", response_model=AuditLogBatchResponse)
+async def log_audit_events(
+    request: AuditLogBatchRequest,
+    service: str = Depends(require_service_auth),
+):
+    """
+    Log a batch of audit events in one insert.
+
+    Called by the SDK audit sink, which buffers events in each service and
+    ships them by size or time. Events keep their original timestamps, so
+    batches replayed after an outage land at the time they happened.
+
+    Returns:
+        AuditLogBatchResponse with:
+        - logged: Number of events written
+        - failed: Number of events not written
+
+    Raises 503 when nothing could be written, so the sink keeps the batch
+    and retries it later.
+    """
+    events = []
+    for event in request.events:
+        data = event.model_dump(mode="json")
+        data["service"] = data["service"] or service
+        events.append(data)
+
+    logged = audit_service.log_events(events)
+    if logged == 0:
+        raise HTTPException(status_code=503, detail="Audit log storage unavailable")
+
+    return AuditLogBatchResponse(logged=logged, failed=len(events) - logged)
+
+
 @router.get("/logs", response_model=AuditLogListResponse)
 async def list_audit_logs(
     actor_id: str | None = Query(None, description="Filter by actor ID"),
@@ -4,15 +4,23 @@ Rate Limiting API endpoints.
 Handles rate limit checking and status queries.
 """
 
+from datetime import datetime, timedelta, timezone
+
 from fastapi import APIRouter, Depends, Query
 
 from api.dependencies import require_service_auth
+from config import settings
 from core import rate_limit_service
 from models import (
+    RateLimitCheckManyRequest,
+    RateLimitCheckManyResponse,
     RateLimitCheckRequest,
     RateLimitCheckResponse,
     RateLimitIncrementRequest,
     RateLimitIncrementResponse,
+    RateLimitLeaseGrant,
+    RateLimitLeaseRequest,
+    RateLimitLeaseResponse,
     RateLimitStatusResponse,
 )
 
@@ -40,7 +48,7 @@ async def check_rate_limit(
         - reset_at: Unix timestamp when limit resets
         - retry_after: Seconds until reset (if denied)
     """
-    result = rate_limit_service.check_rate_limit(
+    result = await rate_limit_service.check_rate_limit(
         key=request.key,
         limit=request.limit,
         window_seconds=request.window_seconds,
@@ -55,6 +63,59 @@ async def check_rate_limit(
     )
 
 
+@router.post("/check-many", response_model=RateLimitCheckManyResponse)
+async def check_rate_limit_many(
+    request: RateLimitCheckManyRequest,
+    service: str = Depends(require_service_auth),
+):
+    """
+    Check and consume several rate limits for one request.
+
+    Use when a request is limited on more than one key (e.g. user, IP and
+    API key). All limits are evaluated in one atomic round trip; quota is
+    consumed from every key only if all of them allow the request.
+
+    Returns:
+        RateLimitCheckManyResponse with the overall decision and one
+        result per check, in request order
+    """
+    results = await rate_limit_service.check_many([
+        {"key": check.key, "limit": check.limit, "window_seconds": check.window_seconds}
+        for check in request.checks
+    ])
+
+    return RateLimitCheckManyResponse(
+        allowed=all(result["allowed"] for result in results),
+        results=[RateLimitCheckResponse(**result) for result in results],
+    )
+
+
+@router.post("/lease", response_model=RateLimitLeaseResponse)
+async def lease_rate_limit(
+    request: RateLimitLeaseRequest,
+    service: str = Depends(require_service_auth),
+):
+    """
+    Lease blocks of quota for SDK clients to admit requests locally.
+
+    Clients spend the granted units without calling this service and
+    return whatever is left unused with their next lease for the key.
+
+    Returns:
+        RateLimitLeaseResponse with one grant per lease, in request order
+    """
+    results = await rate_limit_service.lease_many([
+        lease.model_dump() for lease in request.leases
+    ])
+
+    return RateLimitLeaseResponse(
+        leases=[
+            RateLimitLeaseGrant(key=lease.key, **result)
+            for lease, result in zip(request.leases, results, strict=True)
+        ],
+    )
+
+
 @router.post("/check-only", response_model=RateLimitCheckResponse)
 async def check_rate_limit_only(
     request: RateLimitCheckRequest,
@@ -69,7 +130,7 @@ async def check_rate_limit_only(
     Returns:
         Same as /check but does not increment counter
     """
-    result = rate_limit_service.check_only(
+    result = await rate_limit_service.check_only(
         key=request.key,
         limit=request.limit,
         window_seconds=request.window_seconds,
@@ -95,13 +156,15 @@ async def get_rate_limit_status(
     Returns:
         RateLimitStatusResponse with current state
     """
-    state = rate_limit_service.get_status(key)
+    result = await rate_limit_service.check_only(key)
 
     return RateLimitStatusResponse(
-        key=state.key,
-        request_count=state.request_count,
-        window_start=state.window_start,
-        window_seconds=state.window_seconds,
+        key=key,
+        current_count=result["current"],
+        limit=result["limit"],
+        remaining=result["remaining"],
+        reset_at=result["reset_at"],
+        window_start=datetime.now(timezone.utc) - timedelta(seconds=settings.RATE_LIMIT_WINDOW_SECONDS),
     )
 
 
@@ -122,7 +185,7 @@ async def check_user_rate_limit(
 
     Convenience endpoint that builds the rate limit key automatically.
     """
-    result = rate_limit_service.check_user_rate_limit(
+    result = await rate_limit_service.check_user_rate_limit(
         user_id=user_id,
         endpoint=endpoint,
         limit=limit,
@@ -146,7 +209,7 @@ async def check_ip_rate_limit(
 
     Convenience endpoint that builds the rate limit key automatically.
     """
-    result = rate_limit_service.check_ip_rate_limit(
+    result = await rate_limit_service.check_ip_rate_limit(
         ip_address=ip_address,
         endpoint=endpoint,
         limit=limit,
@@ -170,7 +233,7 @@ async def check_api_key_rate_limit(
 
     Convenience endpoint that builds the rate limit key automatically.
     """
-    result = rate_limit_service.check_api_key_rate_limit(
+    result = await rate_limit_service.check_api_key_rate_limit(
         key_id=key_id,
         limit_per_minute=limit_per_minute,
         endpoint=endpoint,
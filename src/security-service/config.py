@@ -83,6 +83,7 @@ class Settings(BaseSettings):
     RATE_LIMIT_WINDOW_SECONDS: int = 60  # Window size (1 minute)
     RATE_LIMIT_DEFAULT_PER_MINUTE: int = 100
     RATE_LIMIT_DEFAULT_PER_DAY: int = 10000
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 10000  # Keys tracked by the in-process tier
 
     # ==========================================================================
     # CORS CONFIGURATION
@@ -114,6 +114,31 @@ class AuditService:
             metadata=metadata,
         )
 
+    def log_events(self, events: list[dict[str, Any]]) -> int:
+        """
+        Log a batch of audit events with a single database write.
+
+        Used by the SDK audit sink, which has already logged each event
+        locally in the originating service.
+
+        Args:
+            events: Event dicts with the same fields as log_event, plus an
+                optional ISO 'timestamp' for when the event happened
+
+        Returns:
+            Number of events written
+        """
+        if not events:
+            return 0
+
+        written = db.create_audit_logs(events)
+        summary = f"[AUDIT] Batch: {written}/{len(events)} events written"
+        if written == len(events):
+            logger.debug(summary)
+        else:
+            logger.warning(summary)
+        return written
+
     # =========================================================================
     # CONVENIENCE METHODS
     # =========================================================================
@@ -1,44 +1,162 @@
 """
 Rate Limiting Service.
 
-Handles request rate limiting using Security Supabase as backend.
+Handles request rate limiting with a GCRA (sliding window) limiter.
+
+Checks run in two tiers:
+- Local: an in-process GCRA bucket per key that only counts requests this
+  instance admitted. Every admitted request is also counted globally, so a
+  local denial is always a correct global denial - hot or abusive keys are
+  rejected without a round trip.
+- Shared: one atomic Redis script evaluates every limit of a request (user,
+  IP, API key...) together. Falls back to the Security Supabase counters if
+  Redis is unavailable.
 """
 
+import asyncio
 import logging
+import math
 import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
+from crm_cache import gcra
+
 from config import settings
 from db import db
-from models.rate_limit import RateLimitInfo, RateLimitState
+from models.rate_limit import RateLimitState
 
 logger = logging.getLogger("security-service")
 
 
+class _LocalLimiter:
+    """
+    In-process GCRA tier in front of the shared limiter.
+
+    Buckets are keyed by (key, limit, window_seconds) and bounded LRU. Denials
+    reported by the shared limiter are remembered until their retry time,
+    since the shared state can only move further from allowing the request.
+    """
+
+    def __init__(self, max_keys: int):
+        self._max_keys = max_keys
+        self._tats: OrderedDict[tuple[str, int, int], float] = OrderedDict()
+        self._blocked: OrderedDict[tuple[str, int, int], tuple[int, float]] = OrderedDict()
+
+    @staticmethod
+    def _ident(check: dict[str, Any]) -> tuple[str, int, int]:
+        return check["key"], check["limit"], check["window_seconds"]
+
+    def evaluate(self, check: dict[str, Any], now: float) -> dict[str, Any]:
+        """Evaluate a check against local state without consuming."""
+        ident = self._ident(check)
+        blocked = self._blocked.get(ident)
+        if blocked:
+            blocked_cost, until = blocked
+            if now >= until:
+                del self._blocked[ident]
+            elif check["cost"] >= blocked_cost > 0:
+                wait = until - now
+                return {"allowed": False, "remaining": 0, "reset_after": wait, "retry_after": wait}
+
+        result, _ = gcra(self._tats.get(ident), now, check["limit"], check["window_seconds"], check["cost"])
+        return {
+            "allowed": result.allowed,
+            "remaining": result.remaining,
+            "reset_after": result.reset_after,
+            "retry_after": result.retry_after,
+        }
+
+    def commit(self, checks: list[dict[str, Any]], now: float) -> None:
+        """Record requests admitted by the shared limiter."""
+        for check in checks:
+            if not check["cost"]:
+                continue
+            ident = self._ident(check)
+            _, tat = gcra(self._tats.get(ident), now, check["limit"], check["window_seconds"], check["cost"])
+            self._tats[ident] = tat
+            self._tats.move_to_end(ident)
+        while len(self._tats) > self._max_keys:
+            self._tats.popitem(last=False)
+
+    def block(self, check: dict[str, Any], retry_after: float, now: float) -> None:
+        """Remember a shared-limiter denial until its retry time."""
+        if not check["cost"] or retry_after <= 0:
+            return
+        ident = self._ident(check)
+        self._blocked[ident] = (check["cost"], now + retry_after)
+        self._blocked.move_to_end(ident)
+        while len(self._blocked) > self._max_keys:
+            self._blocked.popitem(last=False)
+
+
 class RateLimitService:
     """
-    Rate limiting service using Security Supabase.
+    Rate limiting service.
 
-    Implements sliding window rate limiting with configurable limits.
-    Falls back to allowing requests if database is unavailable.
+    Implements GCRA sliding window rate limiting with configurable limits.
+    Falls back to allowing requests if no backend is available.
     """
 
     def __init__(self):
         self._default_limit = settings.RATE_LIMIT_DEFAULT
         self._default_window = settings.RATE_LIMIT_WINDOW_SECONDS
+        self._local = _LocalLimiter(settings.RATE_LIMIT_LOCAL_MAX_KEYS)
 
     # =========================================================================
     # RATE LIMIT CHECKING
     # =========================================================================
 
-    def check_rate_limit(
+    async def check_many(self, checks: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Check every rate limit for one request in a single round trip.
+
+        The request is allowed only if all limits allow it, and quota is
+        consumed from all of them or from none.
+
+        Args:
+            checks: Dicts with "key" and optional "limit" / "window_seconds"
+                    (defaults to config)
+
+        Returns:
+            One result per check, in order, shaped like check_rate_limit()
+        """
+        checks = [self._normalize(check) for check in checks]
+        if not checks:
+            return []
+
+        now = time.monotonic()
+        local = [self._local.evaluate(check, now) for check in checks]
+        if not all(result["allowed"] for result in local):
+            # Nothing is consumed: report the other limits without consuming
+            local = [
+                result if not result["allowed"] else self._local.evaluate({**check, "cost": 0}, now)
+                for check, result in zip(checks, local, strict=True)
+            ]
+            return self._format_results(checks, local)
+
+        shared = await db.rate_limit_many(checks)
+        if shared is None:
+            shared = await asyncio.to_thread(self._check_counters, checks)
+
+        if all(result["allowed"] for result in shared):
+            self._local.commit(checks, now)
+        else:
+            for check, result in zip(checks, shared, strict=True):
+                if not result["allowed"] and result["retry_after"]:
+                    self._local.block(check, result["retry_after"], now)
+
+        return self._format_results(checks, shared)
+
+    async def check_rate_limit(
         self,
         key: str,
         limit: int | None = None,
         window_seconds: int | None = None,
     ) -> dict[str, Any]:
         """
-        Check if a request is allowed and update the rate limit counter.
+        Check if a request is allowed and consume from the rate limit.
 
         Args:
             key: Rate limit key (e.g., "user:123:endpoint:/api/proposals")
@@ -50,72 +168,132 @@ class RateLimitService:
                 "allowed": bool,
                 "remaining": int,
                 "limit": int,
-                "reset_at": int (unix timestamp),
-                "retry_after": int | None (seconds until reset, if denied)
+                "reset_at": int (unix timestamp when the full limit is available),
+                "retry_after": int | None (seconds until allowed, if denied)
             }
         """
-        limit = limit or self._default_limit
-        window_seconds = window_seconds or self._default_window
+        results = await self.check_many([
+            {"key": key, "limit": limit, "window_seconds": window_seconds},
+        ])
+        return results[0]
 
-        # Get current count
-        current_count = db.get_rate_limit_count(key, window_seconds)
-
-        # Check if allowed
-        allowed = current_count < limit
-
-        if allowed:
-            # Increment counter
-            new_count = db.increment_rate_limit(key, window_seconds)
-            remaining = max(0, limit - new_count)
-        else:
-            remaining = 0
-
-        # Calculate reset time
-        now = int(time.time())
-        reset_at = now + window_seconds
-
-        result = {
-            "allowed": allowed,
-            "remaining": remaining,
-            "limit": limit,
-            "reset_at": reset_at,
-        }
-
-        if not allowed:
-            result["retry_after"] = window_seconds
-            logger.warning(f"[RATE_LIMIT] Exceeded for key: {key}")
-
-        return result
-
-    def check_only(
+    async def check_only(
         self,
         key: str,
         limit: int | None = None,
         window_seconds: int | None = None,
     ) -> dict[str, Any]:
         """
-        Check rate limit status without incrementing.
+        Check rate limit status without consuming.
 
         Useful for displaying rate limit info to users.
         """
-        limit = limit or self._default_limit
-        window_seconds = window_seconds or self._default_window
+        results = await self.check_many([
+            {"key": key, "limit": limit, "window_seconds": window_seconds, "cost": 0},
+        ])
+        result = results[0]
+        result["allowed"] = result["remaining"] > 0
+        result["current"] = result["limit"] - result["remaining"]
+        return result
+
+    async def lease_many(self, leases: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Grant blocks of quota for SDK clients to spend locally.
 
-        current_count = db.get_rate_limit_count(key, window_seconds)
-        remaining = max(0, limit - current_count)
-        allowed = remaining > 0
+        Each lease consumes up to "tokens" units from its key and first
+        refunds "unused" units left over from the client's previous lease.
+        Leases are independent: a partial grant is made when fewer than
+        "tokens" units are available.
 
-        now = int(time.time())
-        reset_at = now + window_seconds
+        Args:
+            leases: Dicts with key, limit, window_seconds, tokens and unused
 
+        Returns:
+            One result per lease, in order, shaped like check_rate_limit()
+            plus "granted"
+        """
+        checks = [
+            {**lease, "cost": lease.get("tokens", 1) - lease.get("unused", 0)}
+            for lease in leases
+        ]
+        results = await self.check_many(checks)
+        if all(result["allowed"] for result in results):
+            return [
+                {**result, "granted": lease.get("tokens", 1)}
+                for lease, result in zip(leases, results, strict=True)
+            ]
+
+        # Some keys cannot cover the full request: lease what each one has
+        granted = []
+        for lease, check, result in zip(leases, checks, results, strict=True):
+            tokens, unused = lease.get("tokens", 1), lease.get("unused", 0)
+            if not tokens and not unused:
+                # Nothing to lease or refund, so nothing to re-check
+                granted.append({**result, "granted": 0})
+                continue
+            if result["allowed"]:
+                grant = tokens
+            else:
+                grant = min(tokens, result["remaining"] + unused)
+            if not grant and not unused:
+                # Nothing to lease or refund: retry once a single unit is free
+                interval = check["window_seconds"] / check["limit"]
+                retry_after = max(1, math.ceil(result["retry_after"] - (tokens - 1) * interval))
+                granted.append({**result, "granted": 0, "retry_after": retry_after})
+                continue
+            [result] = await self.check_many([{**check, "cost": grant - unused}])
+            granted.append({**result, "granted": grant if result["allowed"] else 0})
+        return granted
+
+    def _normalize(self, check: dict[str, Any]) -> dict[str, Any]:
+        """Fill in config defaults for a check."""
         return {
-            "allowed": allowed,
-            "remaining": remaining,
-            "limit": limit,
-            "reset_at": reset_at,
-            "current": current_count,
+            "key": check["key"],
+            "limit": check.get("limit") or self._default_limit,
+            "window_seconds": check.get("window_seconds") or self._default_window,
+            "cost": check.get("cost", 1),
         }
 
+    def _format_results(
+        self,
+        checks: list[dict[str, Any]],
+        results: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Convert limiter results (relative seconds) to the API shape."""
+        now = time.time()
+        formatted = []
+        for check, result in zip(checks, results, strict=True):
+            entry = {
+                "allowed": result["allowed"],
+                "remaining": result["remaining"],
+                "limit": check["limit"],
+                "reset_at": math.ceil(now + result["reset_after"]),
+            }
+            if not result["allowed"]:
+                entry["retry_after"] = max(1, math.ceil(result["retry_after"] or check["window_seconds"]))
+                logger.warning(f"[RATE_LIMIT] Exceeded for key: {check['key']}")
+            formatted.append(entry)
+        return formatted
+
+    @staticmethod
+    def _check_counters(checks: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Fixed-window fallback on the database counters (not atomic)."""
+        counts = [db.get_rate_limit_count(check["key"], check["window_seconds"]) for check in checks]
+        allowed = all(count + check["cost"] <= check["limit"] for check, count in zip(checks, counts, strict=True))
+
+        results = []
+        for check, count in zip(checks, counts, strict=True):
+            fits = not check["cost"] or count + check["cost"] <= check["limit"]
+            if allowed and check["cost"] > 0:
+                count = db.increment_rate_limit(check["key"], check["window_seconds"], check["cost"])
+            results.append({
+                "allowed": fits,
+                "remaining": max(0, check["limit"] - count),
+                "reset_after": check["window_seconds"],
+                "retry_after": None if fits else check["window_seconds"],
+            })
+        return results
+
     # =========================================================================
     # KEY BUILDERS
     # =========================================================================
@@ -152,7 +330,7 @@ class RateLimitService:
     # CONVENIENCE METHODS
     # =========================================================================
 
-    def check_user_rate_limit(
+    async def check_user_rate_limit(
         self,
         user_id: str,
         endpoint: str | None = None,
@@ -160,9 +338,9 @@ class RateLimitService:
     ) -> dict[str, Any]:
         """Check rate limit for a user."""
         key = self.build_user_key(user_id, endpoint)
-        return self.check_rate_limit(key, limit)
+        return await self.check_rate_limit(key, limit)
 
-    def check_ip_rate_limit(
+    async def check_ip_rate_limit(
         self,
         ip_address: str,
         endpoint: str | None = None,
@@ -170,9 +348,9 @@ class RateLimitService:
     ) -> dict[str, Any]:
         """Check rate limit for an IP address."""
         key = self.build_ip_key(ip_address, endpoint)
-        return self.check_rate_limit(key, limit)
+        return await self.check_rate_limit(key, limit)
 
-    def check_api_key_rate_limit(
+    async def check_api_key_rate_limit(
         self,
         key_id: str,
         limit_per_minute: int,
@@ -180,7 +358,7 @@ class RateLimitService:
     ) -> dict[str, Any]:
         """Check rate limit for an API key."""
         key = self.build_api_key_key(key_id, endpoint)
-        return self.check_rate_limit(key, limit_per_minute, window_seconds=60)
+        return await self.check_rate_limit(key, limit_per_minute, window_seconds=60)
 
     # =========================================================================
     # MAINTENANCE
@@ -204,18 +382,15 @@ class RateLimitService:
     # STATUS
     # =========================================================================
 
-    def get_status(self, key: str) -> RateLimitState:
-        """Get current rate limit state for a key."""
-        current = db.get_rate_limit_count(key, self._default_window)
-        now = int(time.time())
+    async def get_status(self, key: str) -> RateLimitState:
+        """Get current rate limit state for a key (default limit and window)."""
+        result = await self.check_only(key)
 
         return RateLimitState(
             key=key,
-            request_count=current,
-            window_start=now - self._default_window,
-            window_seconds=self._default_window,
+            window_start=datetime.now(timezone.utc) - timedelta(seconds=self._default_window),
+            request_count=result["current"],
         )
 
-
 # Singleton instance
 rate_limit_service = RateLimitService()
@@ -347,6 +347,35 @@ class SupabaseBackend(DatabaseBackend):
             logger.error(f"[AUDIT] Failed to create audit log: {e}")
             return None
 
+    def create_audit_logs(self, events: list[dict[str, Any]]) -> int:
+        """
+        Create many audit log entries in one insert.
+
+        In local-only mode (no security client) the events are accepted and
+        not stored, like single events, so callers don't retry them.
+        """
+        client = self._get_security_client()
+        if not client:
+            logger.debug(f"[AUDIT] Local only: {len(events)} events not stored")
+            return len(events)
+
+        now = self._now()
+        rows = [
+            {
+                **event,
+                "timestamp": event.get("timestamp") or now,
+                "metadata": event.get("metadata") or {},
+            }
+            for event in events
+        ]
+
+        try:
+            response = client.table("audit_logs").insert(rows).execute()
+            return len(response.data or [])
+        except Exception as e:
+            logger.error(f"[AUDIT] Failed to create {len(rows)} audit logs: {e}")
+            return 0
+
     def list_audit_logs(
         self,
         actor_id: str | None = None,
@@ -793,6 +822,48 @@ class SupabaseBackend(DatabaseBackend):
             logger.error(f"[RATE_LIMIT] Failed to increment for {key}: {e}")
             return 0
 
+    async def rate_limit_many(
+        self,
+        checks: list[dict[str, Any]],
+    ) -> list[dict[str, Any]] | None:
+        """
+        Atomically evaluate several GCRA rate limits in one cache round trip.
+
+        Returns None when no cache backend supports atomic rate limiting, so
+        callers can fall back to the counter-based methods above.
+        """
+        cache = self._get_cache()
+        if not cache:
+            return None
+
+        try:
+            from crm_cache import RateLimitCheck
+
+            results = await cache.rate_limit_many([
+                RateLimitCheck(
+                    key=f"{check['key']}:{check['window_seconds']}",
+                    limit=check["limit"],
+                    period=check["window_seconds"],
+                    cost=check.get("cost", 1),
+                )
+                for check in checks
+            ])
+        except NotImplementedError:
+            return None
+        except Exception as e:
+            logger.warning(f"[RATE_LIMIT] Atomic check failed, using counters: {e}")
+            return None
+
+        return [
+            {
+                "allowed": result.allowed,
+                "remaining": result.remaining,
+                "reset_after": result.reset_after,
+                "retry_after": result.retry_after,
+            }
+            for result in results
+        ]
+
     def cleanup_rate_limits(self) -> int:
         """Clean up expired rate limit windows."""
         client = self._get_security_client()
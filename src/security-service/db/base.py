@@ -84,6 +84,25 @@ class DatabaseBackend(ABC):
         """
         pass
 
+    def create_audit_logs(self, events: list[dict[str, Any]]) -> int:
+        """
+        Create many audit log entries.
+
+        Each event carries the keyword arguments of create_audit_log, plus an
+        optional ISO 'timestamp' for when the event happened. Backends that
+        support multi-row inserts should override this with a single insert.
+
+        Returns:
+            Number of entries written (or accepted, for a backend with
+            nowhere to store them)
+        """
+        written = 0
+        for event in events:
+            fields = {k: v for k, v in event.items() if k != "timestamp"}
+            if self.create_audit_log(**fields) is not None:
+                written += 1
+        return written
+
     @abstractmethod
     def list_audit_logs(
         self,
@@ -261,6 +280,25 @@ class DatabaseBackend(ABC):
         """
         pass
 
+    async def rate_limit_many(
+        self,
+        checks: list[dict[str, Any]],
+    ) -> list[dict[str, Any]] | None:
+        """
+        Atomically evaluate several rate limits in one round trip.
+
+        Capacity is consumed only if every check is allowed.
+
+        Args:
+            checks: Dicts with key, limit, window_seconds and optional cost
+                    (0 peeks without consuming)
+
+        Returns:
+            One dict per check (allowed, remaining, reset_after, retry_after
+            in seconds), or None if the backend has no atomic limiter
+        """
+        return None
+
     @abstractmethod
     def cleanup_rate_limits(self) -> int:
         """
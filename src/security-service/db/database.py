@@ -108,6 +108,9 @@ class _DatabaseNamespace:
             metadata=metadata,
         )
 
+    def create_audit_logs(self, events: list[dict[str, Any]]) -> int:
+        return self._backend.create_audit_logs(events)
+
     def list_audit_logs(
         self,
         actor_id: str | None = None,
@@ -252,6 +255,12 @@ class _DatabaseNamespace:
     ) -> int:
         return self._backend.increment_rate_limit(key, window_seconds, increment)
 
+    async def rate_limit_many(
+        self,
+        checks: list[dict[str, Any]],
+    ) -> list[dict[str, Any]] | None:
+        return await self._backend.rate_limit_many(checks)
+
     def cleanup_rate_limits(self) -> int:
         return self._backend.cleanup_rate_limits()
 
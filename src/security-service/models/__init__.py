@@ -53,6 +53,8 @@ from .audit import (
     AuditEvent,
     # Pydantic
     AuditLogRequest,
+    AuditLogBatchRequest,
+    AuditLogBatchResponse,
     AuditLogResponse,
     AuditLogQuery,
     AuditLogListResponse,
@@ -83,6 +85,12 @@ from .rate_limit import (
     # Pydantic
     RateLimitCheckRequest,
     RateLimitCheckResponse,
+    RateLimitCheckManyRequest,
+    RateLimitCheckManyResponse,
+    RateLimitLeaseItem,
+    RateLimitLeaseRequest,
+    RateLimitLeaseGrant,
+    RateLimitLeaseResponse,
     RateLimitIncrementRequest,
     RateLimitIncrementResponse,
     RateLimitStatusResponse,
@@ -129,6 +137,8 @@ __all__ = [
     "AuditEvent",
     # Audit Pydantic
     "AuditLogRequest",
+    "AuditLogBatchRequest",
+    "AuditLogBatchResponse",
     "AuditLogResponse",
     "AuditLogQuery",
     "AuditLogListResponse",
@@ -151,6 +161,12 @@ __all__ = [
     # Rate Limit Pydantic
     "RateLimitCheckRequest",
     "RateLimitCheckResponse",
+    "RateLimitCheckManyRequest",
+    "RateLimitCheckManyResponse",
+    "RateLimitLeaseItem",
+    "RateLimitLeaseRequest",
+    "RateLimitLeaseGrant",
+    "RateLimitLeaseResponse",
     "RateLimitIncrementRequest",
     "RateLimitIncrementResponse",
     "RateLimitStatusResponse",
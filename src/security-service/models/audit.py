@@ -184,6 +184,18 @@ class AuditLogRequest(BaseModel):
     response_status: int | None = None
     duration_ms: int | None = None
     metadata: dict[str, Any] = Field(default_factory=dict)
+    timestamp: datetime | None = None  # When the event happened; defaults to receipt time
+
+
+class AuditLogBatchRequest(BaseModel):
+    """Request to create many audit log entries in one insert."""
+    events: list[AuditLogRequest] = Field(..., min_length=1, max_length=500)
+
+
+class AuditLogBatchResponse(BaseModel):
+    """Result of a batch audit log write."""
+    logged: int
+    failed: int
 
 
 class AuditLogResponse(BaseModel):
@@ -51,6 +51,46 @@ class RateLimitCheckResponse(BaseModel):
     retry_after: int | None = None  # Seconds until reset (if exceeded)
 
 
+class RateLimitCheckManyRequest(BaseModel):
+    """Request to check several rate limits for one request atomically."""
+    checks: list[RateLimitCheckRequest] = Field(min_length=1, max_length=20)
+
+
+class RateLimitCheckManyResponse(BaseModel):
+    """Response from a multi-key rate limit check."""
+    allowed: bool  # True only if every check allowed the request
+    results: list[RateLimitCheckResponse]  # In request order
+
+
+class RateLimitLeaseItem(BaseModel):
+    """A block of quota requested by an SDK client."""
+    key: str
+    limit: int = Field(default=100, ge=1)
+    window_seconds: int = Field(default=60, ge=1)
+    tokens: int = Field(default=1, ge=0, le=1000)  # Units to lease
+    unused: int = Field(default=0, ge=0, le=1000)  # Units returned from the previous lease
+
+
+class RateLimitLeaseRequest(BaseModel):
+    """Request to lease quota for one or more keys."""
+    leases: list[RateLimitLeaseItem] = Field(min_length=1, max_length=50)
+
+
+class RateLimitLeaseGrant(BaseModel):
+    """Quota granted for one key."""
+    key: str
+    granted: int  # Units the client may admit locally
+    limit: int
+    remaining: int
+    reset_at: int  # Unix timestamp
+    retry_after: int | None = None  # Seconds until quota is available (if none granted)
+
+
+class RateLimitLeaseResponse(BaseModel):
+    """Response from a quota lease."""
+    leases: list[RateLimitLeaseGrant]  # In request order
+
+
 class RateLimitIncrementRequest(BaseModel):
     """Request to increment rate limit counter."""
     key: str
@@ -0,0 +1,335 @@
+"""
+Tests for the security-service rate limiter (core/rate_limit.py).
+
+These tests verify:
+- check_many() consumes from every limit of a request or from none
+- The in-process tier denies an exhausted key without a shared round trip
+- Shared denials are remembered until their retry time
+- check_only() peeks without consuming
+- lease_many() grants whole or partial blocks and refunds unused units
+- RateLimitClient (crm_security) spends leases locally, returns unused
+  units on the next lease, and several clients leasing from one service
+  never admit more than the limit, over random request streams
+- RateLimitClient fails open on service errors and malformed responses,
+  and lets anything else propagate
+"""
+
+import importlib
+import random
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from crm_cache import MemoryCacheBackend
+from fastapi import FastAPI
+
+from api.dependencies import require_service_auth
+from api.routers import rate_limit as rate_limit_router
+from core.rate_limit import RateLimitService
+from db import db
+
+# crm_security.rate_limit is also the name of a function exported by the package
+client_module = importlib.import_module("crm_security.rate_limit")
+
+# No pytest config here, so asyncio_mode = auto does not apply
+pytestmark = pytest.mark.asyncio
+
+
+class CountingCache(MemoryCacheBackend):
+    """Memory backend that counts atomic rate limit round trips."""
+
+    def __init__(self):
+        super().__init__(max_size=10_000)
+        self.round_trips = 0
+
+    async def rate_limit_many(self, checks):
+        self.round_trips += 1
+        return await super().rate_limit_many(checks)
+
+
+@pytest.fixture
+def cache(monkeypatch) -> CountingCache:
+    cache = CountingCache()
+    monkeypatch.setattr(db._backend, "_cache", cache, raising=False)
+    return cache
+
+
+@pytest.fixture
+def service() -> RateLimitService:
+    return RateLimitService()
+
+
+def user(limit: int = 2) -> dict:
+    return {"key": "user:1", "limit": limit, "window_seconds": 60}
+
+
+def ip(limit: int = 10) -> dict:
+    return {"key": "ip:1", "limit": limit, "window_seconds": 60}
+
+
+class TestCheckMany:
+    """RateLimitService.check_many()."""
+
+    async def test_all_or_nothing(self, service, cache):
+        for _ in range(2):
+            assert all(r["allowed"] for r in await service.check_many([user(), ip()]))
+
+        user_result, ip_result = await service.check_many([user(), ip()])
+        assert not user_result["allowed"]
+        assert user_result["retry_after"] >= 1
+        assert ip_result["allowed"]
+
+        # The denied request consumed nothing from the IP limit
+        status = await service.check_only("ip:1", limit=10, window_seconds=60)
+        assert status["remaining"] == 8
+
+    async def test_one_round_trip_per_request(self, service, cache):
+        await service.check_many([user(5), ip(), {"key": "apikey:1", "limit": 50, "window_seconds": 60}])
+        assert cache.round_trips == 1
+
+    async def test_local_tier_denies_exhausted_key(self, service, cache):
+        for _ in range(2):
+            assert (await service.check_many([user()]))[0]["allowed"]
+        assert cache.round_trips == 2
+
+        result = (await service.check_many([user()]))[0]
+        assert not result["allowed"]
+        assert cache.round_trips == 2
+
+    async def test_shared_denial_is_remembered(self, service, cache):
+        # Another instance used the whole limit
+        other_instance = RateLimitService()
+        for _ in range(2):
+            await other_instance.check_many([user()])
+        cache.round_trips = 0
+
+        assert not (await service.check_many([user()]))[0]["allowed"]
+        assert not (await service.check_many([user()]))[0]["allowed"]
+        assert cache.round_trips == 1
+
+    async def test_check_only_does_not_consume(self, service, cache):
+        for _ in range(3):
+            status = await service.check_only("user:1", limit=2, window_seconds=60)
+            assert status["allowed"]
+            assert status["remaining"] == 2
+
+    async def test_defaults_from_config(self, service, cache):
+        [result] = await service.check_many([{"key": "user:1"}])
+        assert result["allowed"]
+        assert result["limit"] == service._default_limit
+
+
+def lease(tokens: int, unused: int = 0, limit: int = 10) -> dict:
+    # A long window keeps refill negligible while a test runs
+    return {"key": "user:1", "limit": limit, "window_seconds": 3600, "tokens": tokens, "unused": unused}
+
+
+async def remaining(service: RateLimitService, limit: int = 10) -> int:
+    return (await service.check_only("user:1", limit=limit, window_seconds=3600))["remaining"]
+
+
+class TestLeaseMany:
+    """RateLimitService.lease_many()."""
+
+    async def test_full_grant(self, service, cache):
+        [grant] = await service.lease_many([lease(4)])
+        assert grant["granted"] == 4
+        assert grant["remaining"] == 6
+        assert await remaining(service) == 6
+
+    async def test_partial_grant(self, service, cache):
+        await service.lease_many([lease(8)])
+
+        [grant] = await service.lease_many([lease(4)])
+        assert grant["granted"] == 2
+        assert await remaining(service) == 0
+
+    async def test_unused_units_are_refunded(self, service, cache):
+        await service.lease_many([lease(4)])
+        # One unit of the first lease was spent, three come back
+        [grant] = await service.lease_many([lease(4, unused=3)])
+        assert grant["granted"] == 4
+        assert await remaining(service) == 5
+
+    async def test_refund_covers_grant_when_exhausted(self, service, cache):
+        await service.lease_many([lease(5)])
+        await service.lease_many([lease(5)])
+
+        [grant] = await service.lease_many([lease(5, unused=2)])
+        assert grant["granted"] == 2
+        assert await remaining(service) == 0
+
+    async def test_nothing_left_returns_retry_after(self, service, cache):
+        await service.lease_many([lease(10)])
+
+        [grant] = await service.lease_many([lease(3)])
+        assert grant["granted"] == 0
+        assert grant["retry_after"] >= 1
+
+    async def test_refund_only(self, service, cache):
+        await service.lease_many([lease(6)])
+        [grant] = await service.lease_many([lease(0, unused=6)])
+        assert grant["granted"] == 0
+        assert await remaining(service) == 10
+
+    async def test_empty_lease_in_a_partial_batch(self, service, cache):
+        await service.lease_many([lease(8)])
+
+        empty = {**lease(0), "key": "user:2"}
+        grant, nothing = await service.lease_many([lease(4), empty])
+        assert grant["granted"] == 2
+        assert nothing["granted"] == 0
+        assert nothing["allowed"]
+        assert "retry_after" not in nothing
+        assert await remaining(service) == 0
+
+
+class Clock:
+    """Replaces time.monotonic() in crm_security.rate_limit."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(client_module, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+@pytest.fixture
+def app(monkeypatch, service, cache) -> FastAPI:
+    """The /api/rate-limit router backed by the memory cache, recording leases."""
+    leases = []
+    lease_many = service.lease_many
+
+    async def recording_lease_many(items):
+        leases.extend(items)
+        return await lease_many(items)
+
+    monkeypatch.setattr(service, "lease_many", recording_lease_many)
+    monkeypatch.setattr(rate_limit_router, "rate_limit_service", service)
+
+    app = FastAPI()
+    app.include_router(rate_limit_router.router)
+    app.dependency_overrides[require_service_auth] = lambda: "test"
+    app.state.leases = leases
+    return app
+
+
+@pytest.fixture
+def make_client(app, clock):
+    def _make(lease_max: int = 10, lease_ttl: float = 5.0):
+        client = client_module.RateLimitClient(lease_max=lease_max, lease_ttl=lease_ttl)
+        client._base_url = "http://security-service"
+        http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=client._base_url)
+        client._get_client = lambda: http
+        return client
+    return _make
+
+
+class TestRateLimitClient:
+    """crm_security RateLimitClient against the lease endpoint."""
+
+    async def test_spends_lease_locally(self, make_client, app, service):
+        client = make_client()
+
+        for _ in range(10):
+            allowed, _ = await client.acquire("user:1", 100, 3600)
+            assert allowed
+
+        assert len(app.state.leases) == 1
+        assert app.state.leases[0]["tokens"] == 10
+        assert await remaining(service, 100) == 90
+
+    async def test_unused_units_return_with_next_lease(self, make_client, app, service, clock):
+        client = make_client()
+        for _ in range(3):
+            await client.acquire("user:1", 100, 3600)
+
+        clock.now += 5.0  # Lease TTL
+        assert (await client.acquire("user:1", 100, 3600))[0]
+
+        assert [item["unused"] for item in app.state.leases] == [0, 7]
+        # 3 + 1 spent, 9 held by the new lease
+        assert await remaining(service, 100) == 87
+
+    async def test_units_from_a_past_window_are_not_refunded(self, make_client, app, clock):
+        client = make_client(lease_ttl=60.0)
+        await client.acquire("user:1", 100, 30)
+
+        clock.now += 30.0
+        await client.acquire("user:1", 100, 30)
+
+        assert [item["unused"] for item in app.state.leases] == [0, 0]
+
+    async def test_denial_blocks_until_retry_after(self, make_client, app, clock):
+        client = make_client()
+        for _ in range(10):
+            assert (await client.acquire("user:1", 10, 3600))[0]
+
+        allowed, info = await client.acquire("user:1", 10, 3600)
+        assert not allowed
+        assert info.retry_after >= 1
+        leases_made = len(app.state.leases)
+
+        # Denied locally until retry_after, without asking the service
+        assert not (await client.acquire("user:1", 10, 3600))[0]
+        assert len(app.state.leases) == leases_made
+
+    @pytest.mark.parametrize(
+        "response",
+        [httpx.Response(500), httpx.Response(200, content=b"not json"), httpx.Response(200, json={"leases": []})],
+    )
+    async def test_fails_open_when_service_errors(self, make_client, clock, response):
+        client = make_client()
+        http = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: response),
+            base_url=client._base_url,
+        )
+        client._get_client = lambda: http
+
+        assert (await client.acquire("user:1", 10, 3600))[0]
+        assert client._fail_open_until == clock.now + client_module._FAIL_OPEN_SECONDS
+
+    async def test_unexpected_errors_propagate(self, make_client, clock):
+        client = make_client()
+
+        def broken(request):
+            raise AssertionError("bug")
+
+        http = httpx.AsyncClient(transport=httpx.MockTransport(broken), base_url=client._base_url)
+        client._get_client = lambda: http
+
+        with pytest.raises(AssertionError):
+            await client.acquire("user:1", 10, 3600)
+        assert client._fail_open_until == 0
+
+    @pytest.mark.parametrize("seed", range(10))
+    async def test_clients_never_admit_more_than_limit(self, make_client, app, clock, seed):
+        rng = random.Random(seed)
+        limit = rng.randint(10, 60)
+        clients = [make_client(lease_max=rng.randint(1, 8), lease_ttl=rng.choice([1.0, 5.0])) for _ in range(3)]
+        admitted = 0
+
+        for _ in range(300):
+            clock.now += rng.choice([0.0, 0.0, 0.1, 0.5, 2.0])
+            if (await rng.choice(clients).acquire("user:1", limit, 3600))[0]:
+                admitted += 1
+            assert admitted <= limit
+
+        # Let every lease lapse: unused units go back, so all of them get spent
+        clock.now += 10.0
+        while True:
+            results = [(await client.acquire("user:1", limit, 3600))[0] for client in clients]
+            admitted += sum(results)
+            assert admitted <= limit
+            if not any(results):
+                break
+
+        assert admitted == limit
+        assert all(client._fail_open_until == 0 for client in clients)
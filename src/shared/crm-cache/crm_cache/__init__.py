@@ -56,6 +56,9 @@ from .base import (
     CacheBackend,
     CacheEntry,
     CacheStats,
+    RateLimitCheck,
+    RateLimitResult,
+    gcra,
 )
 
 # Backends
@@ -82,6 +85,9 @@ __all__ = [
     "CacheBackend",
     "CacheEntry",
     "CacheStats",
+    "RateLimitCheck",
+    "RateLimitResult",
+    "gcra",
     # Backends
     "MemoryCacheBackend",
     # Client
@@ -18,7 +18,14 @@ import time
 from collections import OrderedDict
 from typing import Any
 
-from ..base import CacheBackend, CacheEntry, CacheStats
+from ..base import (
+    CacheBackend,
+    CacheEntry,
+    CacheStats,
+    RateLimitCheck,
+    RateLimitResult,
+    gcra,
+)
 
 logger = logging.getLogger("crm_cache.memory")
 
@@ -159,6 +166,37 @@ class MemoryCacheBackend(CacheBackend):
                 self._stats.deletes += 1
             return len(matching_keys)
 
+    async def rate_limit_many(
+        self,
+        checks: list[RateLimitCheck],
+    ) -> list[RateLimitResult]:
+        """Atomically evaluate several GCRA rate limits (see CacheBackend)."""
+        async with self._lock:
+            now = time.time()
+            keys = [f"gcra:{check.key}" for check in checks]
+            tats = []
+            for key in keys:
+                entry = self._cache.get(key)
+                tats.append(entry.value if entry and not entry.is_expired() else None)
+
+            evaluated = [
+                gcra(tat, now, check.limit, check.period, check.cost)
+                for check, tat in zip(checks, tats, strict=True)
+            ]
+            if not all(result.allowed for result, _ in evaluated):
+                # Nothing is consumed: report allowed checks as peeks
+                return [
+                    result if not result.allowed else gcra(tat, now, check.limit, check.period, 0)[0]
+                    for (result, _), check, tat in zip(evaluated, checks, tats, strict=True)
+                ]
+
+            for key, check, (_, new_tat) in zip(keys, checks, evaluated, strict=True):
+                if check.cost:
+                    self._cache.pop(key, None)
+                    await self._evict_if_needed()
+                    self._cache[key] = CacheEntry(value=new_tat, expires_at=new_tat)
+            return [result for result, _ in evaluated]
+
     def size(self) -> int:
         """Get current cache size."""
         return len(self._cache)
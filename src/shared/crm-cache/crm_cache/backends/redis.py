@@ -24,7 +24,7 @@ import logging
 import os
 from typing import Any
 
-from ..base import CacheBackend, CacheStats
+from ..base import CacheBackend, CacheStats, RateLimitCheck, RateLimitResult
 
 logger = logging.getLogger("crm_cache.redis")
 
@@ -33,6 +33,53 @@ logger = logging.getLogger("crm_cache.redis")
 _loop_connections: dict[int, tuple["redis.asyncio.Redis", "redis.asyncio.ConnectionPool"]] = {}
 _logged_connection = False
 
+# GCRA over several keys in one atomic round trip (see crm_cache.base.gcra).
+# KEYS: rate limit keys. ARGV: limit, period_ms, cost for each key (a
+# negative cost refunds units).
+# Uses the Redis clock so every instance agrees on "now". Replies are
+# integers: {allowed, remaining, reset_after_ms, retry_after_ms or -1}.
+_GCRA_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local results, tats, new_tats = {}, {}, {}
+local all_allowed = true
+
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[i * 3 - 2])
+    local period = tonumber(ARGV[i * 3 - 1])
+    local cost = tonumber(ARGV[i * 3])
+    local interval = period / limit
+    local tat = math.max(tonumber(redis.call('GET', key)) or now, now)
+    local used = tat - now
+    local retry_after = used + interval * cost - period
+    tats[i] = tat
+    if retry_after > 1e-3 then
+        all_allowed = false
+        local remaining = math.max(0, math.floor((period - used) / interval + 1e-9))
+        results[i] = {0, remaining, math.ceil(used), math.ceil(retry_after)}
+    else
+        new_tats[i] = tat + interval * cost
+        results[i] = {1, math.max(0, math.floor(-retry_after / interval + 1e-9)), math.ceil(new_tats[i] - now), -1}
+    end
+end
+
+for i, key in ipairs(KEYS) do
+    local cost = tonumber(ARGV[i * 3])
+    if new_tats[i] then
+        if not all_allowed then
+            -- Nothing is consumed: report the unconsumed state
+            local interval = tonumber(ARGV[i * 3 - 1]) / tonumber(ARGV[i * 3 - 2])
+            results[i][2] = math.floor((now - tats[i] + tonumber(ARGV[i * 3 - 1])) / interval + 1e-9)
+            results[i][3] = math.ceil(tats[i] - now)
+        elseif cost ~= 0 then
+            redis.call('SET', key, string.format('%.3f', new_tats[i]), 'PX', math.max(1, math.ceil(new_tats[i] - now)))
+        end
+    end
+end
+
+return results
+"""
+
 
 class RedisCacheBackend(CacheBackend):
     """Redis-backed cache backend with connection pooling and auto-reconnect."""
@@ -306,6 +353,33 @@ class RedisCacheBackend(CacheBackend):
             logger.error(f"[CACHE] Redis ttl error: {e}")
             return -2
 
+    async def rate_limit_many(
+        self,
+        checks: list[RateLimitCheck],
+    ) -> list[RateLimitResult]:
+        """Atomically evaluate several GCRA rate limits in one script call (see CacheBackend)."""
+        if not checks:
+            return []
+
+        redis_client = await self._get_redis()
+        keys = [self._make_key(f"gcra:{check.key}") for check in checks]
+        args = []
+        for check in checks:
+            args.extend((check.limit, int(check.period * 1000), check.cost))
+
+        script = redis_client.register_script(_GCRA_SCRIPT)
+        replies = await script(keys=keys, args=args)
+
+        return [
+            RateLimitResult(
+                allowed=bool(allowed),
+                remaining=int(remaining),
+                reset_after=max(0, int(reset_after_ms)) / 1000,
+                retry_after=int(retry_after_ms) / 1000 if retry_after_ms >= 0 else None,
+            )
+            for allowed, remaining, reset_after_ms, retry_after_ms in replies
+        ]
+
     async def close(self) -> None:
         """Close Redis connection for current event loop."""
         try:
@@ -41,6 +41,76 @@ class CacheStats:
         return (self.hits / total) * 100
 
 
+@dataclass
+class RateLimitCheck:
+    """One rate limit to evaluate: `limit` units per `period` seconds."""
+
+    key: str
+    limit: int
+    period: float
+    cost: int = 1  # Units to consume; 0 peeks, negative refunds
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a rate limit check (durations in seconds)."""
+
+    allowed: bool
+    remaining: int
+    reset_after: float  # Until the full limit is available again
+    retry_after: float | None = None  # Until the request would fit (if denied)
+
+
+# Seconds of float error tolerated before a request counts as over the limit
+_GCRA_TOLERANCE = 1e-6
+
+
+def gcra(
+    tat: float | None,
+    now: float,
+    limit: int,
+    period: float,
+    cost: int = 1,
+) -> tuple[RateLimitResult, float]:
+    """
+    Evaluate one check with the generic cell rate algorithm (GCRA).
+
+    GCRA is a sliding-window limiter that keeps a single timestamp per key:
+    the theoretical arrival time (TAT) at which all used capacity has been
+    replenished. Each unit pushes the TAT forward by period / limit and a
+    request is allowed while the TAT stays within `period` of now. That
+    admits a burst of at most `limit` units followed by a steady
+    limit / period: any span of T seconds admits at most
+    limit + T * limit / period units. Unlike fixed windows, there is no 2x
+    burst around a window edge.
+
+    The Redis backend runs the same arithmetic in a Lua script.
+
+    Args:
+        tat: Stored TAT for the key (None if unseen)
+        now: Current time in seconds
+        limit: Units allowed per period
+        period: Window length in seconds
+        cost: Units to consume
+
+    Returns:
+        (result, tat) - the TAT to store if the request is committed
+    """
+    interval = period / limit
+    tat = max(tat or now, now)
+    # Work in offsets from now: absolute epoch times lose the sub-microsecond
+    # precision that decides whether a burst of exactly `limit` fits
+    used = tat - now
+    retry_after = used + interval * cost - period
+
+    if retry_after > _GCRA_TOLERANCE:
+        remaining = max(0, int((period - used) / interval + 1e-9))
+        return RateLimitResult(False, remaining, used, retry_after), tat
+
+    remaining = max(0, int(-retry_after / interval + 1e-9))
+    return RateLimitResult(True, remaining, used + interval * cost), tat + interval * cost
+
+
 class CacheBackend(ABC):
     """Abstract base for cache backends."""
 
@@ -137,3 +207,22 @@ class CacheBackend(ABC):
         Only implemented in Redis backend.
         """
         raise NotImplementedError("ttl requires Redis backend")
+
+    async def rate_limit_many(
+        self,
+        checks: list[RateLimitCheck],
+    ) -> list[RateLimitResult]:
+        """
+        Atomically evaluate several GCRA rate limits.
+
+        Capacity is consumed only if every check is allowed; when any check
+        is denied, nothing is consumed and allowed checks report their
+        unconsumed state.
+
+        Args:
+            checks: Limits to evaluate together
+
+        Returns:
+            One RateLimitResult per check, in order
+        """
+        raise NotImplementedError("rate_limit_many requires Redis or memory backend")
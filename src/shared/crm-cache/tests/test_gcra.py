@@ -0,0 +1,237 @@
+"""
+Tests for the GCRA rate limiter (crm_cache.gcra and rate_limit_many).
+
+These tests verify:
+- A fresh key admits a burst of `limit` units, then denies, whatever the
+  clock's magnitude (float rounding used to deny some full bursts)
+- Capacity refills at limit / period, and fully after `period`
+- retry_after is exactly when the denied request would fit
+- Costs above one, peeks (cost 0) and refunds (negative cost)
+- Any span of T seconds admits at most limit + T * limit / period units
+  (so never more than `limit` at once), over random request streams
+- The memory backend's rate_limit_many() gives the same answers as
+  applying gcra() per key with all-or-nothing commits, over randomly
+  generated multi-key checks
+"""
+
+import random
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from crm_cache import MemoryCacheBackend, RateLimitCheck, gcra
+from crm_cache import base as cache_base
+from crm_cache.backends import memory
+
+LIMIT = 5
+PERIOD = 10.0
+INTERVAL = PERIOD / LIMIT
+
+
+def consume(tat: float | None, now: float, cost: int = 1, limit: int = LIMIT, period: float = PERIOD):
+    """Evaluate and commit one check, like a single-key rate_limit_many()."""
+    result, new_tat = gcra(tat, now, limit, period, cost)
+    return result, (new_tat if result.allowed else tat)
+
+
+class TestGcra:
+    """gcra() as a pure function."""
+
+    def test_burst_then_deny(self):
+        tat = None
+        for expected_remaining in range(LIMIT - 1, -1, -1):
+            result, tat = consume(tat, 100.0)
+            assert result.allowed
+            assert result.remaining == expected_remaining
+            assert result.retry_after is None
+
+        result, denied_tat = consume(tat, 100.0)
+        assert not result.allowed
+        assert result.remaining == 0
+        assert denied_tat == tat
+
+    def test_refill(self):
+        tat = None
+        for _ in range(LIMIT):
+            _, tat = consume(tat, 100.0)
+
+        # One unit comes back every INTERVAL seconds
+        assert not consume(tat, 100.0 + INTERVAL - 0.01)[0].allowed
+        result, tat = consume(tat, 100.0 + INTERVAL)
+        assert result.allowed
+        assert result.remaining == 0
+
+        # A full period after the last unit, the whole burst is available again
+        result, _ = gcra(tat, 100.0 + INTERVAL + PERIOD, LIMIT, PERIOD, 0)
+        assert result.remaining == LIMIT
+
+    def test_retry_after_and_reset_after(self):
+        tat = None
+        for _ in range(LIMIT):
+            result, tat = consume(tat, 100.0)
+        assert result.reset_after == pytest.approx(PERIOD)
+
+        result, _ = consume(tat, 101.5)
+        assert not result.allowed
+        assert result.retry_after == pytest.approx(INTERVAL - 1.5)
+        assert result.reset_after == pytest.approx(PERIOD - 1.5)
+
+        assert not consume(tat, 101.5 + result.retry_after - 0.001)[0].allowed
+        assert consume(tat, 101.5 + result.retry_after)[0].allowed
+
+    def test_cost_above_one(self):
+        tat = None
+        for _ in range(LIMIT - 2):
+            _, tat = consume(tat, 100.0)
+
+        result, _ = consume(tat, 100.0, cost=3)
+        assert not result.allowed
+        assert result.remaining == 2
+        assert result.retry_after == pytest.approx(INTERVAL)
+
+        result, _ = consume(tat, 100.0, cost=2)
+        assert result.allowed
+        assert result.remaining == 0
+
+    @pytest.mark.parametrize(("limit", "period"), [(10, 3600.0), (7, 60.0), (3, 1.0), (100, 60.0)])
+    def test_full_burst_always_fits(self, limit, period):
+        # Float rounding in now + period - period must not deny a burst of exactly `limit`
+        rng = random.Random(limit)
+        for _ in range(500):
+            now = rng.random() * 10 ** rng.randint(0, 9)
+            result, tat = gcra(None, now, limit, period, limit)
+            assert result.allowed
+            assert result.remaining == 0
+            assert not gcra(tat, now, limit, period, 1)[0].allowed
+
+    def test_cost_above_limit_never_fits(self):
+        result, _ = gcra(None, 100.0, LIMIT, PERIOD, LIMIT + 1)
+        assert not result.allowed
+        assert result.retry_after == pytest.approx(INTERVAL)
+
+    def test_peek_does_not_consume(self):
+        _, tat = consume(None, 100.0)
+        result, peeked_tat = gcra(tat, 100.0, LIMIT, PERIOD, 0)
+        assert result.allowed
+        assert result.remaining == LIMIT - 1
+        assert peeked_tat == tat
+
+    def test_refund_restores_capacity(self):
+        tat = None
+        for _ in range(LIMIT):
+            _, tat = consume(tat, 100.0)
+        _, tat = consume(tat, 100.0, cost=-2)
+
+        assert gcra(tat, 100.0, LIMIT, PERIOD, 0)[0].remaining == 2
+        # Refunds never create capacity beyond the limit
+        _, tat = consume(tat, 100.0, cost=-LIMIT * 3)
+        assert gcra(tat, 100.0, LIMIT, PERIOD, 0)[0].remaining == LIMIT
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_span_admits_at_most_burst_plus_rate(self, seed):
+        rng = random.Random(seed)
+        limit = rng.randint(1, 10)
+        period = rng.choice([1.0, 2.5, 10.0, 60.0])
+        now, tat = 0.0, None
+        admitted: list[tuple[float, int]] = []
+
+        for _ in range(300):
+            now += rng.expovariate(limit / period * 2)
+            cost = rng.choice([1, 1, 1, 2, 3])
+            result, tat = consume(tat, now, cost, limit, period)
+            if result.allowed:
+                admitted.append((now, cost))
+            else:
+                assert result.retry_after > 0
+
+        interval = period / limit
+        for span in (0.0, interval / 2, interval * 1.5, period, period * 3):
+            for start, _ in admitted:
+                in_span = sum(cost for at, cost in admitted if start <= at <= start + span)
+                assert in_span <= limit + span / interval + 1e-9
+
+
+class Clock:
+    """Replaces time.time() in the memory backend and its cache entries."""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock(time.time())
+    fake_time = SimpleNamespace(time=clock.time)
+    monkeypatch.setattr(memory, "time", fake_time)
+    monkeypatch.setattr(cache_base, "time", fake_time)
+    return clock
+
+
+class ReferenceLimiter:
+    """gcra() per key, committing only when every check is allowed."""
+
+    def __init__(self):
+        self.tats: dict[str, float] = {}
+
+    def rate_limit_many(self, checks: list[RateLimitCheck], now: float):
+        evaluated = [gcra(self.tats.get(c.key), now, c.limit, c.period, c.cost) for c in checks]
+        if all(result.allowed for result, _ in evaluated):
+            for check, (_, new_tat) in zip(checks, evaluated, strict=True):
+                if check.cost:
+                    self.tats[check.key] = new_tat
+            return [result for result, _ in evaluated]
+        return [
+            result if not result.allowed else gcra(self.tats.get(c.key), now, c.limit, c.period, 0)[0]
+            for (result, _), c in zip(evaluated, checks, strict=True)
+        ]
+
+
+class TestMemoryRateLimitMany:
+    """MemoryCacheBackend.rate_limit_many()."""
+
+    async def test_all_or_nothing(self, clock):
+        backend = MemoryCacheBackend()
+        user = RateLimitCheck("user:1", limit=2, period=PERIOD)
+        ip = RateLimitCheck("ip:1", limit=5, period=PERIOD)
+
+        for _ in range(2):
+            assert all(r.allowed for r in await backend.rate_limit_many([user, ip]))
+
+        user_result, ip_result = await backend.rate_limit_many([user, ip])
+        assert not user_result.allowed
+        assert user_result.retry_after == pytest.approx(PERIOD / 2)
+        # The IP limit would allow it, but nothing was consumed from it
+        assert ip_result.allowed
+        assert ip_result.remaining == 3
+        assert (await backend.rate_limit_many([RateLimitCheck("ip:1", 5, PERIOD, cost=0)]))[0].remaining == 3
+
+    async def test_entries_expire_when_fully_refilled(self, clock):
+        backend = MemoryCacheBackend()
+        await backend.rate_limit_many([RateLimitCheck("user:1", LIMIT, PERIOD)])
+        assert await backend.exists("gcra:user:1")
+
+        clock.now += INTERVAL + 0.001
+        assert not await backend.exists("gcra:user:1")
+
+    @pytest.mark.parametrize("seed", range(10))
+    async def test_matches_reference(self, clock, seed):
+        rng = random.Random(seed)
+        backend = MemoryCacheBackend(max_size=10_000)
+        reference = ReferenceLimiter()
+        keys = {f"k{n}": (rng.randint(1, 8), rng.choice([1.0, 5.0, 30.0])) for n in range(4)}
+
+        for _ in range(400):
+            clock.now += rng.choice([0.0, 0.0, 0.05, 0.3, 1.0, 4.0])
+            chosen = rng.sample(sorted(keys), rng.randint(1, len(keys)))
+            checks = [
+                RateLimitCheck(key, *keys[key], cost=rng.choice([1, 1, 1, 2, 0, -1]))
+                for key in chosen
+            ]
+
+            actual = await backend.rate_limit_many(checks)
+            expected = reference.rate_limit_many(checks, clock.now)
+            assert actual == expected
@@ -4,7 +4,7 @@ CRM Security SDK
 Provides consistent security patterns across all services:
 - Trusted header parsing (from unified-ui gateway)
 - RBAC permission checking (local, no network)
-- Audit logging to security-service (async HTTP)
+- Audit logging to security-service (buffered, batched HTTP)
 - API key authentication
 - Rate limiting
 - FastAPI middleware and dependencies
@@ -59,12 +59,20 @@ from .trusted_headers import (
     HEADER_USER_PROFILE,
     HEADER_USER_PERMISSIONS,
     HEADER_USER_COMPANIES,
+    HEADER_USER_CONTEXT,
+    ContextToken,
+    InvalidContextToken,
+    LazyUserContext,
+    encode_context_token,
+    parse_context_token,
     parse_user_context,
     verify_proxy_secret,
 )
 
 # RBAC
 from .rbac import (
+    CompiledPermissions,
+    compile_permissions,
     matches_wildcard,
     has_permission,
     has_any_permission,
@@ -111,8 +119,11 @@ from .service_auth import (
 from .audit import (
     AuditAction,
     AuditClient,
+    AuditSink,
     audit_log,
     audit,
+    close_audit_client,
+    get_audit_stats,
     # Legacy aliases
     audit_logger,
     audit_action,
@@ -131,10 +142,12 @@ from .api_keys import (
     hash_api_key,
 )
 
-# Rate Limiting (thin client - checks via security-service)
+# Rate Limiting (thin client - quota leased from security-service)
 from .rate_limit import (
+    RateLimitClient,
     RateLimitInfo,
     RateLimiter,
+    close_rate_limit_client,
     rate_limit,
     get_rate_limiter,
 )
@@ -149,6 +162,7 @@ from .middleware import (
 # Context Management
 from .context import (
     set_user_context,
+    set_user_context_mapping,
     get_user_context,
     clear_user_context,
     get_current_user_id,
@@ -176,9 +190,17 @@ __all__ = [
     "HEADER_USER_PROFILE",
     "HEADER_USER_PERMISSIONS",
     "HEADER_USER_COMPANIES",
+    "HEADER_USER_CONTEXT",
+    "ContextToken",
+    "InvalidContextToken",
+    "LazyUserContext",
+    "encode_context_token",
+    "parse_context_token",
     "parse_user_context",
     "verify_proxy_secret",
     # RBAC
+    "CompiledPermissions",
+    "compile_permissions",
     "matches_wildcard",
     "has_permission",
     "has_any_permission",
@@ -213,8 +235,11 @@ __all__ = [
     # Audit
     "AuditAction",
     "AuditClient",
+    "AuditSink",
     "audit_log",
     "audit",
+    "close_audit_client",
+    "get_audit_stats",
     "audit_logger",
     "audit_action",
     "create_audit_logger",
@@ -227,8 +252,10 @@ __all__ = [
     "generate_api_key",
     "hash_api_key",
     # Rate Limiting (thin client)
+    "RateLimitClient",
     "RateLimitInfo",
     "RateLimiter",
+    "close_rate_limit_client",
     "rate_limit",
     "get_rate_limiter",
     # Middleware
@@ -237,6 +264,7 @@ __all__ = [
     "TrustedUserMiddleware",
     # Context Management
     "set_user_context",
+    "set_user_context_mapping",
     "get_user_context",
     "clear_user_context",
     "get_current_user_id",
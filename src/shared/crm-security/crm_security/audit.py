@@ -4,6 +4,12 @@ Audit Logging SDK Client.
 Sends audit events to the security-service via HTTP.
 All persistence is handled by the security-service.
 
+Events are queued in an in-memory ring buffer and shipped in batches by a
+background flusher, either when a batch fills up or when the flush interval
+passes. While the service is unreachable, batches are appended to a local
+spill file and replayed in order once it is back. If the buffer overflows
+the oldest events are dropped; AuditSink.stats() reports drops and lag.
+
 Usage:
     from crm_security import audit_log, audit
 
@@ -24,16 +30,24 @@ Usage:
 
 import asyncio
 import functools
+import json
 import logging
+import os
+import tempfile
+import time
 import uuid
-from collections.abc import Callable
+from collections import deque
+from collections.abc import Awaitable, Callable, Mapping
 from datetime import datetime
 from enum import Enum
+from pathlib import Path
 from typing import Any
 
 import httpx
+from crm_utils import BackgroundFlusher
 
 from .config import security_config
+from .rate_limit import _close_on_loop
 
 logger = logging.getLogger(__name__)
 
@@ -122,17 +136,217 @@ class AuditAction(str, Enum):
     PERMISSION_CHECK = "permission.check"
 
 
+class AuditSink(BackgroundFlusher):
+    """
+    Buffered, batching delivery of audit events.
+
+    emit() never blocks: events go into a bounded deque (thread-safe, so
+    sync code may emit too) and a flusher task on the event loop drains it
+    (see BackgroundFlusher). Delivery is at-least-once; a crash during
+    replay can resend a batch.
+
+    Args:
+        send: Coroutine that delivers a batch and returns how many events
+            were accepted. Raising keeps the batch for a later retry.
+        name: Sink name, used for the default spill file and in logs
+    """
+
+    def __init__(
+        self,
+        send: Callable[[list[dict[str, Any]]], Awaitable[int]],
+        name: str,
+        buffer_size: int | None = None,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+        spill_path: str | Path | None = None,
+        spill_max_bytes: int | None = None,
+    ):
+        super().__init__(flush_interval or security_config.audit_flush_interval, name)
+        self._send = send
+        self._batch_size = batch_size or security_config.audit_batch_size
+        self._spill_max_bytes = spill_max_bytes or security_config.audit_spill_max_bytes
+        # One file per sink: a shared file would replay each sink's events
+        # to the other's destination
+        self._spill_path = Path(
+            spill_path
+            or Path(security_config.audit_spill_dir or tempfile.gettempdir()) / f"crm-audit-{name}.jsonl"
+        )
+        self._buffer: deque[tuple[float, dict[str, Any]]] = deque(
+            maxlen=buffer_size or security_config.audit_buffer_size
+        )
+
+        # Metrics
+        self._enqueued = 0
+        self._sent = 0
+        self._dropped = 0
+        self._spilled = 0
+        self._spill_backlog: int | None = None  # Unknown until the flusher starts
+        self._last_flush_at: float | None = None
+        self._last_error: str | None = None
+
+    def emit(self, event: dict[str, Any]) -> None:
+        """Queue an event for delivery."""
+        if len(self._buffer) == self._buffer.maxlen:
+            self._dropped += 1  # append evicts the oldest event
+        self._buffer.append((time.monotonic(), event))
+        self._enqueued += 1
+        self.notify(batch_ready=len(self._buffer) >= self._batch_size)
+
+    def stats(self) -> dict[str, Any]:
+        """Delivery metrics: queue depth, lag, drops and spill backlog."""
+        oldest = self._buffer[0][0] if self._buffer else None
+        return {
+            "queued": len(self._buffer),
+            "lag_seconds": round(time.monotonic() - oldest, 3) if oldest else 0.0,
+            "enqueued": self._enqueued,
+            "sent": self._sent,
+            "dropped": self._dropped,
+            "spilled": self._spilled,
+            "spill_backlog": self._spill_backlog or 0,
+            "last_flush_at": self._last_flush_at,
+            "last_error": self._last_error,
+        }
+
+    # =========================================================================
+    # FLUSHING
+    # =========================================================================
+
+    async def on_start(self) -> None:
+        if self._spill_backlog is None:
+            self._spill_backlog = await asyncio.to_thread(self._count_spilled)
+
+    async def flush(self) -> None:
+        """Send everything queued, replaying spilled batches first."""
+        async with self.flush_lock():
+            if self._spill_backlog and not await self._replay_spill():
+                # Still down: keep order by spilling behind the backlog
+                await self._spill(self._drain())
+                return
+
+            while self._buffer:
+                batch = self._drain(self._batch_size)
+                if not await self._deliver(batch):
+                    await self._spill(batch + self._drain())
+                    return
+
+    def _drain(self, limit: int | None = None) -> list[dict[str, Any]]:
+        count = len(self._buffer) if limit is None else min(limit, len(self._buffer))
+        return [self._buffer.popleft()[1] for _ in range(count)]
+
+    async def _deliver(self, batch: list[dict[str, Any]]) -> bool:
+        """Send one batch. Returns False if it should be kept for retry."""
+        try:
+            accepted = await self._send(batch)
+        except Exception as e:
+            if self._last_error is None:
+                logger.warning(f"[AUDIT] {self._name}: delivery failed, spilling until it recovers ({e})")
+            self._last_error = str(e)
+            return False
+
+        self._last_error = None
+        self._sent += accepted
+        self._dropped += len(batch) - accepted
+        self._last_flush_at = time.time()
+        return True
+
+    # =========================================================================
+    # SPILL FILE
+    # =========================================================================
+
+    def _count_spilled(self) -> int:
+        try:
+            with open(self._spill_path, "rb") as f:
+                return sum(1 for _ in f)
+        except FileNotFoundError:
+            return 0
+
+    def _append_spill(self, lines: list[str]) -> bool:
+        data = "".join(lines).encode()
+        try:
+            size = self._spill_path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size + len(data) > self._spill_max_bytes:
+            return False
+        self._spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._spill_path, "ab") as f:
+            f.write(data)
+        return True
+
+    async def _spill(self, events: list[dict[str, Any]]) -> None:
+        if not events:
+            return
+        lines = [json.dumps(event, default=str) + "\n" for event in events]
+        try:
+            written = await asyncio.to_thread(self._append_spill, lines)
+        except OSError as e:
+            logger.error(f"[AUDIT] {self._name}: cannot write spill file {self._spill_path}: {e}")
+            written = False
+
+        if written:
+            self._spilled += len(events)
+            self._spill_backlog = (self._spill_backlog or 0) + len(events)
+        else:
+            self._dropped += len(events)
+            logger.error(f"[AUDIT] {self._name}: dropped {len(events)} events (spill file full or unwritable)")
+
+    def _read_spill(self) -> list[dict[str, Any]]:
+        events = []
+        with open(self._spill_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    self._dropped += 1  # Torn write from a crash
+        return events
+
+    def _rewrite_spill(self, events: list[dict[str, Any]]) -> None:
+        if not events:
+            self._spill_path.unlink(missing_ok=True)
+            return
+        tmp_path = self._spill_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(event, default=str) + "\n" for event in events)
+        os.replace(tmp_path, self._spill_path)
+
+    async def _replay_spill(self) -> bool:
+        """Resend spilled batches oldest first. Returns True once the file is empty."""
+        try:
+            events = await asyncio.to_thread(self._read_spill)
+        except FileNotFoundError:
+            self._spill_backlog = 0
+            return True
+
+        sent = 0
+        while sent < len(events):
+            if not await self._deliver(events[sent:sent + self._batch_size]):
+                break
+            sent += self._batch_size
+
+        remaining = events[sent:]
+        await asyncio.to_thread(self._rewrite_spill, remaining)
+        self._spill_backlog = len(remaining)
+        if sent:
+            logger.info(f"[AUDIT] {self._name}: replayed {min(sent, len(events))} spilled events")
+        return not remaining
+
+
 class AuditClient:
     """
     HTTP client for sending audit logs to security-service.
 
-    All writes are fire-and-forget async to avoid blocking the main request.
+    Events are buffered in an AuditSink and posted in batches to
+    /api/audit/log/batch over a pooled connection, so logging never waits
+    on the network.
     """
 
     def __init__(self, service_name: str | None = None):
         self._service_name = service_name or security_config.service_name
         self._base_url = security_config.security_service_url
         self._timeout = 5.0  # Short timeout for audit logs
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        self.sink = AuditSink(self._send_batch, name=self._service_name)
 
     def _get_headers(self) -> dict[str, str]:
         """Get headers for security-service authentication."""
@@ -182,7 +396,7 @@ class AuditClient:
         request: Any | None = None,
     ) -> None:
         """
-        Log an audit event to security-service (async, fire-and-forget).
+        Log an audit event to security-service (queued, never blocks).
 
         Args:
             action: The action being logged
@@ -202,6 +416,45 @@ class AuditClient:
             metadata: Additional context
             request: FastAPI Request object for auto-extracting IP/user-agent
         """
+        self._record(
+            action=action,
+            actor_type=actor_type,
+            actor_id=actor_id,
+            actor_email=actor_email,
+            actor_ip=actor_ip,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            result=result,
+            error_message=error_message,
+            request_id=request_id,
+            request_method=request_method,
+            request_path=request_path,
+            response_status=response_status,
+            duration_ms=duration_ms,
+            metadata=metadata,
+            request=request,
+        )
+
+    def _record(
+        self,
+        action: str | AuditAction,
+        actor_type: str = "user",
+        actor_id: str | None = None,
+        actor_email: str | None = None,
+        actor_ip: str | None = None,
+        resource_type: str | None = None,
+        resource_id: str | None = None,
+        result: str = "success",
+        error_message: str | None = None,
+        request_id: str | None = None,
+        request_method: str | None = None,
+        request_path: str | None = None,
+        response_status: int | None = None,
+        duration_ms: int | None = None,
+        metadata: dict[str, Any] | None = None,
+        request: Any | None = None,
+    ) -> None:
+        """Build the event payload, log it locally and queue it for delivery."""
         if not security_config.audit_enabled:
             return
 
@@ -240,28 +493,47 @@ class AuditClient:
             f"on {resource_type or '-'}/{resource_id or '-'} -> {result}"
         )
 
-        # Fire-and-forget to security-service
-        asyncio.create_task(self._send_to_service(payload))
-
-    async def _send_to_service(self, payload: dict[str, Any]) -> None:
-        """Send audit log to security-service (non-blocking)."""
-        if not self._base_url:
-            logger.debug("[AUDIT] SECURITY_SERVICE_URL not configured, skipping HTTP send")
-            return
+        # Queue for batched delivery to security-service
+        if self._base_url:
+            self.sink.emit(payload)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            if self._client is not None:
+                _close_on_loop(self._client, self._client_loop)
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                headers=self._get_headers(),
+                timeout=httpx.Timeout(self._timeout, connect=2.0),
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def _send_batch(self, events: list[dict[str, Any]]) -> int:
+        """
+        Post a batch to security-service.
 
-        try:
-            async with httpx.AsyncClient(timeout=self._timeout) as client:
-                response = await client.post(
-                    f"{self._base_url}/api/audit/log",
-                    json=payload,
-                    headers=self._get_headers(),
-                )
-                if response.status_code >= 400:
-                    logger.warning(f"[AUDIT] Failed to send to security-service: {response.status_code}")
-        except httpx.TimeoutException:
-            logger.debug("[AUDIT] Timeout sending to security-service (non-critical)")
-        except Exception as e:
-            logger.warning(f"[AUDIT] Error sending to security-service: {e}")
+        Returns the number of events written. Raises on connection errors and
+        on responses worth retrying, so the sink keeps the batch.
+        """
+        response = await self._get_client().post("/api/audit/log/batch", json={"events": events})
+        if response.status_code in (400, 422):
+            logger.error(f"[AUDIT] security-service rejected batch of {len(events)}: {response.text[:200]}")
+            return 0
+        if response.status_code >= 400:
+            raise RuntimeError(f"security-service returned {response.status_code}")
+        return response.json()["logged"]
+
+    async def close(self) -> None:
+        """Flush queued events and close pooled connections."""
+        await self.sink.close()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
 
     def log_sync(
         self,
@@ -271,27 +543,26 @@ class AuditClient:
         **kwargs,
     ) -> None:
         """
-        Synchronous version - logs locally only to avoid blocking.
-        For full audit trail, use async log() method.
+        Synchronous version of log() for non-async contexts.
+
+        Queuing is non-blocking, so sync callers get the full audit trail;
+        events are sent by the flusher on its next interval.
         """
-        if not security_config.audit_enabled:
-            return
+        self._record(action=action, actor_type=actor_type, actor_id=actor_id, **kwargs)
 
-        if isinstance(action, AuditAction):
-            action = action.value
 
-        resource_type = kwargs.get("resource_type")
-        resource_id = kwargs.get("resource_id")
-        result = kwargs.get("result", "success")
+# Global audit client instance
+_audit_client = AuditClient()
 
-        logger.info(
-            f"[AUDIT] {action} by {actor_type}:{actor_id or 'unknown'} "
-            f"on {resource_type or '-'}/{resource_id or '-'} -> {result}"
-        )
 
+async def close_audit_client() -> None:
+    """Flush queued audit events and close connections (call on shutdown)."""
+    await _audit_client.close()
 
-# Global audit client instance
-_audit_client = AuditClient()
+
+def get_audit_stats() -> dict[str, Any]:
+    """Delivery metrics for the shared audit client's sink."""
+    return _audit_client.sink.stats()
 
 
 async def audit_log(
@@ -378,8 +649,9 @@ def audit(
                     if hasattr(user, 'id'):
                         actor_id = user.id
                         actor_email = getattr(user, 'email', None)
-                    elif isinstance(user, dict):
-                        actor_id = user.get('id')
+                    elif isinstance(user, Mapping):
+                        # TrustedUserContext / request context (incl. LazyUserContext)
+                        actor_id = user.get('id') or user.get('user_id')
                         actor_email = user.get('email')
 
             # Extract resource ID
@@ -433,7 +705,7 @@ def audit(
             user = kwargs.get('user') or kwargs.get('current_user')
             actor_id = None
             if user:
-                actor_id = user.id if hasattr(user, 'id') else user.get('id')
+                actor_id = user.id if hasattr(user, 'id') else user.get('id') or user.get('user_id')
 
             resource_id = kwargs.get('resource_id') or kwargs.get('id')
             if resource_id is not None:
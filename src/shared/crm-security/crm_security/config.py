@@ -46,6 +46,10 @@ class SecurityConfig(BaseSettings):
         default=True,
         description="Whether to trust X-Trusted-User-* headers from gateway",
     )
+    context_token_max_age_seconds: int = Field(
+        default=300,
+        description="Reject X-Trusted-User-Context tokens issued longer ago than this",
+    )
 
     # =========================================================================
     # SECURITY SERVICE (HTTP client settings)
@@ -97,6 +101,40 @@ class SecurityConfig(BaseSettings):
         default=100,
         description="Default requests per minute per client",
     )
+    rate_limit_lease_max: int = Field(
+        default=20,
+        description="Max requests leased per key in one call to security-service",
+    )
+    rate_limit_lease_ttl: float = Field(
+        default=2.0,
+        description="Seconds a leased quota is spent locally before unused units are returned",
+    )
+
+    # =========================================================================
+    # AUDIT SINK (buffered delivery to security-service)
+    # =========================================================================
+
+    audit_buffer_size: int = Field(
+        default=10000,
+        description="Max audit events held in memory before the oldest are dropped",
+    )
+    audit_batch_size: int = Field(
+        default=200,
+        description="Audit events sent per batch (a full batch is flushed immediately)",
+    )
+    audit_flush_interval: float = Field(
+        default=1.0,
+        description="Max seconds an audit event waits in the buffer before being sent",
+    )
+    audit_spill_dir: str | None = Field(
+        default=None,
+        description="Directory for the append-only crm-audit-<sink>.jsonl files that hold "
+                    "audit batches while their destination is down (default: temp directory)",
+    )
+    audit_spill_max_bytes: int = Field(
+        default=50 * 1024 * 1024,
+        description="Max size of the audit spill file; batches beyond it are dropped",
+    )
 
     # =========================================================================
     # DEV AUTH (for API testing via /docs in development)
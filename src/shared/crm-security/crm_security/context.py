@@ -21,6 +21,7 @@ Usage:
 
 import json
 import logging
+from collections.abc import Mapping
 from contextvars import ContextVar
 from typing import Any
 
@@ -29,7 +30,7 @@ from .config import security_config
 logger = logging.getLogger(__name__)
 
 # Context variable for storing current user info
-_user_context: ContextVar[dict[str, Any] | None] = ContextVar("user_context", default=None)
+_user_context: ContextVar[Mapping[str, Any] | None] = ContextVar("user_context", default=None)
 
 
 def set_user_context(
@@ -98,14 +99,25 @@ def set_user_context(
     _user_context.set(context)
 
 
-def get_user_context() -> dict[str, Any] | None:
+def set_user_context_mapping(context: Mapping[str, Any]) -> None:
+    """
+    Set an already-built user context for this request.
+
+    Used for the lazily decoded context from X-Trusted-User-Context
+    (crm_security.trusted_headers.LazyUserContext). It must use the same
+    keys as set_user_context() ("user_id", "permissions", ...).
+    """
+    _user_context.set(context)
+
+
+def get_user_context() -> Mapping[str, Any] | None:
     """
     Get the current user context.
 
     Returns None if no user context is set (unauthenticated request).
 
     Returns:
-        Dict with user context or None
+        Dict (or read-only mapping) with user context, or None
     """
     return _user_context.get()
 
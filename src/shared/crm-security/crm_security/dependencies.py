@@ -31,7 +31,7 @@ from fastapi import Depends, HTTPException, Request, status
 
 from .trusted_headers import TrustedUserContext, parse_user_context, verify_proxy_secret
 from .models import AuthUser
-from .rbac import has_permission
+from .rbac import has_any_permission, has_permission
 from .config import security_config
 
 logger = logging.getLogger(__name__)
@@ -136,9 +136,8 @@ def require_any_permission(permissions: list[str]) -> Callable:
     ) -> TrustedUserContext:
         user_permissions: list[str] = user.get("permissions", [])
 
-        for required in permissions:
-            if has_permission(user_permissions, required):
-                return user
+        if has_any_permission(user_permissions, permissions):
+            return user
 
         logger.warning(
             f"[AUTH] User {user.get('id')} ({user.get('email')}) lacks any permission: {permissions}"
@@ -402,9 +401,8 @@ def require_any_permission_user(permissions: list[str]) -> Callable:
     async def _require_any_permission(
         user: AuthUser = Depends(require_auth_user),
     ) -> AuthUser:
-        for required in permissions:
-            if has_permission(user.permissions, required):
-                return user
+        if has_any_permission(user.permissions, permissions):
+            return user
 
         logger.warning(
             f"[AUTH] User {user.id} ({user.email}) lacks any permission: {permissions}"
@@ -171,7 +171,13 @@ class TrustedUserMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next) -> Response:
         import json
         from starlette.responses import JSONResponse
-        from .context import set_user_context, clear_user_context, set_dev_auth_context
+        from .context import (
+            clear_user_context,
+            set_dev_auth_context,
+            set_user_context,
+            set_user_context_mapping,
+        )
+        from .trusted_headers import parse_context_token
 
         path = request.url.path
 
@@ -221,53 +227,65 @@ class TrustedUserMiddleware(BaseHTTPMiddleware):
 
                 # Only set context if proxy secret is valid (or not configured)
                 if not expected_secret or provided_secret == expected_secret:
-                    # Parse all RBAC levels from headers
-                    def safe_json_parse(value: str | None, default):
-                        if not value:
-                            return default
-                        try:
-                            return json.loads(value)
-                        except json.JSONDecodeError:
-                            return default
-
-                    set_user_context(
-                        user_id=user_id,
-                        email=request.headers.get("x-trusted-user-email", ""),
-                        name=request.headers.get("x-trusted-user-name", ""),
-                        profile=request.headers.get("x-trusted-user-profile", ""),
-                        # Level 1+2: Permissions
-                        permissions=safe_json_parse(
-                            request.headers.get("x-trusted-user-permissions"), []
-                        ),
-                        permission_sets=safe_json_parse(
-                            request.headers.get("x-trusted-user-permission-sets"), []
-                        ),
-                        # Level 3: Teams & Hierarchy
-                        teams=safe_json_parse(
-                            request.headers.get("x-trusted-user-teams"), []
-                        ),
-                        team_ids=safe_json_parse(
-                            request.headers.get("x-trusted-user-team-ids"), []
-                        ),
-                        manager_id=request.headers.get("x-trusted-user-manager-id"),
-                        subordinate_ids=safe_json_parse(
-                            request.headers.get("x-trusted-user-subordinate-ids"), []
-                        ),
-                        # Level 4: Sharing
-                        sharing_rules=safe_json_parse(
-                            request.headers.get("x-trusted-user-sharing-rules"), []
-                        ),
-                        shared_records=safe_json_parse(
-                            request.headers.get("x-trusted-user-shared-records"), {}
-                        ),
-                        shared_from_user_ids=safe_json_parse(
-                            request.headers.get("x-trusted-user-shared-from-user-ids"), []
-                        ),
-                        # Level 5: Companies
-                        companies=safe_json_parse(
-                            request.headers.get("x-trusted-user-companies"), []
-                        ),
-                    )
+                    if request.headers.get("x-trusted-user-context"):
+                        # Signed token; RBAC fields decode on first access.
+                        # An invalid token leaves the request unauthenticated.
+                        lazy_context = parse_context_token(
+                            request.headers,
+                            expected_secret,
+                            security_config.context_token_max_age_seconds,
+                            id_key="user_id",
+                        )
+                        if lazy_context is not None:
+                            set_user_context_mapping(lazy_context)
+                    else:
+                        # Parse all RBAC levels from per-field JSON headers
+                        def safe_json_parse(value: str | None, default):
+                            if not value:
+                                return default
+                            try:
+                                return json.loads(value)
+                            except json.JSONDecodeError:
+                                return default
+
+                        set_user_context(
+                            user_id=user_id,
+                            email=request.headers.get("x-trusted-user-email", ""),
+                            name=request.headers.get("x-trusted-user-name", ""),
+                            profile=request.headers.get("x-trusted-user-profile", ""),
+                            # Level 1+2: Permissions
+                            permissions=safe_json_parse(
+                                request.headers.get("x-trusted-user-permissions"), []
+                            ),
+                            permission_sets=safe_json_parse(
+                                request.headers.get("x-trusted-user-permission-sets"), []
+                            ),
+                            # Level 3: Teams & Hierarchy
+                            teams=safe_json_parse(
+                                request.headers.get("x-trusted-user-teams"), []
+                            ),
+                            team_ids=safe_json_parse(
+                                request.headers.get("x-trusted-user-team-ids"), []
+                            ),
+                            manager_id=request.headers.get("x-trusted-user-manager-id"),
+                            subordinate_ids=safe_json_parse(
+                                request.headers.get("x-trusted-user-subordinate-ids"), []
+                            ),
+                            # Level 4: Sharing
+                            sharing_rules=safe_json_parse(
+                                request.headers.get("x-trusted-user-sharing-rules"), []
+                            ),
+                            shared_records=safe_json_parse(
+                                request.headers.get("x-trusted-user-shared-records"), {}
+                            ),
+                            shared_from_user_ids=safe_json_parse(
+                                request.headers.get("x-trusted-user-shared-from-user-ids"), []
+                            ),
+                            # Level 5: Companies
+                            companies=safe_json_parse(
+                                request.headers.get("x-trusted-user-companies"), []
+                            ),
+                        )
 
         try:
             response = await call_next(request)
@@ -1,9 +1,16 @@
 """
 Rate Limiting - SDK Client.
 
-Thin client that checks rate limits via the security-service.
+Thin client that enforces rate limits leased from the security-service.
 All rate limit state storage is handled by the service.
 
+Instead of a round trip per request, the client leases a block of quota
+per key (a fraction of the limit) and admits requests locally until the
+block is spent or its lease expires. Unused units are returned with the
+next lease for the key. Quota is consumed globally when it is leased, so
+instances can never admit more than the limit together; at worst a few
+leased units sit idle on an instance until the lease expires.
+
 Usage:
     from crm_security import rate_limit
 
@@ -17,10 +24,14 @@ Usage:
         return {"result": "..."}
 """
 
+import asyncio
+import concurrent.futures
 import hashlib
 import logging
+import time
+from collections import OrderedDict
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import httpx
 from fastapi import HTTPException, Request, status
@@ -29,6 +40,12 @@ from .config import security_config
 
 logger = logging.getLogger(__name__)
 
+# Keys with live leases kept per process (least recently used are dropped)
+_MAX_LEASES = 10000
+
+# How long to admit requests without the service after it fails
+_FAIL_OPEN_SECONDS = 5.0
+
 
 @dataclass
 class RateLimitInfo:
@@ -70,90 +87,223 @@ def _get_client_key(request: Request) -> str:
     return f"ip:{client_ip}"
 
 
-async def _check_rate_limit_via_service(
-    key: str,
-    limit: int,
-    window: int,
-) -> tuple[bool, RateLimitInfo]:
-    """Check rate limit by calling security-service."""
-    if not security_config.security_service_url:
-        # No service configured - allow all (local development)
-        logger.debug("[RATE_LIMIT] SECURITY_SERVICE_URL not configured, allowing request")
-        return True, RateLimitInfo(
-            limit=limit,
-            remaining=limit - 1,
-            reset_at=0,
-            retry_after=0,
-        )
+@dataclass
+class _Lease:
+    """Quota leased for one (key, limit, window)."""
+    tokens: int = 0              # Units left to admit locally
+    granted_at: float = 0.0      # time.monotonic() of the grant
+    expires_at: float = 0.0      # Unused units are returned after this
+    blocked_until: float = 0.0   # Service had no quota until this
+    remaining: int = 0           # Service-side remaining after the grant
+    reset_at: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class RateLimitClient:
+    """
+    Leases rate limit quota from security-service and spends it locally.
 
-    try:
+    Holds one pooled HTTP client, so keep-alive connections are reused
+    across requests. Refills for the same key are single-flight: concurrent
+    requests wait for one lease call instead of each making their own.
+    """
+
+    def __init__(
+        self,
+        lease_max: int | None = None,
+        lease_ttl: float | None = None,
+    ):
+        self._base_url = security_config.security_service_url
+        self._lease_max = lease_max or security_config.rate_limit_lease_max
+        self._lease_ttl = lease_ttl or security_config.rate_limit_lease_ttl
+        self._leases: OrderedDict[tuple[str, int, int], _Lease] = OrderedDict()
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        self._fail_open_until = 0.0
+
+    def _get_headers(self) -> dict[str, str]:
+        """Get headers for security-service authentication."""
         headers = {
             "Content-Type": "application/json",
             "X-Service-Name": security_config.service_name,
         }
         if security_config.service_api_secret:
             headers["X-Service-Secret"] = security_config.service_api_secret
+        return headers
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            if self._client is not None:
+                _close_on_loop(self._client, self._client_loop)
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                headers=self._get_headers(),
+                timeout=httpx.Timeout(5.0, connect=2.0),
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def close(self) -> None:
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+
+    def _lease_size(self, limit: int) -> int:
+        """Units to lease per call: a tenth of the limit, capped."""
+        return max(1, min(self._lease_max, limit // 10))
+
+    def _info(self, lease: _Lease, limit: int, retry_after: int = 0) -> RateLimitInfo:
+        return RateLimitInfo(
+            limit=limit,
+            remaining=lease.remaining + lease.tokens,
+            reset_at=lease.reset_at,
+            retry_after=retry_after,
+        )
+
+    async def acquire(self, key: str, limit: int, window: int) -> tuple[bool, RateLimitInfo]:
+        """
+        Admit one request for a key.
 
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.post(
-                f"{security_config.security_service_url}/api/rate-limit/check",
-                json={
+        Args:
+            key: Rate limit key
+            limit: Max requests per window
+            window: Window size in seconds
+
+        Returns:
+            (allowed, RateLimitInfo)
+        """
+        if not self._base_url:
+            # No service configured - allow all (local development)
+            logger.debug("[RATE_LIMIT] SECURITY_SERVICE_URL not configured, allowing request")
+            return True, RateLimitInfo(limit=limit, remaining=limit - 1, reset_at=0, retry_after=0)
+
+        ident = (key, limit, window)
+        lease = self._leases.get(ident)
+        if lease is None:
+            lease = self._leases[ident] = _Lease()
+            while len(self._leases) > _MAX_LEASES:
+                self._leases.popitem(last=False)
+        else:
+            self._leases.move_to_end(ident)
+
+        allowed = self._admit(lease, limit, time.monotonic())
+        if allowed is not None:
+            return allowed
+
+        async with lease.lock:
+            # Another request may have refilled the lease while we waited
+            now = time.monotonic()
+            allowed = self._admit(lease, limit, now)
+            if allowed is not None:
+                return allowed
+            return await self._refill(key, lease, limit, window, now)
+
+    def _fail_open(self, limit: int, now: float) -> tuple[bool, RateLimitInfo]:
+        """Admit the request, without retrying the service on every request."""
+        self._fail_open_until = now + _FAIL_OPEN_SECONDS
+        return True, RateLimitInfo(limit=limit, remaining=limit - 1, reset_at=0, retry_after=0)
+
+    def _admit(self, lease: _Lease, limit: int, now: float) -> tuple[bool, RateLimitInfo] | None:
+        """Decide locally, or return None if the service must be asked."""
+        if lease.tokens > 0 and now < lease.expires_at:
+            lease.tokens -= 1
+            return True, self._info(lease, limit)
+        if now < lease.blocked_until:
+            return False, self._info(lease, limit, retry_after=max(1, int(lease.blocked_until - now + 0.999)))
+        if now < self._fail_open_until:
+            return True, RateLimitInfo(limit=limit, remaining=limit - 1, reset_at=0, retry_after=0)
+        return None
+
+    async def _refill(
+        self,
+        key: str,
+        lease: _Lease,
+        limit: int,
+        window: int,
+        now: float,
+    ) -> tuple[bool, RateLimitInfo]:
+        """Lease a new block of quota (returning unused units) and admit from it."""
+        # Only units from a lease still inside its window are outstanding
+        unused = lease.tokens if now - lease.granted_at < window else 0
+        lease.tokens = 0
+
+        try:
+            response = await self._get_client().post(
+                "/api/rate-limit/lease",
+                json={"leases": [{
                     "key": key,
                     "limit": limit,
                     "window_seconds": window,
-                },
-                headers=headers,
+                    "tokens": self._lease_size(limit),
+                    "unused": unused,
+                }]},
             )
+            response.raise_for_status()
+            grant = response.json()["leases"][0]
 
-            if response.status_code == 200:
-                data = response.json()
-                info = RateLimitInfo(
-                    limit=data.get("limit", limit),
-                    remaining=data.get("remaining", 0),
-                    reset_at=data.get("reset_at", 0),
-                    retry_after=data.get("retry_after", 0),
-                )
-                return data.get("allowed", True), info
-
-            elif response.status_code == 429:
-                # Rate limited by service
-                data = response.json()
-                info = RateLimitInfo(
-                    limit=data.get("limit", limit),
-                    remaining=0,
-                    reset_at=data.get("reset_at", 0),
-                    retry_after=data.get("retry_after", 60),
-                )
-                return False, info
-
-            else:
-                logger.warning(f"[RATE_LIMIT] Service returned {response.status_code}")
-                # Fail open on service error
-                return True, RateLimitInfo(
-                    limit=limit,
-                    remaining=limit - 1,
-                    reset_at=0,
-                    retry_after=0,
-                )
+        except httpx.TimeoutException:
+            logger.warning("[RATE_LIMIT] Timeout calling security-service")
+            return self._fail_open(limit, now)
+        except (httpx.HTTPError, ValueError, LookupError, TypeError) as e:
+            # Transport errors, error statuses and malformed responses
+            logger.error(f"[RATE_LIMIT] Error leasing rate limit: {e}")
+            return self._fail_open(limit, now)
 
-    except httpx.TimeoutException:
-        logger.warning("[RATE_LIMIT] Timeout calling security-service")
-        # Fail open on timeout
-        return True, RateLimitInfo(
-            limit=limit,
-            remaining=limit - 1,
-            reset_at=0,
-            retry_after=0,
-        )
-    except Exception as e:
-        logger.error(f"[RATE_LIMIT] Error checking rate limit: {e}")
-        # Fail open on error
-        return True, RateLimitInfo(
-            limit=limit,
-            remaining=limit - 1,
-            reset_at=0,
-            retry_after=0,
-        )
+        lease.granted_at = now
+        lease.expires_at = now + min(self._lease_ttl, window)
+        lease.remaining = grant.get("remaining", 0)
+        lease.reset_at = grant.get("reset_at", 0)
+        lease.tokens = grant.get("granted", 0)
+
+        if lease.tokens > 0:
+            lease.tokens -= 1
+            return True, self._info(lease, limit)
+
+        retry_after = grant.get("retry_after") or 1
+        lease.blocked_until = now + retry_after
+        return False, self._info(lease, limit, retry_after=retry_after)
+
+
+# Closes of clients left behind by a loop change, kept until they finish
+_closing: set[asyncio.Future | concurrent.futures.Future] = set()
+
+
+def _close_on_loop(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop | None) -> None:
+    """
+    Close a client created on another event loop.
+
+    Its connections belong to that loop, so the close runs there while the
+    loop is running. Otherwise it is attempted on the current loop, best
+    effort: once the old loop has closed, its sockets are released when
+    they are garbage collected.
+    """
+    if loop is not None and loop.is_running():
+        future = asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    else:
+        future = asyncio.ensure_future(_aclose_quietly(client))
+    _closing.add(future)
+    future.add_done_callback(_closing.discard)
+
+
+async def _aclose_quietly(client: httpx.AsyncClient) -> None:
+    try:
+        await client.aclose()
+    except (RuntimeError, OSError, httpx.HTTPError) as e:
+        # e.g. "Event loop is closed" from transports of the old loop
+        logger.debug(f"[HTTP] Could not close client from a previous event loop: {e}")
+
+
+_rate_limit_client = RateLimitClient()
+
+
+async def close_rate_limit_client() -> None:
+    """Close the shared rate limit client's connections (call on shutdown)."""
+    await _rate_limit_client.close()
 
 
 class RateLimiter:
@@ -212,11 +362,7 @@ class RateLimiter:
 
             key = _key_func(request)
 
-            allowed, info = await _check_rate_limit_via_service(
-                key=key,
-                limit=_limit,
-                window=_window,
-            )
+            allowed, info = await _rate_limit_client.acquire(key, _limit, _window)
 
             # Store info for middleware to add headers
             request.state.rate_limit_info = info
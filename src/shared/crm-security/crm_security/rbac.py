@@ -11,7 +11,9 @@ Examples:
 Extracted from sales-module/api/auth.py for shared use.
 """
 
+import functools
 import logging
+from collections.abc import Iterable
 
 logger = logging.getLogger(__name__)
 
@@ -52,49 +54,136 @@ def matches_wildcard(pattern: str, permission: str) -> bool:
     return True
 
 
-def has_permission(permissions: list[str], required: str) -> bool:
+class CompiledPermissions:
+    """
+    A permission list compiled for fast checks.
+
+    Same semantics as matching each pattern with matches_wildcard(), but a
+    check is at most a dozen set lookups instead of a scan over every
+    pattern: "*:*:*" is a flag, and the other three-part patterns are
+    stored as (module, resource, action) tuples, so a required permission
+    only has to look up its own parts, "*" and "manage" in each position.
+
+    Results are also memoised per instance, since the same few permissions
+    are checked over and over.
+
+    Usage:
+        perms = compile_permissions(user["permissions"])
+        if perms.has("sales:proposals:create"):
+            ...
+    """
+
+    __slots__ = ("_all", "_exact", "_memo", "_patterns")
+
+    _MEMO_SIZE = 1024
+
+    def __init__(self, permissions: Iterable[str]):
+        self._exact = frozenset(permissions)
+        self._all = "*:*:*" in self._exact
+        self._patterns = frozenset(
+            tuple(parts) for parts in (p.split(":") for p in self._exact) if len(parts) == 3
+        )
+        self._memo: dict[str, bool] = {}
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def __contains__(self, required: str) -> bool:
+        return self.has(required)
+
+    def has(self, required: str) -> bool:
+        """Check if the permissions grant `required` (direct match or wildcard)."""
+        result = self._memo.get(required)
+        if result is None:
+            result = self._match(required)
+            if len(self._memo) < self._MEMO_SIZE:
+                self._memo[required] = result
+        return result
+
+    def has_any(self, required: Iterable[str]) -> bool:
+        """Check if the permissions grant at least one of `required`."""
+        return any(self.has(r) for r in required)
+
+    def has_all(self, required: Iterable[str]) -> bool:
+        """Check if the permissions grant every one of `required`."""
+        return all(self.has(r) for r in required)
+
+    def _match(self, required: str) -> bool:
+        if self._all or required in self._exact:
+            return True
+
+        parts = required.split(":")
+        if len(parts) != 3:
+            return False
+
+        module, resource, action = parts
+        patterns = self._patterns
+        for m in (module, "*"):
+            for r in (resource, "*"):
+                # "manage" action implies all other actions
+                for a in (action, "*", "manage"):
+                    if (m, r, a) in patterns:
+                        return True
+        return False
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_cached(permissions: tuple[str, ...]) -> CompiledPermissions:
+    return CompiledPermissions(permissions)
+
+
+def compile_permissions(permissions: Iterable[str] | CompiledPermissions) -> CompiledPermissions:
+    """
+    Get the compiled form of a permission list.
+
+    Memoised by content, so every request for the same user (same
+    permission list) shares one compiled instance and its check results.
+    """
+    if isinstance(permissions, CompiledPermissions):
+        return permissions
+    return _compile_cached(tuple(permissions))
+
+
+def has_permission(permissions: list[str] | CompiledPermissions, required: str) -> bool:
     """
     Check if user has a permission (direct match or wildcard).
 
     Args:
-        permissions: List of user's permissions
+        permissions: List of user's permissions (or their compiled form)
         required: The permission being checked
 
     Returns:
         True if user has the required permission
     """
-    if required in permissions:
-        return True
-
-    return any(matches_wildcard(perm, required) for perm in permissions)
+    return compile_permissions(permissions).has(required)
 
 
-def has_any_permission(permissions: list[str], required: list[str]) -> bool:
+def has_any_permission(permissions: list[str] | CompiledPermissions, required: list[str]) -> bool:
     """
     Check if user has any of the specified permissions.
 
     Args:
-        permissions: List of user's permissions
+        permissions: List of user's permissions (or their compiled form)
         required: List of permissions to check
 
     Returns:
         True if user has at least one of the required permissions
     """
-    return any(has_permission(permissions, r) for r in required)
+    return compile_permissions(permissions).has_any(required)
 
 
-def has_all_permissions(permissions: list[str], required: list[str]) -> bool:
+def has_all_permissions(permissions: list[str] | CompiledPermissions, required: list[str]) -> bool:
     """
     Check if user has all of the specified permissions.
 
     Args:
-        permissions: List of user's permissions
+        permissions: List of user's permissions (or their compiled form)
         required: List of permissions to check
 
     Returns:
         True if user has all required permissions
     """
-    return all(has_permission(permissions, r) for r in required)
+    return compile_permissions(permissions).has_all(required)
 
 
 # =============================================================================
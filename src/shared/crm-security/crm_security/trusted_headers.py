@@ -7,16 +7,42 @@ Backend services CONSUME these headers from the unified-ui gateway.
 Header Names:
     X-Proxy-Secret: Shared secret proving request origin
     X-Trusted-User-*: User identity and RBAC context
+    X-Trusted-User-Context: Signed, compressed RBAC context (levels 2-5)
+
+Context token:
+    Instead of one JSON header per RBAC field, the gateway can send the
+    whole context as one token:
+
+        v1.<issued_at>.<field>.<field>...<field>.<signature>
+
+    with one segment per CONTEXT_FIELDS entry, in order (empty for the
+    default value). A segment is URL-safe base64 of a kind byte and the
+    value: packed 16-byte UUIDs for lists of user ids, zlib-compressed
+    JSON for larger values, plain JSON otherwise. signature is
+    HMAC-SHA256 over "<user_id>:<everything before the signature>" keyed
+    with the proxy secret, which binds the token to X-Trusted-User-Id.
+    The signature and age are checked up front; each field is decoded
+    only when it is first read (see LazyUserContext).
 
 Usage:
     from shared.security.trusted_headers import TRUSTED_HEADERS, parse_user_context
 
-Version: 1.0.0
+Version: 1.1.0
 """
 
+import base64
+import binascii
+import hashlib
+import hmac
 import json
 import logging
-from typing import TypedDict
+import re
+import time
+import zlib
+from collections.abc import Iterator, Mapping
+from typing import Any, TypedDict
+
+from .config import security_config
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +108,9 @@ HEADER_USER_SHARED_FROM_USER_IDS = "X-Trusted-User-Shared-From-User-Ids"
 # Level 5: Companies
 HEADER_USER_COMPANIES = "X-Trusted-User-Companies"
 
+# Levels 2-5 as one signed token (replaces the JSON headers above)
+HEADER_USER_CONTEXT = "X-Trusted-User-Context"
+
 # All header names for reference
 TRUSTED_HEADERS = {
     "proxy_secret": HEADER_PROXY_SECRET,
@@ -99,6 +128,7 @@ TRUSTED_HEADERS = {
     "user_shared_records": HEADER_USER_SHARED_RECORDS,
     "user_shared_from_user_ids": HEADER_USER_SHARED_FROM_USER_IDS,
     "user_companies": HEADER_USER_COMPANIES,
+    "user_context": HEADER_USER_CONTEXT,
 }
 
 
@@ -116,10 +146,244 @@ def _safe_json_parse(value: str | None, default):
         return default
 
 
+# =============================================================================
+# CONTEXT TOKEN
+# =============================================================================
+
+CONTEXT_TOKEN_VERSION = "v1"
+
+# Fields carried in the token, in token order, with the value used when
+# one is absent. Adding or reordering fields needs a new token version.
+CONTEXT_FIELDS: dict[str, Any] = {
+    "permissions": [],
+    "permission_sets": [],
+    "teams": [],
+    "team_ids": [],
+    "manager_id": None,
+    "subordinate_ids": [],
+    "sharing_rules": [],
+    "shared_records": {},
+    "shared_from_user_ids": [],
+    "companies": [],
+}
+
+# Segment kinds (first byte of a decoded segment)
+_JSON = b"j"
+_ZLIB_JSON = b"z"
+_UUIDS = b"u"  # list of canonical UUID strings, 16 bytes each
+
+_COMPRESS_MIN_BYTES = 256
+# Lowercase canonical form only, so decoding gives back the same strings
+_UUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+_MISSING = object()
+
+
+class InvalidContextToken(ValueError):
+    """Context token is malformed, has a bad signature or is too old."""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(message: str, secret: str | None) -> str:
+    return _b64encode(hmac.new((secret or "").encode(), message.encode(), hashlib.sha256).digest())
+
+
+def _encode_field(value: Any) -> str:
+    if isinstance(value, list) and value and all(isinstance(v, str) and _UUID.fullmatch(v) for v in value):
+        return _b64encode(_UUIDS + bytes.fromhex("".join(value).replace("-", "")))
+
+    raw = json.dumps(value, separators=(",", ":"), default=str).encode()
+    if len(raw) >= _COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(raw)
+        if len(compressed) < len(raw):
+            return _b64encode(_ZLIB_JSON + compressed)
+    return _b64encode(_JSON + raw)
+
+
+def _decode_field(segment: str) -> Any:
+    try:
+        data = _b64decode(segment)
+        kind, body = data[:1], data[1:]
+        if kind == _UUIDS:
+            h = body.hex()
+            return [
+                f"{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-{h[i + 20:i + 32]}"
+                for i in range(0, len(h), 32)
+            ]
+        if kind == _ZLIB_JSON:
+            return json.loads(zlib.decompress(body))
+        if kind == _JSON:
+            return json.loads(body)
+    except (binascii.Error, zlib.error, ValueError) as e:
+        # Signed by the gateway, so this means a producer bug
+        raise InvalidContextToken("Corrupt context token field") from e
+    raise InvalidContextToken(f"Unknown context token field kind: {kind!r}")
+
+
+def encode_context_token(
+    user_id: str,
+    context: Mapping[str, Any],
+    secret: str | None,
+    issued_at: int | None = None,
+) -> str:
+    """
+    Encode a user's RBAC context as a signed token.
+
+    Args:
+        user_id: The user the context belongs to (bound into the signature)
+        context: Values for CONTEXT_FIELDS; missing fields get their defaults
+        secret: Proxy secret used as the HMAC key (unsigned-equivalent if None, local dev)
+        issued_at: Unix time; defaults to now
+
+    Returns:
+        Token for the X-Trusted-User-Context header
+    """
+    segments = []
+    for name, default in CONTEXT_FIELDS.items():
+        value = context.get(name, default)
+        segments.append("" if value == default else _encode_field(value))
+
+    issued_at = int(time.time() if issued_at is None else issued_at)
+    message = ".".join([CONTEXT_TOKEN_VERSION, str(issued_at), *segments])
+    return f"{message}.{_sign(f'{user_id}:{message}', secret)}"
+
+
+class ContextToken:
+    """
+    A verified context token.
+
+    Each field is decoded the first time it is read; fields that are
+    never read are never decoded.
+    """
+
+    def __init__(self, token: str, user_id: str, secret: str | None, max_age: int | None = None):
+        """
+        Verify a token's signature (for this user) and age.
+
+        Raises:
+            InvalidContextToken: If the token is malformed, forged or expired
+        """
+        parts = token.split(".")
+        if len(parts) != len(CONTEXT_FIELDS) + 3:
+            raise InvalidContextToken("Malformed context token")
+        if parts[0] != CONTEXT_TOKEN_VERSION:
+            raise InvalidContextToken(f"Unsupported context token version: {parts[0]}")
+
+        message, signature = token.rsplit(".", 1)
+        if not hmac.compare_digest(signature, _sign(f"{user_id}:{message}", secret)):
+            raise InvalidContextToken("Bad context token signature")
+        try:
+            self.issued_at = int(parts[1])
+        except ValueError as e:
+            raise InvalidContextToken("Malformed context token") from e
+        if max_age is not None and abs(time.time() - self.issued_at) > max_age:
+            raise InvalidContextToken("Context token expired")
+
+        self.user_id = user_id
+        self._segments = dict(zip(CONTEXT_FIELDS, parts[2:-1], strict=True))
+        self._values: dict[str, Any] = {}
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Decode one field (once) and return it."""
+        if name not in self._values:
+            segment = self._segments.get(name)
+            if not segment:
+                return default
+            self._values[name] = _decode_field(segment)
+        return self._values[name]
+
+
+class LazyUserContext(Mapping):
+    """
+    Read-only user context whose RBAC fields come from a ContextToken.
+
+    Identity values (user id, email, name, profile) are held directly;
+    CONTEXT_FIELDS are decoded from the token when first read. Behaves
+    like the dict built by parse_user_context() / set_user_context() for
+    reads (ctx["permissions"], ctx.get("companies", [])).
+    """
+
+    def __init__(self, identity: dict[str, Any], token: ContextToken):
+        self._identity = identity
+        self._token = token
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._identity:
+            return self._identity[key]
+        if key in CONTEXT_FIELDS:
+            value = self._token.get(key, _MISSING)
+            if value is _MISSING:
+                # A fresh copy, not the shared default
+                default = CONTEXT_FIELDS[key]
+                return default.copy() if default is not None else None
+            return value
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._identity
+        yield from (f for f in CONTEXT_FIELDS if f not in self._identity)
+
+    def __len__(self) -> int:
+        return len(self._identity) + sum(1 for f in CONTEXT_FIELDS if f not in self._identity)
+
+    def __repr__(self) -> str:
+        return f"LazyUserContext({self._identity!r})"
+
+
+def parse_context_token(
+    headers: Mapping[str, str],
+    secret: str | None,
+    max_age: int | None,
+    id_key: str = "id",
+) -> LazyUserContext | None:
+    """
+    Build a lazy user context from X-Trusted-User-Context and the identity headers.
+
+    Args:
+        headers: Request headers with lowercase keys
+        secret: Proxy secret the gateway signed with
+        max_age: Maximum token age in seconds
+        id_key: Key for the user id ("id" for TrustedUserContext,
+            "user_id" for the request context)
+
+    Returns:
+        LazyUserContext, or None if there is no token or it is invalid
+    """
+    token_value = headers.get(HEADER_USER_CONTEXT.lower())
+    user_id = headers.get(HEADER_USER_ID.lower())
+    if not token_value or not user_id:
+        return None
+
+    try:
+        token = ContextToken(token_value, user_id, secret, max_age)
+    except InvalidContextToken as e:
+        logger.warning(f"[SECURITY] Rejected context token: {e}")
+        return None
+
+    return LazyUserContext(
+        {
+            id_key: user_id,
+            "email": headers.get(HEADER_USER_EMAIL.lower(), ""),
+            "name": headers.get(HEADER_USER_NAME.lower(), ""),
+            "profile": headers.get(HEADER_USER_PROFILE.lower(), ""),
+        },
+        token,
+    )
+
+
 def parse_user_context(headers: dict[str, str]) -> TrustedUserContext | None:
     """
     Parse trusted user context from request headers.
 
+    Reads X-Trusted-User-Context when present (lazily decoded), otherwise
+    the per-field JSON headers.
+
     Args:
         headers: Request headers dictionary (case-insensitive keys)
 
@@ -133,6 +397,11 @@ def parse_user_context(headers: dict[str, str]) -> TrustedUserContext | None:
     if not user_id:
         return None
 
+    if HEADER_USER_CONTEXT.lower() in normalized:
+        return parse_context_token(
+            normalized, security_config.proxy_secret, security_config.context_token_max_age_seconds
+        )
+
     return TrustedUserContext(
         # Level 1
         id=user_id,
@@ -192,5 +461,4 @@ def verify_proxy_secret(headers: dict[str, str], expected_secret: str | None) ->
         return False
 
     # Constant-time comparison to prevent timing attacks
-    import hmac
     return hmac.compare_digest(header_secret, expected_secret)
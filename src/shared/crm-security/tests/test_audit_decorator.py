@@ -0,0 +1,70 @@
+"""
+Tests for the @audit decorator (crm_security.audit).
+
+These tests verify:
+- The actor is taken from a dict user or a signed-token LazyUserContext
+  (a Mapping keyed "id" or "user_id")
+- A call without a user is logged as anonymous
+"""
+
+import importlib
+
+import pytest
+
+from crm_security.audit import audit
+from crm_security.trusted_headers import LazyUserContext
+
+# The package re-exports the decorator as crm_security.audit
+audit_module = importlib.import_module("crm_security.audit")
+
+
+class FakeToken:
+    """ContextToken stand-in holding already-decoded fields."""
+
+    def get(self, name, default=None):
+        return default
+
+
+@pytest.fixture
+def logged(monkeypatch) -> list[dict]:
+    events: list[dict] = []
+
+    async def log(**event):
+        events.append(event)
+
+    monkeypatch.setattr(audit_module._audit_client, "log", log)
+    return events
+
+
+@audit(action="create", resource_type="proposal")
+async def create_proposal(user=None, resource_id=None):
+    return resource_id
+
+
+class TestActor:
+    """Actor extraction."""
+
+    @pytest.mark.parametrize(
+        "user",
+        [
+            {"id": "u1", "email": "u1@example.com"},
+            LazyUserContext({"id": "u1", "email": "u1@example.com"}, FakeToken()),
+            LazyUserContext({"user_id": "u1", "email": "u1@example.com"}, FakeToken()),
+        ],
+        ids=["dict", "lazy-id", "lazy-user-id"],
+    )
+    async def test_mapping_user(self, logged, user):
+        assert await create_proposal(user=user, resource_id=7) == 7
+
+        [event] = logged
+        assert event["actor_type"] == "user"
+        assert event["actor_id"] == "u1"
+        assert event["actor_email"] == "u1@example.com"
+        assert event["resource_id"] == "7"
+
+    async def test_no_user_is_anonymous(self, logged):
+        await create_proposal(resource_id=7)
+
+        [event] = logged
+        assert event["actor_type"] == "anonymous"
+        assert event["actor_id"] is None
@@ -0,0 +1,217 @@
+"""
+Tests for the signed RBAC context token (crm_security.trusted_headers).
+
+These tests verify:
+- A token round-trips every context field, with defaults for missing ones
+- Fields are decoded lazily: only when first read, and only once
+- UUID lists are packed and large values compressed, and both round-trip
+- Tampered, re-signed, expired and other-user tokens are rejected
+  (the user id is bound into the signature)
+- parse_user_context() prefers the token over the per-field JSON headers
+- TrustedUserMiddleware exposes the token through get_user_context()
+"""
+
+import json
+import time
+import uuid
+
+import pytest
+
+from crm_security import (
+    HEADER_USER_CONTEXT,
+    ContextToken,
+    InvalidContextToken,
+    LazyUserContext,
+    encode_context_token,
+    parse_context_token,
+    parse_user_context,
+    trusted_headers,
+)
+
+SECRET = "test-proxy-secret"
+
+CONTEXT = {
+    "permissions": ["sales:*:read", "assets:locations:read"],
+    "permission_sets": [{"id": 1, "name": "temp", "expiresAt": None}],
+    "teams": [{"id": 10, "name": "north", "role": "leader"}],
+    "team_ids": [10],
+    "manager_id": "user-0",
+    "subordinate_ids": [f"user-{n}" for n in range(200)],
+    "sharing_rules": [{"id": 1, "objectType": "proposal", "accessLevel": "read"}],
+    "shared_records": {"proposal": [{"recordId": "p-1", "accessLevel": "read"}]},
+    "shared_from_user_ids": ["user-9"],
+    "companies": ["backlite_dubai", "viola"],
+}
+
+
+def token_headers(token: str, user_id: str = "user-1") -> dict[str, str]:
+    return {
+        "x-trusted-user-id": user_id,
+        "x-trusted-user-email": "lead@example.com",
+        "x-trusted-user-name": "Lead",
+        "x-trusted-user-profile": "sales_manager",
+        HEADER_USER_CONTEXT.lower(): token,
+    }
+
+
+class TestRoundTrip:
+    """Encoding and decoding."""
+
+    def test_all_fields(self):
+        token = ContextToken(encode_context_token("user-1", CONTEXT, SECRET), "user-1", SECRET)
+        assert token.user_id == "user-1"
+        for name, value in CONTEXT.items():
+            assert token.get(name) == value
+
+    def test_missing_fields_get_defaults(self):
+        ctx = parse_context_token(
+            token_headers(encode_context_token("user-1", {"permissions": ["a:b:c"]}, SECRET)), SECRET, 300
+        )
+        assert ctx["permissions"] == ["a:b:c"]
+        assert ctx["manager_id"] is None
+        assert ctx["shared_records"] == {}
+        assert ctx.get("companies", ["x"]) == []
+
+    def test_mapping_interface(self):
+        ctx = parse_context_token(token_headers(encode_context_token("user-1", CONTEXT, SECRET)), SECRET, 300)
+        assert isinstance(ctx, LazyUserContext)
+        assert ctx["id"] == "user-1"
+        assert ctx["email"] == "lead@example.com"
+        assert set(ctx) == {"id", "email", "name", "profile", *CONTEXT}
+        assert len(ctx) == len(list(ctx))
+        assert ctx.get("unknown") is None
+        with pytest.raises(KeyError):
+            ctx["unknown"]
+
+    def test_smaller_than_json_headers(self):
+        token = encode_context_token("user-1", CONTEXT, SECRET)
+        assert len(token) < sum(len(json.dumps(v)) for v in CONTEXT.values())
+
+
+class TestLaziness:
+    """Decoding happens on access."""
+
+    def test_fields_decoded_on_first_read_only(self, monkeypatch):
+        ctx = parse_context_token(token_headers(encode_context_token("user-1", CONTEXT, SECRET)), SECRET, 300)
+        decoded = []
+        real = trusted_headers._decode_field
+        monkeypatch.setattr(trusted_headers, "_decode_field", lambda segment: decoded.append(1) or real(segment))
+
+        assert ctx["email"] == "lead@example.com"
+        assert ctx["profile"] == "sales_manager"
+        assert decoded == []
+
+        first = ctx["permissions"]
+        assert ctx["permissions"] is first
+        ctx["companies"]
+        assert len(decoded) == 2
+
+
+class TestEncoding:
+    """Segment kinds."""
+
+    def test_uuid_lists_are_packed(self):
+        ids = [str(uuid.uuid4()) for _ in range(100)]
+        token = encode_context_token("user-1", {"subordinate_ids": ids}, SECRET)
+        assert len(token) < len(json.dumps(ids)) * 0.6
+        assert ContextToken(token, "user-1", SECRET).get("subordinate_ids") == ids
+
+    def test_non_canonical_ids_keep_their_form(self):
+        ids = [str(uuid.uuid4()).upper(), "not-a-uuid"]
+        token = encode_context_token("user-1", {"shared_from_user_ids": ids}, SECRET)
+        assert ContextToken(token, "user-1", SECRET).get("shared_from_user_ids") == ids
+
+    def test_large_values_round_trip_compressed(self):
+        records = {"proposal": [{"recordId": f"p-{n}", "accessLevel": "read"} for n in range(100)]}
+        token = encode_context_token("user-1", {"shared_records": records}, SECRET)
+        assert len(token) < len(json.dumps(records))
+        assert ContextToken(token, "user-1", SECRET).get("shared_records") == records
+
+
+class TestVerification:
+    """Forged, stale and mismatched tokens."""
+
+    def test_wrong_secret(self):
+        token = encode_context_token("user-1", CONTEXT, "other-secret")
+        with pytest.raises(InvalidContextToken):
+            ContextToken(token, "user-1", SECRET)
+
+    def test_tampered_payload(self):
+        forged = encode_context_token("user-1", {**CONTEXT, "permissions": ["*:*:*"]}, "attacker")
+        message, _ = forged.rsplit(".", 1)
+        _, signature = encode_context_token("user-1", CONTEXT, SECRET).rsplit(".", 1)
+        with pytest.raises(InvalidContextToken):
+            ContextToken(f"{message}.{signature}", "user-1", SECRET)
+
+    def test_tampered_issued_at(self):
+        version, issued_at, rest = encode_context_token("user-1", CONTEXT, SECRET).split(".", 2)
+        with pytest.raises(InvalidContextToken):
+            ContextToken(f"{version}.{int(issued_at) + 1}.{rest}", "user-1", SECRET)
+
+    def test_expired(self):
+        token = encode_context_token("user-1", CONTEXT, SECRET, issued_at=int(time.time()) - 600)
+        with pytest.raises(InvalidContextToken):
+            ContextToken(token, "user-1", SECRET, max_age=300)
+        assert ContextToken(token, "user-1", SECRET).get("companies") == CONTEXT["companies"]
+
+    @pytest.mark.parametrize("token", ["", "v1", "v1.x.y.z", "v2.1.abc.def", "v1.1.2.3.4"])
+    def test_malformed(self, token):
+        with pytest.raises(InvalidContextToken):
+            ContextToken(token, "user-1", SECRET)
+
+    def test_wrong_version(self):
+        version, rest = encode_context_token("user-1", CONTEXT, SECRET).split(".", 1)
+        with pytest.raises(InvalidContextToken):
+            ContextToken(f"v9.{rest}", "user-1", SECRET)
+
+    def test_token_for_another_user_is_rejected(self):
+        token = encode_context_token("user-2", CONTEXT, SECRET)
+        assert parse_context_token(token_headers(token, user_id="user-1"), SECRET, 300) is None
+
+    def test_invalid_token_is_not_authenticated(self):
+        assert parse_context_token(token_headers("v1.1.abc.def"), SECRET, 300) is None
+
+
+class TestParseUserContext:
+    """Integration with the header parser and middleware."""
+
+    def test_token_preferred_over_json_headers(self, monkeypatch):
+        monkeypatch.setattr(trusted_headers.security_config, "proxy_secret", SECRET)
+        headers = token_headers(encode_context_token("user-1", CONTEXT, SECRET))
+        headers["X-Trusted-User-Permissions"] = '["*:*:*"]'
+        ctx = parse_user_context(headers)
+        assert ctx["permissions"] == CONTEXT["permissions"]
+
+    def test_json_headers_without_token(self):
+        ctx = parse_user_context({"X-Trusted-User-Id": "user-1", "X-Trusted-User-Companies": '["viola"]'})
+        assert ctx["companies"] == ["viola"]
+
+    def test_middleware_sets_lazy_context(self, monkeypatch):
+        # The middleware needs the optional fastapi extra
+        pytest.importorskip("fastapi")
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from crm_security import TrustedUserMiddleware, get_user_context
+        from crm_security.config import security_config
+
+        monkeypatch.setattr(security_config, "proxy_secret", SECRET)
+        monkeypatch.setattr(security_config, "dev_auth_enabled", False, raising=False)
+
+        app = FastAPI()
+        app.add_middleware(TrustedUserMiddleware)
+
+        @app.get("/whoami")
+        async def whoami():
+            ctx = get_user_context()
+            return {"user_id": ctx["user_id"], "companies": ctx["companies"]} if ctx else None
+
+        client = TestClient(app)
+        headers = {**token_headers(encode_context_token("user-1", CONTEXT, SECRET)), "x-proxy-secret": SECRET}
+        assert client.get("/whoami", headers=headers).json() == {
+            "user_id": "user-1",
+            "companies": CONTEXT["companies"],
+        }
+
+        headers[HEADER_USER_CONTEXT.lower()] = encode_context_token("user-1", CONTEXT, "wrong")
+        assert client.get("/whoami", headers=headers).json() is None
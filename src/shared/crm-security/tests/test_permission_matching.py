@@ -0,0 +1,112 @@
+"""
+Tests for compiled permission checks (crm_security.rbac).
+
+These tests verify:
+- CompiledPermissions gives the same answer as scanning every pattern
+  with matches_wildcard(), over randomly generated permission sets
+  (including malformed, empty-part and wildcard-only permissions)
+- The same answer for every combination drawn from a small universe
+- "*:*:*" and "manage" semantics
+- A malformed permission never affects checks against the others
+- compile_permissions() reuses one compiled instance per permission list
+"""
+
+import itertools
+import random
+
+import pytest
+
+from crm_security import (
+    CompiledPermissions,
+    compile_permissions,
+    has_all_permissions,
+    has_any_permission,
+    has_permission,
+    matches_wildcard,
+)
+
+# Parts chosen to collide often: real names, wildcards, "manage", empty
+# strings and strings that look like other parts
+PARTS = ["sales", "assets", "core", "proposals", "locations", "read", "create", "manage", "*", "", "**", "Sales"]
+
+
+def reference_has_permission(permissions: list[str], required: str) -> bool:
+    """has_permission() as it was: exact match, then a scan with matches_wildcard()."""
+    return required in permissions or any(matches_wildcard(p, required) for p in permissions)
+
+
+def random_permission(rng: random.Random) -> str:
+    n_parts = rng.choices([1, 2, 3, 4], weights=[1, 1, 12, 1])[0]
+    return ":".join(rng.choice(PARTS) for _ in range(n_parts))
+
+
+class TestEquivalence:
+    """Compiled checks match the linear scan exactly."""
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_permission_sets(self, seed):
+        rng = random.Random(seed)
+        for _ in range(50):
+            permissions = [random_permission(rng) for _ in range(rng.randint(0, 30))]
+            compiled = CompiledPermissions(permissions)
+            for _ in range(40):
+                # Mix fresh permissions with ones taken from the set itself
+                required = rng.choice(permissions) if permissions and rng.random() < 0.2 else random_permission(rng)
+                assert compiled.has(required) == reference_has_permission(permissions, required), (
+                    permissions,
+                    required,
+                )
+
+    def test_small_universe_exhaustive(self):
+        parts = ["a", "b", "*", "manage"]
+        universe = [":".join(p) for p in itertools.product(parts, repeat=3)] + ["a", "a:b", "*", ""]
+        for pattern in universe:
+            compiled = CompiledPermissions([pattern])
+            for required in universe:
+                assert compiled.has(required) == reference_has_permission([pattern], required), (pattern, required)
+
+    def test_memoised_answers_stay_correct(self):
+        compiled = CompiledPermissions(["sales:*:read"])
+        for _ in range(3):
+            assert compiled.has("sales:proposals:read")
+            assert not compiled.has("sales:proposals:create")
+
+
+class TestSemantics:
+    """Wildcard and manage behaviour."""
+
+    def test_full_admin_matches_anything(self):
+        compiled = CompiledPermissions(["*:*:*"])
+        assert compiled.has("sales:proposals:create")
+        assert compiled.has("not-a-permission")
+
+    def test_manage_implies_other_actions(self):
+        compiled = CompiledPermissions(["sales:proposals:manage"])
+        assert compiled.has("sales:proposals:delete")
+        assert not compiled.has("sales:bookings:delete")
+
+    def test_malformed_permission_is_isolated(self):
+        compiled = CompiledPermissions(["sales:(*:read", "assets:[:*", "sales:proposals:*"])
+        assert compiled.has("sales:proposals:create")
+        assert compiled.has("sales:(*:read")
+        assert not compiled.has("sales:(x:read")
+        assert not compiled.has("assets:locations:read")
+
+    def test_module_functions(self):
+        permissions = ["sales:*:*", "assets:locations:read"]
+        assert has_permission(permissions, "sales:proposals:create")
+        assert has_any_permission(permissions, ["core:users:read", "assets:locations:read"])
+        assert not has_all_permissions(permissions, ["assets:locations:read", "assets:locations:update"])
+        assert "sales:x:y" in compile_permissions(permissions)
+
+
+class TestCompileCache:
+    """compile_permissions() memoisation."""
+
+    def test_same_list_reuses_instance(self):
+        first = compile_permissions(["sales:*:*", "core:users:read"])
+        assert compile_permissions(["sales:*:*", "core:users:read"]) is first
+        assert compile_permissions(first) is first
+
+    def test_different_lists_get_different_instances(self):
+        assert compile_permissions(["sales:*:*"]) is not compile_permissions(["sales:*:read"])
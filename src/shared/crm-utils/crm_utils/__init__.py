@@ -0,0 +1,38 @@
+"""
+CRM Utilities SDK
+
+Service plumbing with no security, cache or LLM concerns, shared by
+several services:
+- SQLite connection pooling for local database backends
+- Background flushing for write-behind buffers
+
+Install:
+    pip install "crm-utils @ git+https://github.com/org/CRM.git#subdirectory=src/shared/crm-utils"
+
+Usage:
+    from crm_utils import SQLiteConnectionPool
+
+    pool = SQLiteConnectionPool("data.db", setup=configure_connection)
+    conn = pool.connect()
+    try:
+        conn.execute("SELECT 1")
+    finally:
+        conn.close()  # Hands the connection back to the pool
+"""
+
+# SQLite connection pool
+from .sqlite_pool import (
+    PooledConnection,
+    SQLiteConnectionPool,
+)
+
+# Write-behind buffers
+from .write_behind import BackgroundFlusher
+
+__all__ = [
+    # SQLite connection pool
+    "PooledConnection",
+    "SQLiteConnectionPool",
+    # Write-behind buffers
+    "BackgroundFlusher",
+]
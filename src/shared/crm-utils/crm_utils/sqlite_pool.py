@@ -0,0 +1,160 @@
+"""
+SQLite connection pool.
+
+Opening a sqlite3 connection re-runs the PRAGMAs and starts with an empty
+page cache and statement cache. The pool keeps one connection per thread
+open instead: sqlite3 connections are bound to the thread that created
+them, so each thread reuses its own, and the statement cache
+(cached_statements) survives between calls.
+
+At most max_size connections are kept. A thread that needs a connection
+beyond that, or a nested one while its own is in use, gets a temporary
+connection that is closed on release.
+
+Used by the SQLite database backends of sales-module and asset-management.
+"""
+
+import contextlib
+import logging
+import sqlite3
+import threading
+import weakref
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class _Slot:
+    """A thread's kept connection."""
+
+    __slots__ = ("__weakref__", "conn", "in_use")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.in_use = False
+
+
+class PooledConnection:
+    """
+    A pooled sqlite3 connection.
+
+    Behaves like the underlying connection; close() hands it back to the
+    pool (rolling back any open transaction) instead of closing it.
+    """
+
+    __slots__ = ("_conn", "_pool", "_slot")
+
+    def __init__(self, pool: "SQLiteConnectionPool", conn: sqlite3.Connection, slot: _Slot | None):
+        self._pool = pool
+        self._conn = conn
+        self._slot = slot
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._pool._release(self._conn, self._slot)
+            self._conn = None
+
+
+class SQLiteConnectionPool:
+    """Per-thread sqlite3 connection reuse with a bounded number of kept connections."""
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        setup: Callable[[sqlite3.Connection], None] | None = None,
+        max_size: int = 16,
+        cached_statements: int = 256,
+        timeout: float = 5.0,
+    ):
+        """
+        Args:
+            db_path: Database file
+            setup: Run once on each new connection (PRAGMAs, row_factory)
+            max_size: Connections kept open across all threads
+            cached_statements: sqlite3 prepared statement cache per connection
+            timeout: sqlite3 busy timeout in seconds
+        """
+        self._db_path = db_path
+        self._setup = setup
+        self._max_size = max_size
+        self._cached_statements = cached_statements
+        self._timeout = timeout
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._slots: weakref.WeakSet[_Slot] = weakref.WeakSet()  # Dropped when the owning thread exits
+        self._opened = 0
+        self._reused = 0
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._db_path,
+            timeout=self._timeout,
+            isolation_level=None,
+            cached_statements=self._cached_statements,
+        )
+        if self._setup:
+            self._setup(conn)
+        with self._lock:
+            self._opened += 1
+        return conn
+
+    def connect(self) -> PooledConnection:
+        """Get this thread's connection (or a temporary one); close() releases it."""
+        slot: _Slot | None = getattr(self._local, "slot", None)
+        if slot is not None and not slot.in_use:
+            slot.in_use = True
+            with self._lock:
+                self._reused += 1
+            return PooledConnection(self, slot.conn, slot)
+
+        conn = self._open()
+        if slot is None:
+            with self._lock:
+                keep = len(self._slots) < self._max_size
+                if keep:
+                    slot = _Slot(conn)
+                    slot.in_use = True
+                    self._slots.add(slot)
+            if keep:
+                self._local.slot = slot
+                return PooledConnection(self, conn, slot)
+        return PooledConnection(self, conn, None)
+
+    def _release(self, conn: sqlite3.Connection, slot: _Slot | None) -> None:
+        if slot is None:
+            conn.close()
+            return
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error as e:
+            # Connection is unusable; drop it so the thread opens a new one
+            logger.warning(f"[DB POOL] Discarding connection after failed rollback: {e}")
+            self._discard(slot)
+            return
+        slot.in_use = False
+
+    def _discard(self, slot: _Slot) -> None:
+        with self._lock:
+            self._slots.discard(slot)
+        if getattr(self._local, "slot", None) is slot:
+            del self._local.slot
+        with contextlib.suppress(sqlite3.Error):
+            slot.conn.close()
+
+    def close(self) -> None:
+        """Close this thread's kept connection. Other threads' close when those threads exit."""
+        slot = getattr(self._local, "slot", None)
+        if slot is not None and not slot.in_use:
+            self._discard(slot)
+
+    def stats(self) -> dict[str, int]:
+        """Kept connections, connections opened and reuses so far."""
+        with self._lock:
+            return {"size": len(self._slots), "opened": self._opened, "reused": self._reused}
@@ -0,0 +1,119 @@
+"""
+Background flushing for write-behind buffers.
+
+Callers queue items without waiting and a task on the event loop writes
+them out in batches: when woken because a batch is ready, or every
+flush_interval seconds. BackgroundFlusher holds that machinery (the task,
+its wakeup, a per-loop flush lock and the drain on close) so a buffer only
+implements flush().
+
+Used by crm_security's AuditSink, and by services for their own
+write-behind queues (e.g. sales-module's AI cost tracker).
+"""
+
+import asyncio
+import contextlib
+import logging
+from abc import ABC, abstractmethod
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundFlusher(ABC):
+    """
+    Base for a buffer flushed by a background task.
+
+    Subclasses implement flush(), holding flush_lock() while they write,
+    and call notify() after queueing. The task starts on the first
+    notify() (or start()) from a running loop, and is recreated if that
+    loop changes. Errors from a flush are logged and the task carries on.
+
+    Args:
+        flush_interval: Seconds between flushes when not woken earlier
+        name: Used in logs
+    """
+
+    def __init__(self, flush_interval: float, name: str):
+        self._flush_interval = flush_interval
+        self._name = name
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._flusher: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+        self._stopping = False
+
+    @abstractmethod
+    async def flush(self) -> None:
+        """Write out what is queued."""
+
+    async def on_start(self) -> None:
+        """Run by the task before its first flush."""
+
+    async def on_interval(self) -> None:
+        """Run by the task when woken or on the interval."""
+        await self.flush()
+
+    def start(self) -> None:
+        """Start the task on the running loop."""
+        self._ensure_flusher(asyncio.get_running_loop())
+
+    def notify(self, batch_ready: bool = False) -> None:
+        """
+        Start the task if needed, and wake it now if batch_ready.
+
+        A no-op without a running loop in this thread: the task picks the
+        items up on its interval.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        self._ensure_flusher(loop)
+        if batch_ready:
+            self._wakeup.set()
+
+    def flush_lock(self) -> asyncio.Lock:
+        """Lock serialising flushes on the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._flush_lock is None or self._lock_loop is not loop:
+            self._flush_lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._flush_lock
+
+    async def close(self) -> None:
+        """Stop the task, then flush whatever is still queued."""
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None and not flusher.done():
+            if self._loop is asyncio.get_running_loop():
+                self._stopping = True
+                self._wakeup.set()
+                await flusher
+            else:
+                flusher.cancel()
+        await self.flush()
+
+    def _ensure_flusher(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._loop is loop and self._flusher is not None and not self._flusher.done():
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._flusher = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        try:
+            await self.on_start()
+        except Exception as e:
+            logger.exception(f"[FLUSH] {self._name}: start failed: {e}")
+
+        while not self._stopping:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self._flush_interval)
+            self._wakeup.clear()
+            try:
+                await self.on_interval()
+            except Exception as e:
+                logger.exception(f"[FLUSH] {self._name}: flush failed: {e}")
@@ -0,0 +1,161 @@
+"""
+Tests for pooled SQLite connections (crm_utils.SQLiteConnectionPool).
+
+These tests verify:
+- A thread reuses its connection; nested use gets a temporary one
+- The number of kept connections is bounded across threads
+- An open transaction is rolled back when a connection is released
+- Worker threads keep their own connection across calls
+- Connections never cross threads: each thread gets its own, and a
+  thread's connection goes away when the thread exits
+- close() closes the calling thread's idle connection, never one in use
+"""
+
+import gc
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from crm_utils import SQLiteConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path) -> SQLiteConnectionPool:
+    setups = []
+    pool = SQLiteConnectionPool(tmp_path / "pool.db", setup=setups.append, max_size=2)
+    pool.setups = setups
+    conn = pool.connect()
+    conn.execute("CREATE TABLE items (n INTEGER)")
+    conn.close()
+    return pool
+
+
+class TestConnectionPool:
+    """Per-thread reuse, bounds and release."""
+
+    def test_thread_reuses_connection(self, pool):
+        for _ in range(5):
+            conn = pool.connect()
+            conn.execute("INSERT INTO items VALUES (1)")
+            conn.close()
+
+        assert pool.stats() == {"size": 1, "opened": 1, "reused": 5}
+        assert len(pool.setups) == 1
+
+    def test_nested_use_gets_temporary_connection(self, pool):
+        outer = pool.connect()
+        inner = pool.connect()
+        outer_raw, inner_raw = outer._conn, inner._conn
+        assert inner_raw is not outer_raw
+        inner.close()
+        outer.close()
+
+        assert pool.stats()["size"] == 1
+        outer_raw.execute("SELECT 1")  # Kept for reuse
+        with pytest.raises(sqlite3.ProgrammingError):
+            inner_raw.execute("SELECT 1")  # Temporary, closed on release
+
+    def test_size_is_bounded_across_threads(self, pool):
+        barrier = threading.Barrier(4)
+
+        def use():
+            conn = pool.connect()
+            barrier.wait()
+            conn.execute("SELECT COUNT(*) FROM items").fetchone()
+            conn.close()
+
+        threads = [threading.Thread(target=use) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # Main thread's slot plus one more; the other threads used temporary connections
+        assert pool.stats()["size"] <= 2
+
+    def test_release_rolls_back_open_transaction(self, pool):
+        conn = pool.connect()
+        conn.execute("BEGIN")
+        conn.execute("INSERT INTO items VALUES (42)")
+        conn.close()
+
+        conn = pool.connect()
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM items WHERE n = 42").fetchone()[0] == 0
+        conn.close()
+
+    def test_worker_thread_keeps_its_connection(self, pool):
+        def count() -> int:
+            conn = pool.connect()
+            try:
+                return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+            finally:
+                conn.close()
+
+        with ThreadPoolExecutor(max_workers=1) as single:
+            for _ in range(3):
+                single.submit(count).result()
+        assert pool.stats()["opened"] == 2  # Main thread + the one worker
+
+
+    def test_threads_get_their_own_connection(self, pool):
+        seen = {}
+
+        def use(name: str) -> None:
+            conn = pool.connect()
+            seen[name] = conn._conn
+            conn.execute("SELECT 1")  # Raises if the connection belongs to another thread
+            conn.close()
+
+        main = pool.connect()
+        main_raw = main._conn
+        main.close()
+        for name in ("a", "b"):
+            thread = threading.Thread(target=use, args=(name,))
+            thread.start()
+            thread.join()
+
+        assert seen["a"] is not main_raw
+        assert seen["b"] is not main_raw
+        with pytest.raises(sqlite3.ProgrammingError):
+            seen["a"].execute("SELECT 1")  # Closed with its thread, or bound to it
+
+    def test_exited_thread_releases_its_slot(self, pool):
+        def use() -> None:
+            pool.connect().close()
+
+        thread = threading.Thread(target=use)
+        thread.start()
+        thread.join()
+        del thread
+        gc.collect()
+
+        # Only the main thread's connection from the fixture is still kept
+        assert pool.stats()["size"] == 1
+
+    def test_close_closes_idle_connection(self, pool):
+        conn = pool.connect()
+        raw = conn._conn
+        conn.close()
+
+        pool.close()
+
+        assert pool.stats()["size"] == 0
+        with pytest.raises(sqlite3.ProgrammingError):
+            raw.execute("SELECT 1")
+        # The next connect() opens and keeps a fresh one
+        conn = pool.connect()
+        assert conn._conn is not raw
+        conn.close()
+        assert pool.stats()["size"] == 1
+
+    def test_close_leaves_connection_in_use(self, pool):
+        conn = pool.connect()
+        pool.close()
+
+        conn.execute("INSERT INTO items VALUES (1)")
+        conn.close()
+        assert pool.stats()["size"] == 1
+
@@ -68,6 +68,9 @@ class Settings(BaseSettings):
     # Shared secret for trusted proxy communication
     # ==========================================================================
     PROXY_SECRET: str | None = None
+    # Also send the per-field X-Trusted-User-* JSON headers next to the signed
+    # X-Trusted-User-Context token (for backends on an older crm_security)
+    PROXY_LEGACY_CONTEXT_HEADERS: bool = False
 
     # ==========================================================================
     # RATE LIMITING - server.js:64-102
@@ -87,6 +90,30 @@ class Settings(BaseSettings):
     # ==========================================================================
     RBAC_CACHE_TTL_SECONDS: int = 30  # 30 second TTL - reduced for faster permission propagation
 
+    # ==========================================================================
+    # COMPANY HIERARCHY (backend/services/company_hierarchy.py)
+    # Tree from asset-management, cached to expand company access in-process
+    # ==========================================================================
+    COMPANY_HIERARCHY_TTL_SECONDS: int = 300  # Revalidate (If-None-Match) after this long
+    COMPANY_HIERARCHY_RETRY_SECONDS: int = 10  # Wait this long before retrying a failed first load
+
+    # ==========================================================================
+    # ACCESS TOKEN VERIFICATION (backend/services/token_verifier.py)
+    # Supabase access tokens are verified locally instead of via auth.get_user()
+    # ==========================================================================
+    # Legacy HS256 JWT secret (Supabase: Project Settings > API > JWT secret).
+    # Asymmetric (ES256/RS256) tokens use the project's JWKS and need no secret.
+    UI_PROD_SUPABASE_JWT_SECRET: str | None = None
+    UI_DEV_SUPABASE_JWT_SECRET: str | None = None
+    SUPABASE_JWT_SECRET: str | None = None
+
+    AUTH_LOCAL_JWT_VERIFY: bool = True  # False: always call Supabase auth.get_user()
+    AUTH_REMOTE_FALLBACK: bool = False  # Call auth.get_user() for tokens naming an unknown signing key
+    AUTH_JWKS_TTL_SECONDS: int = 600  # How long fetched signing keys are trusted
+    AUTH_TOKEN_CACHE_SIZE: int = 10000  # Verified tokens remembered (LRU, by SHA-256 digest)
+    AUTH_REVOCATION_CHECK_SECONDS: int = 5  # How stale a user's revocation status may be
+    AUTH_REVOCATION_TTL_SECONDS: int = 3600  # Keep revocations this long (>= access token lifetime)
+
     class Config:
         env_file = ".env"
         extra = "ignore"
@@ -153,6 +180,13 @@ class Settings(BaseSettings):
             return self.UI_PROD_SUPABASE_ANON_KEY or self.SUPABASE_ANON_KEY
         return self.UI_DEV_SUPABASE_ANON_KEY or self.SUPABASE_ANON_KEY
 
+    @property
+    def supabase_jwt_secret(self) -> str | None:
+        """Get the HS256 JWT secret for the environment's Supabase project (if set)."""
+        if self.is_production:
+            return self.UI_PROD_SUPABASE_JWT_SECRET or self.SUPABASE_JWT_SECRET
+        return self.UI_DEV_SUPABASE_JWT_SECRET or self.SUPABASE_JWT_SECRET
+
     @property
     def allowed_origins(self) -> list[str]:
         """
@@ -201,6 +235,13 @@ class Settings(BaseSettings):
                 "(or UI_PROD_* for production)"
             )
 
+        if self.AUTH_LOCAL_JWT_VERIFY and not self.supabase_jwt_secret:
+            logger.warning(
+                "[UI] No Supabase JWT secret set: HS256 access tokens are verified with "
+                "Supabase auth.get_user(). Set UI_DEV_SUPABASE_JWT_SECRET (or UI_PROD_*) "
+                "to verify them locally, unless the project uses asymmetric signing keys."
+            )
+
         if not self.PROXY_SECRET:
             logger.warning(
                 "[UI] WARNING: PROXY_SECRET not set. "
@@ -7,11 +7,14 @@ unified-ui PRODUCES these headers when proxying to downstream services.
 Header Names:
     X-Proxy-Secret: Shared secret proving request origin
     X-Trusted-User-*: User identity and RBAC context
+    X-Trusted-User-Context: Signed, compressed RBAC context (levels 2-5),
+        sent instead of the per-field JSON headers. Encoded with
+        crm_security.encode_context_token(), which defines the format.
 
 Usage:
     from backend.contracts.trusted_headers import TRUSTED_HEADERS, build_headers
 
-Version: 1.0.0
+Version: 1.1.0
 """
 
 from typing import TypedDict
@@ -78,6 +81,9 @@ HEADER_USER_SHARED_FROM_USER_IDS = "X-Trusted-User-Shared-From-User-Ids"
 # Level 5: Companies
 HEADER_USER_COMPANIES = "X-Trusted-User-Companies"
 
+# Levels 2-5 as one signed token (replaces the JSON headers above)
+HEADER_USER_CONTEXT = "X-Trusted-User-Context"
+
 # All header names for reference
 TRUSTED_HEADERS = {
     "proxy_secret": HEADER_PROXY_SECRET,
@@ -95,4 +101,5 @@ TRUSTED_HEADERS = {
     "user_shared_records": HEADER_USER_SHARED_RECORDS,
     "user_shared_from_user_ids": HEADER_USER_SHARED_FROM_USER_IDS,
     "user_companies": HEADER_USER_COMPANIES,
+    "user_context": HEADER_USER_CONTEXT,
 }
@@ -114,6 +114,12 @@ async def lifespan(app: FastAPI):
     await close_proxy_client()
     logger.info("[UI] Closed proxy HTTP client")
 
+    from backend.services.company_hierarchy import close_company_hierarchy
+    await close_company_hierarchy()
+
+    from crm_security import close_rate_limit_client
+    await close_rate_limit_client()
+
     await close_cache()
     logger.info("[UI] Shutting down...")
 
@@ -33,18 +33,21 @@ the local_auth service for fully offline development. This allows:
 """
 
 import asyncio
+import functools
 import logging
 import os
+import re
 from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
 
-import httpx
 from fastapi import Depends, HTTPException, Request
 
 from backend.config import get_settings
+from backend.services.company_hierarchy import get_company_hierarchy
 from backend.services.rbac_service import get_user_rbac_data
 from backend.services.supabase_client import get_supabase
+from backend.services.token_verifier import KeyUnknownError, NoKeySourceError, get_token_verifier
 from backend.services.local_auth import (
     is_local_auth_enabled,
     local_get_user,
@@ -97,6 +100,36 @@ async def _get_user_with_timeout(supabase, token: str, timeout: float = None):
         raise
 
 
+async def _verify_token(supabase, token: str):
+    """
+    Validate an access token and return its user (or None if invalid).
+
+    Verifies locally (see services/token_verifier.py) unless
+    AUTH_LOCAL_JWT_VERIFY is off. Supabase is only called when local
+    verification is off, when there is no local key source for the token
+    (e.g. HS256 with no JWT secret configured), or when the token names an
+    unknown key and AUTH_REMOTE_FALLBACK is on.
+
+    Raises:
+        asyncio.TimeoutError: If the remote call times out
+    """
+    settings = get_settings()
+    verifier = get_token_verifier() if settings.AUTH_LOCAL_JWT_VERIFY else None
+
+    if verifier is not None:
+        try:
+            return await verifier.verify(token)
+        except NoKeySourceError as e:
+            logger.debug(f"[UI Auth] {e} - verifying with Supabase")
+        except KeyUnknownError as e:
+            if not settings.AUTH_REMOTE_FALLBACK:
+                logger.warning(f"[UI Auth] {e} - rejecting token (AUTH_REMOTE_FALLBACK is off)")
+                return None
+            logger.debug(f"[UI Auth] {e} - falling back to Supabase")
+
+    return await _get_user_with_timeout(supabase, token)
+
+
 # =============================================================================
 # USER MODELS
 # =============================================================================
@@ -301,8 +334,9 @@ async def _expand_companies_for_hierarchy(companies: list[str]) -> list[str]:
     - backlite -> all backlite verticals (backlite_dubai, backlite_uk, backlite_abudhabi)
     - backlite_dubai -> just backlite_dubai (leaf company)
 
-    Calls asset-management /api/companies/expand endpoint.
-    Falls back to original companies if the API call fails.
+    Expands in-process against the company tree cached from asset-management
+    (see services/company_hierarchy.py).
+    Falls back to original companies if the tree has never loaded.
     """
     if not companies:
         return []
@@ -312,32 +346,16 @@ async def _expand_companies_for_hierarchy(companies: list[str]) -> list[str]:
         logger.warning("[AUTH] Asset Management URL not configured, cannot expand companies")
         return companies
 
-    try:
-        # Build query string with all company codes
-        params = "&".join(f"company_codes={c}" for c in companies)
-        url = f"{settings.ASSET_MANAGEMENT_URL}/api/companies/expand?{params}"
-
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.post(url)
-            response.raise_for_status()
-            data = response.json()
-            expanded = data.get("expanded", companies)
-
-            if expanded != companies:
-                logger.info(f"[AUTH] Expanded companies: {companies} -> {expanded}")
-
-            return expanded
-
-    except httpx.TimeoutException:
-        logger.warning("[AUTH] Timeout expanding companies, using original list")
-        return companies
-    except httpx.ConnectError as e:
-        logger.warning(f"[AUTH] Connection error expanding companies: {e}")
-        return companies
-    except Exception as e:
-        logger.warning(f"[AUTH] Error expanding companies: {e}, using original list")
+    hierarchy = await get_company_hierarchy()
+    if hierarchy is None:
+        logger.warning("[AUTH] Company hierarchy unavailable, using original list")
         return companies
 
+    expanded = hierarchy.expand(companies)
+    if expanded != companies:
+        logger.debug(f"[AUTH] Expanded companies: {companies} -> {expanded}")
+    return expanded
+
 
 def _build_trusted_user_from_impersonation(impersonate_data: dict) -> TrustedUser:
     """
@@ -426,7 +444,7 @@ async def get_current_user(request: Request) -> AuthUser | None:
         return None
 
     try:
-        user = await _get_user_with_timeout(supabase, token)
+        user = await _verify_token(supabase, token)
 
         if not user:
             return None
@@ -497,7 +515,7 @@ async def require_auth(request: Request) -> AuthUser:
 
     try:
         # server.js:754-759
-        user = await _get_user_with_timeout(supabase, token)
+        user = await _verify_token(supabase, token)
 
         if not user:
             raise HTTPException(
@@ -607,6 +625,32 @@ def require_profile(*allowed_profiles: str) -> Callable:
 # REQUIRE PERMISSION MIDDLEWARE
 # =============================================================================
 
+@functools.lru_cache(maxsize=1024)
+def _compile_perms(user_perms: tuple[str, ...]) -> tuple[frozenset[str], re.Pattern[str] | None]:
+    """
+    Compile a permission list once: exact permissions as a set, and every
+    wildcard permission ("*" matches any run of characters) as one regex.
+
+    Each permission is escaped, so the only pattern syntax is "*" and a
+    permission containing regex characters only matches itself literally.
+    Gateway semantics differ from crm_security's matcher on purpose: there
+    is no "manage" implication and a wildcard may span ":" separators.
+
+    Memoised by content, so repeated checks for the same user reuse it.
+    """
+    wildcards = [re.escape(perm).replace(r"\*", ".*") for perm in user_perms if "*" in perm]
+    pattern = re.compile("|".join(wildcards)) if wildcards else None
+    return frozenset(user_perms), pattern
+
+
+def _check_perm_match(user_perms: list[str], required: str) -> bool:
+    """Check permission with wildcard support."""
+    exact, wildcard = _compile_perms(tuple(user_perms))
+    if required in exact or "*:*:*" in exact:
+        return True
+    return wildcard is not None and wildcard.fullmatch(required) is not None
+
+
 def require_permission(*required_permissions: str, require_all: bool = False) -> Callable:
     """
     Create a dependency that checks if user has required permission(s).
@@ -627,20 +671,8 @@ def require_permission(*required_permissions: str, require_all: bool = False) ->
         async def create_user(user: AuthUser = Depends(require_permission("admin:users:create", "admin:users:manage"))):
             ...
     """
-    import re
     from backend.services.rbac_service import get_user_rbac_data
 
-    def _check_perm_match(user_perms: list[str], required: str) -> bool:
-        """Check permission with wildcard support."""
-        if required in user_perms or "*:*:*" in user_perms:
-            return True
-        for perm in user_perms:
-            if "*" in perm:
-                pattern = perm.replace("*", ".*")
-                if re.match(f"^{pattern}$", required):
-                    return True
-        return False
-
     async def check_permission(user: AuthUser = Depends(require_auth)) -> AuthUser:
         if not user:
             raise HTTPException(status_code=401, detail="Not authenticated")
@@ -826,7 +858,7 @@ async def get_trusted_user(request: Request) -> TrustedUser:
 
     try:
         # server.js:561-567
-        user = await _get_user_with_timeout(supabase, token)
+        user = await _verify_token(supabase, token)
 
         if not user:
             logger.warning("[PROXY AUTH] Invalid token: no user")
@@ -386,7 +386,7 @@ async def deactivate_user(
         }).eq("id", user_id).execute()
 
         # server.js:1786-1788 - Force logout the user
-        invalidate_rbac_cache(user_id)
+        invalidate_rbac_cache(user_id, sections=["profile"])
         with contextlib.suppress(Exception):
             supabase.auth.admin.sign_out(user_id)
 
@@ -473,7 +473,7 @@ async def update_user(
                 }).execute()
 
         # server.js:1864-1865 - Invalidate RBAC cache
-        invalidate_rbac_cache(user_id)
+        invalidate_rbac_cache(user_id, sections=["profile", "teams"])
 
         # server.js:1867-1878 - Audit log
         with contextlib.suppress(Exception):
@@ -35,6 +35,7 @@ from pydantic import BaseModel, EmailStr, Field
 from backend.middleware.auth import AuthUser, require_auth, require_profile
 from backend.services.rbac_service import invalidate_rbac_cache
 from backend.services.supabase_client import get_supabase
+from backend.services.token_verifier import revoke_user_tokens
 from crm_security import rate_limit
 
 logger = logging.getLogger("unified-ui")
@@ -697,6 +698,9 @@ async def logout(user: AuthUser = Depends(require_auth)) -> dict[str, Any]:
         # server.js:1466-1467 - Clear RBAC cache
         invalidate_rbac_cache(user.id)
 
+        # Locally verified tokens stay valid until expiry unless revoked here
+        await revoke_user_tokens(user.id)
+
         # server.js:1469-1475 - Sign out from Supabase
         if supabase:
             try:
@@ -745,6 +749,7 @@ async def force_logout(
     try:
         # server.js:1506-1507 - Clear RBAC cache
         invalidate_rbac_cache(user_id)
+        await revoke_user_tokens(user_id)
 
         # server.js:1509-1514 - Sign out from Supabase
         try:
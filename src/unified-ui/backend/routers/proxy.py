@@ -6,26 +6,36 @@ trusted user headers, enabling the backend to trust the user context without
 re-validating tokens.
 
 5-Level RBAC context is injected as headers:
-1. User identity & profile
+1. User identity & profile (plain headers)
 2. Combined permissions (profile + permission sets)
 3. Teams and hierarchy
 4. Sharing rules & record shares
 5. Company access
 
+Levels 2-5 travel in one signed, compressed X-Trusted-User-Context token
+that backends decode lazily, instead of one JSON header per field.
+
+Request and response bodies are streamed through, not buffered, so uploads
+and downloads of any size use bounded gateway memory.
+
 See backend/contracts/trusted_headers.py for the header contract.
 """
 
 import json
 import logging
 
+import anyio
 import httpx
+from crm_security import encode_context_token
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
 
 from backend.config import get_settings
 from backend.contracts.trusted_headers import (
     HEADER_PROXY_SECRET,
     HEADER_USER_COMPANIES,
+    HEADER_USER_CONTEXT,
     HEADER_USER_EMAIL,
     HEADER_USER_ID,
     HEADER_USER_MANAGER_ID,
@@ -93,7 +103,7 @@ def _build_trusted_headers(user: TrustedUser, proxy_secret: str | None) -> dict[
 
     Args:
         user: TrustedUser with full RBAC context
-        proxy_secret: Shared secret to prove request origin
+        proxy_secret: Shared secret to prove request origin (also signs the context token)
 
     Returns:
         Dictionary of headers to inject
@@ -110,6 +120,27 @@ def _build_trusted_headers(user: TrustedUser, proxy_secret: str | None) -> dict[
     headers[HEADER_USER_NAME] = user.name
     headers[HEADER_USER_PROFILE] = user.profile
 
+    # Levels 2-5: one signed token
+    headers[HEADER_USER_CONTEXT] = encode_context_token(
+        user.id,
+        {
+            "permissions": user.permissions,
+            "permission_sets": user.permission_sets,
+            "teams": user.teams,
+            "team_ids": user.team_ids,
+            "manager_id": user.manager_id,
+            "subordinate_ids": user.subordinate_ids,
+            "sharing_rules": user.sharing_rules,
+            "shared_records": user.shared_records,
+            "shared_from_user_ids": user.shared_from_user_ids,
+            "companies": user.companies,
+        },
+        proxy_secret,
+    )
+
+    if not get_settings().PROXY_LEGACY_CONTEXT_HEADERS:
+        return headers
+
     # Level 2: Combined permissions (profile + permission sets)
     headers[HEADER_USER_PERMISSIONS] = json.dumps(user.permissions)
     headers[HEADER_USER_PERMISSION_SETS] = json.dumps(user.permission_sets)
@@ -179,32 +210,8 @@ async def proxy_to_sales_bot(
     if content_type:
         trusted_headers["Content-Type"] = content_type
 
-    # Check if this is a streaming request (SSE)
-    is_streaming = (
-        "stream" in path or
-        request.headers.get("accept") == "text/event-stream"
-    )
-
     try:
-        body = await request.body()
-
-        if is_streaming:
-            # SSE streaming response
-            return await _proxy_streaming(
-                method=request.method,
-                url=target_url,
-                headers=trusted_headers,
-                body=body,
-            )
-        else:
-            # Regular response
-            return await _proxy_regular(
-                method=request.method,
-                url=target_url,
-                headers=trusted_headers,
-                body=body,
-            )
-
+        return await _proxy_request(request, target_url, trusted_headers)
     except httpx.TimeoutException:
         logger.error(f"[PROXY] Timeout for {request.method} {target_url}")
         raise HTTPException(
@@ -233,88 +240,99 @@ async def proxy_to_sales_bot(
         raise HTTPException(status_code=502, detail="Proxy error")
 
 
-async def _proxy_regular(
-    method: str,
-    url: str,
-    headers: dict[str, str],
-    body: bytes,
-) -> Response:
-    """
-    Proxy a regular (non-streaming) request.
+# Hop-by-hop headers (RFC 9110 7.6.1) are not forwarded in either direction
+_HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+}
 
-    Uses shared connection pool for better performance and to prevent
-    connection exhaustion on page refreshes.
-    """
-    client = _get_proxy_client()
-    response = await client.request(
-        method=method,
-        url=url,
-        headers=headers,
-        content=body,
-    )
 
-    logger.info(f"[PROXY] Response: {response.status_code}")
-
-    # Forward response headers, filtering out hop-by-hop headers
-    # Also skip content-encoding since httpx auto-decompresses
-    response_headers = {}
-    skip_headers = {
-        "transfer-encoding",
-        "content-encoding",  # httpx already decompresses, don't confuse browser
-        "content-length",    # length changed after decompression
-        "connection",
-        "keep-alive",
-        "proxy-authenticate",
-        "proxy-authorization",
-        "te",
-        "trailers",
-        "upgrade",
-    }
-    for key, value in response.headers.items():
-        if key.lower() not in skip_headers:
-            response_headers[key] = value
-
-    return Response(
-        content=response.content,
-        status_code=response.status_code,
-        headers=response_headers,
-    )
+def _is_event_stream(content_type: str | None) -> bool:
+    """True for a text/event-stream (SSE) content type, with or without parameters."""
+    if not content_type:
+        return False
+    return content_type.split(";", 1)[0].strip().lower() == "text/event-stream"
 
 
-async def _proxy_streaming(
-    method: str,
+async def _proxy_request(
+    request: Request,
     url: str,
     headers: dict[str, str],
-    body: bytes,
 ) -> StreamingResponse:
     """
-    Proxy a streaming (SSE) request.
-
-    Uses shared connection pool for better performance. The stream context
-    is managed separately from the client lifecycle.
+    Proxy a request, streaming the body in both directions.
+
+    The incoming body is forwarded chunk by chunk as the client sends it, and
+    the backend's response is relayed as it arrives, undecoded (the client's
+    Accept-Encoding is forwarded, so Content-Encoding and Content-Length stay
+    valid). Each chunk is only pulled once the previous one has been written,
+    so a transfer holds a few network buffers in gateway memory regardless of
+    its size, and the first byte reaches the client without waiting for the
+    rest.
+
+    SSE is detected from the response's Content-Type, and gets headers that
+    stop intermediaries from buffering it.
+
+    Uses the shared connection pool. The backend response (and its pooled
+    connection) is released when the body is done, fails or the client
+    disconnects.
     """
+    headers = dict(headers)
+    headers["Accept-Encoding"] = request.headers.get("accept-encoding", "identity")
+
+    content = None
+    content_length = request.headers.get("content-length")
+    if content_length:
+        headers["Content-Length"] = content_length
+    if (content_length and content_length != "0") or "transfer-encoding" in request.headers:
+        # Without a Content-Length httpx sends the body chunked
+        content = request.stream()
+
+    client = _get_proxy_client()
+    upstream = await client.send(
+        client.build_request(request.method, url, headers=headers, content=content),
+        stream=True,
+    )
+
+    logger.info(f"[PROXY] Response: {upstream.status_code}")
 
-    async def stream_generator():
-        client = _get_proxy_client()
-        async with client.stream(
-            method=method,
-            url=url,
-            headers=headers,
-            content=body,
-        ) as response:
-            logger.info(f"[PROXY] Streaming response: {response.status_code}")
-            async for chunk in response.aiter_bytes():
+    response_headers = {
+        key: value
+        for key, value in upstream.headers.items()
+        if key.lower() not in _HOP_BY_HOP_HEADERS
+    }
+    if _is_event_stream(upstream.headers.get("content-type")):
+        response_headers["X-Accel-Buffering"] = "no"
+        response_headers["Cache-Control"] = "no-cache"
+
+    async def body():
+        try:
+            async for chunk in upstream.aiter_raw():
                 yield chunk
+        except httpx.HTTPError as e:
+            # Headers are already sent; abort so the client sees a truncated body
+            logger.error(f"[PROXY] Stream error for {request.method} {url}: {e}")
+            raise
+        finally:
+            # On a client disconnect this runs in a cancelled scope; shield the
+            # close, or it is interrupted after httpx has marked the response
+            # closed and the connection is never released
+            with anyio.CancelScope(shield=True):
+                await upstream.aclose()
 
-    # SSE headers
     return StreamingResponse(
-        stream_generator(),
-        media_type="text/event-stream",
-        headers={
-            "X-Accel-Buffering": "no",
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-        },
+        body(),
+        status_code=upstream.status_code,
+        headers=response_headers,
+        # Runs when the client disconnects before the body has started
+        background=BackgroundTask(upstream.aclose),
     )
 
 
@@ -376,16 +394,7 @@ async def proxy_to_asset_management(
         trusted_headers["Content-Type"] = content_type
 
     try:
-        body = await request.body()
-
-        # Asset management doesn't use streaming, always regular response
-        return await _proxy_regular(
-            method=request.method,
-            url=target_url,
-            headers=trusted_headers,
-            body=body,
-        )
-
+        return await _proxy_request(request, target_url, trusted_headers)
     except httpx.TimeoutException:
         logger.error(f"[PROXY] Timeout for {request.method} {target_url}")
         raise HTTPException(
@@ -471,15 +480,7 @@ async def proxy_to_security_service(
         trusted_headers["Content-Type"] = content_type
 
     try:
-        body = await request.body()
-
-        return await _proxy_regular(
-            method=request.method,
-            url=target_url,
-            headers=trusted_headers,
-            body=body,
-        )
-
+        return await _proxy_request(request, target_url, trusted_headers)
     except httpx.TimeoutException:
         logger.error(f"[PROXY] Timeout for {request.method} {target_url}")
         raise HTTPException(
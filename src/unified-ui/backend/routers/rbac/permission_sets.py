@@ -369,7 +369,7 @@ async def assign_permission_set(
         )
 
         # server.js:2785 - Clear RBAC cache
-        invalidate_rbac_cache(user_id)
+        invalidate_rbac_cache(user_id, sections=["permission_sets"])
 
         return response.data
 
@@ -403,7 +403,7 @@ async def revoke_permission_set(
         supabase.table("user_permission_sets").delete().eq("user_id", user_id).eq("permission_set_id", set_id).execute()
 
         # server.js:2810 - Clear RBAC cache
-        invalidate_rbac_cache(user_id)
+        invalidate_rbac_cache(user_id, sections=["permission_sets"])
 
         return {"success": True}
 
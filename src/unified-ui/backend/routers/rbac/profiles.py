@@ -486,7 +486,7 @@ async def update_profile(
             .execute()
         )
         for u in (users_response.data or []):
-            invalidate_rbac_cache(u["id"])
+            invalidate_rbac_cache(u["id"], sections=["profile"])
 
         # server.js:2424-2432 - Audit log
         with contextlib.suppress(Exception):
@@ -488,7 +488,7 @@ async def create_share(
 
         # server.js:3709-3711 - Clear RBAC cache
         if request.shared_with_user_id:
-            invalidate_rbac_cache(request.shared_with_user_id)
+            invalidate_rbac_cache(request.shared_with_user_id, sections=["sharing"])
 
         return share
 
@@ -685,7 +685,7 @@ async def delete_share(
 
         # server.js:3863-3865 - Clear RBAC cache
         if share.get("shared_with_user_id"):
-            invalidate_rbac_cache(share["shared_with_user_id"])
+            invalidate_rbac_cache(share["shared_with_user_id"], sections=["sharing"])
 
         return {"success": True}
 
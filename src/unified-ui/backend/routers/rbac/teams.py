@@ -316,7 +316,7 @@ async def add_team_member(
         )
 
         # server.js:2992 - Clear RBAC cache
-        invalidate_rbac_cache(request.user_id)
+        invalidate_rbac_cache(request.user_id, sections=["teams"])
 
         return response.data
 
@@ -364,7 +364,7 @@ async def update_team_member(
         )
 
         # server.js:3024 - Clear RBAC cache
-        invalidate_rbac_cache(member_user_id)
+        invalidate_rbac_cache(member_user_id, sections=["teams"])
 
         return response.data
 
@@ -398,7 +398,7 @@ async def remove_team_member(
         supabase.table("team_members").delete().eq("team_id", team_id).eq("user_id", member_user_id).execute()
 
         # server.js:3049 - Clear RBAC cache
-        invalidate_rbac_cache(member_user_id)
+        invalidate_rbac_cache(member_user_id, sections=["teams"])
 
         return {"success": True}
 
@@ -440,9 +440,9 @@ async def set_user_manager(
         )
 
         # server.js:3076-3077 - Clear RBAC cache for user and manager
-        invalidate_rbac_cache(user_id)
+        invalidate_rbac_cache(user_id, sections=["profile"])
         if request.manager_id:
-            invalidate_rbac_cache(request.manager_id)
+            invalidate_rbac_cache(request.manager_id, sections=["teams"])
 
         return response.data
 
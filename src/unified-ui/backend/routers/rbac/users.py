@@ -219,7 +219,7 @@ async def update_user(
         )
 
         # server.js:3402-3403 - Clear RBAC cache
-        invalidate_rbac_cache(user_id)
+        invalidate_rbac_cache(user_id, sections=["profile"])
 
         return response.data
 
@@ -307,7 +307,7 @@ async def deactivate_user(
         )
 
         # server.js:3475-3476 - Clear RBAC cache
-        invalidate_rbac_cache(user_id)
+        invalidate_rbac_cache(user_id, sections=["profile"])
 
         # server.js:3478-3488 - Audit log
         supabase.table("audit_log").insert({
@@ -362,7 +362,7 @@ async def reactivate_user(
         )
 
         # server.js:3513-3514 - Clear RBAC cache
-        invalidate_rbac_cache(user_id)
+        invalidate_rbac_cache(user_id, sections=["profile"])
 
         return {"success": True, "user": response.data}
 
@@ -423,7 +423,7 @@ async def assign_user_profile(
             raise HTTPException(status_code=404, detail="User not found")
 
         # Clear RBAC cache
-        invalidate_rbac_cache(user_id)
+        invalidate_rbac_cache(user_id, sections=["profile"])
 
         return {
             "success": True,
@@ -918,7 +918,7 @@ async def set_user_permissions(
                 }).execute()
 
         # Clear RBAC cache
-        invalidate_rbac_cache(user_id)
+        invalidate_rbac_cache(user_id, sections=["permission_sets"])
 
         return {
             "success": True,
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Benchmark: RBAC context loading (backend/services/rbac_service.py).
+
+Runs get_user_rbac_data() against an in-process fake Supabase client that
+sleeps --latency ms per query and counts queries, with the in-memory RBAC
+cache. Reports:
+
+- cold load: wall time and query count for an uncached user, next to the
+  time the same queries take one after another
+- stampede: --concurrency simultaneous requests for an uncached user, with
+  single-flight and without it (each request loading on its own)
+- partial invalidation: reload after a team change (teams section only)
+  and after a full invalidation
+- warm: per-call time when every section is cached
+
+Usage:
+    python backend/scripts/benchmark_rbac_loading.py
+    python backend/scripts/benchmark_rbac_loading.py --latency 20 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.services import rbac_service  # noqa: E402
+
+USER_ID = "user-1"
+
+# Rows returned per (table, first filter column)
+_ROWS = {
+    ("users", "id"): {
+        "id": USER_ID, "email": "lead@example.com", "name": "Lead", "profile_id": 1,
+        "is_active": True, "manager_id": "user-0",
+        "profiles": {"id": 1, "name": "sales_manager", "display_name": "Sales Manager"},
+    },
+    ("profile_permissions", "profile_id"): [{"permission": f"sales:{r}:read"} for r in ("proposals", "bookings", "clients")],
+    ("user_permission_sets", "user_id"): [
+        {"permission_set_id": n, "expires_at": None, "permission_sets": {"id": n, "name": f"set-{n}", "is_active": True}}
+        for n in (1, 2, 3)
+    ],
+    ("permission_set_permissions", "permission_set_id"): [{"permission": "assets:locations:read"}],
+    ("team_members", "user_id"): [
+        {"role": "leader", "teams": {"id": 10, "name": "north", "display_name": "North", "parent_team_id": None, "is_active": True}},
+        {"role": "member", "teams": {"id": 11, "name": "all", "display_name": "All", "parent_team_id": None, "is_active": True}},
+    ],
+    ("users", "manager_id"): [{"id": f"report-{n}"} for n in range(5)],
+    ("team_members", "team_id"): [{"user_id": f"member-{n}"} for n in range(8)],
+    ("record_shares", "shared_with_user_id"): [
+        {"object_type": "proposal", "record_id": "p-1", "access_level": "read", "shared_by": "user-9", "reason": None}
+    ],
+    ("record_shares", "shared_with_team_id"): [],
+    ("sharing_rules", "is_active"): [
+        {"id": 1, "name": "everyone", "object_type": "proposal", "share_from_type": "profile",
+         "share_from_id": "sales_user", "share_to_type": "all", "share_to_id": None, "access_level": "read"},
+        {"id": 2, "name": "team", "object_type": "booking", "share_from_type": "team",
+         "share_from_id": "11", "share_to_type": "team", "share_to_id": "10", "access_level": "read"},
+    ],
+    ("users", "profiles.name"): [{"id": f"rep-{n}"} for n in range(20)],
+    ("user_companies", "user_id"): [{"company_id": 1, "companies": {"id": 1, "code": "backlite", "is_group": True}}],
+    ("rpc", "get_accessible_schemas"): [{"schema_name": s} for s in ("backlite_dubai", "backlite_uk", "backlite_abudhabi")],
+}
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, client: "FakeSupabase", table: str):
+        self._client = client
+        self._table = table
+        self._column: str | None = None
+        self._single = False
+
+    def _filter(self, column, *_args):
+        if self._column is None:
+            self._column = column
+        return self
+
+    eq = neq = in_ = _filter
+
+    def select(self, *_args):
+        return self
+
+    def or_(self, *_args):
+        return self
+
+    def single(self):
+        self._single = True
+        return self
+
+    def execute(self) -> _Result:
+        rows = self._client.query((self._table, self._column))
+        if self._single:
+            return _Result(rows)
+        return _Result(rows if isinstance(rows, list) else [rows])
+
+
+class _Rpc:
+    def __init__(self, client: "FakeSupabase", name: str):
+        self._client = client
+        self._name = name
+
+    def execute(self) -> _Result:
+        return _Result(self._client.query(("rpc", self._name)))
+
+
+class FakeSupabase:
+    """Answers the RBAC queries from _ROWS after a fixed delay, counting them."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.queries = 0
+        self._lock = threading.Lock()
+
+    def query(self, key):
+        with self._lock:
+            self.queries += 1
+        time.sleep(self.latency)
+        return _ROWS[key]
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+    def rpc(self, name: str, _params=None) -> _Rpc:
+        return _Rpc(self, name)
+
+
+def _reset_cache() -> None:
+    rbac_service._rbac_cache_fallback.clear()
+    rbac_service._inflight.clear()
+
+
+async def _timed(fake: FakeSupabase, coro) -> tuple[float, int]:
+    before = fake.queries
+    start = time.perf_counter()
+    await coro
+    return (time.perf_counter() - start) * 1000, fake.queries - before
+
+
+async def run(latency_ms: float, concurrency: int, warm_calls: int) -> None:
+    fake = FakeSupabase(latency_ms / 1000)
+    rbac_service.get_supabase = lambda: fake
+    # In-memory RBAC cache, no Redis
+    rbac_service._cache_backend = None
+    rbac_service._cache_initialized = True
+
+    print(f"Fake Supabase latency: {latency_ms:.0f} ms/query\n")
+
+    _reset_cache()
+    ms, queries = await _timed(fake, rbac_service.get_user_rbac_data(USER_ID))
+    print(f"cold load:            {ms:8.1f} ms  {queries:3d} queries  (sequential: {queries * latency_ms:.0f} ms)")
+
+    _reset_cache()
+    ms, queries = await _timed(
+        fake, asyncio.gather(*(rbac_service.get_user_rbac_data(USER_ID) for _ in range(concurrency)))
+    )
+    print(f"stampede x{concurrency:<4d}        {ms:8.1f} ms  {queries:3d} queries  (single-flight)")
+
+    _reset_cache()
+    ms, queries = await _timed(
+        fake,
+        asyncio.gather(*(rbac_service._load_rbac_data(fake, USER_ID, True) for _ in range(concurrency))),
+    )
+    print(f"stampede x{concurrency:<4d}        {ms:8.1f} ms  {queries:3d} queries  (no single-flight)")
+
+    _reset_cache()
+    await rbac_service.get_user_rbac_data(USER_ID)
+    rbac_service.invalidate_rbac_cache(USER_ID, sections=["teams"])
+    ms, queries = await _timed(fake, rbac_service.get_user_rbac_data(USER_ID))
+    print(f"after team change:    {ms:8.1f} ms  {queries:3d} queries")
+
+    rbac_service.invalidate_rbac_cache(USER_ID)
+    ms, queries = await _timed(fake, rbac_service.get_user_rbac_data(USER_ID))
+    print(f"after full invalidate:{ms:8.1f} ms  {queries:3d} queries")
+
+    ms, queries = await _timed(
+        fake, asyncio.gather(*(rbac_service.get_user_rbac_data(USER_ID) for _ in range(warm_calls)))
+    )
+    print(f"warm (per call):      {ms * 1000 / warm_calls:8.1f} us  {queries:3d} queries")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=15, help="Simulated ms per Supabase query")
+    parser.add_argument("--concurrency", type=int, default=50, help="Simultaneous requests in the stampede runs")
+    parser.add_argument("--warm-calls", type=int, default=2000, help="Calls averaged for the warm figure")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args.latency, args.concurrency, args.warm_calls))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Company hierarchy cache for the gateway.
+
+Authenticated requests expand the user's company codes to leaf companies
+(a group like 'backlite' grants all its verticals). That used to be a POST
+to asset-management's /api/companies/expand on every request. The tree
+changes rarely, so the gateway now loads it once from
+/api/companies/hierarchy and expands in-process.
+
+The tree is refreshed after COMPANY_HIERARCHY_TTL_SECONDS, in the
+background (requests keep using the current tree meanwhile), with
+If-None-Match so an unchanged tree costs a 304. asset-management derives
+the version (ETag) from the tree's content, so any change is a version
+bump. invalidate_company_hierarchy() forces a reload on the next request.
+
+A failed load (an error or an empty tree) keeps the current tree. If there
+is none yet, requests fall back to the unexpanded codes, and the load is
+not retried for COMPANY_HIERARCHY_RETRY_SECONDS, so an asset-management
+outage does not queue every request behind its own fetch.
+
+Expansion follows asset-management's expand_companies(): unknown and
+inactive codes are dropped, a group expands to its active leaf
+descendants (through active groups only), a leaf is kept as is.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+import httpx
+
+from backend.config import get_settings
+
+logger = logging.getLogger("unified-ui")
+
+
+class CompanyHierarchy:
+    """An immutable snapshot of the company tree with memoised expansion."""
+
+    def __init__(self, companies: list[dict[str, Any]], version: str | None = None):
+        self.version = version
+        self._by_code = {c["code"]: c for c in companies}
+        self._children: dict[Any, list[dict[str, Any]]] = {}
+        for c in companies:
+            if c.get("parent_id"):
+                self._children.setdefault(c["parent_id"], []).append(c)
+        self._leaves: dict[str, frozenset[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_code)
+
+    def _active_leaves(self, company: dict[str, Any]) -> frozenset[str]:
+        code = company["code"]
+        leaves = self._leaves.get(code)
+        if leaves is None:
+            if not company.get("is_group", False):
+                leaves = frozenset([code])
+            else:
+                found: set[str] = set()
+                for child in self._children.get(company["id"], []):
+                    if child.get("is_active", True):
+                        found |= self._active_leaves(child)
+                leaves = frozenset(found)
+            self._leaves[code] = leaves
+        return leaves
+
+    def expand(self, company_codes: list[str]) -> list[str]:
+        """Expand company codes (groups or leaves) to the sorted leaf companies they grant."""
+        result: set[str] = set()
+        for code in company_codes:
+            company = self._by_code.get(code)
+            if company is None or not company.get("is_active", True):
+                continue
+            result |= self._active_leaves(company)
+        return sorted(result)
+
+
+_hierarchy: CompanyHierarchy | None = None
+_loaded_at = 0.0
+_failed_at: float | None = None
+_load_lock = asyncio.Lock()
+_refresh_task: asyncio.Task | None = None
+_client: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(timeout=5.0)
+    return _client
+
+
+async def _load() -> None:
+    """Fetch the tree (conditionally, if one is cached) and swap it in."""
+    global _hierarchy, _loaded_at, _failed_at
+
+    settings = get_settings()
+    headers = {}
+    if _hierarchy is not None and _hierarchy.version:
+        headers["If-None-Match"] = f'"{_hierarchy.version}"'
+
+    try:
+        response = await _get_client().get(
+            f"{settings.ASSET_MANAGEMENT_URL}/api/companies/hierarchy", headers=headers
+        )
+        if response.status_code == 304:
+            _loaded_at = time.monotonic()
+            return
+        response.raise_for_status()
+        data = response.json()
+        if not data.get("hierarchy"):
+            raise ValueError("empty company hierarchy")
+    except Exception as e:
+        # Keep the current tree; retry after another TTL
+        logger.warning(f"[HIERARCHY] Failed to load company hierarchy: {e}")
+        if _hierarchy is not None:
+            _loaded_at = time.monotonic()
+        else:
+            _failed_at = time.monotonic()
+        return
+
+    version = data.get("version") or response.headers.get("etag", "").strip('"') or None
+    _hierarchy = CompanyHierarchy(data.get("hierarchy", []), version)
+    _loaded_at = time.monotonic()
+    _failed_at = None
+    logger.info(f"[HIERARCHY] Loaded company hierarchy ({len(_hierarchy)} companies, version {version})")
+
+
+async def _load_once() -> None:
+    async with _load_lock:
+        await _load()
+
+
+def _retry_pending() -> bool:
+    """True while a failed first load is within its retry delay."""
+    if _failed_at is None:
+        return False
+    return time.monotonic() - _failed_at < get_settings().COMPANY_HIERARCHY_RETRY_SECONDS
+
+
+async def get_company_hierarchy() -> CompanyHierarchy | None:
+    """
+    Get the cached hierarchy, loading it on first use.
+
+    Once loaded, an expired tree is refreshed in the background and the
+    current one is returned. None if the tree has never loaded (including
+    while a failed first load waits to be retried).
+    """
+    global _refresh_task
+
+    if _hierarchy is None:
+        if _retry_pending():
+            return None
+        async with _load_lock:
+            # Another request may have loaded it, or failed, while we waited
+            if _hierarchy is None and not _retry_pending():
+                await _load()
+        return _hierarchy
+
+    ttl = get_settings().COMPANY_HIERARCHY_TTL_SECONDS
+    if time.monotonic() - _loaded_at > ttl and (_refresh_task is None or _refresh_task.done()):
+        _refresh_task = asyncio.create_task(_load_once())
+    return _hierarchy
+
+
+def invalidate_company_hierarchy() -> None:
+    """Drop the cached tree so the next request reloads it."""
+    global _hierarchy, _loaded_at, _failed_at
+    _hierarchy = None
+    _loaded_at = 0.0
+    _failed_at = None
+
+
+async def close_company_hierarchy() -> None:
+    """Close the HTTP client (application shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
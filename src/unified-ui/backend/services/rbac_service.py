@@ -13,14 +13,28 @@ RBAC (Role-Based Access Control) service for unified-ui.
 4. Record Sharing (share specific records with users/teams)
 5. Company Access (for data filtering in proposal-bot)
 
+Loading:
+- The context is built from independent sections (RBAC_SECTIONS), fetched
+  in parallel threads; sharing runs after profile and teams since it
+  depends on them
+- Concurrent requests for the same user share one load (single-flight)
+
 Caching:
 - Uses Redis via crm_cache for distributed caching
 - Falls back to in-memory dict if Redis unavailable
+- Each section is cached separately (rbac:user:{id}:{section}) with its
+  own version (rbac:user:{id}:{section}:v). Invalidating a section bumps
+  its version, so only that section is refetched, and a load that was in
+  flight during the bump cannot write back stale data
+- The sharing section records the profile and teams it was built from and
+  is rebuilt when they change
 - TTL: 30 seconds (RBAC_CACHE_TTL_SECONDS from settings)
 """
 
 import asyncio
 import logging
+import time
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
@@ -30,6 +44,12 @@ from backend.services.supabase_client import get_supabase
 
 logger = logging.getLogger("unified-ui")
 
+# Sections of the RBAC context, each cached and invalidated on its own
+RBAC_SECTIONS = ("profile", "permission_sets", "teams", "sharing", "companies")
+
+# Versions must outlive the section entries they guard
+_VERSION_TTL_SECONDS = 86400
+
 # =============================================================================
 # RBAC CACHE - Redis-backed with in-memory fallback
 # =============================================================================
@@ -82,20 +102,23 @@ def _run_async(coro):
         return asyncio.run(coro)
 
 
+def _fallback_get(key: str, ttl: int) -> Any | None:
+    cached = _rbac_cache_fallback.get(key)
+    if cached:
+        cache_age = (datetime.utcnow() - cached["ts"]).total_seconds()
+        if cache_age < cached.get("ttl", ttl):
+            return cached["data"]
+        else:
+            del _rbac_cache_fallback[key]
+    return None
+
+
 async def _cache_get(key: str) -> Any | None:
     """Get value from cache."""
     cache = _get_cache()
     if not cache:
         # Fallback to in-memory
-        cached = _rbac_cache_fallback.get(key)
-        if cached:
-            settings = get_settings()
-            cache_age = (datetime.utcnow() - cached["ts"]).total_seconds()
-            if cache_age < settings.RBAC_CACHE_TTL_SECONDS:
-                return cached["data"]
-            else:
-                del _rbac_cache_fallback[key]
-        return None
+        return _fallback_get(key, get_settings().RBAC_CACHE_TTL_SECONDS)
 
     try:
         return await cache.get(key)
@@ -104,12 +127,27 @@ async def _cache_get(key: str) -> Any | None:
         return None
 
 
+async def _cache_get_many(keys: list[str]) -> dict[str, Any]:
+    """Get several values in one round trip. Missing keys are left out."""
+    cache = _get_cache()
+    if not cache:
+        ttl = get_settings().RBAC_CACHE_TTL_SECONDS
+        found = {key: _fallback_get(key, ttl) for key in keys}
+        return {key: value for key, value in found.items() if value is not None}
+
+    try:
+        return await cache.get_many(keys)
+    except Exception as e:
+        logger.debug(f"[RBAC CACHE] Get many error: {e}")
+        return {}
+
+
 async def _cache_set(key: str, value: Any, ttl: int = 30) -> None:
     """Set value in cache."""
     cache = _get_cache()
     if not cache:
         # Fallback to in-memory
-        _rbac_cache_fallback[key] = {"data": value, "ts": datetime.utcnow()}
+        _rbac_cache_fallback[key] = {"data": value, "ts": datetime.utcnow(), "ttl": ttl}
         return
 
     try:
@@ -118,6 +156,21 @@ async def _cache_set(key: str, value: Any, ttl: int = 30) -> None:
         logger.debug(f"[RBAC CACHE] Set error: {e}")
 
 
+async def _cache_set_many(mapping: dict[str, Any], ttl: int = 30) -> None:
+    """Set several values with the same TTL."""
+    cache = _get_cache()
+    if not cache:
+        now = datetime.utcnow()
+        for key, value in mapping.items():
+            _rbac_cache_fallback[key] = {"data": value, "ts": now, "ttl": ttl}
+        return
+
+    try:
+        await cache.set_many(mapping, ttl=ttl)
+    except Exception as e:
+        logger.debug(f"[RBAC CACHE] Set many error: {e}")
+
+
 async def _cache_delete(key: str) -> None:
     """Delete value from cache."""
     cache = _get_cache()
@@ -149,27 +202,63 @@ async def _cache_delete_pattern(pattern: str) -> int:
         return 0
 
 
-def invalidate_rbac_cache(user_id: str) -> None:
+def _section_key(user_id: str, section: str) -> str:
+    return f"rbac:user:{user_id}:{section}"
+
+
+def _version_key(user_id: str, section: str) -> str:
+    return f"rbac:user:{user_id}:{section}:v"
+
+
+def _check_sections(sections: Iterable[str] | None) -> tuple[str, ...]:
+    if sections is None:
+        return RBAC_SECTIONS
+    sections = tuple(sections)
+    unknown = set(sections) - set(RBAC_SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown RBAC sections: {sorted(unknown)}")
+    return sections
+
+
+async def _invalidate_sections(user_ids: list[str], sections: tuple[str, ...]) -> None:
+    """Bump the sections' versions and drop their entries."""
+    version = f"{time.time_ns():x}"
+    await _cache_set_many(
+        {_version_key(user_id, s): version for user_id in user_ids for s in sections},
+        ttl=_VERSION_TTL_SECONDS,
+    )
+    for user_id in user_ids:
+        for section in sections:
+            await _cache_delete(_section_key(user_id, section))
+        # Later requests must not join a load that started before the bump
+        _inflight.pop((user_id, True), None)
+        _inflight.pop((user_id, False), None)
+
+
+def invalidate_rbac_cache(user_id: str, sections: Iterable[str] | None = None) -> None:
     """
     Invalidate RBAC cache for a user.
     Mirrors server.js:524-529 (invalidateRBACCache)
+
+    Args:
+        user_id: The user's ID
+        sections: Sections that changed (see RBAC_SECTIONS); all if None
     """
     if user_id:
-        cache_key = f"rbac:user:{user_id}"
-        _run_async(_cache_delete(cache_key))
-        logger.info(f"[RBAC CACHE] Invalidated cache for user {user_id}")
+        sections = _check_sections(sections)
+        _run_async(_invalidate_sections([user_id], sections))
+        logger.info(f"[RBAC CACHE] Invalidated {', '.join(sections)} for user {user_id}")
 
 
-def invalidate_rbac_cache_for_users(user_ids: list[str]) -> None:
+def invalidate_rbac_cache_for_users(user_ids: list[str], sections: Iterable[str] | None = None) -> None:
     """
     Invalidate RBAC cache for multiple users.
     Mirrors server.js:531-539 (invalidateRBACCacheForUsers)
     """
-    for user_id in user_ids or []:
-        cache_key = f"rbac:user:{user_id}"
-        _run_async(_cache_delete(cache_key))
+    sections = _check_sections(sections)
     if user_ids:
-        logger.info(f"[RBAC CACHE] Invalidated cache for {len(user_ids)} users")
+        _run_async(_invalidate_sections(list(user_ids), sections))
+        logger.info(f"[RBAC CACHE] Invalidated {', '.join(sections)} for {len(user_ids)} users")
 
 
 def clear_all_rbac_cache() -> None:
@@ -178,6 +267,7 @@ def clear_all_rbac_cache() -> None:
     Mirrors server.js:541-546 (clearAllRBACCache)
     """
     count = _run_async(_cache_delete_pattern("rbac:user:*"))
+    _inflight.clear()
     logger.info(f"[RBAC CACHE] Cleared all cached entries (pattern match count: {count})")
 
 
@@ -354,6 +444,35 @@ def _dict_to_rbac_context(data: dict[str, Any]) -> RBACContext:
     )
 
 
+def _fetch_record_shares(supabase, user_id: str, team_ids: list[int]) -> list[dict[str, Any]]:
+    """Record shares to the user and to their teams (sync; run in a thread)."""
+    now = datetime.utcnow().isoformat()
+
+    # Get shares to this user - server.js:493-498
+    user_shares_response = (
+        supabase.table("record_shares")
+        .select("*")
+        .eq("shared_with_user_id", user_id)
+        .or_(f"expires_at.is.null,expires_at.gt.{now}")
+        .execute()
+    )
+    user_shares = user_shares_response.data or []
+
+    # Get shares to user's teams - server.js:500-510
+    team_shares = []
+    if team_ids:
+        team_shares_response = (
+            supabase.table("record_shares")
+            .select("*")
+            .in_("shared_with_team_id", team_ids)
+            .or_(f"expires_at.is.null,expires_at.gt.{now}")
+            .execute()
+        )
+        team_shares = team_shares_response.data or []
+
+    return user_shares + team_shares
+
+
 async def get_user_record_shares(
     user_id: str, team_ids: list[int]
 ) -> list[dict[str, Any]]:
@@ -367,41 +486,303 @@ async def get_user_record_shares(
         return []
 
     try:
-        now = datetime.utcnow().isoformat()
+        return await asyncio.to_thread(_fetch_record_shares, supabase, user_id, team_ids)
+    except Exception as e:
+        logger.error(f"[RBAC] Error fetching record shares: {e}")
+        return []
 
-        # Get shares to this user - server.js:493-498
-        user_shares_response = (
-            supabase.table("record_shares")
-            .select("*")
-            .eq("shared_with_user_id", user_id)
-            .or_(f"expires_at.is.null,expires_at.gt.{now}")
+
+# =============================================================================
+# SECTION LOADERS
+# Each returns its part of RBACContext.to_dict(). The sync ones run in
+# worker threads so independent sections are fetched in parallel.
+# =============================================================================
+
+
+def _load_profile(supabase, user_id: str) -> dict[str, Any] | None:
+    """LEVEL 1: user, profile and profile permissions. None if the user is missing or inactive."""
+    # server.js:201-235
+    user_response = (
+        supabase.table("users")
+        .select("id, email, name, profile_id, is_active, manager_id, profiles(id, name, display_name)")
+        .eq("id", user_id)
+        .single()
+        .execute()
+    )
+
+    user_data = user_response.data
+    if not user_data:
+        logger.warning(f"[RBAC] User {user_id} not found in users table - ACCESS DENIED")
+        return None
+
+    # Check if user is active - server.js:215-219
+    if user_data.get("is_active") is False:
+        logger.warning(f"[RBAC] User {user_id} is deactivated - ACCESS DENIED")
+        return None
+
+    profile = user_data.get("profiles") or {}
+
+    # Get permissions from profile - server.js:224-235
+    permissions: list[str] = []
+    profile_id = profile.get("id")
+    if profile_id:
+        perms_response = (
+            supabase.table("profile_permissions")
+            .select("permission")
+            .eq("profile_id", profile_id)
+            .execute()
+        )
+        if perms_response.data:
+            permissions = [p["permission"] for p in perms_response.data]
+
+    return {
+        "profile": profile.get("name") or "sales_user",
+        "permissions": permissions,
+        "managerId": user_data.get("manager_id"),
+    }
+
+
+def _load_permission_sets(supabase, user_id: str) -> dict[str, Any]:
+    """LEVEL 2: active, unexpired permission sets and their permissions - server.js:237-274."""
+    perm_sets_response = (
+        supabase.table("user_permission_sets")
+        .select("permission_set_id, expires_at, permission_sets(id, name, is_active)")
+        .eq("user_id", user_id)
+        .execute()
+    )
+
+    active_permission_sets: list[dict[str, Any]] = []
+    for ups in perm_sets_response.data or []:
+        perm_set = ups.get("permission_sets") or {}
+
+        # Skip if permission set is inactive - server.js:250
+        if not perm_set.get("is_active"):
+            continue
+
+        # Skip if expired - server.js:252-256
+        expires_at = ups.get("expires_at")
+        if expires_at and datetime.fromisoformat(expires_at.replace("Z", "+00:00")).replace(tzinfo=None) < datetime.utcnow():
+            logger.info(f"[RBAC] Permission set {perm_set.get('name')} expired for user {user_id}")
+            continue
+
+        active_permission_sets.append(
+            {"id": perm_set.get("id"), "name": perm_set.get("name"), "expiresAt": expires_at}
+        )
+
+    # Permissions of all active sets in one query - server.js:264-272
+    permissions: list[str] = []
+    if active_permission_sets:
+        ps_perms_response = (
+            supabase.table("permission_set_permissions")
+            .select("permission")
+            .in_("permission_set_id", [ps["id"] for ps in active_permission_sets])
             .execute()
         )
-        user_shares = user_shares_response.data or []
-
-        # Get shares to user's teams - server.js:500-510
-        team_shares = []
-        if team_ids:
-            team_shares_response = (
-                supabase.table("record_shares")
-                .select("*")
-                .in_("shared_with_team_id", team_ids)
-                .or_(f"expires_at.is.null,expires_at.gt.{now}")
-                .execute()
+        permissions = [p["permission"] for p in ps_perms_response.data or []]
+
+    return {"permissionSets": active_permission_sets, "permissions": permissions}
+
+
+def _load_teams(supabase, user_id: str) -> dict[str, Any]:
+    """LEVEL 3: teams, direct reports and members of led teams - server.js:276-327."""
+    # Get user's teams - server.js:280-299
+    teams_response = (
+        supabase.table("team_members")
+        .select("role, teams(id, name, display_name, parent_team_id, is_active)")
+        .eq("user_id", user_id)
+        .execute()
+    )
+
+    teams: list[dict[str, Any]] = []
+    for tm in teams_response.data or []:
+        team = tm.get("teams") or {}
+        if team.get("is_active"):
+            teams.append(
+                {
+                    "id": team.get("id"),
+                    "name": team.get("name"),
+                    "displayName": team.get("display_name"),
+                    "role": tm.get("role"),
+                    "parentTeamId": team.get("parent_team_id"),
+                }
             )
-            team_shares = team_shares_response.data or []
 
-        return user_shares + team_shares
+    # Get subordinates (users where this user is their manager) - server.js:301-308
+    subordinates_response = (
+        supabase.table("users")
+        .select("id")
+        .eq("manager_id", user_id)
+        .eq("is_active", True)
+        .execute()
+    )
+    subordinate_ids = [s["id"] for s in subordinates_response.data or []]
 
-    except Exception as e:
-        logger.error(f"[RBAC] Error fetching record shares: {e}")
-        return []
+    # Get team members for teams where user is leader - server.js:310-324
+    led_team_ids = [t["id"] for t in teams if t["role"] == "leader"]
+    team_member_ids: list[str] = []
+
+    if led_team_ids:
+        team_members_response = (
+            supabase.table("team_members")
+            .select("user_id")
+            .in_("team_id", led_team_ids)
+            .neq("user_id", user_id)
+            .execute()
+        )
+        if team_members_response.data:
+            team_member_ids = [tm["user_id"] for tm in team_members_response.data]
+
+    # Combine subordinates - server.js:326-327
+    return {"teams": teams, "subordinateIds": list(set(subordinate_ids + team_member_ids))}
+
+
+def _load_companies(supabase, user_id: str) -> dict[str, Any]:
+    """LEVEL 5: company schemas the user can access - server.js:390-413."""
+    companies_response = (
+        supabase.table("user_companies")
+        .select("company_id, companies(id, code, is_group)")
+        .eq("user_id", user_id)
+        .execute()
+    )
+
+    companies: list[str] = []
+    assigned_company_ids = [
+        uc.get("company_id")
+        for uc in companies_response.data or []
+        if uc.get("company_id")
+    ]
+
+    if assigned_company_ids:
+        # Use recursive CTE to get accessible schemas - server.js:405-412
+        schemas_response = supabase.rpc(
+            "get_accessible_schemas",
+            {"p_company_ids": assigned_company_ids}
+        ).execute()
+
+        if schemas_response.data:
+            companies = [
+                s.get("schema_name")
+                for s in schemas_response.data
+                if s.get("schema_name")
+            ]
+
+    return {"companies": companies}
+
+
+def _sharing_inputs(profile_name: str, team_ids: list[int]) -> dict[str, Any]:
+    """What the sharing section depends on; it is rebuilt when these change."""
+    return {"profile": profile_name, "teamIds": sorted(team_ids)}
+
+
+def _rule_applies(rule: dict[str, Any], profile_name: str, team_ids: list[int]) -> bool:
+    """Whether a sharing rule shares TO this user - server.js:368-375."""
+    share_to_type = rule.get("share_to_type")
+    share_to_id = rule.get("share_to_id")
+
+    if share_to_type == "all":
+        return True
+    if share_to_type == "profile" and share_to_id == profile_name:
+        return True
+    if share_to_type == "team":
+        try:
+            return int(share_to_id) in team_ids
+        except (ValueError, TypeError):
+            return False
+    return False
+
+
+def _rule_user_ids(supabase, rule: dict[str, Any]) -> list[str]:
+    """Users whose records a rule shares - server.js:415-442."""
+    if rule["shareFromType"] == "profile":
+        # Get all users with this profile - server.js:420-429
+        profile_users_response = (
+            supabase.table("users")
+            .select("id, profiles!inner(name)")
+            .eq("profiles.name", rule["shareFromId"])
+            .eq("is_active", True)
+            .execute()
+        )
+        return [u["id"] for u in profile_users_response.data or []]
+
+    if rule["shareFromType"] == "team":
+        # Get all users in this team - server.js:430-439
+        try:
+            team_id = int(rule["shareFromId"])
+        except (ValueError, TypeError):
+            return []
+        team_users_response = (
+            supabase.table("team_members")
+            .select("user_id")
+            .eq("team_id", team_id)
+            .execute()
+        )
+        return [u["user_id"] for u in team_users_response.data or []]
+
+    return []
+
+
+async def _load_sharing(supabase, user_id: str, profile_name: str, team_ids: list[int]) -> dict[str, Any]:
+    """LEVEL 4: sharing rules and record shares - server.js:329-388."""
+    # Record shares (server.js:336-353) and sharing rules (server.js:355-388)
+    record_shares, rules_response = await asyncio.gather(
+        asyncio.to_thread(_fetch_record_shares, supabase, user_id, team_ids),
+        asyncio.to_thread(
+            lambda: supabase.table("sharing_rules").select("*").eq("is_active", True).execute()
+        ),
+    )
+
+    shared_records: dict[str, list[dict[str, Any]]] = {}
+    for share in record_shares:
+        shared_records.setdefault(share.get("object_type"), []).append(
+            {
+                "recordId": share.get("record_id"),
+                "accessLevel": share.get("access_level"),
+                "sharedBy": share.get("shared_by"),
+                "reason": share.get("reason"),
+            }
+        )
+
+    applicable_rules = [
+        {
+            "id": rule.get("id"),
+            "name": rule.get("name"),
+            "objectType": rule.get("object_type"),
+            "shareFromType": rule.get("share_from_type"),
+            "shareFromId": rule.get("share_from_id"),
+            "accessLevel": rule.get("access_level"),
+        }
+        for rule in rules_response.data or []
+        if _rule_applies(rule, profile_name, team_ids)
+    ]
+
+    rule_user_ids = await asyncio.gather(
+        *(asyncio.to_thread(_rule_user_ids, supabase, rule) for rule in applicable_rules)
+    )
+
+    return {
+        "inputs": _sharing_inputs(profile_name, team_ids),
+        "sharingRules": applicable_rules,
+        "sharedRecords": shared_records,
+        "sharedFromUserIds": list({uid for ids in rule_user_ids for uid in ids}),
+    }
+
+
+_SECTION_LOADERS = {
+    "profile": _load_profile,
+    "permission_sets": _load_permission_sets,
+    "teams": _load_teams,
+    "companies": _load_companies,
+}
 
 
 # =============================================================================
 # MAIN RBAC FUNCTION
 # =============================================================================
 
+# (user_id, use_cache) -> load in progress, shared by concurrent callers
+_inflight: dict[tuple[str, bool], asyncio.Task] = {}
+
+
 async def get_user_rbac_data(user_id: str, use_cache: bool = True) -> RBACContext | None:
     """
     Fetch complete RBAC context for a user.
@@ -415,6 +796,8 @@ async def get_user_rbac_data(user_id: str, use_cache: bool = True) -> RBACContex
     4. Sharing rules & record shares
     5. Company access
 
+    Concurrent calls for the same user share one load.
+
     Args:
         user_id: The user's ID
         use_cache: Whether to use cached data (default True)
@@ -422,7 +805,6 @@ async def get_user_rbac_data(user_id: str, use_cache: bool = True) -> RBACContex
     Returns:
         RBACContext if user exists and is active, None otherwise
     """
-    settings = get_settings()
     supabase = get_supabase()
 
     # Dev mode fallback - server.js:189-198
@@ -435,296 +817,74 @@ async def get_user_rbac_data(user_id: str, use_cache: bool = True) -> RBACContex
             subordinate_ids=[],
         )
 
-    # Check cache (Redis or in-memory fallback)
-    cache_key = f"rbac:user:{user_id}"
-    if use_cache:
-        cached = await _cache_get(cache_key)
-        if cached is not None:
-            logger.debug(f"[RBAC CACHE] Hit for user {user_id}")
-            # Reconstruct RBACContext from cached dict
-            return _dict_to_rbac_context(cached)
+    key = (user_id, use_cache)
+    task = _inflight.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.create_task(_load_rbac_data(supabase, user_id, use_cache))
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _inflight.pop(key) if _inflight.get(key) is t else None)
 
-    try:
-        # =====================================================================
-        # LEVEL 1: Get user with profile - server.js:201-235
-        # =====================================================================
-        user_response = (
-            supabase.table("users")
-            .select("id, email, name, profile_id, is_active, manager_id, profiles(id, name, display_name)")
-            .eq("id", user_id)
-            .single()
-            .execute()
-        )
+    # shield: a cancelled caller must not cancel the load for the others
+    return await asyncio.shield(task)
 
-        user_data = user_response.data
-        if not user_data:
-            logger.warning(f"[RBAC] User {user_id} not found in users table - ACCESS DENIED")
-            return None
 
-        # Check if user is active - server.js:215-219
-        if user_data.get("is_active") is False:
-            logger.warning(f"[RBAC] User {user_id} is deactivated - ACCESS DENIED")
-            return None
-
-        profile = user_data.get("profiles") or {}
-        profile_name = profile.get("name") or "sales_user"
-
-        # Get permissions from profile - server.js:224-235
-        permissions: list[str] = []
-        profile_id = profile.get("id")
-        if profile_id:
-            perms_response = (
-                supabase.table("profile_permissions")
-                .select("permission")
-                .eq("profile_id", profile_id)
-                .execute()
-            )
-            if perms_response.data:
-                permissions = [p["permission"] for p in perms_response.data]
+async def _load_rbac_data(supabase, user_id: str, use_cache: bool) -> RBACContext | None:
+    """Assemble the context from cached sections, loading the missing ones."""
+    settings = get_settings()
 
-        # =====================================================================
-        # LEVEL 2: Permission Sets (with expiration check) - server.js:237-274
-        # =====================================================================
-        datetime.utcnow().isoformat()
-        perm_sets_response = (
-            supabase.table("user_permission_sets")
-            .select("permission_set_id, expires_at, permission_sets(id, name, is_active)")
-            .eq("user_id", user_id)
-            .execute()
+    try:
+        # Versions are read even when bypassing the cache, to tag what we write
+        cached = await _cache_get_many(
+            [_version_key(user_id, s) for s in RBAC_SECTIONS]
+            + ([_section_key(user_id, s) for s in RBAC_SECTIONS] if use_cache else [])
         )
+        versions = {s: cached.get(_version_key(user_id, s), "0") for s in RBAC_SECTIONS}
 
-        active_permission_sets: list[PermissionSetInfo] = []
-        if perm_sets_response.data:
-            for ups in perm_sets_response.data:
-                perm_set = ups.get("permission_sets") or {}
-
-                # Skip if permission set is inactive - server.js:250
-                if not perm_set.get("is_active"):
-                    continue
-
-                # Skip if expired - server.js:252-256
-                expires_at = ups.get("expires_at")
-                if expires_at and datetime.fromisoformat(expires_at.replace("Z", "+00:00")) < datetime.utcnow():
-                    logger.info(f"[RBAC] Permission set {perm_set.get('name')} expired for user {user_id}")
-                    continue
-
-                active_permission_sets.append(
-                    PermissionSetInfo(
-                        id=perm_set.get("id"),
-                        name=perm_set.get("name"),
-                        expires_at=expires_at,
-                    )
-                )
-
-                # Get permissions from this permission set - server.js:264-272
-                ps_perms_response = (
-                    supabase.table("permission_set_permissions")
-                    .select("permission")
-                    .eq("permission_set_id", perm_set.get("id"))
-                    .execute()
-                )
-                if ps_perms_response.data:
-                    permissions.extend([p["permission"] for p in ps_perms_response.data])
-
-        # =====================================================================
-        # LEVEL 3: Teams & Hierarchy - server.js:276-327
-        # =====================================================================
+        sections: dict[str, Any] = {}
+        for section in RBAC_SECTIONS:
+            entry = cached.get(_section_key(user_id, section))
+            if isinstance(entry, dict) and entry.get("v") == versions[section]:
+                sections[section] = entry["data"]
 
-        # Get user's teams - server.js:280-299
-        teams_response = (
-            supabase.table("team_members")
-            .select("role, teams(id, name, display_name, parent_team_id, is_active)")
-            .eq("user_id", user_id)
-            .execute()
+        missing = [s for s in _SECTION_LOADERS if s not in sections]
+        loaded = await asyncio.gather(
+            *(asyncio.to_thread(_SECTION_LOADERS[s], supabase, user_id) for s in missing)
         )
-
-        teams: list[TeamInfo] = []
-        if teams_response.data:
-            for tm in teams_response.data:
-                team = tm.get("teams") or {}
-                if team.get("is_active"):
-                    teams.append(
-                        TeamInfo(
-                            id=team.get("id"),
-                            name=team.get("name"),
-                            display_name=team.get("display_name"),
-                            role=tm.get("role"),
-                            parent_team_id=team.get("parent_team_id"),
-                        )
-                    )
-
-        # Get subordinates (users where this user is their manager) - server.js:301-308
-        subordinates_response = (
-            supabase.table("users")
-            .select("id")
-            .eq("manager_id", user_id)
-            .eq("is_active", True)
-            .execute()
-        )
-        subordinate_ids = [s["id"] for s in subordinates_response.data or []]
-
-        # Get team members for teams where user is leader - server.js:310-324
-        led_team_ids = [t.id for t in teams if t.role == "leader"]
-        team_member_ids: list[str] = []
-
-        if led_team_ids:
-            team_members_response = (
-                supabase.table("team_members")
-                .select("user_id")
-                .in_("team_id", led_team_ids)
-                .neq("user_id", user_id)
-                .execute()
-            )
-            if team_members_response.data:
-                team_member_ids = [tm["user_id"] for tm in team_members_response.data]
-
-        # Combine subordinates - server.js:326-327
-        all_subordinate_ids = list(set(subordinate_ids + team_member_ids))
-
-        # =====================================================================
-        # LEVEL 4: Sharing Rules & Record Shares - server.js:329-388
-        # =====================================================================
-
-        user_team_ids = [t.id for t in teams]
-
-        # Get record shares - server.js:336-353
-        record_shares = await get_user_record_shares(user_id, user_team_ids)
-        shared_records: dict[str, list[SharedRecordInfo]] = {}
-        for share in record_shares:
-            obj_type = share.get("object_type")
-            if obj_type not in shared_records:
-                shared_records[obj_type] = []
-            shared_records[obj_type].append(
-                SharedRecordInfo(
-                    record_id=share.get("record_id"),
-                    access_level=share.get("access_level"),
-                    shared_by=share.get("shared_by"),
-                    reason=share.get("reason"),
-                )
+        fresh = dict(zip(missing, loaded, strict=True))
+        if "profile" in fresh and fresh["profile"] is None:
+            return None
+        sections.update(fresh)
+
+        profile_name = sections["profile"]["profile"]
+        team_ids = [t["id"] for t in sections["teams"]["teams"]]
+        sharing = sections.get("sharing")
+        if sharing is None or sharing.get("inputs") != _sharing_inputs(profile_name, team_ids):
+            sharing = await _load_sharing(supabase, user_id, profile_name, team_ids)
+            fresh["sharing"] = sharing
+            sections["sharing"] = sharing
+
+        if fresh:
+            await _cache_set_many(
+                {_section_key(user_id, s): {"v": versions[s], "data": data} for s, data in fresh.items()},
+                ttl=settings.RBAC_CACHE_TTL_SECONDS,
             )
-
-        # Get sharing rules - server.js:355-388
-        rules_response = (
-            supabase.table("sharing_rules")
-            .select("*")
-            .eq("is_active", True)
-            .execute()
-        )
-
-        applicable_rules: list[SharingRuleInfo] = []
-        if rules_response.data:
-            for rule in rules_response.data:
-                applies = False
-
-                # Check if rule shares TO this user - server.js:368-375
-                share_to_type = rule.get("share_to_type")
-                share_to_id = rule.get("share_to_id")
-
-                if share_to_type == "all":
-                    applies = True
-                elif share_to_type == "profile" and share_to_id == profile_name:
-                    applies = True
-                elif share_to_type == "team":
-                    try:
-                        if int(share_to_id) in user_team_ids:
-                            applies = True
-                    except (ValueError, TypeError):
-                        pass
-
-                if applies:
-                    applicable_rules.append(
-                        SharingRuleInfo(
-                            id=rule.get("id"),
-                            name=rule.get("name"),
-                            object_type=rule.get("object_type"),
-                            share_from_type=rule.get("share_from_type"),
-                            share_from_id=rule.get("share_from_id"),
-                            access_level=rule.get("access_level"),
-                        )
-                    )
-
-        # =====================================================================
-        # LEVEL 5: Company Access - server.js:390-413
-        # =====================================================================
-        companies_response = (
-            supabase.table("user_companies")
-            .select("company_id, companies(id, code, is_group)")
-            .eq("user_id", user_id)
-            .execute()
-        )
-
-        companies: list[str] = []
-        if companies_response.data:
-            assigned_company_ids = [
-                uc.get("company_id")
-                for uc in companies_response.data
-                if uc.get("company_id")
-            ]
-
-            if assigned_company_ids:
-                # Use recursive CTE to get accessible schemas - server.js:405-412
-                schemas_response = supabase.rpc(
-                    "get_accessible_schemas",
-                    {"p_company_ids": assigned_company_ids}
-                ).execute()
-
-                if schemas_response.data:
-                    companies = [
-                        s.get("schema_name")
-                        for s in schemas_response.data
-                        if s.get("schema_name")
-                    ]
-
-        # Get user IDs accessible via sharing rules - server.js:415-442
-        shared_from_user_ids: list[str] = []
-        for rule in applicable_rules:
-            if rule.share_from_type == "profile":
-                # Get all users with this profile - server.js:420-429
-                profile_users_response = (
-                    supabase.table("users")
-                    .select("id, profiles!inner(name)")
-                    .eq("profiles.name", rule.share_from_id)
-                    .eq("is_active", True)
-                    .execute()
-                )
-                if profile_users_response.data:
-                    shared_from_user_ids.extend([u["id"] for u in profile_users_response.data])
-
-            elif rule.share_from_type == "team":
-                # Get all users in this team - server.js:430-439
-                try:
-                    team_users_response = (
-                        supabase.table("team_members")
-                        .select("user_id")
-                        .eq("team_id", int(rule.share_from_id))
-                        .execute()
-                    )
-                    if team_users_response.data:
-                        shared_from_user_ids.extend([u["user_id"] for u in team_users_response.data])
-                except (ValueError, TypeError):
-                    pass
+            logger.debug(f"[RBAC CACHE] Cached {', '.join(fresh)} for user {user_id}")
+        else:
+            logger.debug(f"[RBAC CACHE] Hit for user {user_id}")
 
         # =====================================================================
-        # Build and cache result - server.js:444-460
+        # Build result - server.js:444-460
         # =====================================================================
-        rbac_context = RBACContext(
-            profile=profile_name,
-            permissions=list(set(permissions)),  # Deduplicate
-            permission_sets=active_permission_sets,
-            teams=teams,
-            manager_id=user_data.get("manager_id"),
-            subordinate_ids=all_subordinate_ids,
-            sharing_rules=applicable_rules,
-            shared_records=shared_records,
-            shared_from_user_ids=list(set(shared_from_user_ids)),
-            companies=companies,
-        )
-
-        # Cache the result (Redis or in-memory fallback)
-        await _cache_set(cache_key, rbac_context.to_dict(), ttl=settings.RBAC_CACHE_TTL_SECONDS)
-        logger.debug(f"[RBAC CACHE] Cached RBAC for user {user_id}")
-
-        return rbac_context
+        return _dict_to_rbac_context({
+            **sections["profile"],
+            **sections["teams"],
+            **sections["sharing"],
+            **sections["companies"],
+            "permissionSets": sections["permission_sets"]["permissionSets"],
+            "permissions": list(set(
+                sections["profile"]["permissions"] + sections["permission_sets"]["permissions"]
+            )),  # Deduplicate
+        })
 
     except Exception as e:
         # Error fetching - reject access for safety - server.js:462-465
@@ -0,0 +1,318 @@
+"""
+Local verification of Supabase access tokens.
+
+Authenticated requests used to call supabase.auth.get_user() (a network
+round trip, run in a thread) before any other work. Access tokens are
+signed JWTs, so the gateway checks them itself:
+
+- ES256/RS256 tokens against the project's JWKS
+  ({supabase_url}/auth/v1/.well-known/jwks.json), cached for
+  AUTH_JWKS_TTL_SECONDS and refetched early when a token names a key id
+  that is not in the cached set
+- HS256 tokens against the project's JWT secret, when configured
+- Claims: exp, iat and sub required; aud "authenticated"; iss the
+  project's auth URL
+
+Verified tokens are remembered in a bounded LRU keyed by the token's
+SHA-256 digest until they expire, so a repeat request costs one hash and
+a dict lookup.
+
+Logout and force-logout record a revocation time per user (shared across
+instances through crm_cache), in whole seconds like the token's iat.
+Tokens issued in an earlier second are rejected.
+Each instance re-reads a user's revocation at most every
+AUTH_REVOCATION_CHECK_SECONDS.
+
+When the gateway has no key source for a token at all (HS256 without a
+configured secret, or no signing keys could be loaded from the JWKS),
+verify() raises NoKeySourceError and the auth middleware calls Supabase,
+so a deployment that has not configured a secret keeps working. A token
+naming a key id missing from a loaded JWKS raises KeyUnknownError; the
+middleware then calls Supabase only if AUTH_REMOTE_FALLBACK is enabled.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+import jwt
+
+from backend.config import get_settings
+
+logger = logging.getLogger("unified-ui")
+
+_ASYMMETRIC_ALGORITHMS = {"ES256", "RS256"}
+_JWKS_MIN_REFRESH_SECONDS = 30  # Unknown kids cannot trigger fetches more often than this
+_REVOCATION_KEY = "auth:revoked:{user_id}"
+
+
+class KeyUnknownError(Exception):
+    """No configured or published key can verify the token."""
+
+
+class NoKeySourceError(KeyUnknownError):
+    """No key of the token's kind is configured or published at all."""
+
+
+@dataclass(frozen=True)
+class VerifiedUser:
+    """
+    User from a verified access token.
+
+    Has the same attributes the middleware reads from a Supabase user
+    (id, email, role, user_metadata).
+    """
+    id: str
+    email: str
+    role: str | None
+    user_metadata: dict[str, Any] | None
+    issued_at: int
+    expires_at: int
+
+
+class TokenVerifier:
+    """Verifies Supabase access tokens locally. One instance per process (see get_token_verifier)."""
+
+    def __init__(
+        self,
+        supabase_url: str,
+        jwt_secret: str | None = None,
+        jwks_ttl: int = 600,
+        cache_size: int = 10000,
+        revocation_check_seconds: int = 5,
+        leeway: int = 0,
+    ):
+        base = supabase_url.rstrip("/")
+        self._issuer = f"{base}/auth/v1"
+        self._jwks_url = f"{base}/auth/v1/.well-known/jwks.json"
+        self._jwt_secret = jwt_secret
+        self._jwks_ttl = jwks_ttl
+        self._cache_size = cache_size
+        self._revocation_check_seconds = revocation_check_seconds
+        self._leeway = leeway
+
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._keys_fetched_at = 0.0
+        self._keys_attempted_at = 0.0
+        self._keys_lock = asyncio.Lock()
+
+        # digest -> VerifiedUser, least recently used first
+        self._verified: OrderedDict[bytes, VerifiedUser] = OrderedDict()
+        # user_id -> (checked_at, revoked_at or 0)
+        self._revocations: dict[str, tuple[float, int]] = {}
+
+        self._stats = {"hits": 0, "verified": 0, "invalid": 0, "key_unknown": 0, "revoked": 0, "jwks_fetches": 0}
+
+    # =========================================================================
+    # VERIFICATION
+    # =========================================================================
+
+    async def verify(self, token: str) -> VerifiedUser | None:
+        """
+        Verify an access token.
+
+        Returns:
+            The token's user, or None if the token is invalid, expired or revoked
+
+        Raises:
+            NoKeySourceError: If no key of the token's kind is available
+            KeyUnknownError: If the token names a key that is not available
+        """
+        digest = hashlib.sha256(token.encode()).digest()
+        user = self._verified.get(digest)
+
+        if user is not None:
+            if user.expires_at + self._leeway <= time.time():
+                self._verified.pop(digest, None)
+                self._stats["invalid"] += 1
+                return None
+            self._verified.move_to_end(digest)
+            self._stats["hits"] += 1
+        else:
+            user = await self._verify_signature(token)
+            if user is None:
+                self._stats["invalid"] += 1
+                return None
+            self._stats["verified"] += 1
+            self._verified[digest] = user
+            if len(self._verified) > self._cache_size:
+                self._verified.popitem(last=False)
+
+        # iat has whole-second resolution: a token issued in the second of
+        # the revocation is kept, so signing in again right after a logout works
+        if user.issued_at < await self._revoked_at(user.id):
+            self._stats["revoked"] += 1
+            return None
+        return user
+
+    async def _verify_signature(self, token: str) -> VerifiedUser | None:
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.InvalidTokenError:
+            return None
+
+        alg = header.get("alg")
+        if alg == "HS256":
+            if not self._jwt_secret:
+                self._stats["key_unknown"] += 1
+                raise NoKeySourceError("HS256 token but no Supabase JWT secret is configured")
+            key: Any = self._jwt_secret
+        elif alg in _ASYMMETRIC_ALGORITHMS:
+            key = await self._signing_key(header.get("kid"))
+            if key is None:
+                self._stats["key_unknown"] += 1
+                if not self._keys:
+                    raise NoKeySourceError("No signing keys loaded from the JWKS")
+                raise KeyUnknownError(f"Unknown signing key: {header.get('kid')}")
+        else:
+            logger.debug(f"[TOKEN] Rejecting token with algorithm {alg!r}")
+            return None
+
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=[alg],
+                audience="authenticated",
+                issuer=self._issuer,
+                leeway=self._leeway,
+                options={"require": ["exp", "iat", "sub"]},
+            )
+        except jwt.InvalidTokenError as e:
+            logger.debug(f"[TOKEN] Invalid token: {e}")
+            return None
+
+        return VerifiedUser(
+            id=claims["sub"],
+            email=claims.get("email") or "",
+            role=claims.get("role"),
+            user_metadata=claims.get("user_metadata"),
+            issued_at=int(claims["iat"]),
+            expires_at=int(claims["exp"]),
+        )
+
+    # =========================================================================
+    # SIGNING KEYS
+    # =========================================================================
+
+    async def _signing_key(self, kid: str | None) -> Any | None:
+        """Get the public key for a key id, refreshing the JWKS when stale or the kid is new."""
+        now = time.time()
+        stale = now - self._keys_fetched_at > self._jwks_ttl
+        if (stale or kid not in self._keys) and now - self._keys_attempted_at > _JWKS_MIN_REFRESH_SECONDS:
+            async with self._keys_lock:
+                # Another request may have fetched while we waited
+                if self._keys_attempted_at < now:
+                    await self._fetch_jwks()
+
+        jwk = self._keys.get(kid) if kid else None
+        if jwk is None and not kid and len(self._keys) == 1:
+            jwk = next(iter(self._keys.values()))
+        return jwk.key if jwk is not None else None
+
+    async def _fetch_jwks(self) -> None:
+        self._keys_attempted_at = time.time()
+        self._stats["jwks_fetches"] += 1
+        try:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                response = await client.get(self._jwks_url)
+                response.raise_for_status()
+                data = response.json()
+        except Exception as e:
+            # Keep serving the keys we have; retried after the minimum interval
+            logger.warning(f"[TOKEN] Failed to fetch JWKS: {e}")
+            return
+
+        keys: dict[str, jwt.PyJWK] = {}
+        for entry in data.get("keys", []):
+            try:
+                keys[entry.get("kid", "")] = jwt.PyJWK(entry)
+            except (jwt.PyJWKError, jwt.InvalidKeyError) as e:
+                logger.debug(f"[TOKEN] Skipping JWKS entry {entry.get('kid')}: {e}")
+
+        self._keys = keys
+        self._keys_fetched_at = time.time()
+        logger.info(f"[TOKEN] Loaded {len(keys)} signing key(s) from JWKS")
+
+    # =========================================================================
+    # REVOCATION
+    # =========================================================================
+
+    async def _revoked_at(self, user_id: str) -> int:
+        now = time.time()
+        cached = self._revocations.get(user_id)
+        if cached is not None and now - cached[0] < self._revocation_check_seconds:
+            return cached[1]
+
+        revoked_at = cached[1] if cached else 0
+        cache = _get_cache()
+        if cache is not None:
+            try:
+                value = await cache.get(_REVOCATION_KEY.format(user_id=user_id))
+                revoked_at = max(revoked_at, int(float(value or 0)))
+            except Exception as e:
+                logger.debug(f"[TOKEN] Revocation lookup failed: {e}")
+
+        self._revocations[user_id] = (now, revoked_at)
+        if len(self._revocations) > self._cache_size:
+            self._revocations.pop(next(iter(self._revocations)))
+        return revoked_at
+
+    async def revoke_user(self, user_id: str, ttl: int) -> None:
+        """Reject every token issued to the user before this second (on all instances)."""
+        now = time.time()
+        revoked_at = int(now)
+        self._revocations[user_id] = (now, revoked_at)
+        for digest in [d for d, u in self._verified.items() if u.id == user_id]:
+            del self._verified[digest]
+
+        cache = _get_cache()
+        if cache is not None:
+            try:
+                await cache.set(_REVOCATION_KEY.format(user_id=user_id), revoked_at, ttl=ttl)
+            except Exception as e:
+                logger.warning(f"[TOKEN] Failed to share revocation for {user_id}: {e}")
+
+    def stats(self) -> dict[str, int]:
+        """Counters plus current cache sizes."""
+        return {**self._stats, "cached_tokens": len(self._verified), "signing_keys": len(self._keys)}
+
+
+def _get_cache():
+    try:
+        from crm_cache import get_cache
+        return get_cache()
+    except Exception:
+        return None
+
+
+_verifier: TokenVerifier | None = None
+
+
+def get_token_verifier() -> TokenVerifier | None:
+    """Get the process-wide verifier, or None if Supabase is not configured."""
+    global _verifier
+    if _verifier is None:
+        settings = get_settings()
+        if not settings.supabase_url:
+            return None
+        _verifier = TokenVerifier(
+            supabase_url=settings.supabase_url,
+            jwt_secret=settings.supabase_jwt_secret,
+            jwks_ttl=settings.AUTH_JWKS_TTL_SECONDS,
+            cache_size=settings.AUTH_TOKEN_CACHE_SIZE,
+            revocation_check_seconds=settings.AUTH_REVOCATION_CHECK_SECONDS,
+        )
+    return _verifier
+
+
+async def revoke_user_tokens(user_id: str) -> None:
+    """Revoke a user's current access tokens (call on logout / force-logout)."""
+    verifier = get_token_verifier()
+    if verifier is not None:
+        await verifier.revoke_user(user_id, ttl=get_settings().AUTH_REVOCATION_TTL_SECONDS)
@@ -0,0 +1 @@
+"""Test suite for the Unified UI gateway."""
@@ -0,0 +1,220 @@
+"""
+Tests for the gateway's company hierarchy cache (backend/services/company_hierarchy.py).
+
+These tests verify:
+- expand() grants a group's active leaf companies, through active groups
+  only, keeps leaves as they are and drops unknown or inactive codes
+- The tree is loaded once, by one request even when many arrive together
+- An expired tree is revalidated in the background with If-None-Match:
+  a 304 keeps it, a new version replaces it
+- A failed or empty first load is not cached and is retried only after
+  COMPANY_HIERARCHY_RETRY_SECONDS; a failed refresh keeps the current tree
+- The auth middleware expands a user's companies from the cached tree
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from backend.config import get_settings
+from backend.middleware import auth
+from backend.services import company_hierarchy
+from backend.services.company_hierarchy import CompanyHierarchy
+
+ASSET_MANAGEMENT_URL = "http://asset-management"
+
+COMPANIES = [
+    {"id": 1, "code": "mmg", "is_group": True, "parent_id": None},
+    {"id": 2, "code": "backlite", "is_group": True, "parent_id": 1},
+    {"id": 3, "code": "backlite_dubai", "is_group": False, "parent_id": 2},
+    {"id": 4, "code": "backlite_uk", "is_group": False, "parent_id": 2},
+    {"id": 5, "code": "backlite_closed", "is_group": False, "parent_id": 2, "is_active": False},
+    {"id": 6, "code": "viola", "is_group": False, "parent_id": 1},
+    {"id": 7, "code": "dormant", "is_group": True, "parent_id": 1, "is_active": False},
+    {"id": 8, "code": "dormant_leaf", "is_group": False, "parent_id": 7},
+]
+
+
+class TestExpand:
+    """CompanyHierarchy.expand()."""
+
+    @pytest.fixture
+    def hierarchy(self) -> CompanyHierarchy:
+        return CompanyHierarchy(COMPANIES, "v1")
+
+    def test_group_expands_to_active_leaves(self, hierarchy):
+        assert hierarchy.expand(["backlite"]) == ["backlite_dubai", "backlite_uk"]
+
+    def test_nested_groups_skip_inactive_branches(self, hierarchy):
+        assert hierarchy.expand(["mmg"]) == ["backlite_dubai", "backlite_uk", "viola"]
+
+    def test_leaf_is_kept(self, hierarchy):
+        assert hierarchy.expand(["viola"]) == ["viola"]
+
+    def test_unknown_and_inactive_codes_are_dropped(self, hierarchy):
+        assert hierarchy.expand(["nope", "backlite_closed", "dormant"]) == []
+
+    def test_overlapping_codes_are_deduplicated_and_sorted(self, hierarchy):
+        assert hierarchy.expand(["viola", "backlite_uk", "backlite"]) == ["backlite_dubai", "backlite_uk", "viola"]
+
+
+class Clock:
+    """Replaces time.monotonic() in the hierarchy module."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "ASSET_MANAGEMENT_URL", ASSET_MANAGEMENT_URL)
+    monkeypatch.setattr(settings, "COMPANY_HIERARCHY_TTL_SECONDS", 300)
+    monkeypatch.setattr(settings, "COMPANY_HIERARCHY_RETRY_SECONDS", 10)
+    return settings
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(company_hierarchy, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+@pytest.fixture
+def server(monkeypatch, settings, clock):
+    """Serve /api/companies/hierarchy from a mutable tree, recording requests."""
+    server = SimpleNamespace(companies=COMPANIES, version="v1", status=None, requests=[])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        server.requests.append(request)
+        if server.status is not None:
+            return httpx.Response(server.status)
+        if request.headers.get("if-none-match") == f'"{server.version}"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            json={"hierarchy": server.companies, "version": server.version},
+            headers={"ETag": f'"{server.version}"'},
+        )
+
+    monkeypatch.setattr(company_hierarchy, "_hierarchy", None)
+    monkeypatch.setattr(company_hierarchy, "_loaded_at", 0.0)
+    monkeypatch.setattr(company_hierarchy, "_failed_at", None)
+    monkeypatch.setattr(company_hierarchy, "_refresh_task", None)
+    monkeypatch.setattr(company_hierarchy, "_load_lock", asyncio.Lock())
+    monkeypatch.setattr(
+        company_hierarchy, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    return server
+
+
+async def refreshed():
+    """Wait for a background refresh started by get_company_hierarchy()."""
+    task = company_hierarchy._refresh_task
+    if task is not None:
+        await task
+
+
+class TestGetCompanyHierarchy:
+    """Loading and refreshing the cached tree."""
+
+    async def test_loads_once(self, server):
+        first = await company_hierarchy.get_company_hierarchy()
+        second = await company_hierarchy.get_company_hierarchy()
+
+        assert first is second
+        assert first.version == "v1"
+        assert len(server.requests) == 1
+        assert str(server.requests[0].url) == f"{ASSET_MANAGEMENT_URL}/api/companies/hierarchy"
+
+    async def test_concurrent_first_requests_share_one_load(self, server):
+        results = await asyncio.gather(*[company_hierarchy.get_company_hierarchy() for _ in range(10)])
+
+        assert len({id(result) for result in results}) == 1
+        assert len(server.requests) == 1
+
+    async def test_unchanged_tree_is_revalidated_with_304(self, server, clock):
+        hierarchy = await company_hierarchy.get_company_hierarchy()
+
+        clock.now += 301
+        assert await company_hierarchy.get_company_hierarchy() is hierarchy
+        await refreshed()
+
+        assert server.requests[-1].headers["if-none-match"] == '"v1"'
+        assert await company_hierarchy.get_company_hierarchy() is hierarchy
+        assert len(server.requests) == 2
+
+    async def test_version_bump_replaces_tree(self, server, clock):
+        await company_hierarchy.get_company_hierarchy()
+        server.companies = [*COMPANIES, {"id": 9, "code": "backlite_ksa", "is_group": False, "parent_id": 2}]
+        server.version = "v2"
+
+        clock.now += 301
+        # The expired tree is served while the refresh runs
+        stale = await company_hierarchy.get_company_hierarchy()
+        assert "backlite_ksa" not in stale.expand(["backlite"])
+        await refreshed()
+
+        fresh = await company_hierarchy.get_company_hierarchy()
+        assert fresh.version == "v2"
+        assert fresh.expand(["backlite"]) == ["backlite_dubai", "backlite_ksa", "backlite_uk"]
+
+    async def test_failed_refresh_keeps_current_tree(self, server, clock):
+        hierarchy = await company_hierarchy.get_company_hierarchy()
+        server.status = 503
+
+        clock.now += 301
+        await company_hierarchy.get_company_hierarchy()
+        await refreshed()
+
+        assert await company_hierarchy.get_company_hierarchy() is hierarchy
+        # Not retried on every request: the failure counts as a load
+        assert company_hierarchy._refresh_task.done()
+        assert len(server.requests) == 2
+
+    @pytest.mark.parametrize("failure", ["error", "empty"])
+    async def test_failed_first_load_is_retried_after_delay(self, server, clock, failure):
+        if failure == "error":
+            server.status = 500
+        else:
+            server.companies = []
+
+        assert await company_hierarchy.get_company_hierarchy() is None
+        assert await company_hierarchy.get_company_hierarchy() is None
+        assert len(server.requests) == 1
+
+        server.status, server.companies = None, COMPANIES
+        clock.now += 10
+        assert (await company_hierarchy.get_company_hierarchy()).version == "v1"
+        assert len(server.requests) == 2
+
+    async def test_invalidate_forces_reload(self, server):
+        await company_hierarchy.get_company_hierarchy()
+        company_hierarchy.invalidate_company_hierarchy()
+
+        await company_hierarchy.get_company_hierarchy()
+        assert len(server.requests) == 2
+        assert "if-none-match" not in server.requests[1].headers
+
+
+class TestMiddlewareExpansion:
+    """backend.middleware.auth._expand_companies_for_hierarchy()."""
+
+    async def test_expands_from_cached_tree(self, server):
+        assert await auth._expand_companies_for_hierarchy(["backlite", "viola"]) == [
+            "backlite_dubai",
+            "backlite_uk",
+            "viola",
+        ]
+        assert await auth._expand_companies_for_hierarchy(["mmg"]) == ["backlite_dubai", "backlite_uk", "viola"]
+        assert len(server.requests) == 1
+
+    async def test_falls_back_to_codes_without_tree(self, server):
+        server.status = 503
+        assert await auth._expand_companies_for_hierarchy(["backlite"]) == ["backlite"]
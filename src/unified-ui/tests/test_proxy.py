@@ -0,0 +1,379 @@
+"""
+Tests for the streaming proxy (backend/routers/proxy.py) and the backends'
+view of the headers it sends.
+
+These tests verify:
+- Request bodies are forwarded chunk by chunk (chunked without a
+  Content-Length) and response chunks are relayed as they arrive
+- Hop-by-hop headers are not relayed, and SSE responses get no-buffering
+  headers
+- The backend response is closed when the client disconnects mid-stream
+- The X-Trusted-User-Context token built by the gateway is accepted by
+  crm_security's parse_context_token() and TrustedUserMiddleware, and
+  tampered, expired and other-user tokens are rejected
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from crm_security import TrustedUserMiddleware, encode_context_token, get_user_context, parse_context_token
+from crm_security.config import security_config
+from fastapi import FastAPI
+
+from backend.config import get_settings
+from backend.middleware.auth import TrustedUser, get_trusted_user
+from backend.routers import proxy
+
+SALES_MODULE_URL = "http://sales-module"
+SECRET = "test-proxy-secret"
+
+USER = TrustedUser(
+    id="user-1",
+    email="lead@example.com",
+    name="Lead",
+    profile="sales_manager",
+    permissions=["sales:proposals:read", "assets:locations:read"],
+    permission_sets=[{"id": 1, "name": "assets", "expiresAt": None}],
+    teams=[{"id": 10, "name": "north", "role": "leader"}],
+    team_ids=[10],
+    manager_id="user-0",
+    subordinate_ids=["report-1", "member-1"],
+    sharing_rules=[],
+    shared_records={"proposal": [{"recordId": "p-1", "accessLevel": "read"}]},
+    shared_from_user_ids=["rep-1"],
+    companies=["backlite_dubai", "backlite_uk"],
+)
+
+
+class Upstream(httpx.AsyncBaseTransport):
+    """Backend stand-in that hands requests to `handler` with their body unread."""
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.handler(request)
+
+
+class UpstreamBody(httpx.AsyncByteStream):
+    """Backend response body: yields `chunks`, then waits for `gate` (if any) before ending."""
+
+    def __init__(self, chunks: list[bytes], gate: asyncio.Event | None = None):
+        self.chunks = chunks
+        self.gate = gate
+        self.closed = False
+
+    async def __aiter__(self):
+        for n, chunk in enumerate(self.chunks):
+            yield chunk
+            if n == 0 and self.gate is not None:
+                await self.gate.wait()
+
+    async def aclose(self) -> None:
+        # Releasing a pooled connection yields to the event loop
+        await asyncio.sleep(0)
+        self.closed = True
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "SALES_MODULE_URL", SALES_MODULE_URL)
+    monkeypatch.setattr(settings, "PROXY_SECRET", SECRET)
+    monkeypatch.setattr(settings, "PROXY_LEGACY_CONTEXT_HEADERS", False)
+    return settings
+
+
+@pytest.fixture
+def gateway(settings) -> FastAPI:
+    app = FastAPI()
+    app.include_router(proxy.router)
+    app.dependency_overrides[get_trusted_user] = lambda: USER
+    return app
+
+
+@pytest.fixture
+def use_upstream(monkeypatch):
+    """Send proxied requests to an ASGI app or an async handler."""
+    def _use(app=None, handler=None) -> None:
+        transport = httpx.ASGITransport(app=app) if app is not None else Upstream(handler)
+        monkeypatch.setattr(proxy, "_proxy_client", httpx.AsyncClient(transport=transport))
+    return _use
+
+
+def respond(body: UpstreamBody, status_code: int = 200, headers: dict[str, str] | None = None):
+    """Handler answering every request with `body`, streamed like a real backend response."""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(status_code, headers=headers, stream=body)
+    return handler
+
+
+JSON_OK = {"content-type": "application/json"}
+
+
+def client_for(app: FastAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway")
+
+
+def http_scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"gateway")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("gateway", 80),
+    }
+
+
+def client_receive(disconnect: asyncio.Event | None = None):
+    """ASGI receive for a GET: no body, then a disconnect once `disconnect` is set (never if None)."""
+    requested = False
+
+    async def receive() -> dict:
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await (disconnect or asyncio.Event()).wait()
+        return {"type": "http.disconnect"}
+
+    return receive
+
+
+def response_bodies(messages: list[dict]) -> list[bytes]:
+    return [m["body"] for m in messages if m["type"] == "http.response.body" and m.get("body")]
+
+
+class TestStreaming:
+    """_proxy_request() body streaming."""
+
+    async def test_chunked_request_body_is_forwarded_in_chunks(self, gateway, use_upstream):
+        received = {}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            received["url"] = str(request.url)
+            received["headers"] = request.headers
+            received["chunks"] = [chunk async for chunk in request.stream if chunk]
+            return httpx.Response(201, headers=JSON_OK, stream=UpstreamBody([b'{"ok": true}']))
+
+        use_upstream(handler=handler)
+        parts = [b"a" * 1000, b"b" * 1000, b"c"]
+
+        async def upload():
+            for part in parts:
+                yield part
+
+        async with client_for(gateway) as client:
+            response = await client.post(
+                "/api/sales/files?folder=1", content=upload(), headers={"content-type": "application/octet-stream"}
+            )
+
+        assert response.status_code == 201
+        assert response.json() == {"ok": True}
+        assert received["url"] == f"{SALES_MODULE_URL}/api/files?folder=1"
+        assert received["chunks"] == parts
+        assert received["headers"]["transfer-encoding"] == "chunked"
+        assert "content-length" not in received["headers"]
+        assert received["headers"]["content-type"] == "application/octet-stream"
+
+    async def test_sized_request_body_keeps_content_length(self, gateway, use_upstream):
+        received = {}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            received["headers"] = request.headers
+            received["body"] = b"".join([chunk async for chunk in request.stream])
+            return httpx.Response(200, stream=UpstreamBody([]))
+
+        use_upstream(handler=handler)
+        async with client_for(gateway) as client:
+            await client.put("/api/sales/files/1", content=b"x" * 5000)
+
+        assert received["headers"]["content-length"] == "5000"
+        assert received["body"] == b"x" * 5000
+
+    async def test_response_headers(self, gateway, use_upstream):
+        body = UpstreamBody([b"data: 1\n\n", b"data: 2\n\n"])
+        use_upstream(handler=respond(body, headers={
+            "content-type": "text/event-stream; charset=utf-8",
+            "connection": "keep-alive",
+            "keep-alive": "timeout=5",
+            "x-request-id": "abc",
+        }))
+
+        async with client_for(gateway) as client:
+            response = await client.get("/api/sales/chat/stream")
+
+        assert response.text == "data: 1\n\ndata: 2\n\n"
+        assert response.headers["x-request-id"] == "abc"
+        assert "connection" not in response.headers
+        assert "keep-alive" not in response.headers
+        assert response.headers["x-accel-buffering"] == "no"
+        assert response.headers["cache-control"] == "no-cache"
+        assert body.closed
+
+    async def test_json_response_is_not_marked_as_stream(self, gateway, use_upstream):
+        use_upstream(handler=respond(UpstreamBody([b'{"ok": true}']), headers=JSON_OK))
+
+        async with client_for(gateway) as client:
+            response = await client.get("/api/sales/health")
+
+        assert response.json() == {"ok": True}
+        assert "x-accel-buffering" not in response.headers
+
+    async def test_chunks_are_relayed_as_they_arrive(self, gateway, use_upstream):
+        # The backend only finishes once the client has the first chunk
+        gate = asyncio.Event()
+        body = UpstreamBody([b"first", b"second"], gate)
+        use_upstream(handler=respond(body))
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+            if message.get("body") == b"first":
+                gate.set()
+
+        await asyncio.wait_for(gateway(http_scope("/api/sales/chat/stream"), client_receive(), send), 5)
+
+        assert response_bodies(sent) == [b"first", b"second"]
+        assert body.closed
+
+    async def test_client_disconnect_closes_upstream(self, gateway, use_upstream):
+        # The backend never finishes on its own
+        body = UpstreamBody([b"first", b"never sent"], asyncio.Event())
+        use_upstream(handler=respond(body))
+        first_sent = asyncio.Event()
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+            if message.get("body"):
+                first_sent.set()
+
+        await asyncio.wait_for(gateway(http_scope("/api/sales/chat/stream"), client_receive(first_sent), send), 5)
+
+        assert response_bodies(sent) == [b"first"]
+        assert body.closed
+
+
+def consumer_app() -> FastAPI:
+    """A backend behind the gateway, reading the user through crm_security."""
+    app = FastAPI()
+    app.add_middleware(TrustedUserMiddleware)
+
+    @app.get("/api/me")
+    async def me():
+        ctx = get_user_context()
+        if ctx is None:
+            return None
+        return {
+            "user_id": ctx["user_id"],
+            "profile": ctx["profile"],
+            "permissions": ctx["permissions"],
+            "subordinate_ids": ctx["subordinate_ids"],
+            "shared_records": ctx["shared_records"],
+            "companies": ctx["companies"],
+        }
+
+    return app
+
+
+@pytest.fixture
+def consumer(monkeypatch) -> FastAPI:
+    monkeypatch.setattr(security_config, "proxy_secret", SECRET)
+    return consumer_app()
+
+
+def trusted_headers(**overrides) -> dict[str, str]:
+    headers = {key.lower(): value for key, value in proxy._build_trusted_headers(USER, SECRET).items()}
+    headers.update(overrides)
+    return headers
+
+
+def context_of(user: TrustedUser, **changes) -> dict:
+    return {
+        "permissions": user.permissions,
+        "subordinate_ids": user.subordinate_ids,
+        "shared_records": user.shared_records,
+        "companies": user.companies,
+        **changes,
+    }
+
+
+class TestContextTokenConsumers:
+    """The gateway's context token as read by crm_security."""
+
+    async def test_backend_reads_gateway_context(self, settings, gateway, use_upstream, consumer):
+        use_upstream(app=consumer)
+
+        async with client_for(gateway) as client:
+            response = await client.get("/api/sales/me")
+
+        assert response.json() == {
+            "user_id": USER.id,
+            "profile": USER.profile,
+            "permissions": USER.permissions,
+            "subordinate_ids": USER.subordinate_ids,
+            "shared_records": USER.shared_records,
+            "companies": USER.companies,
+        }
+
+    def test_parse_context_token_accepts_gateway_headers(self, settings):
+        ctx = parse_context_token(trusted_headers(), SECRET, 300)
+
+        assert ctx["id"] == USER.id
+        assert ctx["email"] == USER.email
+        assert ctx["team_ids"] == USER.team_ids
+        assert ctx["manager_id"] == USER.manager_id
+        assert ctx["permission_sets"] == USER.permission_sets
+
+    def test_tampered_token_is_rejected(self, settings):
+        token = trusted_headers()["x-trusted-user-context"].split(".")
+        # Swap in the permissions of another, validly signed token
+        other = encode_context_token(USER.id, context_of(USER, permissions=["*:*:*"]), SECRET).split(".")
+        token[2] = other[2]
+
+        assert parse_context_token(trusted_headers(**{"x-trusted-user-context": ".".join(token)}), SECRET, 300) is None
+
+    def test_other_users_token_is_rejected(self, settings):
+        # A valid token only vouches for the user it was issued to
+        assert parse_context_token(trusted_headers(**{"x-trusted-user-id": "user-2"}), SECRET, 300) is None
+
+    def test_expired_token_is_rejected(self, settings):
+        max_age = security_config.context_token_max_age_seconds
+        expired = encode_context_token(USER.id, context_of(USER), SECRET, issued_at=int(time.time()) - max_age - 1)
+
+        assert parse_context_token(trusted_headers(**{"x-trusted-user-context": expired}), SECRET, max_age) is None
+
+    @pytest.mark.parametrize("change", ["forged", "expired", "other_user"])
+    async def test_middleware_leaves_bad_tokens_unauthenticated(self, settings, consumer, change):
+        if change == "forged":
+            headers = trusted_headers(**{"x-trusted-user-context": encode_context_token(
+                USER.id, context_of(USER, companies=["viola"]), "another-secret"
+            )})
+        elif change == "expired":
+            headers = trusted_headers(**{"x-trusted-user-context": encode_context_token(
+                USER.id, context_of(USER), SECRET, issued_at=int(time.time()) - 3600
+            )})
+        else:
+            headers = trusted_headers(**{"x-trusted-user-id": "user-2"})
+
+        async with client_for(consumer) as client:
+            response = await client.get("/api/me", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json() is None
+
+    async def test_middleware_rejects_wrong_proxy_secret(self, settings, consumer):
+        async with client_for(consumer) as client:
+            response = await client.get("/api/me", headers=trusted_headers(**{"x-proxy-secret": "guess"}))
+
+        assert response.status_code == 403
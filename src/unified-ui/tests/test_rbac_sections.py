@@ -0,0 +1,339 @@
+"""
+Tests for sectioned RBAC loading (backend/services/rbac_service.py).
+
+These tests verify:
+- Permissions are the deduplicated union of profile and permission set
+  permissions; inactive and expired permission sets are left out
+- Teams, subordinates, sharing rules and companies are resolved from
+  their tables, and an inactive or missing user gets no context
+- A warm call makes no queries; invalidating a section refetches only that
+  section, and sharing only when the teams or profile it was built from
+  changed
+- Concurrent calls for a user share one load, and a load racing an
+  invalidation cannot write stale data back
+
+Supabase is replaced by a fake answering per (table, first filter column),
+with the in-memory RBAC cache.
+"""
+
+import asyncio
+import copy
+import threading
+from collections import Counter
+
+import pytest
+
+from backend.services import rbac_service
+
+USER_ID = "user-1"
+
+
+class ByValue(dict):
+    """Rows per filter value; an in_() filter gets the rows of every value."""
+
+
+ROWS = {
+    ("users", "id"): {
+        "id": USER_ID, "email": "lead@example.com", "name": "Lead", "profile_id": 1,
+        "is_active": True, "manager_id": "user-0",
+        "profiles": {"id": 1, "name": "sales_manager", "display_name": "Sales Manager"},
+    },
+    ("profile_permissions", "profile_id"): [
+        {"permission": "sales:proposals:read"},
+        {"permission": "sales:bookings:read"},
+    ],
+    ("user_permission_sets", "user_id"): [
+        {"permission_set_id": 1, "expires_at": None,
+         "permission_sets": {"id": 1, "name": "assets", "is_active": True}},
+        {"permission_set_id": 2, "expires_at": None,
+         "permission_sets": {"id": 2, "name": "retired", "is_active": False}},
+        {"permission_set_id": 3, "expires_at": "2020-01-01T00:00:00Z",
+         "permission_sets": {"id": 3, "name": "expired", "is_active": True}},
+        {"permission_set_id": 4, "expires_at": "2999-01-01T00:00:00Z",
+         "permission_sets": {"id": 4, "name": "temporary", "is_active": True}},
+    ],
+    ("permission_set_permissions", "permission_set_id"): ByValue({
+        1: [{"permission": "assets:locations:read"}, {"permission": "sales:proposals:read"}],
+        2: [{"permission": "core:*:*"}],
+        3: [{"permission": "core:users:manage"}],
+        4: [{"permission": "sales:bookings:update"}],
+    }),
+    ("team_members", "user_id"): [
+        {"role": "leader", "teams": {"id": 10, "name": "north", "display_name": "North",
+                                     "parent_team_id": None, "is_active": True}},
+        {"role": "member", "teams": {"id": 11, "name": "all", "display_name": "All",
+                                     "parent_team_id": None, "is_active": True}},
+        {"role": "member", "teams": {"id": 12, "name": "old", "display_name": "Old",
+                                     "parent_team_id": 11, "is_active": False}},
+    ],
+    ("users", "manager_id"): [{"id": "report-1"}, {"id": "report-2"}],
+    ("team_members", "team_id"): ByValue({
+        10: [{"user_id": "member-1"}, {"user_id": "report-1"}],
+        11: [{"user_id": "peer-1"}],
+        12: [{"user_id": "peer-2"}],
+    }),
+    ("record_shares", "shared_with_user_id"): [
+        {"object_type": "proposal", "record_id": "p-1", "access_level": "read",
+         "shared_by": "user-9", "reason": None},
+    ],
+    ("record_shares", "shared_with_team_id"): ByValue({
+        10: [{"object_type": "booking", "record_id": "b-1", "access_level": "read_write",
+              "shared_by": "user-8", "reason": "cover"}],
+    }),
+    ("sharing_rules", "is_active"): [
+        {"id": 1, "name": "everyone", "object_type": "proposal", "share_from_type": "profile",
+         "share_from_id": "sales_user", "share_to_type": "all", "share_to_id": None, "access_level": "read"},
+        {"id": 2, "name": "managers", "object_type": "proposal", "share_from_type": "team",
+         "share_from_id": "11", "share_to_type": "profile", "share_to_id": "sales_manager", "access_level": "read"},
+        {"id": 3, "name": "north", "object_type": "booking", "share_from_type": "team",
+         "share_from_id": "12", "share_to_type": "team", "share_to_id": "10", "access_level": "read"},
+        {"id": 4, "name": "reps", "object_type": "proposal", "share_from_type": "team",
+         "share_from_id": "11", "share_to_type": "profile", "share_to_id": "sales_user", "access_level": "read"},
+        {"id": 5, "name": "south", "object_type": "booking", "share_from_type": "team",
+         "share_from_id": "11", "share_to_type": "team", "share_to_id": "99", "access_level": "read"},
+    ],
+    ("users", "profiles.name"): ByValue({"sales_user": [{"id": "rep-1"}, {"id": "rep-2"}]}),
+    ("user_companies", "user_id"): [
+        {"company_id": 1, "companies": {"id": 1, "code": "backlite", "is_group": True}},
+    ],
+    ("rpc", "get_accessible_schemas"): [{"schema_name": "backlite_dubai"}, {"schema_name": "backlite_uk"}],
+}
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, client: "FakeSupabase", table: str):
+        self._client = client
+        self._table = table
+        self._column: str | None = None
+        self._value = None
+        self._single = False
+
+    def _filter(self, column, value=None, *_args):
+        if self._column is None:
+            self._column = column
+            self._value = value
+        return self
+
+    eq = neq = in_ = _filter
+
+    def select(self, *_args):
+        return self
+
+    def or_(self, *_args):
+        return self
+
+    def single(self):
+        self._single = True
+        return self
+
+    def execute(self) -> _Result:
+        rows = self._client.query(self._table, self._column, self._value)
+        if self._single:
+            return _Result(rows)
+        return _Result(rows if isinstance(rows, list) else [rows])
+
+
+class _Rpc:
+    def __init__(self, client: "FakeSupabase", name: str):
+        self._client = client
+        self._name = name
+
+    def execute(self) -> _Result:
+        return _Result(self._client.query("rpc", self._name, None))
+
+
+class FakeSupabase:
+    """Answers the RBAC queries from its own copy of ROWS, counting them per key."""
+
+    def __init__(self):
+        self.rows = copy.deepcopy(ROWS)
+        self.counts: Counter = Counter()
+        self._held: dict[tuple, tuple[threading.Event, threading.Event]] = {}
+        self._lock = threading.Lock()
+
+    def hold(self, key: tuple) -> tuple[threading.Event, threading.Event]:
+        """Block queries for key until released; returns (entered, release)."""
+        self._held[key] = (threading.Event(), threading.Event())
+        return self._held[key]
+
+    def query(self, table: str, column: str | None, value):
+        key = (table, column)
+        with self._lock:
+            self.counts[key] += 1
+        rows = self.rows[key]
+        if isinstance(rows, ByValue):
+            values = value if isinstance(value, list) else [value]
+            rows = [row for v in values for row in rows.get(v, [])]
+        rows = copy.deepcopy(rows)
+        # Held queries have read their rows, as if the response were in transit
+        if key in self._held:
+            entered, release = self._held[key]
+            entered.set()
+            release.wait(5)
+        return rows
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+    def rpc(self, name: str, _params=None) -> _Rpc:
+        return _Rpc(self, name)
+
+
+@pytest.fixture
+def supabase(monkeypatch) -> FakeSupabase:
+    fake = FakeSupabase()
+    monkeypatch.setattr(rbac_service, "get_supabase", lambda: fake)
+    monkeypatch.setattr(rbac_service, "_get_cache", lambda: None)
+    monkeypatch.setattr(rbac_service, "_rbac_cache_fallback", {})
+    monkeypatch.setattr(rbac_service, "_inflight", {})
+    return fake
+
+
+class TestSectionResolution:
+    """What each section contributes to the context."""
+
+    async def test_permissions_are_deduplicated_union(self, supabase):
+        context = await rbac_service.get_user_rbac_data(USER_ID)
+
+        assert context.profile == "sales_manager"
+        assert sorted(context.permissions) == [
+            "assets:locations:read",
+            "sales:bookings:read",
+            "sales:bookings:update",
+            "sales:proposals:read",
+        ]
+
+    async def test_inactive_and_expired_permission_sets_are_excluded(self, supabase):
+        context = await rbac_service.get_user_rbac_data(USER_ID)
+
+        assert [(ps.id, ps.expires_at) for ps in context.permission_sets] == [
+            (1, None),
+            (4, "2999-01-01T00:00:00Z"),
+        ]
+
+    async def test_teams_and_subordinates(self, supabase):
+        context = await rbac_service.get_user_rbac_data(USER_ID)
+
+        assert [(t.id, t.role) for t in context.teams] == [(10, "leader"), (11, "member")]
+        assert context.manager_id == "user-0"
+        # Direct reports plus members of led teams, once each
+        assert sorted(context.subordinate_ids) == ["member-1", "report-1", "report-2"]
+
+    async def test_sharing(self, supabase):
+        context = await rbac_service.get_user_rbac_data(USER_ID)
+
+        assert [r.id for r in context.sharing_rules] == [1, 2, 3]
+        assert sorted(context.shared_from_user_ids) == ["peer-1", "peer-2", "rep-1", "rep-2"]
+        assert [sr.record_id for sr in context.shared_records["proposal"]] == ["p-1"]
+        assert [(sr.record_id, sr.access_level) for sr in context.shared_records["booking"]] == [
+            ("b-1", "read_write")
+        ]
+
+    async def test_companies_come_from_accessible_schemas(self, supabase):
+        context = await rbac_service.get_user_rbac_data(USER_ID)
+        assert context.companies == ["backlite_dubai", "backlite_uk"]
+
+    async def test_no_assigned_companies(self, supabase):
+        supabase.rows[("user_companies", "user_id")] = []
+
+        context = await rbac_service.get_user_rbac_data(USER_ID)
+        assert context.companies == []
+        assert supabase.counts[("rpc", "get_accessible_schemas")] == 0
+
+    @pytest.mark.parametrize("user", [None, "inactive"])
+    async def test_missing_or_inactive_user_is_denied(self, supabase, user):
+        if user is None:
+            supabase.rows[("users", "id")] = None
+        else:
+            supabase.rows[("users", "id")]["is_active"] = False
+
+        assert await rbac_service.get_user_rbac_data(USER_ID) is None
+
+
+class TestSectionCaching:
+    """Section caching, invalidation and single-flight."""
+
+    async def test_warm_call_makes_no_queries(self, supabase):
+        first = await rbac_service.get_user_rbac_data(USER_ID)
+        queries = sum(supabase.counts.values())
+
+        assert await rbac_service.get_user_rbac_data(USER_ID) == first
+        assert sum(supabase.counts.values()) == queries
+
+    async def test_use_cache_false_reloads(self, supabase):
+        await rbac_service.get_user_rbac_data(USER_ID)
+        await rbac_service.get_user_rbac_data(USER_ID, use_cache=False)
+        assert supabase.counts[("users", "id")] == 2
+
+    async def test_teams_invalidation_refetches_only_teams(self, supabase):
+        await rbac_service.get_user_rbac_data(USER_ID)
+        before = supabase.counts.copy()
+
+        rbac_service.invalidate_rbac_cache(USER_ID, ["teams"])
+        await rbac_service.get_user_rbac_data(USER_ID)
+
+        assert supabase.counts - before == Counter({
+            ("team_members", "user_id"): 1,
+            ("users", "manager_id"): 1,
+            ("team_members", "team_id"): 1,
+        })
+
+    async def test_team_change_rebuilds_sharing(self, supabase):
+        await rbac_service.get_user_rbac_data(USER_ID)
+        # No longer leads team 10
+        del supabase.rows[("team_members", "user_id")][0]
+
+        rbac_service.invalidate_rbac_cache(USER_ID, ["teams"])
+        context = await rbac_service.get_user_rbac_data(USER_ID)
+
+        assert supabase.counts[("sharing_rules", "is_active")] == 2
+        assert [r.id for r in context.sharing_rules] == [1, 2]
+        assert "booking" not in context.shared_records
+        assert sorted(context.subordinate_ids) == ["report-1", "report-2"]
+
+    async def test_permission_set_invalidation_picks_up_new_permission(self, supabase):
+        await rbac_service.get_user_rbac_data(USER_ID)
+        supabase.rows[("permission_set_permissions", "permission_set_id")][1].append(
+            {"permission": "assets:locations:update"}
+        )
+
+        # Cached until invalidated
+        assert "assets:locations:update" not in (await rbac_service.get_user_rbac_data(USER_ID)).permissions
+
+        rbac_service.invalidate_rbac_cache(USER_ID, ["permission_sets"])
+        context = await rbac_service.get_user_rbac_data(USER_ID)
+
+        assert "assets:locations:update" in context.permissions
+        assert supabase.counts[("users", "id")] == 1
+
+    def test_unknown_section_is_rejected(self, supabase):
+        with pytest.raises(ValueError):
+            rbac_service.invalidate_rbac_cache(USER_ID, ["roles"])
+
+    async def test_concurrent_calls_share_one_load(self, supabase):
+        results = await asyncio.gather(*[rbac_service.get_user_rbac_data(USER_ID) for _ in range(20)])
+
+        assert all(result == results[0] for result in results)
+        assert supabase.counts[("users", "id")] == 1
+        assert rbac_service._inflight == {}
+
+    async def test_load_racing_invalidation_does_not_cache_stale_data(self, supabase):
+        entered, release = supabase.hold(("profile_permissions", "profile_id"))
+        racing = asyncio.create_task(rbac_service.get_user_rbac_data(USER_ID))
+        assert await asyncio.to_thread(entered.wait, 5)
+
+        # The profile changes while the load is reading the old permissions
+        supabase.rows[("profile_permissions", "profile_id")].append({"permission": "sales:clients:read"})
+        rbac_service.invalidate_rbac_cache(USER_ID, ["profile"])
+        del supabase._held[("profile_permissions", "profile_id")]
+        release.set()
+
+        assert "sales:clients:read" not in (await racing).permissions
+        context = await rbac_service.get_user_rbac_data(USER_ID)
+        assert "sales:clients:read" in context.permissions
+        assert supabase.counts[("profile_permissions", "profile_id")] == 2
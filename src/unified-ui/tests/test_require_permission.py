@@ -0,0 +1,131 @@
+"""
+Tests for permission-checking dependencies (backend/middleware/auth.py).
+
+These tests verify:
+- The compiled matcher gives the same answer as the original per-permission
+  regex scan, over randomly generated permission sets
+- Gateway wildcard semantics: "*" spans ":" separators, "*:*:*" grants
+  everything, and "manage" implies nothing beyond itself
+- require_permission() any-of and all-of semantics
+- A permission containing regex characters matches only itself, and does
+  not affect checks against the rest of the list
+- Missing permissions answer 403
+
+RBAC data is replaced by a fixed permission list per test.
+"""
+
+import random
+import re
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from backend.middleware import auth
+from backend.services import rbac_service
+
+USER = auth.AuthUser(id="user-1", email="lead@example.com")
+
+# Parts chosen to collide often: real names, wildcards, "manage" and
+# strings that look like other parts (no regex characters besides "*",
+# which the original matcher would have interpreted)
+PARTS = ["sales", "core", "proposals", "system", "read", "admin", "manage", "*", "", "Sales", "sales*"]
+
+
+def reference_check(user_perms: list[str], required: str) -> bool:
+    """The gateway's original matcher: exact match, then one regex per wildcard."""
+    if required in user_perms or "*:*:*" in user_perms:
+        return True
+    for perm in user_perms:
+        if "*" in perm:
+            pattern = perm.replace("*", ".*")
+            if re.match(f"^{pattern}$", required):
+                return True
+    return False
+
+
+def random_permission(rng: random.Random) -> str:
+    n_parts = rng.choices([1, 2, 3, 4], weights=[2, 2, 12, 1])[0]
+    return ":".join(rng.choice(PARTS) for _ in range(n_parts))
+
+
+@pytest.fixture
+def grant(monkeypatch):
+    """Give USER the permissions passed in."""
+
+    def grant(*permissions: str) -> None:
+        async def get_user_rbac_data(user_id):
+            return SimpleNamespace(permissions=list(permissions))
+
+        monkeypatch.setattr(rbac_service, "get_user_rbac_data", get_user_rbac_data)
+
+    return grant
+
+
+async def check(*required: str, require_all: bool = False) -> bool:
+    try:
+        await auth.require_permission(*required, require_all=require_all)(USER)
+    except HTTPException as e:
+        assert e.status_code == 403
+        return False
+    return True
+
+
+class TestEquivalence:
+    """The compiled matcher matches the original regex scan exactly."""
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_permission_sets(self, seed):
+        rng = random.Random(seed)
+        for _ in range(50):
+            permissions = [random_permission(rng) for _ in range(rng.randint(0, 20))]
+            for _ in range(40):
+                required = rng.choice(permissions) if permissions and rng.random() < 0.2 else random_permission(rng)
+                assert auth._check_perm_match(permissions, required) == reference_check(permissions, required), (
+                    permissions,
+                    required,
+                )
+
+
+class TestRequirePermission:
+    """require_permission() decisions."""
+
+    async def test_exact_and_wildcard(self, grant):
+        grant("assets:locations:read", "sales:*:read")
+
+        assert await check("assets:locations:read")
+        assert await check("sales:proposals:read")
+        assert not await check("sales:proposals:create")
+
+    async def test_wildcard_spans_separators(self, grant):
+        grant("sales:*")
+
+        assert await check("sales:proposals:read")
+        assert not await check("core:users:read")
+
+    async def test_manage_is_not_implied(self, grant):
+        grant("sales:proposals:manage", "core:*:manage")
+
+        assert await check("sales:proposals:manage")
+        assert not await check("sales:proposals:delete")
+        assert not await check("core:system:admin")
+
+    async def test_any_and_all(self, grant):
+        grant("sales:proposals:read")
+
+        assert await check("core:users:read", "sales:proposals:read")
+        assert not await check("core:users:read", "sales:proposals:read", require_all=True)
+
+    async def test_regex_characters_are_literal(self, grant):
+        grant("sales:(*:read", "assets:[:*", "sales:proposals:*")
+
+        assert await check("sales:proposals:create")
+        assert await check("sales:(x:read")
+        assert not await check("sales:x:read")
+        assert not await check("assets:locations:read")
+
+    async def test_full_admin(self, grant):
+        grant("*:*:*")
+
+        assert await check("core:users:delete", "sales:proposals:create", require_all=True)
+        assert await check("not-a-permission")
@@ -0,0 +1,236 @@
+"""
+Tests for local access-token verification (backend/services/token_verifier.py).
+
+These tests verify:
+- Valid HS256 and ES256 tokens are accepted, and repeats come from the cache
+- Expired, wrong-audience, wrong-issuer and tampered tokens are rejected
+- A kid missing from a loaded JWKS raises KeyUnknownError; with no key
+  source at all (no secret, empty JWKS) NoKeySourceError is raised
+- The auth middleware falls back to Supabase without a key source, and only
+  with AUTH_REMOTE_FALLBACK for unknown kids
+- Revocation rejects tokens issued in an earlier second
+"""
+
+import time
+from types import SimpleNamespace
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from backend.config import get_settings
+from backend.middleware import auth
+from backend.services import token_verifier
+from backend.services.token_verifier import KeyUnknownError, NoKeySourceError, TokenVerifier
+
+SUPABASE_URL = "https://project.supabase.co"
+ISSUER = f"{SUPABASE_URL}/auth/v1"
+SECRET = "test-jwt-secret-with-at-least-32-bytes!"
+
+
+def make_token(key=SECRET, algorithm="HS256", kid=None, **overrides) -> str:
+    now = int(time.time())
+    claims = {
+        "sub": "user-1",
+        "email": "user@example.com",
+        "role": "authenticated",
+        "aud": "authenticated",
+        "iss": ISSUER,
+        "iat": now,
+        "exp": now + 3600,
+        **overrides,
+    }
+    headers = {"kid": kid} if kid else None
+    return jwt.encode(claims, key, algorithm=algorithm, headers=headers)
+
+
+def make_jwk(private_key, kid: str) -> dict:
+    jwk = jwt.algorithms.ECAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    return {**jwk, "kid": kid, "alg": "ES256", "use": "sig"}
+
+
+@pytest.fixture(autouse=True)
+def no_shared_cache(monkeypatch):
+    monkeypatch.setattr(token_verifier, "_get_cache", lambda: None)
+
+
+@pytest.fixture
+def signing_key():
+    return ec.generate_private_key(ec.SECP256R1())
+
+
+@pytest.fixture
+def jwks(monkeypatch, signing_key):
+    """Serve a JWKS with one ES256 key ("key-1") to the verifier."""
+    served = {"keys": [make_jwk(signing_key, "key-1")]}
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url)
+        return httpx.Response(200, json=served)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        token_verifier.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    return SimpleNamespace(served=served, requests=requests)
+
+
+class TestTokenVerifier:
+    """TokenVerifier.verify()."""
+
+    async def test_valid_hs256_token(self):
+        verifier = TokenVerifier(SUPABASE_URL, jwt_secret=SECRET)
+        token = make_token()
+
+        user = await verifier.verify(token)
+        assert user.id == "user-1"
+        assert user.email == "user@example.com"
+
+        assert await verifier.verify(token) == user
+        assert verifier.stats()["hits"] == 1
+
+    async def test_valid_es256_token(self, jwks, signing_key):
+        verifier = TokenVerifier(SUPABASE_URL)
+
+        user = await verifier.verify(make_token(signing_key, "ES256", kid="key-1"))
+        assert user.id == "user-1"
+        assert [str(url) for url in jwks.requests] == [f"{ISSUER}/.well-known/jwks.json"]
+
+    async def test_expired_token(self):
+        verifier = TokenVerifier(SUPABASE_URL, jwt_secret=SECRET)
+        now = int(time.time())
+        assert await verifier.verify(make_token(iat=now - 7200, exp=now - 3600)) is None
+        assert verifier.stats()["invalid"] == 1
+
+    async def test_wrong_audience(self):
+        verifier = TokenVerifier(SUPABASE_URL, jwt_secret=SECRET)
+        assert await verifier.verify(make_token(aud="anon")) is None
+
+    async def test_wrong_issuer(self):
+        verifier = TokenVerifier(SUPABASE_URL, jwt_secret=SECRET)
+        assert await verifier.verify(make_token(iss="https://other.supabase.co/auth/v1")) is None
+
+    async def test_wrong_secret(self):
+        verifier = TokenVerifier(SUPABASE_URL, jwt_secret=SECRET)
+        assert await verifier.verify(make_token(key="another-secret-that-is-also-long-enough")) is None
+
+    async def test_tampered_payload(self):
+        verifier = TokenVerifier(SUPABASE_URL, jwt_secret=SECRET)
+        header, _, signature = make_token().split(".")
+        forged = make_token(sub="admin").split(".")[1]
+        assert await verifier.verify(f"{header}.{forged}.{signature}") is None
+
+    async def test_unknown_kid(self, jwks, signing_key):
+        verifier = TokenVerifier(SUPABASE_URL)
+        other_key = ec.generate_private_key(ec.SECP256R1())
+
+        with pytest.raises(KeyUnknownError) as excinfo:
+            await verifier.verify(make_token(other_key, "ES256", kid="key-2"))
+        assert not isinstance(excinfo.value, NoKeySourceError)
+        assert verifier.stats()["signing_keys"] == 1
+
+    async def test_new_kid_refetches_jwks(self, jwks, signing_key, monkeypatch):
+        verifier = TokenVerifier(SUPABASE_URL)
+        await verifier.verify(make_token(signing_key, "ES256", kid="key-1"))
+
+        rotated = ec.generate_private_key(ec.SECP256R1())
+        jwks.served["keys"].append(make_jwk(rotated, "key-2"))
+        monkeypatch.setattr(token_verifier, "_JWKS_MIN_REFRESH_SECONDS", 0)
+
+        assert (await verifier.verify(make_token(rotated, "ES256", kid="key-2"))).id == "user-1"
+        assert len(jwks.requests) == 2
+
+    async def test_hs256_without_secret_has_no_key_source(self):
+        verifier = TokenVerifier(SUPABASE_URL)
+        with pytest.raises(NoKeySourceError):
+            await verifier.verify(make_token())
+
+    async def test_empty_jwks_has_no_key_source(self, jwks, signing_key):
+        jwks.served["keys"] = []
+        verifier = TokenVerifier(SUPABASE_URL)
+        with pytest.raises(NoKeySourceError):
+            await verifier.verify(make_token(signing_key, "ES256", kid="key-1"))
+
+    async def test_revocation_rejects_earlier_tokens(self):
+        verifier = TokenVerifier(SUPABASE_URL, jwt_secret=SECRET)
+        earlier = make_token(iat=int(time.time()) - 60)
+        assert await verifier.verify(earlier) is not None
+
+        await verifier.revoke_user("user-1", ttl=3600)
+
+        assert await verifier.verify(earlier) is None
+        # Signing in again in the same second still works
+        assert await verifier.verify(make_token()) is not None
+
+
+class FakeSupabase:
+    """Supabase client stub whose auth.get_user() returns a fixed user."""
+
+    def __init__(self):
+        self.calls: list[str] = []
+        self.auth = SimpleNamespace(get_user=self._get_user)
+
+    def _get_user(self, token: str):
+        self.calls.append(token)
+        return SimpleNamespace(user=SimpleNamespace(id="remote-user"))
+
+
+class TestMiddlewareFallback:
+    """backend.middleware.auth._verify_token()."""
+
+    @pytest.fixture
+    def settings(self, monkeypatch):
+        settings = get_settings()
+        monkeypatch.setattr(settings, "AUTH_LOCAL_JWT_VERIFY", True)
+        monkeypatch.setattr(settings, "AUTH_REMOTE_FALLBACK", False)
+        return settings
+
+    @pytest.fixture
+    def use_verifier(self, monkeypatch):
+        def _use(verifier: TokenVerifier) -> None:
+            monkeypatch.setattr(auth, "get_token_verifier", lambda: verifier)
+        return _use
+
+    async def test_local_verification_skips_supabase(self, settings, use_verifier):
+        use_verifier(TokenVerifier(SUPABASE_URL, jwt_secret=SECRET))
+        supabase = FakeSupabase()
+
+        user = await auth._verify_token(supabase, make_token())
+        assert user.id == "user-1"
+        assert supabase.calls == []
+
+    async def test_no_key_source_falls_back_to_supabase(self, settings, use_verifier):
+        use_verifier(TokenVerifier(SUPABASE_URL))
+        supabase = FakeSupabase()
+        token = make_token()
+
+        user = await auth._verify_token(supabase, token)
+        assert user.id == "remote-user"
+        assert supabase.calls == [token]
+
+    async def test_unknown_kid_rejected_without_remote_fallback(self, settings, use_verifier, jwks):
+        use_verifier(TokenVerifier(SUPABASE_URL))
+        supabase = FakeSupabase()
+        token = make_token(ec.generate_private_key(ec.SECP256R1()), "ES256", kid="key-2")
+
+        assert await auth._verify_token(supabase, token) is None
+        assert supabase.calls == []
+
+    async def test_unknown_kid_with_remote_fallback(self, settings, use_verifier, jwks, monkeypatch):
+        monkeypatch.setattr(settings, "AUTH_REMOTE_FALLBACK", True)
+        use_verifier(TokenVerifier(SUPABASE_URL))
+        supabase = FakeSupabase()
+
+        user = await auth._verify_token(supabase, make_token(ec.generate_private_key(ec.SECP256R1()), "ES256", kid="key-2"))
+        assert user.id == "remote-user"
+
+    async def test_invalid_token_is_not_sent_to_supabase(self, settings, use_verifier):
+        use_verifier(TokenVerifier(SUPABASE_URL, jwt_secret=SECRET))
+        supabase = FakeSupabase()
+
+        assert await auth._verify_token(supabase, make_token(aud="anon")) is None
+        assert supabase.calls == []